@@ -42,6 +42,11 @@ class CreateExperimentRunResponseBodyData(TypedDict):
     id: str
 
 
+class CreateExperimentRunsResponseBodyData(TypedDict):
+    id: NotRequired[str]
+    error: NotRequired[str]
+
+
 class CreateProjectRequestBody(TypedDict):
     name: str
     description: NotRequired[str]
@@ -120,6 +125,16 @@ class ExperimentRun(TypedDict):
     error: NotRequired[str]
 
 
+class ExperimentRunData(TypedDict):
+    dataset_example_id: str
+    output: Any
+    repetition_number: int
+    start_time: str
+    end_time: str
+    trace_id: NotRequired[str]
+    error: NotRequired[str]
+
+
 class FreeformAnnotationConfig(TypedDict):
     type: Literal["FREEFORM"]
     name: str
@@ -528,6 +543,11 @@ class UpsertExperimentEvaluationResponseBodyData(TypedDict):
     id: str
 
 
+class UpsertExperimentEvaluationsResponseBodyData(TypedDict):
+    id: NotRequired[str]
+    error: NotRequired[str]
+
+
 class ValidationError(TypedDict):
     loc: Sequence[Union[str, int]]
     msg: str
@@ -614,6 +634,14 @@ class CreateExperimentRunResponseBody(TypedDict):
     data: CreateExperimentRunResponseBodyData
 
 
+class CreateExperimentRunsRequestBody(TypedDict):
+    data: Sequence[ExperimentRunData]
+
+
+class CreateExperimentRunsResponseBody(TypedDict):
+    data: Sequence[CreateExperimentRunsResponseBodyData]
+
+
 class CreateProjectResponseBody(TypedDict):
     data: Project
 
@@ -782,6 +810,14 @@ class UpsertExperimentEvaluationResponseBody(TypedDict):
     data: UpsertExperimentEvaluationResponseBodyData
 
 
+class UpsertExperimentEvaluationsRequestBody(TypedDict):
+    data: Sequence[UpsertExperimentEvaluationRequestBody]
+
+
+class UpsertExperimentEvaluationsResponseBody(TypedDict):
+    data: Sequence[UpsertExperimentEvaluationsResponseBodyData]
+
+
 class CreateSpansRequestBody(TypedDict):
     data: Sequence[Span]
 
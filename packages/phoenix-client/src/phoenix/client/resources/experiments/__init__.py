@@ -1,9 +1,11 @@
+import asyncio
 import copy
 import functools
 import inspect
 import json
 import logging
 import random
+import time
 import traceback
 from binascii import hexlify
 from collections.abc import Awaitable, Callable, Iterator, Mapping, Sequence
@@ -12,7 +14,7 @@ from contextvars import ContextVar
 from dataclasses import replace
 from datetime import datetime, timezone
 from itertools import product
-from threading import Lock
+from threading import Lock, Timer
 from typing import Any, Literal, Optional, Union, cast
 from urllib.parse import urljoin
 
@@ -437,6 +439,301 @@ def _build_incomplete_evaluation_tasks(
     return _build_tasks_for_named_evaluators(incomplete_evals, evaluators_by_name)
 
 
+DEFAULT_SUBMISSION_BATCH_SIZE = 100
+DEFAULT_SUBMISSION_INTERVAL_IN_SECONDS = 5.0
+DEFAULT_SUBMISSION_MAX_ATTEMPTS = 4
+DEFAULT_SUBMISSION_RETRY_DELAY_IN_SECONDS = 1.0
+
+_SubmissionKey = tuple[Any, ...]
+
+
+def _run_key(run: Mapping[str, Any]) -> _SubmissionKey:
+    return run["dataset_example_id"], run["repetition_number"]
+
+
+def _evaluation_key(evaluation: Mapping[str, Any]) -> _SubmissionKey:
+    return evaluation["experiment_run_id"], evaluation["name"]
+
+
+def _is_missing_endpoint(response: httpx.Response) -> bool:
+    # Servers that predate an endpoint answer with a 405 or with the HTML of the app
+    return response.status_code == 405 or (
+        response.status_code == 404 and "text/html" in response.headers.get("content-type", "")
+    )
+
+
+def _is_transient(exc: httpx.HTTPError) -> bool:
+    if isinstance(exc, HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _single_submission_result(response: httpx.Response) -> Mapping[str, Any]:
+    if response.status_code == 409:
+        # the item already exists on the server with a successful result
+        return {}
+    if response.is_error:
+        return {"error": f"HTTP {response.status_code} - {response.text}"}
+    return {"id": response.json()["data"]["id"]}
+
+
+class _SubmissionBuffer:
+    """
+    Buffers experiment runs or evaluations bound for the Phoenix server and submits them
+    together to the `{url}/batch` endpoint once `batch_size` items are buffered or the oldest
+    buffered item has waited for `flush_interval` seconds.
+
+    The server reports an outcome for each item: rejected items are logged one by one and the
+    IDs of recorded items are kept in `ids`. A request that fails with a timeout, a network
+    error, a 429 or a 5xx is retried with exponential backoff up to `max_attempts` times. If it
+    still fails, the items are put back into the buffer to be submitted again with the next
+    batch, and the error is only raised by `flush`, which submits whatever is left for the last
+    time. Any other failed request is raised right away. Servers without the batch endpoint are
+    sent one item at a time to `url` instead.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        kind: str,
+        key: Callable[[Mapping[str, Any]], _SubmissionKey],
+        timeout: Optional[int],
+        batch_size: int = DEFAULT_SUBMISSION_BATCH_SIZE,
+        flush_interval: float = DEFAULT_SUBMISSION_INTERVAL_IN_SECONDS,
+        max_attempts: int = DEFAULT_SUBMISSION_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_SUBMISSION_RETRY_DELAY_IN_SECONDS,
+    ) -> None:
+        self.ids: dict[_SubmissionKey, str] = {}
+        self._url = url
+        self._kind = kind
+        self._key = key
+        self._timeout = timeout
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._items: list[Mapping[str, Any]] = []
+        self._oldest: Optional[float] = None
+        self._batch_endpoint_is_missing = False
+
+    def _append(self, item: Mapping[str, Any]) -> list[Mapping[str, Any]]:
+        """Buffers the item and returns the buffered items if they are due for submission."""
+        self._items.append(item)
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+            self._schedule_flush(self._flush_interval)
+        if (
+            len(self._items) >= self._batch_size
+            or time.monotonic() - self._oldest >= self._flush_interval
+        ):
+            return self._take()
+        return []
+
+    def _take(self) -> list[Mapping[str, Any]]:
+        items, self._items, self._oldest = self._items, [], None
+        return items
+
+    def _take_if_due(self) -> list[Mapping[str, Any]]:
+        """
+        Returns the buffered items if the oldest one has waited for `flush_interval` seconds,
+        and otherwise schedules the next check for when it will have.
+        """
+        if self._oldest is None:
+            return []
+        if (remaining := self._oldest + self._flush_interval - time.monotonic()) > 0:
+            self._schedule_flush(remaining)
+            return []
+        return self._take()
+
+    def _put_back(self, items: Sequence[Mapping[str, Any]], exc: httpx.HTTPError) -> None:
+        """Returns the items of a failed submission to the front of the buffer."""
+        self._log_failure(items, exc, retry=True)
+        self._items[:0] = items
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+            self._schedule_flush(self._flush_interval)
+
+    def _schedule_flush(self, delay: float) -> None:
+        """Arranges for the buffered items to be submitted if they are still due in `delay`."""
+        raise NotImplementedError
+
+    def _backoff(self, attempt: int, exc: httpx.HTTPError) -> Optional[float]:
+        """Returns how long to wait before retrying the failed attempt, if it is retried."""
+        if attempt >= self._max_attempts or not _is_transient(exc):
+            return None
+        return self._retry_delay * 2.0 ** (attempt - 1)
+
+    def _record(
+        self, items: Sequence[Mapping[str, Any]], results: Sequence[Mapping[str, Any]]
+    ) -> None:
+        for item, result in zip(items, results):
+            if (id_ := result.get("id")) is not None:
+                self.ids[self._key(item)] = id_
+            elif (error := result.get("error")) is not None:
+                logger.warning(f"Failed to submit {self._kind} {self._key(item)}: {error}")
+
+    def _log_failure(
+        self, items: Sequence[Mapping[str, Any]], exc: httpx.HTTPError, retry: bool = False
+    ) -> None:
+        if isinstance(exc, HTTPStatusError):
+            reason = f"HTTP {exc.response.status_code} - {exc.response.text}"
+        else:
+            reason = repr(exc)
+        logger.warning(
+            f"Failed to submit {len(items)} {self._kind}(s): {reason}"
+            + ("; they will be submitted again with the next batch" if retry else "")
+        )
+
+
+class _SyncSubmissionBuffer(_SubmissionBuffer):
+    def __init__(self, client: httpx.Client, url: str, **kwargs: Any) -> None:
+        super().__init__(url, **kwargs)
+        self._client = client
+        self._lock = Lock()
+        self._timer: Optional[Timer] = None
+
+    def add(self, item: Mapping[str, Any]) -> None:
+        with self._lock:
+            if items := self._append(item):
+                self._submit(items)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if items := self._take():
+                self._submit(items, final=True)
+
+    def _schedule_flush(self, delay: float) -> None:
+        if self._timer is not None:
+            return
+        self._timer = Timer(delay, self._flush_if_due)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_if_due(self) -> None:
+        with self._lock:
+            self._timer = None
+            if not (items := self._take_if_due()):
+                return
+            try:
+                self._submit(items)
+            except httpx.HTTPError as exc:
+                # nobody is waiting on the timer, so the error is left for `add` or `flush`
+                self._put_back(items, exc)
+
+    def _submit(self, items: Sequence[Mapping[str, Any]], final: bool = False) -> None:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                results = self._post(items)
+            except httpx.HTTPError as exc:
+                if (delay := self._backoff(attempt, exc)) is not None:
+                    time.sleep(delay)
+                    continue
+                if final or not _is_transient(exc):
+                    self._log_failure(items, exc)
+                    raise
+                self._put_back(items, exc)
+                return
+            self._record(items, results)
+            return
+
+    def _post(self, items: Sequence[Mapping[str, Any]]) -> Sequence[Mapping[str, Any]]:
+        if not self._batch_endpoint_is_missing:
+            response = self._client.post(
+                f"{self._url}/batch", json={"data": items}, timeout=self._timeout
+            )
+            self._batch_endpoint_is_missing = _is_missing_endpoint(response)
+        if self._batch_endpoint_is_missing:
+            return [
+                _single_submission_result(
+                    self._client.post(self._url, json=item, timeout=self._timeout)
+                )
+                for item in items
+            ]
+        response.raise_for_status()
+        return cast(Sequence[Mapping[str, Any]], response.json()["data"])
+
+
+class _AsyncSubmissionBuffer(_SubmissionBuffer):
+    def __init__(self, client: httpx.AsyncClient, url: str, **kwargs: Any) -> None:
+        super().__init__(url, **kwargs)
+        self._client = client
+        self._lock = asyncio.Lock()
+        self._submissions: list[asyncio.Task[None]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def add(self, item: Mapping[str, Any]) -> None:
+        # Due items are submitted in the background, so cancelling the caller on a timeout
+        # cannot lose them.
+        if items := self._append(item):
+            self._submit_in_background(items)
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        submissions, self._submissions = self._submissions, []
+        # Errors of the background submissions are raised once the rest has been submitted.
+        outcomes = await asyncio.gather(*submissions, return_exceptions=True)
+        if items := self._take():
+            await self._submit(items, final=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+    def _schedule_flush(self, delay: float) -> None:
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(delay, self._flush_if_due)
+
+    def _flush_if_due(self) -> None:
+        self._timer = None
+        if items := self._take_if_due():
+            self._submit_in_background(items)
+
+    def _submit_in_background(self, items: Sequence[Mapping[str, Any]]) -> None:
+        self._submissions.append(asyncio.create_task(self._submit(items)))
+
+    async def _submit(self, items: Sequence[Mapping[str, Any]], final: bool = False) -> None:
+        async with self._lock:  # keeps the batches in order
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    results = await self._post(items)
+                except httpx.HTTPError as exc:
+                    if (delay := self._backoff(attempt, exc)) is not None:
+                        await asyncio.sleep(delay)
+                        continue
+                    if final or not _is_transient(exc):
+                        self._log_failure(items, exc)
+                        raise
+                    self._put_back(items, exc)
+                    return
+                self._record(items, results)
+                return
+
+    async def _post(self, items: Sequence[Mapping[str, Any]]) -> Sequence[Mapping[str, Any]]:
+        if not self._batch_endpoint_is_missing:
+            response = await self._client.post(
+                f"{self._url}/batch", json={"data": items}, timeout=self._timeout
+            )
+            self._batch_endpoint_is_missing = _is_missing_endpoint(response)
+        if self._batch_endpoint_is_missing:
+            return [
+                _single_submission_result(
+                    await self._client.post(self._url, json=item, timeout=self._timeout)
+                )
+                for item in items
+            ]
+        response.raise_for_status()
+        return cast(Sequence[Mapping[str, Any]], response.json()["data"])
+
+
 class Experiments:
     """
     Provides methods for running experiments and evaluations.
@@ -784,6 +1081,17 @@ class Experiments:
         ]
 
         task_result_cache: dict[tuple[str, int], Any] = {}
+        run_submissions = (
+            None
+            if dry_run
+            else _SyncSubmissionBuffer(
+                self._client,
+                f"v1/experiments/{experiment['id']}/runs",
+                kind="experiment run",
+                key=_run_key,
+                timeout=timeout,
+            )
+        )
 
         # Setup rate limiting
         errors: tuple[type[BaseException], ...]
@@ -802,7 +1110,7 @@ class Experiments:
                 tracer,
                 resource,
                 root_span_name,
-                dry_run,
+                run_submissions,
                 timeout,
                 task_result_cache,
             )
@@ -820,6 +1128,8 @@ class Experiments:
         )
 
         task_runs, _execution_details = executor.run(test_cases)
+        if run_submissions is not None:
+            run_submissions.flush()
         print("✅ Task runs completed.")
 
         # Get the final state of runs from the database if not dry run
@@ -1135,6 +1445,13 @@ class Experiments:
         )
         root_span_name = f"Task: {get_func_name(task)}"
         task_result_cache: dict[tuple[str, int], Any] = {}
+        run_submissions = _SyncSubmissionBuffer(
+            self._client,
+            f"v1/experiments/{experiment_id}/runs",
+            kind="experiment run",
+            key=_run_key,
+            timeout=timeout,
+        )
 
         # Setup rate limiting
         errors: tuple[type[BaseException], ...]
@@ -1153,7 +1470,7 @@ class Experiments:
                 tracer,
                 resource,
                 root_span_name,
-                False,  # dry_run
+                run_submissions,
                 timeout,
                 task_result_cache,
             )
@@ -1229,6 +1546,7 @@ class Experiments:
                 )
 
                 batch_results, _ = executor.run(batch_test_cases)
+                run_submissions.flush()
                 batch_completed_runs = [r for r in batch_results if r is not None]
 
                 total_processed += len(batch_test_cases)
@@ -1662,7 +1980,7 @@ class Experiments:
         tracer: Tracer,
         resource: Resource,
         root_span_name: str,
-        dry_run: Union[bool, int],
+        run_submissions: Optional[_SyncSubmissionBuffer],
         timeout: Optional[int],
         task_result_cache: dict[tuple[str, int], Any],
     ) -> Optional[ExperimentRun]:
@@ -1671,9 +1989,9 @@ class Experiments:
 
         This function will be called more than once in the following cases:
             1. The task is cancelled due to an *executor-level* timeout.
-              - In the event where the user task has completed, but the timeout cancels the
-                POST to the Phoenix server, we will re-run this function with the memoized result,
-                regardless of whether the task failed or was successful
+              - In the event where the user task has completed, but the timeout interrupts the
+                submission to the Phoenix server, we will re-run this function with the memoized
+                result, regardless of whether the task failed or was successful
             2. The task fails, raises an exception, and is requeued by the executor if there are
                 retries remaining
               - This only happens if a timeout did not occur and the error has been persisted to the
@@ -1687,22 +2005,10 @@ class Experiments:
         # Check if we have a cached result
         if cache_key in task_result_cache:
             cached_value = cast(ExperimentRun, task_result_cache[cache_key])
-            # we only get to this point if the previous post to the sever was cancelled, so we
-            # re-try the post
-            if not dry_run:
-                try:
-                    resp = self._client.post(
-                        f"v1/experiments/{experiment['id']}/runs",
-                        json=cached_value,
-                        timeout=timeout,
-                    )
-                    resp.raise_for_status()
-                except HTTPStatusError as e:
-                    if e.response.status_code == 409:
-                        pass
-                    else:
-                        task_result_cache.pop(cache_key, None)
-                        raise
+            # we only get to this point if the previous submission to the server was
+            # interrupted, so we re-submit the run
+            if run_submissions is not None:
+                run_submissions.add(cached_value)
             return cached_value
 
         output = None
@@ -1780,31 +2086,19 @@ class Experiments:
         if error:
             exp_run["error"] = repr(error)
 
-        # here we cache the result because the post to the server may be cancelled
+        # here we cache the result because the submission to the server may be interrupted
         task_result_cache[cache_key] = exp_run
 
-        if not dry_run:
-            try:
-                resp = self._client.post(
-                    f"v1/experiments/{experiment['id']}/runs",
-                    json=exp_run,
-                    timeout=timeout,
-                )
-                resp.raise_for_status()
-                exp_run = {**exp_run, "id": resp.json()["data"]["id"]}
-            except HTTPStatusError as e:
-                if e.response.status_code == 409:
-                    # Run already exists on server, but our local data is valid
-                    pass
-                else:
-                    task_result_cache.pop(cache_key, None)
-                    raise
+        if run_submissions is not None:
+            # runs are submitted in batches and in order, so the run of a successful retry
+            # replaces the failed one on the server
+            run_submissions.add(exp_run)
 
         # Re-raise exception if task failed
         if error is not None:
             # we can delete the task result from the cache because the result has been
-            # successfully submitted to the server, however we will leave the error check in place
-            # just in case our assumption is wrong
+            # handed off for submission to the server, however we will leave the error check in
+            # place just in case our assumption is wrong
             task_result_cache.pop(cache_key, None)
             raise error
 
@@ -1843,6 +2137,18 @@ class Experiments:
             errors = tuple(filter(None, rate_limit_errors))
         rate_limiters = [RateLimiter(rate_limit_error=error) for error in errors]
 
+        evaluation_submissions = (
+            None
+            if dry_run
+            else _SyncSubmissionBuffer(
+                self._client,
+                "v1/experiment_evaluations",
+                kind="experiment evaluation",
+                key=_evaluation_key,
+                timeout=timeout,
+            )
+        )
+
         def sync_evaluate_run(
             obj: tuple[v1.DatasetExample, ExperimentRun, Evaluator],
         ) -> list[ExperimentEvaluationRun]:
@@ -1853,7 +2159,7 @@ class Experiments:
                 evaluator,
                 tracer,
                 resource,
-                dry_run,
+                evaluation_submissions,
                 timeout,
             )
 
@@ -1876,6 +2182,18 @@ class Experiments:
             if res is None:
                 continue
             flattened.extend(cast(list[ExperimentEvaluationRun], res))
+        if evaluation_submissions is not None:
+            evaluation_submissions.flush()
+            # the evaluations get their IDs once the server has recorded them
+            flattened = [
+                replace(
+                    eval_run,
+                    id=evaluation_submissions.ids.get(
+                        _evaluation_key(eval_run.__dict__), eval_run.id
+                    ),
+                )
+                for eval_run in flattened
+            ]
         return flattened
 
     def _run_single_evaluation_sync(
@@ -1885,7 +2203,7 @@ class Experiments:
         evaluator: Evaluator,
         tracer: Tracer,
         resource: Resource,
-        dry_run: bool,
+        evaluation_submissions: Optional[_SyncSubmissionBuffer],
         timeout: Optional[int],
     ) -> list[ExperimentEvaluationRun]:
         result: Optional[EvaluationResult] = None
@@ -1996,21 +2314,8 @@ class Experiments:
                 trace_id=trace_id,
             )
 
-            if not dry_run:
-                try:
-                    resp = self._client.post(
-                        "v1/experiment_evaluations",
-                        json=jsonify(eval_run.__dict__),
-                        timeout=timeout,
-                    )
-                    resp.raise_for_status()
-                    eval_run = replace(eval_run, id=resp.json()["data"]["id"])  # pyright: ignore[reportUnknownArgumentType]
-                except HTTPStatusError as e:
-                    logger.warning(
-                        f"Failed to submit evaluation result for evaluator '{evaluator.name}': "
-                        f"HTTP {e.response.status_code} - {e.response.text}"
-                    )
-                    # Continue even if evaluation storage fails
+            if evaluation_submissions is not None:
+                evaluation_submissions.add(jsonify(eval_run.__dict__))
 
             eval_runs.append(eval_run)
 
@@ -2513,6 +2818,17 @@ class AsyncExperiments:
         ]
 
         task_result_cache: dict[tuple[str, int], Any] = {}
+        run_submissions = (
+            None
+            if dry_run
+            else _AsyncSubmissionBuffer(
+                self._client,
+                f"v1/experiments/{experiment['id']}/runs",
+                kind="experiment run",
+                key=_run_key,
+                timeout=timeout,
+            )
+        )
 
         # Setup rate limiting
         errors: tuple[type[BaseException], ...]
@@ -2531,7 +2847,7 @@ class AsyncExperiments:
                 tracer,
                 resource,
                 root_span_name,
-                dry_run,
+                run_submissions,
                 timeout,
                 task_result_cache,
             )
@@ -2551,6 +2867,8 @@ class AsyncExperiments:
         )
 
         task_runs, _execution_details = await executor.execute(test_cases)
+        if run_submissions is not None:
+            await run_submissions.flush()
         print("✅ Task runs completed.")
 
         # Get the final state of runs from the database if not dry run
@@ -2867,6 +3185,13 @@ class AsyncExperiments:
         )
         root_span_name = f"Task: {get_func_name(task)}"
         task_result_cache: dict[tuple[str, int], Any] = {}
+        run_submissions = _AsyncSubmissionBuffer(
+            self._client,
+            f"v1/experiments/{experiment_id}/runs",
+            kind="experiment run",
+            key=_run_key,
+            timeout=timeout,
+        )
 
         # Setup rate limiting
         errors: tuple[type[BaseException], ...]
@@ -2885,7 +3210,7 @@ class AsyncExperiments:
                 tracer,
                 resource,
                 root_span_name,
-                False,  # dry_run
+                run_submissions,
                 timeout,
                 task_result_cache,
             )
@@ -2963,6 +3288,7 @@ class AsyncExperiments:
                 )
 
                 batch_results, _ = await executor.execute(batch_test_cases)
+                await run_submissions.flush()
                 batch_completed_runs = [r for r in batch_results if r is not None]
 
                 total_processed += len(batch_test_cases)
@@ -3403,7 +3729,7 @@ class AsyncExperiments:
         tracer: Tracer,
         resource: Resource,
         root_span_name: str,
-        dry_run: Union[bool, int],
+        run_submissions: Optional[_AsyncSubmissionBuffer],
         timeout: Optional[int],
         task_result_cache: dict[tuple[str, int], Any],
     ) -> Optional[ExperimentRun]:
@@ -3412,9 +3738,9 @@ class AsyncExperiments:
 
         This function will be called more than once in the following cases:
             1. The task is cancelled due to an *executor-level* timeout.
-              - In the event where the user task has completed, but the timeout cancels the
-                POST to the Phoenix server, we will re-run this function with the memoized result,
-                regardless of whether the task failed or was successful
+              - In the event where the user task has completed, but the timeout interrupts the
+                submission to the Phoenix server, we will re-run this function with the memoized
+                result, regardless of whether the task failed or was successful
             2. The task fails, raises an exception, and is requeued by the executor if there are
                 retries remaining
               - This only happens if a timeout did not occur and the error has been persisted to the
@@ -3428,22 +3754,10 @@ class AsyncExperiments:
         # Check if we have a cached result
         if cache_key in task_result_cache:
             cached_value = cast(ExperimentRun, task_result_cache[cache_key])
-            # we only get to this point if the previous post to the sever was cancelled, so we
-            # re-try the post
-            if not dry_run:
-                try:
-                    resp = await self._client.post(
-                        f"v1/experiments/{experiment['id']}/runs",
-                        json=cached_value,
-                        timeout=timeout,
-                    )
-                    resp.raise_for_status()
-                except HTTPStatusError as e:
-                    if e.response.status_code == 409:
-                        pass
-                    else:
-                        task_result_cache.pop(cache_key, None)
-                        raise
+            # we only get to this point if the previous submission to the server was
+            # interrupted, so we re-submit the run
+            if run_submissions is not None:
+                run_submissions.add(cached_value)
             return cached_value
 
         output = None
@@ -3518,31 +3832,19 @@ class AsyncExperiments:
         if error:
             exp_run["error"] = repr(error)
 
-        # here we cache the result because the post to the server may be cancelled
+        # here we cache the result because the submission to the server may be interrupted
         task_result_cache[cache_key] = exp_run
 
-        if not dry_run:
-            try:
-                resp = await self._client.post(
-                    f"v1/experiments/{experiment['id']}/runs",
-                    json=exp_run,
-                    timeout=timeout,
-                )
-                resp.raise_for_status()
-                exp_run = {**exp_run, "id": resp.json()["data"]["id"]}
-            except HTTPStatusError as e:
-                if e.response.status_code == 409:
-                    # Run already exists on server, but our local data is valid
-                    pass
-                else:
-                    task_result_cache.pop(cache_key, None)
-                    raise
+        if run_submissions is not None:
+            # runs are submitted in batches and in order, so the run of a successful retry
+            # replaces the failed one on the server
+            run_submissions.add(exp_run)
 
         # Re-raise exception if task failed
         if error is not None:
             # we can delete the task result from the cache because the result has been
-            # successfully submitted to the server, however we will leave the error check in place
-            # just in case our assumption is wrong
+            # handed off for submission to the server, however we will leave the error check in
+            # place just in case our assumption is wrong
             task_result_cache.pop(cache_key, None)
             raise error
 
@@ -3584,6 +3886,18 @@ class AsyncExperiments:
             errors = tuple(filter(None, rate_limit_errors))
         rate_limiters = [RateLimiter(rate_limit_error=error) for error in errors]
 
+        evaluation_submissions = (
+            None
+            if dry_run
+            else _AsyncSubmissionBuffer(
+                self._client,
+                "v1/experiment_evaluations",
+                kind="experiment evaluation",
+                key=_evaluation_key,
+                timeout=timeout,
+            )
+        )
+
         async def async_evaluate_run(
             obj: tuple[v1.DatasetExample, ExperimentRun, Evaluator],
         ) -> list[ExperimentEvaluationRun]:
@@ -3594,7 +3908,7 @@ class AsyncExperiments:
                 evaluator,
                 tracer,
                 resource,
-                dry_run,
+                evaluation_submissions,
                 timeout,
             )
 
@@ -3618,6 +3932,18 @@ class AsyncExperiments:
             if res is None:
                 continue
             flattened.extend(cast(list[ExperimentEvaluationRun], res))
+        if evaluation_submissions is not None:
+            await evaluation_submissions.flush()
+            # the evaluations get their IDs once the server has recorded them
+            flattened = [
+                replace(
+                    eval_run,
+                    id=evaluation_submissions.ids.get(
+                        _evaluation_key(eval_run.__dict__), eval_run.id
+                    ),
+                )
+                for eval_run in flattened
+            ]
         return flattened
 
     async def _run_single_evaluation_async(
@@ -3627,7 +3953,7 @@ class AsyncExperiments:
         evaluator: Evaluator,
         tracer: Tracer,
         resource: Resource,
-        dry_run: bool,
+        evaluation_submissions: Optional[_AsyncSubmissionBuffer],
         timeout: Optional[int],
     ) -> list[ExperimentEvaluationRun]:
         result: Optional[EvaluationResult] = None
@@ -3738,21 +4064,8 @@ class AsyncExperiments:
                 trace_id=trace_id,
             )
 
-            if not dry_run:
-                try:
-                    resp = await self._client.post(
-                        "v1/experiment_evaluations",
-                        json=jsonify(eval_run.__dict__),
-                        timeout=timeout,
-                    )
-                    resp.raise_for_status()
-                    eval_run = replace(eval_run, id=resp.json()["data"]["id"])  # pyright: ignore[reportUnknownArgumentType]
-                except HTTPStatusError as e:
-                    logger.warning(
-                        f"Failed to submit evaluation result for evaluator '{evaluator.name}': "
-                        f"HTTP {e.response.status_code} - {e.response.text}"
-                    )
-                    # Continue even if evaluation storage fails
+            if evaluation_submissions is not None:
+                evaluation_submissions.add(jsonify(eval_run.__dict__))
 
             eval_runs.append(eval_run)
 
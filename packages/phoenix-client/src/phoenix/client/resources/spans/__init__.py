@@ -1,8 +1,22 @@
+import asyncio
+import importlib.util
+import io
 import json
 import logging
 from datetime import datetime, timezone, tzinfo
 from io import StringIO
-from typing import TYPE_CHECKING, Any, Iterable, Literal, Optional, Sequence, Union, cast, overload
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+    overload,
+)
 
 import httpx
 from typing_extensions import TypeAlias
@@ -46,6 +60,7 @@ SpanDocumentAnnotationResult = v1.AnnotationResult
 DEFAULT_TIMEOUT_IN_SECONDS = 5
 _LOCAL_TIMEZONE = datetime.now(timezone.utc).astimezone().tzinfo
 _MAX_SPAN_IDS_PER_REQUEST = 100
+_ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
 
 _AnnotatorKind: TypeAlias = Literal["LLM", "CODE", "HUMAN"]
 
@@ -174,6 +189,20 @@ class Spans:
                 else:
                     project_name = project_identifier
 
+            if _is_pyarrow_installed():
+                with self._client.stream(
+                    "POST",
+                    url="v1/spans",
+                    headers={"accept": _ARROW_STREAM_MEDIA_TYPE},
+                    params={"project_name": project_name} if project_name else None,
+                    json=request_body,
+                    timeout=timeout,
+                ) as response:
+                    if response.is_error:
+                        response.read()
+                        response.raise_for_status()
+                    chunks = response.iter_bytes()
+                    return _read_span_dataframe_from_arrow_stream(lambda: next(chunks, None))
             response = self._client.post(
                 url="v1/spans",
                 headers={"accept": "application/json"},
@@ -1344,6 +1373,33 @@ class AsyncSpans:
                 else:
                     project_name = project_identifier
 
+            if _is_pyarrow_installed():
+                async with self._client.stream(
+                    "POST",
+                    url="v1/spans",
+                    headers={"accept": _ARROW_STREAM_MEDIA_TYPE},
+                    params={"project_name": project_name} if project_name else None,
+                    json=request_body,
+                    timeout=timeout,
+                ) as response:
+                    if response.is_error:
+                        await response.aread()
+                        response.raise_for_status()
+                    loop = asyncio.get_running_loop()
+                    chunks = response.aiter_bytes()
+
+                    async def next_chunk() -> Optional[bytes]:
+                        try:
+                            return await chunks.__anext__()
+                        except StopAsyncIteration:
+                            return None
+
+                    # Arrow reads the stream synchronously, so it runs in a worker thread
+                    # that pulls the response body from the event loop one chunk at a time.
+                    return await asyncio.to_thread(
+                        _read_span_dataframe_from_arrow_stream,
+                        lambda: asyncio.run_coroutine_threadsafe(next_chunk(), loop).result(),
+                    )
             response = await self._client.post(
                 url="v1/spans",
                 headers={"accept": "application/json"},
@@ -2496,6 +2552,78 @@ def _process_span_dataframe(response: httpx.Response) -> "pd.DataFrame":
         return pd.DataFrame()
 
 
+def _is_pyarrow_installed() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+class _ChunkedBytesReader(io.RawIOBase):
+    """A read-only file-like object over a sequence of byte chunks, e.g. a streamed response
+    body, that holds at most one chunk in memory at a time.
+
+    Args:
+        next_chunk (Callable[[], Optional[bytes]]): Returns the next chunk, or None when the
+            sequence is exhausted.
+    """
+
+    def __init__(self, next_chunk: Callable[[], Optional[bytes]]) -> None:
+        self._next_chunk = next_chunk
+        self._chunk = b""
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while self._offset >= len(self._chunk):
+            if (chunk := self._next_chunk()) is None:
+                return 0
+            self._chunk, self._offset = chunk, 0
+        size = min(len(buffer), len(self._chunk) - self._offset)
+        buffer[:size] = self._chunk[self._offset : self._offset + size]
+        self._offset += size
+        return size
+
+
+def _read_span_dataframe_from_arrow_stream(
+    next_chunk: Callable[[], Optional[bytes]],
+) -> "pd.DataFrame":
+    """Reads a span DataFrame from a response body of concatenated Arrow IPC streams.
+
+    The server sends the result in pages, each a self-contained IPC stream, so that rows are
+    decoded as they arrive rather than after the whole body has been received. Servers that
+    predate streaming send a single IPC stream, which is read the same way.
+
+    Args:
+        next_chunk (Callable[[], Optional[bytes]]): Returns the next chunk of the response
+            body, or None when the body is exhausted.
+
+    Returns:
+        pd.DataFrame: The pages concatenated, or an empty DataFrame if no data.
+    """
+    import pandas as pd
+    import pyarrow as pa  # type: ignore[import-untyped,unused-ignore]
+
+    source = io.BufferedReader(_ChunkedBytesReader(next_chunk))
+    dfs: list["pd.DataFrame"] = []
+    # Only the end of the body ends the result; a truncated or corrupt page raises instead.
+    while source.peek(1):
+        with pa.ipc.open_stream(source) as reader:
+            table = reader.read_all()
+        df = table.to_pandas()
+        for field in table.schema:
+            # Decode lists as Python lists, as in JSON responses, instead of as NumPy arrays.
+            if field.name in df.columns and (
+                pa.types.is_list(field.type) or pa.types.is_large_list(field.type)
+            ):
+                df[field.name] = table.column(field.name).to_pylist()
+        dfs.append(df)
+    if not dfs:
+        return pd.DataFrame()
+    if len(dfs) == 1:
+        return dfs[0]
+    return pd.concat(dfs)
+
+
 def _flatten_nested_column(df: "pd.DataFrame", column_name: str) -> "pd.DataFrame":
     """Flatten a nested dictionary column in a DataFrame.
 
@@ -0,0 +1,293 @@
+import asyncio
+import json
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from phoenix.client.resources.experiments import (
+    _AsyncSubmissionBuffer,
+    _evaluation_key,
+    _SyncSubmissionBuffer,
+)
+
+
+def _evaluation(run_id: str, name: str) -> dict[str, Any]:
+    return {"experiment_run_id": run_id, "name": name}
+
+
+def _batch_handler(requests: list[httpx.Request]) -> Any:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        data = [
+            {"id": f"{item['experiment_run_id']}:{item['name']}"}
+            if item["name"] != "rejected"
+            else {"error": "rejected by the server"}
+            for item in json.loads(request.content)["data"]
+        ]
+        return httpx.Response(200, json={"data": data})
+
+    return handler
+
+
+def test_sync_buffer_submits_in_batches_and_records_ids(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    requests: list[httpx.Request] = []
+    client = httpx.Client(
+        base_url="http://localhost:6006", transport=httpx.MockTransport(_batch_handler(requests))
+    )
+    buffer = _SyncSubmissionBuffer(
+        client,
+        "v1/experiment_evaluations",
+        kind="experiment evaluation",
+        key=_evaluation_key,
+        timeout=None,
+        batch_size=2,
+        flush_interval=3600,
+    )
+    buffer.add(_evaluation("run-1", "accuracy"))
+    assert not requests
+    buffer.add(_evaluation("run-1", "rejected"))
+    assert len(requests) == 1
+    buffer.add(_evaluation("run-2", "accuracy"))
+    assert len(requests) == 1
+    buffer.flush()
+    buffer.flush()
+    assert [request.url.path for request in requests] == ["/v1/experiment_evaluations/batch"] * 2
+    assert buffer.ids == {
+        ("run-1", "accuracy"): "run-1:accuracy",
+        ("run-2", "accuracy"): "run-2:accuracy",
+    }
+    assert "rejected by the server" in caplog.text
+
+
+def test_sync_buffer_flushes_items_that_waited_too_long() -> None:
+    requests: list[httpx.Request] = []
+    client = httpx.Client(
+        base_url="http://localhost:6006", transport=httpx.MockTransport(_batch_handler(requests))
+    )
+    buffer = _SyncSubmissionBuffer(
+        client,
+        "v1/experiment_evaluations",
+        kind="experiment evaluation",
+        key=_evaluation_key,
+        timeout=None,
+        flush_interval=0,
+    )
+    buffer.add(_evaluation("run-1", "accuracy"))
+    assert len(requests) == 1
+
+
+def test_sync_buffer_falls_back_to_single_submissions() -> None:
+    paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path.endswith("/batch"):
+            return httpx.Response(405)
+        if json.loads(request.content)["name"] == "duplicate":
+            return httpx.Response(409)
+        return httpx.Response(200, json={"data": {"id": "evaluation-id"}})
+
+    client = httpx.Client(base_url="http://localhost:6006", transport=httpx.MockTransport(handler))
+    buffer = _SyncSubmissionBuffer(
+        client,
+        "v1/experiment_evaluations",
+        kind="experiment evaluation",
+        key=_evaluation_key,
+        timeout=None,
+    )
+    buffer.add(_evaluation("run-1", "accuracy"))
+    buffer.add(_evaluation("run-1", "duplicate"))
+    buffer.flush()
+    buffer.add(_evaluation("run-2", "accuracy"))
+    buffer.flush()
+    assert paths == [
+        "/v1/experiment_evaluations/batch",
+        "/v1/experiment_evaluations",
+        "/v1/experiment_evaluations",
+        "/v1/experiment_evaluations",
+    ]
+    assert buffer.ids == {
+        ("run-1", "accuracy"): "evaluation-id",
+        ("run-2", "accuracy"): "evaluation-id",
+    }
+
+
+def test_sync_buffer_raises_failed_batches_on_flush(caplog: pytest.LogCaptureFixture) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(500, text="server error")
+
+    client = httpx.Client(base_url="http://localhost:6006", transport=httpx.MockTransport(handler))
+    buffer = _SyncSubmissionBuffer(
+        client,
+        "v1/experiment_evaluations",
+        kind="experiment evaluation",
+        key=_evaluation_key,
+        timeout=None,
+        max_attempts=3,
+        retry_delay=0,
+    )
+    buffer.add(_evaluation("run-1", "accuracy"))
+    with pytest.raises(httpx.HTTPStatusError):
+        buffer.flush()
+    assert len(requests) == 3
+    assert not buffer.ids
+    assert "Failed to submit 1 experiment evaluation(s): HTTP 500 - server error" in caplog.text
+
+
+def test_sync_buffer_keeps_items_of_transient_failures(caplog: pytest.LogCaptureFixture) -> None:
+    requests: list[httpx.Request] = []
+    statuses = [503, 503, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if (status := statuses.pop(0)) != 200:
+            return httpx.Response(status, text="unavailable")
+        return _batch_handler(requests)(request)
+
+    client = httpx.Client(base_url="http://localhost:6006", transport=httpx.MockTransport(handler))
+    buffer = _SyncSubmissionBuffer(
+        client,
+        "v1/experiment_evaluations",
+        kind="experiment evaluation",
+        key=_evaluation_key,
+        timeout=None,
+        batch_size=1,
+        flush_interval=3600,
+        max_attempts=2,
+        retry_delay=0,
+    )
+    buffer.add(_evaluation("run-1", "accuracy"))
+    assert "they will be submitted again with the next batch" in caplog.text
+    buffer.add(_evaluation("run-2", "accuracy"))
+    assert [
+        [item["experiment_run_id"] for item in json.loads(request.content)["data"]]
+        for request in requests
+    ] == [["run-1", "run-2"]]
+    assert len(buffer.ids) == 2
+
+
+def test_sync_buffer_does_not_retry_client_errors() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(422, text="invalid")
+
+    client = httpx.Client(base_url="http://localhost:6006", transport=httpx.MockTransport(handler))
+    buffer = _SyncSubmissionBuffer(
+        client,
+        "v1/experiment_evaluations",
+        kind="experiment evaluation",
+        key=_evaluation_key,
+        timeout=None,
+        batch_size=1,
+        retry_delay=0,
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        buffer.add(_evaluation("run-1", "accuracy"))
+    assert len(requests) == 1
+
+
+def test_sync_buffer_flushes_quiet_buffer_on_a_timer() -> None:
+    requests: list[httpx.Request] = []
+    client = httpx.Client(
+        base_url="http://localhost:6006", transport=httpx.MockTransport(_batch_handler(requests))
+    )
+    buffer = _SyncSubmissionBuffer(
+        client,
+        "v1/experiment_evaluations",
+        kind="experiment evaluation",
+        key=_evaluation_key,
+        timeout=None,
+        flush_interval=0.05,
+    )
+    buffer.add(_evaluation("run-1", "accuracy"))
+    assert not requests
+    for _ in range(100):
+        if requests:
+            break
+        time.sleep(0.01)
+    assert len(requests) == 1
+    assert len(buffer.ids) == 1
+
+
+async def test_async_buffer_submits_batches_in_order() -> None:
+    requests: list[httpx.Request] = []
+    client = httpx.AsyncClient(
+        base_url="http://localhost:6006", transport=httpx.MockTransport(_batch_handler(requests))
+    )
+    buffer = _AsyncSubmissionBuffer(
+        client,
+        "v1/experiment_evaluations",
+        kind="experiment evaluation",
+        key=_evaluation_key,
+        timeout=None,
+        batch_size=2,
+        flush_interval=3600,
+    )
+    for i in range(5):
+        buffer.add(_evaluation(f"run-{i}", "accuracy"))
+    await buffer.flush()
+    assert [
+        [item["experiment_run_id"] for item in json.loads(request.content)["data"]]
+        for request in requests
+    ] == [["run-0", "run-1"], ["run-2", "run-3"], ["run-4"]]
+    assert len(buffer.ids) == 5
+
+
+async def test_async_buffer_flushes_quiet_buffer_on_a_timer() -> None:
+    requests: list[httpx.Request] = []
+    client = httpx.AsyncClient(
+        base_url="http://localhost:6006", transport=httpx.MockTransport(_batch_handler(requests))
+    )
+    buffer = _AsyncSubmissionBuffer(
+        client,
+        "v1/experiment_evaluations",
+        kind="experiment evaluation",
+        key=_evaluation_key,
+        timeout=None,
+        flush_interval=0.05,
+    )
+    buffer.add(_evaluation("run-1", "accuracy"))
+    for _ in range(100):
+        if requests:
+            break
+        await asyncio.sleep(0.01)
+    assert len(requests) == 1
+    await buffer.flush()
+    assert len(requests) == 1
+    assert len(buffer.ids) == 1
+
+
+async def test_async_buffer_retries_and_raises_failed_batches_on_flush() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(503, text="unavailable")
+
+    client = httpx.AsyncClient(
+        base_url="http://localhost:6006", transport=httpx.MockTransport(handler)
+    )
+    buffer = _AsyncSubmissionBuffer(
+        client,
+        "v1/experiment_evaluations",
+        kind="experiment evaluation",
+        key=_evaluation_key,
+        timeout=None,
+        batch_size=1,
+        max_attempts=2,
+        retry_delay=0,
+    )
+    buffer.add(_evaluation("run-1", "accuracy"))
+    with pytest.raises(httpx.HTTPStatusError):
+        await buffer.flush()
+    # the background submission puts the item back, and the flush submits it once more
+    assert len(requests) == 4
+    assert not buffer.ids
@@ -140,3 +140,36 @@ def test_concatenation_kwargs_equivalence() -> None:
     client_query = SpanQuery().concat("messages", arg1="span_id", arg2="some_field")
 
     assert_dict_equivalence(phoenix_query.to_dict(), client_query.to_dict())
+
+
+def test_read_span_dataframe_from_arrow_stream() -> None:
+    pd = pytest.importorskip("pandas")
+    pa = pytest.importorskip("pyarrow")
+    from phoenix.client.resources.spans import (
+        _read_span_dataframe_from_arrow_stream,  # pyright: ignore[reportPrivateUsage]
+    )
+
+    body = b""
+    for df in (
+        pd.DataFrame({"name": ["a", "b"], "attributes.x": [[1], [2, 3]]}),
+        pd.DataFrame({"name": ["c"], "attributes.y": ["z"]}),
+    ):
+        sink = pa.BufferOutputStream()
+        table = pa.Table.from_pandas(df)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        body += sink.getvalue().to_pybytes()
+    chunks = iter([body[i : i + 7] for i in range(0, len(body), 7)])
+
+    df = _read_span_dataframe_from_arrow_stream(lambda: next(chunks, None))
+    assert df["name"].tolist() == ["a", "b", "c"]
+    assert df["attributes.x"].tolist()[:2] == [[1], [2, 3]]
+    assert df["attributes.y"].tolist()[2] == "z"
+    assert _read_span_dataframe_from_arrow_stream(lambda: None).empty
+
+    truncated = iter([body[:-20]])
+    with pytest.raises(OSError):
+        _read_span_dataframe_from_arrow_stream(lambda: next(truncated, None))
+    corrupt = iter([body, b"\x00" * 8])
+    with pytest.raises(pa.ArrowInvalid):
+        _read_span_dataframe_from_arrow_stream(lambda: next(corrupt, None))
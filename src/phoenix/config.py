@@ -188,6 +188,86 @@ throughput.
 
 Defaults to 20000.
 """
+ENV_PHOENIX_MAX_ANNOTATIONS_QUEUE_SIZE = "PHOENIX_MAX_ANNOTATIONS_QUEUE_SIZE"
+"""
+The maximum number of annotations of each type (span, trace, document, and session) to
+hold in the processing queue before rejecting new asynchronous annotation requests of
+that type with a 503.
+
+As with PHOENIX_MAX_SPANS_QUEUE_SIZE, this is a heuristic to protect system memory, and
+the actual queue size may exceed this limit, because a single accepted request may
+contain multiple annotations. Requests made with `sync=true` bypass the queue and are
+never rejected.
+
+Defaults to 20000.
+"""
+ENV_PHOENIX_CUMULATIVE_COUNTS_CONSISTENCY = "PHOENIX_CUMULATIVE_COUNTS_CONSISTENCY"
+"""
+How the cumulative error and token counts of spans are kept up to date as spans are
+ingested (either 'synchronous' or 'eventual').
+
+With 'synchronous', the cumulative counts of the ancestors of a span are updated in the
+same transaction that inserts the span. With 'eventual', the span is inserted with only
+the counts of its own batch, and the traces it belongs to are recomputed in one bottom-up
+pass by a background rollup at the interval set by
+PHOENIX_CUMULATIVE_COUNTS_ROLLUP_INTERVAL_SECONDS. This avoids repeatedly updating the
+same ancestors of deeply nested traces, at the cost of the counts lagging behind.
+
+Defaults to 'synchronous'.
+"""
+ENV_PHOENIX_CUMULATIVE_COUNTS_ROLLUP_INTERVAL_SECONDS = (
+    "PHOENIX_CUMULATIVE_COUNTS_ROLLUP_INTERVAL_SECONDS"
+)
+"""
+The number of seconds between runs of the background rollup of cumulative counts when
+PHOENIX_CUMULATIVE_COUNTS_CONSISTENCY is 'eventual'. Defaults to 5.
+"""
+ENV_PHOENIX_OTLP_DECODE_WORKERS = "PHOENIX_OTLP_DECODE_WORKERS"
+"""
+The number of worker processes used to decode incoming OTLP trace export requests.
+
+By default (0), spans are decoded on threads of the server process, which means decoding
+is bound to a single core by the GIL. When set to a positive number, the raw bytes of each
+export request received over HTTP or gRPC are shipped to a pool of that many processes,
+each of which decodes the whole request and sends back the spans ready to be inserted.
+This lets decoding throughput scale with the number of cores while keeping the server's
+event loop responsive.
+
+Defaults to 0.
+"""
+ENV_PHOENIX_SPAN_SPOOL_DIR = "PHOENIX_SPAN_SPOOL_DIR"
+"""
+A directory in which to spool incoming spans on disk until they are inserted into the
+database.
+
+By default, spans that have been accepted but not yet inserted are held in memory, so
+they are lost if the server is restarted or killed. When set, each span is appended to
+the spool before the export request is acknowledged, spans are read back from it in
+batches for insertion, and whatever is left in the spool is replayed when the server
+starts again. The spans in the spool count toward PHOENIX_MAX_SPANS_QUEUE_SIZE, so new
+requests are still rejected once the database falls that far behind. The spool must not
+be shared by multiple servers.
+"""
+ENV_PHOENIX_ENABLE_POSTGRES_DATALOADER_CACHE = "PHOENIX_ENABLE_POSTGRES_DATALOADER_CACHE"
+"""
+Whether to cache the results of expensive GraphQL data loaders, e.g. project summaries,
+when using PostgreSQL. (They are always cached when using SQLite.)
+
+When enabled, cached results are invalidated by changes to the data, and the changes made
+by each server replica are broadcast to all replicas via PostgreSQL LISTEN/NOTIFY, so it is
+safe to enable with multiple replicas sharing the same database. Defaults to False.
+"""
+ENV_PHOENIX_ENABLE_SPAN_TEXT_SEARCH_INDEX = "PHOENIX_ENABLE_SPAN_TEXT_SEARCH_INDEX"
+"""
+Whether to index the input and output values of spans for substring search, e.g. for span
+filters like `'some text' in input.value` and for session filters. Defaults to False.
+
+On SQLite the index is an FTS5 trigram table kept in sync by triggers on every span insert,
+update and delete. On PostgreSQL it is a pair of pg_trgm GIN indexes, which are only created
+if the pg_trgm extension can be installed. The index is built by the database migration that
+introduces it, so this must be set when that migration runs. Unsetting it afterwards stops
+substring filters from using the index but does not drop it.
+"""
 ENV_LOGGING_MODE = "PHOENIX_LOGGING_MODE"
 """
 The logging mode (either 'default' or 'structured').
@@ -396,6 +476,17 @@ ENV_PHOENIX_DEFAULT_RETENTION_POLICY_DAYS = "PHOENIX_DEFAULT_RETENTION_POLICY_DA
 """
 The default retention policy for traces in days.
 """
+ENV_PHOENIX_TRACE_RETENTION_BATCH_SIZE = "PHOENIX_TRACE_RETENTION_BATCH_SIZE"
+"""
+The maximum number of traces deleted per transaction when applying trace retention policies.
+Smaller batches hold locks for less time, at the cost of more round trips. Defaults to 1000.
+"""
+ENV_PHOENIX_TRACE_RETENTION_BATCH_PAUSE_SECONDS = "PHOENIX_TRACE_RETENTION_BATCH_PAUSE_SECONDS"
+"""
+The number of seconds to pause between batches of deletions when applying trace retention
+policies, giving other writers, e.g. span ingestion, a chance to acquire the database.
+Defaults to 0.1.
+"""
 
 
 @dataclass(frozen=True)
@@ -571,6 +662,27 @@ def get_env_default_retention_policy_days() -> int:
     return days
 
 
+def get_env_trace_retention_batch_size() -> int:
+    batch_size = _int_val(ENV_PHOENIX_TRACE_RETENTION_BATCH_SIZE, 1000)
+    if batch_size <= 0:
+        raise ValueError(
+            f"Invalid value for environment variable {ENV_PHOENIX_TRACE_RETENTION_BATCH_SIZE}: "
+            f"{batch_size}. Value must be a positive integer."
+        )
+    return batch_size
+
+
+def get_env_trace_retention_batch_pause_seconds() -> float:
+    pause = _float_val(ENV_PHOENIX_TRACE_RETENTION_BATCH_PAUSE_SECONDS, 0.1)
+    if pause < 0:
+        raise ValueError(
+            f"Invalid value for environment variable "
+            f"{ENV_PHOENIX_TRACE_RETENTION_BATCH_PAUSE_SECONDS}: {pause}. "
+            "Value must be a non-negative number."
+        )
+    return pause
+
+
 def get_env_tls_config() -> Optional[TLSConfig]:
     """
     Retrieves and validates TLS configuration from environment variables.
@@ -1933,6 +2045,27 @@ def get_env_max_spans_queue_size() -> int:
     return max_size
 
 
+def get_env_max_annotations_queue_size() -> int:
+    """
+    Gets the maximum size of each annotation queue from the
+    PHOENIX_MAX_ANNOTATIONS_QUEUE_SIZE environment variable.
+
+    Returns:
+        int: The maximum number of annotations of each type to hold in queue before
+             rejecting requests. Defaults to 20,000 if not set.
+
+    Raises:
+        ValueError: If the value is not a positive integer.
+    """
+    max_size = _int_val(ENV_PHOENIX_MAX_ANNOTATIONS_QUEUE_SIZE, 20_000)
+    if max_size <= 0:
+        raise ValueError(
+            f"Invalid value for environment variable {ENV_PHOENIX_MAX_ANNOTATIONS_QUEUE_SIZE}: "
+            f"{max_size}. Value must be a positive integer."
+        )
+    return max_size
+
+
 def get_env_client_headers() -> dict[str, str]:
     headers = parse_env_headers(getenv(ENV_PHOENIX_CLIENT_HEADERS))
     if (api_key := get_env_phoenix_api_key()) and "authorization" not in [
@@ -1991,6 +2124,68 @@ def get_web_base_url() -> str:
     return get_base_url()
 
 
+def get_env_otlp_decode_workers() -> int:
+    """
+    Gets the number of OTLP decode worker processes from the PHOENIX_OTLP_DECODE_WORKERS
+    environment variable.
+
+    Returns:
+        int: The number of worker processes, or 0 if spans are decoded in-process.
+
+    Raises:
+        ValueError: If the value is a negative integer.
+    """
+    num_workers = _int_val(ENV_PHOENIX_OTLP_DECODE_WORKERS, 0)
+    if num_workers < 0:
+        raise ValueError(
+            f"Invalid value for environment variable {ENV_PHOENIX_OTLP_DECODE_WORKERS}: "
+            f"{num_workers}. Value must be a non-negative integer."
+        )
+    return num_workers
+
+
+def get_env_span_spool_dir() -> Optional[Path]:
+    """
+    Gets the span spool directory from the PHOENIX_SPAN_SPOOL_DIR environment variable.
+
+    Returns:
+        Optional[Path]: The spool directory, or None if spans are queued in memory.
+    """
+    if not (spool_dir := getenv(ENV_PHOENIX_SPAN_SPOOL_DIR, "").strip()):
+        return None
+    return Path(spool_dir).expanduser()
+
+
+class CumulativeCountsConsistency(Enum):
+    SYNCHRONOUS = "synchronous"
+    EVENTUAL = "eventual"
+
+
+def get_env_cumulative_counts_consistency() -> CumulativeCountsConsistency:
+    if (consistency := getenv(ENV_PHOENIX_CUMULATIVE_COUNTS_CONSISTENCY)) is None:
+        return CumulativeCountsConsistency.SYNCHRONOUS
+    try:
+        return CumulativeCountsConsistency(consistency.lower().strip())
+    except ValueError:
+        raise ValueError(
+            f"Invalid value `{consistency}` for env var "
+            f"`{ENV_PHOENIX_CUMULATIVE_COUNTS_CONSISTENCY}`. Valid values are: "
+            f"{log_a_list([mode.value for mode in CumulativeCountsConsistency], 'and')} "
+            "(case-insensitive)."
+        )
+
+
+def get_env_cumulative_counts_rollup_interval_seconds() -> float:
+    interval = _float_val(ENV_PHOENIX_CUMULATIVE_COUNTS_ROLLUP_INTERVAL_SECONDS, 5.0)
+    if interval <= 0:
+        raise ValueError(
+            f"Invalid value for environment variable "
+            f"{ENV_PHOENIX_CUMULATIVE_COUNTS_ROLLUP_INTERVAL_SECONDS}: {interval}. "
+            "Value must be a positive number."
+        )
+    return interval
+
+
 class LoggingMode(Enum):
     DEFAULT = "default"
     STRUCTURED = "structured"
@@ -2196,6 +2391,11 @@ def verify_server_environment_variables() -> None:
     get_env_database_usage_email_warning_threshold_percentage()
     get_env_database_usage_insertion_blocking_threshold_percentage()
     get_env_max_spans_queue_size()
+    get_env_cumulative_counts_consistency()
+    get_env_cumulative_counts_rollup_interval_seconds()
+    get_env_otlp_decode_workers()
+    get_env_trace_retention_batch_size()
+    get_env_trace_retention_batch_pause_seconds()
     validate_env_support_email()
     _validate_iam_auth_config()
 
@@ -2258,6 +2458,22 @@ def get_env_allow_external_resources() -> bool:
     return _bool_val(ENV_PHOENIX_ALLOW_EXTERNAL_RESOURCES, True)
 
 
+def get_env_enable_postgres_dataloader_cache() -> bool:
+    """
+    Gets the value of the PHOENIX_ENABLE_POSTGRES_DATALOADER_CACHE environment variable.
+    Defaults to False if not set.
+    """
+    return _bool_val(ENV_PHOENIX_ENABLE_POSTGRES_DATALOADER_CACHE, False)
+
+
+def get_env_enable_span_text_search_index() -> bool:
+    """
+    Gets the value of the PHOENIX_ENABLE_SPAN_TEXT_SEARCH_INDEX environment variable.
+    Defaults to False if not set.
+    """
+    return _bool_val(ENV_PHOENIX_ENABLE_SPAN_TEXT_SEARCH_INDEX, False)
+
+
 def get_env_postgres_use_iam_auth() -> bool:
     """
     Gets whether AWS RDS IAM authentication is enabled for PostgreSQL connections.
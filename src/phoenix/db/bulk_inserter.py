@@ -3,11 +3,15 @@ import logging
 from asyncio import Queue, as_completed
 from collections import deque
 from dataclasses import dataclass, field
+from datetime import datetime
 from functools import singledispatchmethod
+from itertools import islice
 from time import perf_counter, time
-from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, cast
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Sequence, cast
 
 from openinference.semconv.trace import SpanAttributes
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import TypeAlias
 
 import phoenix.trace.v1 as pb
@@ -21,23 +25,30 @@ from phoenix.db.insertion.evaluation import (
 from phoenix.db.insertion.helpers import (
     DataManipulation,
     DataManipulationEvent,
+    chunked,
+    get_token_count,
     should_calculate_span_cost,
 )
 from phoenix.db.insertion.session_annotation import SessionAnnotationQueueInserter
-from phoenix.db.insertion.span import SpanInsertionEvent, insert_span
+from phoenix.db.insertion.span import SpanInsertionEvent, insert_span, insert_spans
 from phoenix.db.insertion.span_annotation import SpanAnnotationQueueInserter
 from phoenix.db.insertion.trace_annotation import TraceAnnotationQueueInserter
 from phoenix.db.insertion.types import Insertables, Precursors
+from phoenix.db.span_spool import SpanSpool
+from phoenix.db.time_series_rollups import AffectedTimeRange, refresh_time_series_rollups
+from phoenix.server.daemons.cumulative_counts_rollup import CumulativeCountsRollup
 from phoenix.server.daemons.span_cost_calculator import (
     SpanCostCalculator,
 )
-from phoenix.server.dml_event import DmlEvent, SpanInsertEvent
+from phoenix.server.dml_event import DmlEvent, InsertedSpans, SpanInsertEvent
 from phoenix.server.prometheus import (
     BULK_LOADER_EVALUATION_INSERTIONS,
     BULK_LOADER_EXCEPTIONS,
     BULK_LOADER_LAST_ACTIVITY,
+    BULK_LOADER_SPAN_BATCH_FALLBACKS,
     BULK_LOADER_SPAN_EXCEPTIONS,
     BULK_LOADER_SPAN_INSERTION_TIME,
+    BULK_LOADER_SPAN_INSERTIONS,
     SPAN_QUEUE_SIZE,
 )
 from phoenix.server.types import CanPutItem, DbSessionFactory
@@ -61,14 +72,17 @@ class BulkInserter:
         *,
         event_queue: CanPutItem[DmlEvent],
         span_cost_calculator: SpanCostCalculator,
+        cumulative_counts_rollup: Optional[CumulativeCountsRollup] = None,
         initial_batch_of_spans: Iterable[tuple[Span, ProjectName]] = (),
         initial_batch_of_evaluations: Iterable[pb.Evaluation] = (),
         sleep: float = 0.1,
         max_ops_per_transaction: int = 1000,
         max_queue_size: int = 1000,
         max_spans_queue_size: Optional[int] = None,
+        max_annotations_queue_size: Optional[int] = None,
         retry_delay_sec: float = DEFAULT_RETRY_DELAY_SEC,
         retry_allowance: int = DEFAULT_RETRY_ALLOWANCE,
+        span_spool: Optional[SpanSpool] = None,
     ) -> None:
         """
         :param db: A function to initiate a new database session.
@@ -77,6 +91,14 @@ class BulkInserter:
         :param max_ops_per_transaction: The maximum number of operations to dequeue from
         the operations queue for each transaction.
         :param max_queue_size: The maximum length of the operations queue.
+        :param max_annotations_queue_size: The length at which the queue of each type of
+        annotation is reported as full.
+        :param cumulative_counts_rollup: If provided, cumulative counts are not propagated
+        to existing ancestors on insertion. Instead, the traces of the inserted spans are
+        handed to the rollup to be recomputed in the background.
+        :param span_spool: If provided, spans are appended to the spool on disk when they
+        are enqueued, and are read back from it in batches for insertion, so that spans
+        not yet inserted are neither held in memory nor lost on a restart.
         """
         self._db = db
         self._running = False
@@ -86,17 +108,38 @@ class BulkInserter:
         self._max_queue_size = max_queue_size
         self._max_spans_queue_size = max_spans_queue_size
         self._spans: deque[tuple[Span, ProjectName]] = deque(initial_batch_of_spans)
-        self._evaluations: deque[pb.Evaluation] = deque(initial_batch_of_evaluations)
+        self._initial_batch_of_evaluations = tuple(initial_batch_of_evaluations)
+        # Each evaluation is queued with the number of spans enqueued before it, and is only
+        # inserted once that many spans have left the queue, since it may reference them.
+        self._evaluations: deque[tuple[int, pb.Evaluation]] = deque()
+        self._num_enqueued_spans = 0
+        self._num_dequeued_spans = 0
         self._task: Optional[asyncio.Task[None]] = None
         self._event_queue = event_queue
         self._retry_delay_sec = retry_delay_sec
         self._retry_allowance = retry_allowance
-        self._queue_inserters = _QueueInserters(db, self._retry_delay_sec, self._retry_allowance)
+        self._queue_inserters = _QueueInserters(
+            db,
+            self._retry_delay_sec,
+            self._retry_allowance,
+            max_queue_size=max_annotations_queue_size,
+        )
         self._span_cost_calculator = span_cost_calculator
+        self._cumulative_counts_rollup = cumulative_counts_rollup
+        self._span_spool = span_spool
+        self._spool_buffer: list[tuple[Span, ProjectName]] = []
+        self._spool_buffer_written: Optional[asyncio.Future[None]] = None
+        self._spool_writer: Optional[asyncio.Task[None]] = None
+        self._num_spans_being_spooled = 0
 
     @property
     def is_full(self) -> bool:
-        return bool(self._max_spans_queue_size and self._max_spans_queue_size <= len(self._spans))
+        return bool(
+            self._max_spans_queue_size and self._max_spans_queue_size <= self._num_queued_spans
+        )
+
+    def annotation_queue_is_full(self, table: type[models.Base]) -> bool:
+        return self._queue_inserters.is_full(table)
 
     async def __aenter__(
         self,
@@ -108,6 +151,15 @@ class BulkInserter:
     ]:
         self._running = True
         self._operations = Queue(maxsize=self._max_queue_size)
+        if self._span_spool is not None:
+            self._span_spool.open()
+            self._span_spool.append(self._spans)
+            self._spans.clear()
+        self._num_enqueued_spans = self._num_queued_spans
+        self._evaluations.extend(
+            (self._num_enqueued_spans, evaluation)
+            for evaluation in self._initial_batch_of_evaluations
+        )
         self._task = asyncio.create_task(self._bulk_insert())
         return (
             self._enqueue_annotations,
@@ -121,6 +173,11 @@ class BulkInserter:
         if self._task:
             self._task.cancel()
             self._task = None
+        if self._span_spool is not None:
+            if self._spool_writer is not None:
+                await self._spool_writer
+                self._spool_writer = None
+            self._span_spool.close()
 
     async def _enqueue_annotations(self, *items: Any) -> None:
         await self._queue_inserters.enqueue(*items)
@@ -129,10 +186,49 @@ class BulkInserter:
         cast("Queue[DataManipulation]", self._operations).put_nowait(operation)
 
     async def _enqueue_span(self, span: Span, project_name: str) -> None:
-        self._spans.append((span, project_name))
+        if self._span_spool is None:
+            self._num_enqueued_spans += 1
+            self._spans.append((span, project_name))
+            return
+        # The span is only acknowledged, and counted as enqueued, once it is on disk. Spans
+        # enqueued while a write is in progress are written together by the next one.
+        if self._spool_buffer_written is None:
+            self._spool_buffer_written = asyncio.get_running_loop().create_future()
+        written = self._spool_buffer_written
+        self._spool_buffer.append((span, project_name))
+        if self._spool_writer is None or self._spool_writer.done():
+            self._spool_writer = asyncio.create_task(self._write_spool_buffer())
+        await asyncio.shield(written)
+
+    async def _write_spool_buffer(self) -> None:
+        """
+        Appends the buffered spans to the spool off the event loop, one write per batch.
+        """
+        assert self._span_spool is not None
+        loop = asyncio.get_running_loop()
+        while self._spool_buffer:
+            batch, self._spool_buffer = self._spool_buffer, []
+            written = cast("asyncio.Future[None]", self._spool_buffer_written)
+            self._spool_buffer_written = None
+            self._num_spans_being_spooled = len(batch)
+            try:
+                await loop.run_in_executor(None, self._span_spool.append, batch)
+            except asyncio.CancelledError:
+                written.cancel()
+                raise
+            except Exception as e:
+                logger.exception("Failed to append spans to spool")
+                written.set_exception(e)
+            else:
+                # Spans that failed to be spooled are never dequeued, so they must not be
+                # counted, or the evaluations enqueued after them would wait forever.
+                self._num_enqueued_spans += len(batch)
+                written.set_result(None)
+            finally:
+                self._num_spans_being_spooled = 0
 
     async def _enqueue_evaluation(self, evaluation: pb.Evaluation) -> None:
-        self._evaluations.append(evaluation)
+        self._evaluations.append((self._num_enqueued_spans, evaluation))
 
     async def _process_events(self, events: Iterable[Optional[DataManipulationEvent]]) -> None: ...
 
@@ -143,15 +239,15 @@ class BulkInserter:
             self._running
             or not self._queue_inserters.empty
             or not self._operations.empty()
-            or self._spans
+            or self._num_queued_spans
             or self._evaluations
         ):
             BULK_LOADER_LAST_ACTIVITY.set(time())
-            SPAN_QUEUE_SIZE.set(len(self._spans))
+            SPAN_QUEUE_SIZE.set(self._num_queued_spans)
             if (
                 self._queue_inserters.empty
                 and self._operations.empty()
-                and not self._spans
+                and not self._num_queued_spans
                 and not self._evaluations
             ):
                 await asyncio.sleep(self._sleep)
@@ -167,46 +263,102 @@ class BulkInserter:
                     except Exception as e:
                         BULK_LOADER_EXCEPTIONS.inc()
                         logger.exception(str(e))
-            # It's important to grab the buffers at the same time so there's
-            # no race condition, since an eval insertion will fail if the span
-            # it references doesn't exist. Grabbing the eval buffer later may
-            # include an eval whose span is in the queue but missed being
-            # included in the span buffer that was grabbed previously.
+            if self._span_spool is not None:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self._span_spool.sync)
+                self._spans.extend(
+                    await loop.run_in_executor(
+                        None, self._span_spool.read, self._max_ops_per_transaction
+                    )
+                )
             num_spans_to_insert = min(self._max_ops_per_transaction, len(self._spans))
-            num_evals_to_insert = min(self._max_ops_per_transaction, len(self._evaluations))
             # Spans should be inserted before the evaluations, since an evaluation
             # insertion will fail if the span it references doesn't exist.
-            await self._insert_spans(num_spans_to_insert)
-            await self._insert_evaluations(num_evals_to_insert)
+            committed = await self._insert_spans(num_spans_to_insert)
+            if self._span_spool is None:
+                self._num_dequeued_spans += num_spans_to_insert
+            elif num_spans_to_insert:
+                # Spans are only removed from the spool once they are committed, so
+                # that a batch failing because e.g. the database is unavailable is
+                # retried rather than dropped.
+                if committed:
+                    self._num_dequeued_spans += await loop.run_in_executor(
+                        None, self._span_spool.commit
+                    )
+                else:
+                    self._spans.clear()
+                    await loop.run_in_executor(None, self._span_spool.rewind)
+            await self._insert_evaluations(self._num_evaluations_to_insert)
             async for event in self._queue_inserters.insert():
                 self._event_queue.put(event)
             await asyncio.sleep(self._sleep)
 
-    async def _insert_spans(self, num_spans_to_insert: int) -> None:
+    @property
+    def _num_queued_spans(self) -> int:
+        # With a spool, the spans in memory are the batch read from the spool that is
+        # yet to be committed, so they are already included in the spool's count.
+        if self._span_spool is not None:
+            return len(self._span_spool) + len(self._spool_buffer) + self._num_spans_being_spooled
+        return len(self._spans)
+
+    @property
+    def _num_evaluations_to_insert(self) -> int:
+        """
+        The number of evaluations at the front of the queue, up to one transaction's
+        worth, whose preceding spans have all left the span queue.
+        """
+        num_evaluations = 0
+        for num_preceding_spans, _ in islice(self._evaluations, self._max_ops_per_transaction):
+            if self._num_dequeued_spans < num_preceding_spans:
+                break
+            num_evaluations += 1
+        return num_evaluations
+
+    async def _insert_spans(self, num_spans_to_insert: int) -> bool:
+        """
+        Returns whether the transaction inserting the spans was committed.
+        """
         if not num_spans_to_insert or not self._spans:
-            return
+            return False
         project_ids = set()
+        trace_rowids: list[int] = []
+        inserted_spans: dict[ProjectRowId, list[tuple[datetime, int, int]]] = {}
+        time_ranges: dict[ProjectRowId, tuple[datetime, datetime]] = {}
+        committed = False
         span_costs: list[models.SpanCost] = []
+        rollup_time_ranges: list[AffectedTimeRange] = []
         try:
             start = perf_counter()
             async with self._db() as session:
+                batch: list[tuple[Span, ProjectName]] = []
                 while num_spans_to_insert > 0:
                     num_spans_to_insert -= 1
                     if not self._spans:
                         break
-                    span, project_name = self._spans.popleft()
-                    result: Optional[SpanInsertionEvent] = None
-                    try:
-                        async with session.begin_nested():
-                            result = await insert_span(session, span, project_name)
-                    except Exception:
-                        BULK_LOADER_SPAN_EXCEPTIONS.inc()
-                        logger.exception(
-                            f"Failed to insert span with span_id={span.context.span_id}"
-                        )
-                    if result is None:
-                        continue
+                    batch.append(self._spans.popleft())
+                # The start times of existing traces are recorded before they are moved
+                # earlier by the new spans, so that the buckets they leave are refreshed.
+                rollup_time_ranges.extend(
+                    await _get_trace_start_times(
+                        session,
+                        models.Trace.trace_id.in_({span.context.trace_id for span, _ in batch}),
+                    )
+                )
+                for span, result in await self._insert_batch_of_spans(session, batch):
                     project_ids.add(result.project_rowid)
+                    trace_rowids.append(result.trace_rowid)
+                    rollup_time_ranges.append(
+                        (result.project_rowid, span.start_time, span.start_time)
+                    )
+                    inserted_spans.setdefault(result.project_rowid, []).append(
+                        (
+                            span.start_time,
+                            get_token_count(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT),
+                            get_token_count(
+                                span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION
+                            ),
+                        )
+                    )
                     try:
                         if not should_calculate_span_cost(span.attributes):
                             continue
@@ -225,19 +377,94 @@ class BulkInserter:
                         span_cost.span_rowid = result.span_rowid
                         span_cost.trace_rowid = result.trace_rowid
                         span_costs.append(span_cost)
+                time_ranges = await _get_trace_time_ranges_by_project(session, trace_rowids)
+                rollup_time_ranges.extend(
+                    await _get_trace_start_times(session, models.Trace.id.in_(set(trace_rowids)))
+                )
+            committed = True
             BULK_LOADER_SPAN_INSERTION_TIME.observe(perf_counter() - start)
+            BULK_LOADER_SPAN_INSERTIONS.inc(len(trace_rowids))
         except Exception:
             BULK_LOADER_SPAN_EXCEPTIONS.inc()
             logger.exception("Failed to insert spans")
         if project_ids:
-            self._event_queue.put(SpanInsertEvent(tuple(project_ids)))
-        if not span_costs:
-            return
+            self._event_queue.put(
+                SpanInsertEvent(
+                    tuple(project_ids),
+                    # Cached aggregates can only be updated incrementally if the spans
+                    # are known to have been committed.
+                    inserted_spans={
+                        project_rowid: InsertedSpans(
+                            started_at=start,
+                            min_time=time_ranges[project_rowid][0],
+                            max_time=time_ranges[project_rowid][1],
+                            spans=tuple(spans),
+                        )
+                        for project_rowid, spans in inserted_spans.items()
+                        if project_rowid in time_ranges
+                    }
+                    if committed
+                    else {},
+                )
+            )
+        if committed and trace_rowids and self._cumulative_counts_rollup is not None:
+            # The traces are handed over only after the transaction is committed,
+            # so that the rollup cannot miss spans that are not yet visible to it.
+            self._cumulative_counts_rollup.put_nowait(*trace_rowids)
+        if span_costs:
+            try:
+                async with self._db() as session:
+                    session.add_all(span_costs)
+            except Exception:
+                logger.exception("Failed to insert span costs")
+        if not committed:
+            return False
         try:
             async with self._db() as session:
-                session.add_all(span_costs)
+                await refresh_time_series_rollups(session, rollup_time_ranges)
         except Exception:
-            logger.exception("Failed to insert span costs")
+            logger.exception("Failed to refresh time series rollups")
+        return True
+
+    async def _insert_batch_of_spans(
+        self,
+        session: AsyncSession,
+        batch: Sequence[tuple[Span, ProjectName]],
+    ) -> list[tuple[Span, SpanInsertionEvent]]:
+        """
+        Inserts the batch with a fixed number of set-based statements. If that fails,
+        e.g. because of a single malformed span, the batch is rolled back and the
+        spans are inserted one at a time so that one bad span does not drop the rest.
+        """
+        if not batch:
+            return []
+        try:
+            async with session.begin_nested():
+                results = await insert_spans(
+                    session,
+                    batch,
+                    propagate_cumulative_counts=self._cumulative_counts_rollup is None,
+                )
+        except Exception:
+            BULK_LOADER_SPAN_BATCH_FALLBACKS.inc()
+            logger.exception(
+                f"Failed to insert batch of {len(batch)} spans; "
+                "falling back to inserting spans one at a time"
+            )
+        else:
+            return results
+        results = []
+        for span, project_name in batch:
+            result: Optional[SpanInsertionEvent] = None
+            try:
+                async with session.begin_nested():
+                    result = await insert_span(session, span, project_name)
+            except Exception:
+                BULK_LOADER_SPAN_EXCEPTIONS.inc()
+                logger.exception(f"Failed to insert span with span_id={span.context.span_id}")
+            if result is not None:
+                results.append((span, result))
+        return results
 
     async def _insert_evaluations(self, num_evals_to_insert: int) -> None:
         if not num_evals_to_insert or not self._evaluations:
@@ -248,7 +475,7 @@ class BulkInserter:
                     num_evals_to_insert -= 1
                     if not self._evaluations:
                         break
-                    evaluation = self._evaluations.popleft()
+                    _, evaluation = self._evaluations.popleft()
                     BULK_LOADER_EVALUATION_INSERTIONS.inc()
                     try:
                         async with session.begin_nested():
@@ -267,9 +494,10 @@ class _QueueInserters:
         db: DbSessionFactory,
         retry_delay_sec: float = DEFAULT_RETRY_DELAY_SEC,
         retry_allowance: int = DEFAULT_RETRY_ALLOWANCE,
+        max_queue_size: Optional[int] = None,
     ) -> None:
         self._db = db
-        args = (db, retry_delay_sec, retry_allowance)
+        args = (db, retry_delay_sec, retry_allowance, max_queue_size)
         self._span_annotations = SpanAnnotationQueueInserter(*args)
         self._trace_annotations = TraceAnnotationQueueInserter(*args)
         self._document_annotations = DocumentAnnotationQueueInserter(*args)
@@ -293,6 +521,9 @@ class _QueueInserters:
     def empty(self) -> bool:
         return all(q.empty for q in self._queues)
 
+    def is_full(self, table: type[models.Base]) -> bool:
+        return any(q.is_full for q in self._queues if q.table is table)
+
     async def enqueue(self, *items: Any) -> None:
         for item in items:
             await self._enqueue(item)
@@ -334,3 +565,45 @@ LLM_TOKEN_COUNT_PROMPT_DETAILS_CACHE_READ = SpanAttributes.LLM_TOKEN_COUNT_PROMP
 LLM_TOKEN_COUNT_PROMPT_DETAILS_CACHE_WRITE = (
     SpanAttributes.LLM_TOKEN_COUNT_PROMPT_DETAILS_CACHE_WRITE
 )
+
+
+async def _get_trace_start_times(
+    session: AsyncSession,
+    whereclause: ColumnElement[bool],
+) -> list[AffectedTimeRange]:
+    """
+    Returns the start times of the matching traces as time ranges of their projects.
+    """
+    stmt = select(models.Trace.project_rowid, models.Trace.start_time).where(whereclause)
+    return [
+        (project_rowid, start_time, start_time)
+        for project_rowid, start_time in await session.execute(stmt)
+    ]
+
+
+async def _get_trace_time_ranges_by_project(
+    session: AsyncSession,
+    trace_rowids: Sequence[int],
+) -> dict[ProjectRowId, tuple[datetime, datetime]]:
+    """
+    Returns the earliest start time and the latest end time of the given traces, grouped
+    by project.
+    """
+    time_ranges: dict[ProjectRowId, tuple[datetime, datetime]] = {}
+    for chunk in chunked(list(set(trace_rowids))):
+        stmt = (
+            select(
+                models.Trace.project_rowid,
+                func.min(models.Trace.start_time),
+                func.max(models.Trace.end_time),
+            )
+            .where(models.Trace.id.in_(chunk))
+            .group_by(models.Trace.project_rowid)
+        )
+        for project_rowid, min_start_time, max_end_time in await session.execute(stmt):
+            if project_rowid in time_ranges:
+                prev_min_start_time, prev_max_end_time = time_ranges[project_rowid]
+                min_start_time = min(min_start_time, prev_min_start_time)
+                max_end_time = max(max_end_time, prev_max_end_time)
+            time_ranges[project_rowid] = (min_start_time, max_end_time)
+    return time_ranges
@@ -31,7 +31,7 @@ from sqlalchemy.orm import QueryableAttribute
 from sqlalchemy.sql.roles import InElementRole
 from typing_extensions import assert_never
 
-from phoenix.config import PLAYGROUND_PROJECT_NAME
+from phoenix.config import PLAYGROUND_PROJECT_NAME, get_env_enable_span_text_search_index
 from phoenix.db import models
 
 
@@ -107,6 +107,7 @@ def get_project_names_for_experiments(*experiment_ids: int) -> Select[tuple[Opti
 
 _AnyT = TypeVar("_AnyT")
 _KeyT = TypeVar("_KeyT", bound=Hashable)
+_AnyTuple = TypeVar("_AnyTuple", bound=tuple[Any, ...])
 
 
 def dedup(
@@ -176,6 +177,30 @@ def _build_ranked_revisions_query(
     return stmt
 
 
+def _filter_by_splits(
+    stmt: Select[_AnyTuple],
+    example_id: QueryableAttribute[int],
+    split_ids: Optional[Union[Sequence[int], InElementRole]] = None,
+    split_names: Optional[Union[Sequence[str], InElementRole]] = None,
+) -> Select[_AnyTuple]:
+    if split_names is not None:
+        split_example_ids_subquery = (
+            select(models.DatasetSplitDatasetExample.dataset_example_id)
+            .join(
+                models.DatasetSplit,
+                models.DatasetSplit.id == models.DatasetSplitDatasetExample.dataset_split_id,
+            )
+            .where(models.DatasetSplit.name.in_(split_names))
+        )
+        return stmt.where(example_id.in_(split_example_ids_subquery))
+    if split_ids is not None:
+        split_example_ids_subquery = select(
+            models.DatasetSplitDatasetExample.dataset_example_id
+        ).where(models.DatasetSplitDatasetExample.dataset_split_id.in_(split_ids))
+        return stmt.where(example_id.in_(split_example_ids_subquery))
+    return stmt
+
+
 def get_dataset_example_revisions(
     dataset_version_id: int,
     /,
@@ -188,7 +213,64 @@ def get_dataset_example_revisions(
     """
     Get the latest revisions for all dataset examples within a specific dataset version.
 
-    Excludes examples where the latest revision is a DELETE.
+    Excludes examples where the latest revision is a DELETE. The revisions are looked up in
+    the materialized snapshot of the version, so the cost does not depend on the length of
+    the revision history.
+
+    Args:
+        dataset_version_id: The dataset version to get revisions for
+        dataset_id: Optional dataset ID - if provided, the version must belong to the dataset
+        example_ids: Optional filter by specific example IDs (subquery or list of IDs).
+            - None = no filtering
+            - Empty sequences/subqueries = no matches (strict filtering)
+        split_ids: Optional filter by split IDs (subquery or list of split IDs).
+            - None = no filtering
+            - Empty sequences/subqueries = no matches (strict filtering)
+        split_names: Optional filter by split names (subquery or list of split names).
+            - None = no filtering
+            - Empty sequences/subqueries = no matches (strict filtering)
+
+    Note:
+        - split_ids and split_names are mutually exclusive
+        - Use split_ids for better performance when IDs are available (avoids JOIN)
+        - Empty filters use strict behavior: empty inputs return zero results
+    """
+    if split_ids is not None and split_names is not None:
+        raise ValueError(
+            "Cannot specify both split_ids and split_names - they are mutually exclusive"
+        )
+    snapshot = models.DatasetVersionDatasetExample
+    stmt = select(models.DatasetExampleRevision).join(
+        snapshot,
+        snapshot.dataset_example_revision_id == models.DatasetExampleRevision.id,
+    )
+    if dataset_id is None:
+        stmt = stmt.where(snapshot.dataset_version_id == dataset_version_id)
+    else:
+        stmt = stmt.where(
+            snapshot.dataset_version_id
+            == select(models.DatasetVersion.id)
+            .filter_by(id=dataset_version_id, dataset_id=dataset_id)
+            .scalar_subquery()
+        )
+    if example_ids is not None:
+        stmt = stmt.where(snapshot.dataset_example_id.in_(example_ids))
+    return _filter_by_splits(stmt, snapshot.dataset_example_id, split_ids, split_names)
+
+
+def get_dataset_example_revisions_from_history(
+    dataset_version_id: int,
+    /,
+    *,
+    dataset_id: Optional[int] = None,
+    example_ids: Optional[Union[Sequence[int], InElementRole]] = None,
+    split_ids: Optional[Union[Sequence[int], InElementRole]] = None,
+    split_names: Optional[Union[Sequence[str], InElementRole]] = None,
+) -> Select[tuple[models.DatasetExampleRevision]]:
+    """
+    Same as `get_dataset_example_revisions`, but ranks the full revision history of the dataset
+    instead of reading the materialized snapshot of the version. Its cost grows with the number
+    of revisions in the dataset, so it is only meant to verify the snapshot.
 
     Args:
         dataset_version_id: The dataset version to get revisions for
@@ -222,24 +304,7 @@ def get_dataset_example_revisions(
         models.DatasetExampleRevision.revision_kind,
     )
 
-    if split_ids is not None or split_names is not None:
-        if split_names is not None:
-            split_example_ids_subquery = (
-                select(models.DatasetSplitDatasetExample.dataset_example_id)
-                .join(
-                    models.DatasetSplit,
-                    models.DatasetSplit.id == models.DatasetSplitDatasetExample.dataset_split_id,
-                )
-                .where(models.DatasetSplit.name.in_(split_names))
-            )
-            stmt = stmt.where(models.DatasetExample.id.in_(split_example_ids_subquery))
-        else:
-            assert split_ids is not None
-            split_example_ids_subquery = select(
-                models.DatasetSplitDatasetExample.dataset_example_id
-            ).where(models.DatasetSplitDatasetExample.dataset_split_id.in_(split_ids))
-            stmt = stmt.where(models.DatasetExample.id.in_(split_example_ids_subquery))
-
+    stmt = _filter_by_splits(stmt, models.DatasetExample.id, split_ids, split_names)
     ranked_subquery = stmt.subquery()
     return (
         select(models.DatasetExampleRevision)
@@ -269,15 +334,7 @@ def create_experiment_examples_snapshot_insert(
     Returns:
         SQLAlchemy INSERT statement ready for execution
     """
-    stmt = _build_ranked_revisions_query(
-        experiment.dataset_version_id,
-        dataset_id=experiment.dataset_id,
-    ).add_columns(
-        models.DatasetExampleRevision.id,
-        models.DatasetExampleRevision.dataset_example_id,
-        models.DatasetExampleRevision.revision_kind,
-    )
-
+    snapshot = models.DatasetVersionDatasetExample
     experiment_splits_subquery = select(models.ExperimentDatasetSplit.dataset_split_id).where(
         models.ExperimentDatasetSplit.experiment_id == experiment.id
     )
@@ -285,17 +342,6 @@ def create_experiment_examples_snapshot_insert(
     split_filtered_example_ids = select(models.DatasetSplitDatasetExample.dataset_example_id).where(
         models.DatasetSplitDatasetExample.dataset_split_id.in_(experiment_splits_subquery)
     )
-
-    stmt = stmt.where(
-        or_(
-            ~has_splits_condition,  # No splits = include all examples
-            models.DatasetExampleRevision.dataset_example_id.in_(
-                split_filtered_example_ids
-            ),  # Has splits = filter by splits
-        )
-    )
-
-    ranked_subquery = stmt.subquery()
     return insert(models.ExperimentDatasetExample).from_select(
         [
             models.ExperimentDatasetExample.experiment_id,
@@ -304,11 +350,16 @@ def create_experiment_examples_snapshot_insert(
         ],
         select(
             literal(experiment.id),
-            ranked_subquery.c.dataset_example_id,
-            ranked_subquery.c.id,
+            snapshot.dataset_example_id,
+            snapshot.dataset_example_revision_id,
         ).where(
-            ranked_subquery.c.rn == 1,
-            ranked_subquery.c.revision_kind != "DELETE",
+            snapshot.dataset_version_id == experiment.dataset_version_id,
+            or_(
+                ~has_splits_condition,  # No splits = include all examples
+                snapshot.dataset_example_id.in_(
+                    split_filtered_example_ids
+                ),  # Has splits = filter by splits
+            ),
         ),
     )
 
@@ -326,9 +377,6 @@ async def insert_experiment_with_examples_snapshot(
     await session.execute(insert_stmt)
 
 
-_AnyTuple = TypeVar("_AnyTuple", bound=tuple[Any, ...])
-
-
 def exclude_experiment_projects(
     stmt: Select[_AnyTuple],
 ) -> Select[_AnyTuple]:
@@ -520,6 +568,34 @@ def get_ancestor_span_rowids(parent_id: str) -> Select[tuple[int]]:
     return select(ancestors.c.id)
 
 
+def span_text_search(
+    substring: str,
+    *keys: Literal["input", "output"],
+) -> sa.ColumnElement[bool]:
+    """
+    Returns a prefilter that narrows spans down to those whose input and/or output values
+    may contain the substring by looking it up in the full-text index. It must be combined
+    with the exact substring predicate, which it does not replace.
+
+    The prefilter is a no-op when the index is not enabled, or when it cannot serve the
+    substring, i.e. when it is shorter than three characters, or when it has characters
+    whose case mapping is not one-to-one, which the case folding of the index may not
+    agree with.
+    """
+    if (
+        not get_env_enable_span_text_search_index()
+        or len(substring) < 3
+        or any(len(c.lower()) != 1 or len(c.upper()) != 1 for c in substring)
+    ):
+        return sa.true()
+    return models.SpanTextSearch(
+        models.Span.id,
+        models.Span.attributes,
+        substring,
+        *(literal_column(key) for key in keys),
+    )
+
+
 def truncate_name(name: str, max_len: int = 63) -> str:
     # https://github.com/sqlalchemy/sqlalchemy/blob/e263825e3c5060bf4f47eed0e833c6660a31658e/lib/sqlalchemy/sql/compiler.py#L7844-L7845
     if len(name) > max_len:
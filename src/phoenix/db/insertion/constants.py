@@ -1,2 +1,5 @@
 DEFAULT_RETRY_DELAY_SEC: float = 10
 DEFAULT_RETRY_ALLOWANCE: int = 60
+# Keeps the number of bound parameters of each SELECT and multi-row INSERT issued for a
+# chunk of queued annotations well below the limits of SQLite (32766) and asyncpg (32767).
+DEFAULT_CHUNK_SIZE: int = 500
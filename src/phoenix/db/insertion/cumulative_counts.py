@@ -0,0 +1,171 @@
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from phoenix.db import models
+from phoenix.db.insertion.helpers import chunked
+from phoenix.server.types import DbSessionFactory
+
+
+class CumulativeCounts(NamedTuple):
+    error_count: int
+    llm_token_count_prompt: int
+    llm_token_count_completion: int
+
+    def __add__(self, other: Any) -> "CumulativeCounts":
+        if not isinstance(other, CumulativeCounts):
+            return NotImplemented
+        return CumulativeCounts(
+            self.error_count + other.error_count,
+            self.llm_token_count_prompt + other.llm_token_count_prompt,
+            self.llm_token_count_completion + other.llm_token_count_completion,
+        )
+
+    def __bool__(self) -> bool:
+        return any(self)
+
+
+NO_COUNTS = CumulativeCounts(0, 0, 0)
+
+
+def accumulate(
+    span_id: str,
+    own_counts: Mapping[str, CumulativeCounts],
+    children: Mapping[str, Sequence[str]],
+    cumulative_counts: dict[str, CumulativeCounts],
+) -> CumulativeCounts:
+    """
+    Computes the cumulative counts of the subtree rooted at `span_id`, storing the
+    result for every span in the subtree in `cumulative_counts`.
+    """
+    # Iterative post-order traversal, because agent traces can be nested deeper than
+    # the recursion limit. Spans on the current path are skipped so that malformed
+    # parent_id cycles cannot loop forever.
+    stack: list[tuple[str, bool]] = [(span_id, False)]
+    on_path: set[str] = set()
+    while stack:
+        current, expanded = stack.pop()
+        if current in cumulative_counts:
+            continue
+        if not expanded:
+            if current in on_path:
+                continue
+            on_path.add(current)
+            stack.append((current, True))
+            stack.extend(
+                (child, False)
+                for child in children.get(current, ())
+                if child not in cumulative_counts and child not in on_path
+            )
+            continue
+        on_path.discard(current)
+        counts = own_counts[current]
+        for child in children.get(current, ()):
+            counts += cumulative_counts.get(child, NO_COUNTS)
+        cumulative_counts[current] = counts
+    return cumulative_counts[span_id]
+
+
+async def recompute_cumulative_counts(
+    session: AsyncSession,
+    trace_rowids: Iterable[int],
+) -> set[int]:
+    """
+    Recomputes the cumulative columns of every span in the given traces with a single
+    bottom-up pass per trace, and writes back only the rows whose values changed.
+
+    Returns the rowids of the projects with at least one updated span.
+    """
+    rows: dict[str, tuple[int, int, CumulativeCounts]] = {}
+    own_counts: dict[str, CumulativeCounts] = {}
+    children: dict[str, list[str]] = {}
+    trace_project_rowids: dict[int, int] = {}
+    for chunk in chunked(list(dict.fromkeys(trace_rowids))):
+        for (
+            span_rowid,
+            span_id,
+            parent_id,
+            trace_rowid,
+            project_rowid,
+            status_code,
+            llm_token_count_prompt,
+            llm_token_count_completion,
+            *current_counts,
+        ) in await session.execute(
+            select(
+                models.Span.id,
+                models.Span.span_id,
+                models.Span.parent_id,
+                models.Span.trace_rowid,
+                models.Trace.project_rowid,
+                models.Span.status_code,
+                models.Span.llm_token_count_prompt,
+                models.Span.llm_token_count_completion,
+                models.Span.cumulative_error_count,
+                models.Span.cumulative_llm_token_count_prompt,
+                models.Span.cumulative_llm_token_count_completion,
+            )
+            .join_from(models.Span, models.Trace)
+            .where(models.Span.trace_rowid.in_(chunk))
+        ):
+            rows[span_id] = (span_rowid, trace_rowid, CumulativeCounts(*current_counts))
+            trace_project_rowids[trace_rowid] = project_rowid
+            own_counts[span_id] = CumulativeCounts(
+                int(status_code == "ERROR"),
+                llm_token_count_prompt or 0,
+                llm_token_count_completion or 0,
+            )
+            if parent_id is not None:
+                children.setdefault(parent_id, []).append(span_id)
+    if not rows:
+        return set()
+    cumulative_counts: dict[str, CumulativeCounts] = {}
+    for span_id in own_counts:
+        accumulate(span_id, own_counts, children, cumulative_counts)
+    changes: list[dict[str, int]] = []
+    project_rowids: set[int] = set()
+    for span_id, (span_rowid, trace_rowid, current) in rows.items():
+        if (counts := cumulative_counts[span_id]) == current:
+            continue
+        project_rowids.add(trace_project_rowids[trace_rowid])
+        changes.append(
+            dict(
+                id=span_rowid,
+                cumulative_error_count=counts.error_count,
+                cumulative_llm_token_count_prompt=counts.llm_token_count_prompt,
+                cumulative_llm_token_count_completion=counts.llm_token_count_completion,
+            )
+        )
+    if changes:
+        await session.execute(update(models.Span), changes)
+    return project_rowids
+
+
+async def recompute_project_cumulative_counts(
+    db: DbSessionFactory,
+    project_rowid: int,
+    traces_per_pass: int = 1000,
+) -> int:
+    """
+    Recomputes the cumulative columns of every span in the project, a page of traces
+    at a time with one transaction per page, and returns the number of traces processed.
+    """
+    num_traces = 0
+    last_trace_rowid: Optional[int] = None
+    while True:
+        stmt = (
+            select(models.Trace.id)
+            .where(models.Trace.project_rowid == project_rowid)
+            .order_by(models.Trace.id)
+            .limit(traces_per_pass)
+        )
+        if last_trace_rowid is not None:
+            stmt = stmt.where(models.Trace.id > last_trace_rowid)
+        async with db() as session:
+            if not (trace_rowids := list(await session.scalars(stmt))):
+                return num_traces
+            await recompute_cumulative_counts(session, trace_rowids)
+        num_traces += len(trace_rowids)
+        last_trace_rowid = trace_rowids[-1]
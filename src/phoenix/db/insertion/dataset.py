@@ -1,9 +1,10 @@
+import asyncio
 import logging
 from collections.abc import Awaitable, Iterable, Iterator, Mapping
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from itertools import chain
+from itertools import chain, islice
 from typing import Any, Optional, Union, cast
 
 from sqlalchemy import insert, select
@@ -31,6 +32,12 @@ class ExampleContent:
 
 Examples: TypeAlias = Iterable[ExampleContent]
 
+EXAMPLES_BATCH_SIZE = 1_000
+"""
+Number of examples written by each multi-row insert when adding examples to a dataset, so that
+memory use is bounded by the batch rather than by the size of the upload.
+"""
+
 
 @dataclass(frozen=True)
 class DatasetExampleAdditionEvent(DataManipulationEvent):
@@ -187,32 +194,47 @@ async def add_dataset_examples(
     except Exception:
         logger.exception(f"Failed to insert dataset version for {dataset_id=}")
         raise
-    for example in (await examples) if isinstance(examples, Awaitable) else examples:
+    examples = iter((await examples) if isinstance(examples, Awaitable) else examples)
+    example_count = 0
+    loop = asyncio.get_running_loop()
+    # Pulling examples may read, decompress and parse the uploaded file, so it is kept off
+    # the event loop.
+    while batch := await loop.run_in_executor(
+        None, lambda: list(islice(examples, EXAMPLES_BATCH_SIZE))
+    ):
         try:
-            dataset_example_id = await insert_dataset_example(
-                session=session,
-                dataset_id=dataset_id,
-                created_at=created_at,
+            dataset_example_ids = await session.scalars(
+                insert(models.DatasetExample).returning(
+                    models.DatasetExample.id, sort_by_parameter_order=True
+                ),
+                [{"dataset_id": dataset_id, "created_at": created_at} for _ in batch],
             )
         except Exception:
-            logger.exception(f"Failed to insert dataset example for {dataset_id=}")
+            logger.exception(f"Failed to insert dataset examples for {dataset_id=}")
             raise
         try:
-            await insert_dataset_example_revision(
-                session=session,
-                dataset_version_id=dataset_version_id,
-                dataset_example_id=dataset_example_id,
-                input=example.input,
-                output=example.output,
-                metadata=example.metadata,
-                created_at=created_at,
+            await session.execute(
+                insert(models.DatasetExampleRevision),
+                [
+                    {
+                        "dataset_version_id": dataset_version_id,
+                        "dataset_example_id": dataset_example_id,
+                        "input": example.input,
+                        "output": example.output,
+                        "metadata_": example.metadata,
+                        "revision_kind": RevisionKind.CREATE.value,
+                        "created_at": created_at,
+                    }
+                    for dataset_example_id, example in zip(dataset_example_ids, batch)
+                ],
             )
         except Exception:
             logger.exception(
-                f"Failed to insert dataset example revision for {dataset_version_id=}, "
-                f"{dataset_example_id=}"
+                f"Failed to insert dataset example revisions for {dataset_version_id=}"
             )
             raise
+        example_count += len(batch)
+        logger.debug(f"Inserted {example_count} examples into {dataset_version_id=}")
     return DatasetExampleAdditionEvent(dataset_id=dataset_id, dataset_version_id=dataset_version_id)
 
 
@@ -1,7 +1,7 @@
 from abc import ABC
 from collections.abc import Awaitable, Callable, Iterable, Iterator, Mapping, Sequence
 from enum import Enum, auto
-from typing import Any, Optional
+from typing import Any, Optional, TypeVar
 
 from openinference.semconv.trace import OpenInferenceSpanKindValues, SpanAttributes
 from sqlalchemy import Insert
@@ -13,6 +13,7 @@ from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
 from phoenix.db.helpers import SupportedSQLDialect, truncate_name
+from phoenix.db.insertion.constants import DEFAULT_CHUNK_SIZE
 from phoenix.db.models import Base
 from phoenix.trace.attributes import get_attribute_value
 
@@ -101,6 +102,60 @@ def as_kv(obj: models.Base) -> Iterator[tuple[str, Any]]:
         yield k, v
 
 
+_T = TypeVar("_T")
+
+MAX_IN_CLAUSE_SIZE = 10_000
+"""
+Upper bound on the number of values bound in a single IN clause, which keeps the
+statements well below the bound-parameter limits of SQLite (32766) and asyncpg (32767).
+"""
+
+
+def chunked(items: Sequence[_T], size: int = MAX_IN_CLAUSE_SIZE) -> Iterator[Sequence[_T]]:
+    """
+    Splits a sequence into consecutive slices of at most `size` items.
+    """
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+async def upsert_rows(
+    session: AsyncSession,
+    records: Sequence[Mapping[str, Any]],
+    *,
+    table: type[Base],
+    unique_by: Sequence[str],
+    constraint_name: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[int]:
+    """
+    Upserts the records with one multi-row statement per chunk and returns the ids of
+    the rows in the order of the records, so records with the same unique key get the
+    same id.
+    """
+    dialect = SupportedSQLDialect(session.bind.dialect.name)
+    key_columns = [getattr(table, name) for name in unique_by]
+    ids: dict[tuple[Any, ...], int] = {}
+    for records_chunk in chunked(records, chunk_size):
+        stmt = insert_on_conflict(
+            *records_chunk,
+            dialect=dialect,
+            table=table,
+            unique_by=unique_by,
+            constraint_name=constraint_name,
+        ).returning(getattr(table, "id"), *key_columns)
+        for id_, *key in await session.execute(stmt):
+            ids[tuple(key)] = id_
+    return [ids[tuple(record[name] for name in unique_by)] for record in records]
+
+
+def get_token_count(attributes: Optional[Mapping[str, Any]], key: str) -> int:
+    try:
+        return int(get_attribute_value(attributes, key) or 0)
+    except BaseException:
+        return 0
+
+
 def should_calculate_span_cost(
     attributes: Optional[Mapping[str, Any]],
 ) -> bool:
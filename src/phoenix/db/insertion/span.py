@@ -1,16 +1,28 @@
+from collections.abc import Sequence
 from dataclasses import asdict
-from typing import NamedTuple, Optional, cast
+from datetime import datetime
+from typing import Any, NamedTuple, Optional, cast
 
 from openinference.semconv.trace import SpanAttributes
-from sqlalchemy import func, insert, select, update
+from sqlalchemy import bindparam, case, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from phoenix.db import models
 from phoenix.db.helpers import SupportedSQLDialect
-from phoenix.db.insertion.helpers import OnConflict, insert_on_conflict
+from phoenix.db.insertion.cumulative_counts import NO_COUNTS, CumulativeCounts, accumulate
+from phoenix.db.insertion.helpers import (
+    OnConflict,
+    chunked,
+    get_token_count,
+    insert_on_conflict,
+)
 from phoenix.trace.attributes import get_attribute_value
 from phoenix.trace.schemas import Span, SpanStatusCode
 
+# Keeps the number of bound parameters of each multi-row span INSERT well below the
+# limits of SQLite (32766) and asyncpg (32767).
+_SPAN_INSERT_CHUNK_SIZE = 1_000
+
 
 class SpanInsertionEvent(NamedTuple):
     project_rowid: int
@@ -145,6 +157,7 @@ async def insert_span(
             dict(
                 span_id=span.context.span_id,
                 trace_rowid=trace.id,
+                project_rowid=trace.project_rowid,
                 parent_id=span.parent_id,
                 span_kind=span.span_kind.value,
                 name=span.name,
@@ -195,3 +208,423 @@ async def insert_span(
         )
     )
     return SpanInsertionEvent(project_rowid, span_rowid, trace.id)
+
+
+def _get_session_id(span: Span) -> str:
+    session_id = get_attribute_value(span.attributes, SpanAttributes.SESSION_ID)
+    return str(session_id).strip() if session_id is not None else ""
+
+
+async def insert_spans(
+    session: AsyncSession,
+    spans: Sequence[tuple[Span, str]],
+    *,
+    propagate_cumulative_counts: bool = True,
+) -> list[tuple[Span, SpanInsertionEvent]]:
+    """
+    Set-based counterpart to `insert_span` for a whole batch of spans.
+
+    Traces, projects and sessions are looked up and upserted in bulk, the spans
+    are written with multi-row inserts, and cumulative counts are propagated to
+    pre-existing ancestors in a single pass, so the number of statements does not
+    grow with the number of spans in the batch. The end state of the database is
+    the same as if `insert_span` were called on each span in order.
+
+    Spans whose span_id is already present in the database (or earlier in the
+    batch) are skipped, and no event is returned for them.
+
+    When `propagate_cumulative_counts` is False, cumulative counts are only
+    accumulated within the batch, i.e. children and ancestors already in the
+    database are neither read nor updated. The caller is then responsible for
+    reconciling them later, e.g. via `recompute_cumulative_counts`.
+    """
+    dialect = SupportedSQLDialect(session.bind.dialect.name)
+
+    # Spans are inserted with ON CONFLICT DO NOTHING, so duplicates are dropped
+    # up front to keep them out of the cumulative counts.
+    candidates: dict[str, tuple[Span, str]] = {}
+    for span, project_name in spans:
+        candidates.setdefault(span.context.span_id, (span, project_name))
+    if not candidates:
+        return []
+    for chunk in chunked(list(candidates)):
+        for span_id in await session.scalars(
+            select(models.Span.span_id).where(models.Span.span_id.in_(chunk))
+        ):
+            candidates.pop(span_id, None)
+    if not candidates:
+        return []
+    batch = list(candidates.values())
+
+    # Traces
+    trace_ids = list(dict.fromkeys(span.context.trace_id for span, _ in batch))
+    existing_traces: dict[str, models.Trace] = {}
+    for chunk in chunked(trace_ids):
+        for existing_trace in await session.scalars(
+            select(models.Trace).where(models.Trace.trace_id.in_(chunk))
+        ):
+            existing_traces[existing_trace.trace_id] = existing_trace
+    trace_times: dict[str, tuple[datetime, datetime]] = {}
+    trace_session_ids: dict[str, str] = {}
+    new_trace_project_names: dict[str, str] = {}
+    for span, project_name in batch:
+        trace_id = span.context.trace_id
+        if trace_id in trace_times:
+            start_time, end_time = trace_times[trace_id]
+            trace_times[trace_id] = (
+                min(start_time, span.start_time),
+                max(end_time, span.end_time),
+            )
+        elif trace_id in existing_traces:
+            trace_times[trace_id] = (
+                min(existing_traces[trace_id].start_time, span.start_time),
+                max(existing_traces[trace_id].end_time, span.end_time),
+            )
+        else:
+            trace_times[trace_id] = (span.start_time, span.end_time)
+            # The project_name of the first span determines the project of a new trace.
+            # Existing traces keep their project, because users can transfer traces
+            # between projects.
+            new_trace_project_names[trace_id] = project_name
+        if trace_id not in trace_session_ids and (session_id := _get_session_id(span)):
+            trace_session_ids[trace_id] = session_id
+
+    # Projects
+    project_rowids: dict[str, int] = {}
+    if project_names := list(dict.fromkeys(new_trace_project_names.values())):
+        await session.execute(
+            insert_on_conflict(
+                *(dict(name=name) for name in project_names),
+                dialect=dialect,
+                table=models.Project,
+                unique_by=("name",),
+                on_conflict=OnConflict.DO_NOTHING,
+            )
+        )
+        for project_rowid, name in await session.execute(
+            select(models.Project.id, models.Project.name).where(
+                models.Project.name.in_(project_names)
+            )
+        ):
+            project_rowids[name] = project_rowid
+
+    trace_project_rowids = {
+        trace_id: project_rowids[name] for trace_id, name in new_trace_project_names.items()
+    }
+    trace_project_rowids.update(
+        (trace_id, trace.project_rowid) for trace_id, trace in existing_traces.items()
+    )
+
+    # Sessions
+    trace_session_rowids: dict[str, Optional[int]] = {
+        trace_id: trace.project_session_rowid for trace_id, trace in existing_traces.items()
+    }
+    # As in `insert_span`, the session_id on a span is ignored when the trace
+    # already belongs to a session.
+    new_session_ids: dict[str, str] = {
+        trace_id: session_id
+        for trace_id, session_id in trace_session_ids.items()
+        if trace_session_rowids.get(trace_id) is None
+    }
+    if new_session_ids:
+        records: dict[str, dict[str, Any]] = {}
+        for trace_id, session_id in new_session_ids.items():
+            start_time, end_time = trace_times[trace_id]
+            if (record := records.get(session_id)) is None:
+                records[session_id] = dict(
+                    session_id=session_id,
+                    project_id=trace_project_rowids[trace_id],
+                    start_time=start_time,
+                    end_time=end_time,
+                )
+            else:
+                record["start_time"] = min(record["start_time"], start_time)
+                record["end_time"] = max(record["end_time"], end_time)
+        await session.execute(
+            insert_on_conflict(
+                *records.values(),
+                dialect=dialect,
+                table=models.ProjectSession,
+                unique_by=("session_id",),
+                on_conflict=OnConflict.DO_NOTHING,
+            )
+        )
+        session_rowids: dict[str, int] = {}
+        for chunk in chunked(list(records)):
+            for rowid, session_id in await session.execute(
+                select(models.ProjectSession.id, models.ProjectSession.session_id).where(
+                    models.ProjectSession.session_id.in_(chunk)
+                )
+            ):
+                session_rowids[session_id] = rowid
+        for trace_id, session_id in new_session_ids.items():
+            trace_session_rowids[trace_id] = session_rowids[session_id]
+    session_times: dict[int, tuple[datetime, datetime]] = {}
+    for trace_id, session_rowid in trace_session_rowids.items():
+        if session_rowid is None:
+            continue
+        start_time, end_time = trace_times[trace_id]
+        if session_rowid in session_times:
+            session_start_time, session_end_time = session_times[session_rowid]
+            start_time = min(start_time, session_start_time)
+            end_time = max(end_time, session_end_time)
+        session_times[session_rowid] = (start_time, end_time)
+    # Late-arriving spans usually fall within the time range already recorded,
+    # so only the sessions whose range actually widens are written.
+    for rowids in chunked(list(session_times)):
+        for rowid, session_start_time, session_end_time in await session.execute(
+            select(
+                models.ProjectSession.id,
+                models.ProjectSession.start_time,
+                models.ProjectSession.end_time,
+            ).where(models.ProjectSession.id.in_(rowids))
+        ):
+            start_time, end_time = session_times[rowid]
+            if session_start_time <= start_time and end_time <= session_end_time:
+                del session_times[rowid]
+    # The executemany UPDATEs below go through the connection, because the ORM
+    # session would otherwise treat a list of parameters as a bulk UPDATE by
+    # primary key, which does not allow SQL expressions in the SET clause.
+    connection = await session.connection()
+    if session_times:
+        await connection.execute(
+            update(models.ProjectSession)
+            .where(models.ProjectSession.id == bindparam("_id"))
+            .values(
+                start_time=case(
+                    (
+                        models.ProjectSession.start_time < bindparam("_start_time"),
+                        models.ProjectSession.start_time,
+                    ),
+                    else_=bindparam("_start_time"),
+                ),
+                end_time=case(
+                    (
+                        models.ProjectSession.end_time > bindparam("_end_time"),
+                        models.ProjectSession.end_time,
+                    ),
+                    else_=bindparam("_end_time"),
+                ),
+            ),
+            [
+                dict(_id=rowid, _start_time=start_time, _end_time=end_time)
+                for rowid, (start_time, end_time) in session_times.items()
+            ],
+        )
+
+    # Trace rows are written once per batch.
+    trace_rowids = {trace_id: trace.id for trace_id, trace in existing_traces.items()}
+    if new_trace_project_names:
+        new_trace_ids = list(new_trace_project_names)
+        for chunk in chunked(new_trace_ids):
+            for trace_rowid, trace_id in await session.execute(
+                insert(models.Trace)
+                .values(
+                    [
+                        dict(
+                            trace_id=trace_id,
+                            project_rowid=trace_project_rowids[trace_id],
+                            project_session_rowid=trace_session_rowids.get(trace_id),
+                            start_time=trace_times[trace_id][0],
+                            end_time=trace_times[trace_id][1],
+                        )
+                        for trace_id in chunk
+                    ]
+                )
+                .returning(models.Trace.id, models.Trace.trace_id)
+            ):
+                trace_rowids[trace_id] = trace_rowid
+    # Existing traces are only written when the batch widens their time range or
+    # assigns them to a session, and, as with sessions, the range is widened in
+    # SQL so that a concurrent writer cannot shrink it again.
+    if changed_traces := [
+        (trace_id, trace)
+        for trace_id, trace in existing_traces.items()
+        if (trace.start_time, trace.end_time) != trace_times[trace_id]
+        or trace.project_session_rowid != trace_session_rowids[trace_id]
+    ]:
+        await connection.execute(
+            update(models.Trace)
+            .where(models.Trace.id == bindparam("_id"))
+            .values(
+                start_time=case(
+                    (
+                        models.Trace.start_time < bindparam("_start_time"),
+                        models.Trace.start_time,
+                    ),
+                    else_=bindparam("_start_time"),
+                ),
+                end_time=case(
+                    (
+                        models.Trace.end_time > bindparam("_end_time"),
+                        models.Trace.end_time,
+                    ),
+                    else_=bindparam("_end_time"),
+                ),
+                project_session_rowid=bindparam("_project_session_rowid"),
+            ),
+            [
+                dict(
+                    _id=trace.id,
+                    _start_time=trace_times[trace_id][0],
+                    _end_time=trace_times[trace_id][1],
+                    _project_session_rowid=trace_session_rowids[trace_id],
+                )
+                for trace_id, trace in changed_traces
+            ],
+        )
+
+    # Cumulative counts are first accumulated in memory over the batch, with
+    # children already in the database summed in one aggregate query.
+    own_counts: dict[str, CumulativeCounts] = {}
+    children: dict[str, list[str]] = {}
+    for span, _ in batch:
+        span_id = span.context.span_id
+        own_counts[span_id] = CumulativeCounts(
+            int(span.status_code is SpanStatusCode.ERROR),
+            get_token_count(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT),
+            get_token_count(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION),
+        )
+        if span.parent_id is not None:
+            children.setdefault(span.parent_id, []).append(span_id)
+    for chunk in chunked(list(own_counts) if propagate_cumulative_counts else []):
+        for parent_id, *accumulation in await session.execute(
+            select(
+                models.Span.parent_id,
+                func.sum(models.Span.cumulative_error_count),
+                func.sum(models.Span.cumulative_llm_token_count_prompt),
+                func.sum(models.Span.cumulative_llm_token_count_completion),
+            )
+            .where(models.Span.parent_id.in_(chunk))
+            .group_by(models.Span.parent_id)
+        ):
+            own_counts[parent_id] += CumulativeCounts(*(int(v or 0) for v in accumulation))
+    cumulative_counts: dict[str, CumulativeCounts] = {}
+    for span_id in own_counts:
+        accumulate(span_id, own_counts, children, cumulative_counts)
+
+    span_rowids: dict[str, int] = {}
+    for spans_chunk in chunked(batch, _SPAN_INSERT_CHUNK_SIZE):
+        for span_rowid, span_id in await session.execute(
+            insert_on_conflict(
+                *(
+                    _span_record(
+                        span,
+                        trace_rowids[span.context.trace_id],
+                        trace_project_rowids[span.context.trace_id],
+                        cumulative_counts[span.context.span_id],
+                    )
+                    for span, _ in spans_chunk
+                ),
+                dialect=dialect,
+                table=models.Span,
+                unique_by=("span_id",),
+                on_conflict=OnConflict.DO_NOTHING,
+            ).returning(models.Span.id, models.Span.span_id)
+        ):
+            span_rowids[span_id] = span_rowid
+
+    # Propagate the cumulative counts of the spans whose parents are not in the
+    # batch to all of their ancestors already in the database in one pass.
+    deltas: dict[str, CumulativeCounts] = {}
+    for span, _ in batch:
+        span_id, parent_id = span.context.span_id, span.parent_id
+        if (
+            not propagate_cumulative_counts
+            or parent_id is None
+            or parent_id in cumulative_counts
+            or span_id not in span_rowids
+        ):
+            continue
+        if counts := cumulative_counts[span_id]:
+            deltas[parent_id] = deltas.get(parent_id, NO_COUNTS) + counts
+    if deltas:
+        ancestors: dict[str, tuple[int, Optional[str]]] = {}
+        for chunk in chunked(list(deltas)):
+            cte = (
+                select(models.Span.id, models.Span.span_id, models.Span.parent_id)
+                .where(models.Span.span_id.in_(chunk))
+                .cte(recursive=True)
+            )
+            child = cte.alias()
+            cte = cte.union(
+                select(models.Span.id, models.Span.span_id, models.Span.parent_id).join(
+                    child, models.Span.span_id == child.c.parent_id
+                )
+            )
+            for rowid, span_id, parent_id in await session.execute(select(cte)):
+                ancestors[span_id] = (rowid, parent_id)
+        increments: dict[int, CumulativeCounts] = {}
+        for ancestor_id, counts in deltas.items():
+            seen: set[str] = set()
+            next_id: Optional[str] = ancestor_id
+            while next_id is not None and next_id not in seen and next_id in ancestors:
+                seen.add(next_id)
+                rowid, next_id = ancestors[next_id]
+                increments[rowid] = increments.get(rowid, NO_COUNTS) + counts
+        if increments:
+            await connection.execute(
+                update(models.Span)
+                .where(models.Span.id == bindparam("_id"))
+                .values(
+                    cumulative_error_count=models.Span.cumulative_error_count
+                    + bindparam("_error_count"),
+                    cumulative_llm_token_count_prompt=models.Span.cumulative_llm_token_count_prompt
+                    + bindparam("_llm_token_count_prompt"),
+                    cumulative_llm_token_count_completion=models.Span.cumulative_llm_token_count_completion
+                    + bindparam("_llm_token_count_completion"),
+                ),
+                [
+                    dict(
+                        _id=rowid,
+                        _error_count=counts.error_count,
+                        _llm_token_count_prompt=counts.llm_token_count_prompt,
+                        _llm_token_count_completion=counts.llm_token_count_completion,
+                    )
+                    for rowid, counts in increments.items()
+                ],
+            )
+
+    return [
+        (
+            span,
+            SpanInsertionEvent(
+                trace_project_rowids[span.context.trace_id],
+                span_rowids[span.context.span_id],
+                trace_rowids[span.context.trace_id],
+            ),
+        )
+        for span, _ in batch
+        if span.context.span_id in span_rowids
+    ]
+
+
+def _span_record(
+    span: Span,
+    trace_rowid: int,
+    project_rowid: int,
+    cumulative_counts: CumulativeCounts,
+) -> dict[str, Any]:
+    llm_token_count_prompt = get_token_count(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT)
+    llm_token_count_completion = get_token_count(
+        span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION
+    )
+    return dict(
+        span_id=span.context.span_id,
+        trace_rowid=trace_rowid,
+        project_rowid=project_rowid,
+        parent_id=span.parent_id,
+        span_kind=span.span_kind.value,
+        name=span.name,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        attributes=span.attributes,
+        events=[asdict(event) for event in span.events],
+        status_code=span.status_code.value,
+        status_message=span.status_message,
+        cumulative_error_count=cumulative_counts.error_count,
+        cumulative_llm_token_count_prompt=cumulative_counts.llm_token_count_prompt,
+        cumulative_llm_token_count_completion=cumulative_counts.llm_token_count_completion,
+        llm_token_count_prompt=llm_token_count_prompt,
+        llm_token_count_completion=llm_token_count_completion,
+    )
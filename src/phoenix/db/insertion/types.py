@@ -13,9 +13,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.dml import Insert
 
 from phoenix.db import models
-from phoenix.db.insertion.constants import DEFAULT_RETRY_ALLOWANCE, DEFAULT_RETRY_DELAY_SEC
-from phoenix.db.insertion.helpers import insert_on_conflict
+from phoenix.db.insertion.constants import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_RETRY_ALLOWANCE,
+    DEFAULT_RETRY_DELAY_SEC,
+)
+from phoenix.db.insertion.helpers import chunked, insert_on_conflict
 from phoenix.server.dml_event import DmlEvent
+from phoenix.server.prometheus import ANNOTATION_QUEUE_LATENCY, ANNOTATION_QUEUE_SIZE
 from phoenix.server.types import DbSessionFactory
 
 logger = logging.getLogger(__name__)
@@ -67,18 +72,34 @@ class QueueInserter(ABC, Generic[_PrecursorT, _InsertableT, _RowT, _DmlEventT]):
         db: DbSessionFactory,
         retry_delay_sec: float = DEFAULT_RETRY_DELAY_SEC,
         retry_allowance: int = DEFAULT_RETRY_ALLOWANCE,
+        max_queue_size: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
     ) -> None:
+        """
+        :param max_queue_size: The length of the queue at which it is reported as full.
+        Items are still accepted beyond it, so it is up to the callers to stop enqueueing.
+        :param chunk_size: The maximum number of items partitioned and inserted together.
+        """
         self._queue: list[Received[_PrecursorT]] = []
         self._db = db
         self._retry_delay_sec = retry_delay_sec
         self._retry_allowance = retry_allowance
+        self._max_queue_size = max_queue_size
+        self._chunk_size = chunk_size
+        self._queue_size = ANNOTATION_QUEUE_SIZE.labels(table=self.table.__tablename__)
+        self._queue_latency = ANNOTATION_QUEUE_LATENCY.labels(table=self.table.__tablename__)
 
     @property
     def empty(self) -> bool:
         return not bool(self._queue)
 
+    @property
+    def is_full(self) -> bool:
+        return bool(self._max_queue_size and self._max_queue_size <= len(self._queue))
+
     async def enqueue(self, *items: _PrecursorT) -> None:
         self._queue.extend([Received(item) for item in items])
+        self._queue_size.set(len(self._queue))
 
     @abstractmethod
     async def _partition(
@@ -98,21 +119,58 @@ class QueueInserter(ABC, Generic[_PrecursorT, _InsertableT, _RowT, _DmlEventT]):
         # IMPORTANT: Use .clear() instead of reassignment, i.e. self._queue = [], to
         # avoid potential race conditions when appending postponed items to the queue.
         self._queue.clear()
+        self._queue_size.set(0)
+        self._queue_latency.set(
+            (datetime.now(timezone.utc) - min(p.received_at for p in parcels)).total_seconds()
+        )
         events: list[_DmlEventT] = []
-        async with self._db() as session:
-            to_insert, to_postpone, _ = await self._partition(session, *parcels)
-            if to_insert:
-                events, to_retry, _ = await self._insert(session, *to_insert)
-                if to_retry:
-                    to_postpone.extend(to_retry)
+        to_postpone: list[Postponed[_PrecursorT]] = []
+        # The backlog is worked off in chunks of bounded size, each in its own
+        # transaction, so that a burst of items neither produces statements with
+        # too many parameters nor holds a single transaction open for long.
+        # A chunk that fails, e.g. because its transaction cannot be committed, is retried
+        # later, without losing the events of the chunks that have already been committed.
+        for chunk in chunked(parcels, self._chunk_size):
+            chunk_events: list[_DmlEventT] = []
+            chunk_to_postpone: list[Postponed[_PrecursorT]] = []
+            try:
+                async with self._db() as session:
+                    to_insert, postponed, _ = await self._partition(session, *chunk)
+                    chunk_to_postpone.extend(postponed)
+                    if to_insert:
+                        inserted, to_retry, _ = await self._insert(session, *to_insert)
+                        chunk_events.extend(inserted)
+                        chunk_to_postpone.extend(to_retry)
+            except Exception:
+                logger.exception(
+                    f"Failed to insert a chunk of {len(chunk)} records "
+                    f"for {self.table.__name__}. Will retry them later."
+                )
+                to_postpone.extend(self._retry(*chunk))
+            else:
+                events.extend(chunk_events)
+                to_postpone.extend(chunk_to_postpone)
         if to_postpone:
             loop = asyncio.get_running_loop()
             loop.call_later(self._retry_delay_sec, self._add_postponed_to_queue, to_postpone)
         return events
 
+    def _retry(self, *parcels: Received[_PrecursorT]) -> list[Postponed[_PrecursorT]]:
+        """Postpones the parcels that have retries left, dropping the rest."""
+        to_retry: list[Postponed[_PrecursorT]] = []
+        for p in parcels:
+            if not isinstance(p, Postponed):
+                to_retry.append(p.postpone(self._retry_allowance))
+            elif p.retries_left > 1:
+                to_retry.append(p.postpone(p.retries_left - 1))
+            else:
+                logger.error(f"Dropped a record for {self.table.__name__} after retries.")
+        return to_retry
+
     def _add_postponed_to_queue(self, items: list[Postponed[_PrecursorT]]) -> None:
         """Add postponed items back to the queue for retry."""
         self._queue.extend(items)
+        self._queue_size.set(len(self._queue))
 
     def _insert_on_conflict(self, *records: Mapping[str, Any]) -> Insert:
         return insert_on_conflict(
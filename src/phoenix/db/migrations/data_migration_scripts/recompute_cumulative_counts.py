@@ -0,0 +1,83 @@
+# /// script
+# dependencies = [
+#   "arize-phoenix[pg]",
+# ]
+# ///
+"""
+Recompute the cumulative error and token counts of every span in a project.
+
+The cumulative counts of a span include the counts of all of its descendants. They can
+drift from the actual values, e.g. if spans were ingested with
+`PHOENIX_CUMULATIVE_COUNTS_CONSISTENCY=eventual` and the server stopped before the
+background rollup caught up. This script repairs them.
+
+Usage:
+
+    python -m phoenix.db.migrations.data_migration_scripts.recompute_cumulative_counts \\
+        --project default
+
+Environment variables.
+
+- `PHOENIX_SQL_DATABASE_URL` must be set to the database connection string.
+- (optional) Postgresql schema can be set via `PHOENIX_SQL_DATABASE_SCHEMA`.
+"""
+
+import asyncio
+from argparse import ArgumentParser
+from time import perf_counter
+
+from sqlalchemy import select
+
+from phoenix.config import get_env_database_connection_str
+from phoenix.db import models
+from phoenix.db.engines import create_engine
+from phoenix.db.insertion.cumulative_counts import recompute_project_cumulative_counts
+from phoenix.server.app import _db
+from phoenix.server.types import DbSessionFactory
+
+
+async def recompute_cumulative_counts(db: DbSessionFactory, project_names: list[str]) -> None:
+    async with db() as session:
+        projects = {
+            name: id_
+            for id_, name in await session.execute(
+                select(models.Project.id, models.Project.name).where(
+                    models.Project.name.in_(project_names)
+                )
+            )
+        }
+    for name in project_names:
+        if (project_rowid := projects.get(name)) is None:
+            print(f"⚠️ Project {name!r} not found.")
+            continue
+        start_time = perf_counter()
+        num_traces = await recompute_project_cumulative_counts(db, project_rowid)
+        elapsed_time = perf_counter() - start_time
+        print(
+            f"✅ Recomputed cumulative counts for {num_traces} traces "
+            f"in project {name!r} in {elapsed_time:.3f} seconds."
+        )
+
+
+async def main(project_names: list[str]) -> None:
+    engine = create_engine(get_env_database_connection_str(), migrate=False)
+    db = DbSessionFactory(db=_db(engine), dialect=engine.dialect.name)
+    try:
+        await recompute_cumulative_counts(db, project_names)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Recompute the cumulative counts of every span in a project."
+    )
+    parser.add_argument(
+        "--project",
+        dest="projects",
+        action="append",
+        required=True,
+        help="Name of the project to repair. Can be repeated.",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.projects))
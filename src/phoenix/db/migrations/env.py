@@ -90,20 +90,19 @@ async def run_async_migrations(connectable: AsyncEngine) -> None:
 
 
 def run_migrations(connection: Connection) -> None:
-    transaction = connection.begin()
     try:
+        # All migrations run in one transaction that is rolled back if any of them fails.
+        # The transaction is begun by Alembic rather than on the connection, so that a
+        # migration that has to, e.g. to build an index concurrently, can step out of it
+        # with an autocommit block, which commits the migrations that preceded it.
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
             transactional_ddl=True,
-            transaction_per_migration=True,
         )
-        context.run_migrations()
-        transaction.commit()
-    except Exception:
-        transaction.rollback()
-        raise
+        with context.begin_transaction():
+            context.run_migrations()
     finally:
         connection.close()
 
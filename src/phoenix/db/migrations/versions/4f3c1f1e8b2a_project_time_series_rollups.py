@@ -0,0 +1,198 @@
+"""project time series rollups
+
+Revision ID: 4f3c1f1e8b2a
+Revises: deb2c81c0bb2
+Create Date: 2025-09-22 10:14:37.518209
+
+"""
+
+from typing import Any, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+_Integer = sa.Integer().with_variant(
+    sa.BigInteger(),
+    "postgresql",
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "4f3c1f1e8b2a"
+down_revision: Union[str, None] = "deb2c81c0bb2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COUNTS = (
+    "span_count",
+    "span_ok_count",
+    "span_error_count",
+    "span_unset_count",
+    "trace_count",
+    "span_cost_count",
+)
+_SUMS = (
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "prompt_cost",
+    "completion_cost",
+    "total_cost",
+)
+
+# Matches the format in which SQLAlchemy stores datetimes in SQLite, so that the
+# backfilled buckets compare equal to the ones written by the application.
+_SQLITE_FORMATS = {
+    "minute": "%Y-%m-%d %H:%M:00.000000",
+    "hour": "%Y-%m-%d %H:00:00.000000",
+    "day": "%Y-%m-%d 00:00:00.000000",
+}
+
+spans = sa.table(
+    "spans",
+    sa.column("id"),
+    sa.column("trace_rowid"),
+    sa.column("start_time"),
+    sa.column("status_code"),
+)
+traces = sa.table(
+    "traces",
+    sa.column("id"),
+    sa.column("project_rowid"),
+    sa.column("start_time"),
+)
+span_costs = sa.table(
+    "span_costs",
+    sa.column("id"),
+    sa.column("trace_rowid"),
+    *(sa.column(name) for name in _SUMS),
+)
+rollups = sa.table(
+    "project_time_series_rollups",
+    sa.column("project_rowid"),
+    sa.column("granularity"),
+    sa.column("bucket_start"),
+    *(sa.column(name) for name in _COUNTS + _SUMS),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_time_series_rollups",
+        sa.Column("id", _Integer, primary_key=True),
+        sa.Column(
+            "project_rowid",
+            _Integer,
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "granularity",
+            sa.String,
+            sa.CheckConstraint(
+                "granularity IN ('minute', 'hour', 'day')",
+                name="valid_granularity",
+            ),
+            nullable=False,
+        ),
+        sa.Column("bucket_start", sa.TIMESTAMP(timezone=True), nullable=False),
+        *(sa.Column(name, sa.Integer, nullable=False) for name in _COUNTS),
+        *(sa.Column(name, sa.Float, nullable=True) for name in _SUMS),
+        sa.UniqueConstraint(
+            "project_rowid",
+            "granularity",
+            "bucket_start",
+        ),
+    )
+    dialect = op.get_bind().dialect.name
+    op.execute(
+        rollups.insert().from_select(
+            ["project_rowid", "granularity", "bucket_start", *_COUNTS, *_SUMS],
+            _minute_totals(dialect),
+        )
+    )
+    for granularity, finer in (("hour", "minute"), ("day", "hour")):
+        bucket = _truncate(granularity, rollups.c.bucket_start, dialect)
+        op.execute(
+            rollups.insert().from_select(
+                ["project_rowid", "granularity", "bucket_start", *_COUNTS, *_SUMS],
+                sa.select(
+                    rollups.c.project_rowid,
+                    sa.literal(granularity),
+                    bucket,
+                    *(sa.func.sum(rollups.c[name]) for name in _COUNTS + _SUMS),
+                )
+                .where(rollups.c.granularity == finer)
+                .group_by(rollups.c.project_rowid, bucket),
+            )
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("project_time_series_rollups")
+
+
+def _minute_totals(dialect: str) -> sa.Select[Any]:
+    null = sa.cast(sa.null(), sa.Float)
+    span_bucket = _truncate("minute", spans.c.start_time, dialect)
+    trace_bucket = _truncate("minute", traces.c.start_time, dialect)
+    span_totals = (
+        sa.select(
+            traces.c.project_rowid.label("project_rowid"),
+            span_bucket.label("bucket_start"),
+            sa.func.count(spans.c.id).label("span_count"),
+            *(
+                sa.func.sum(sa.case((spans.c.status_code == status, 1), else_=0)).label(name)
+                for status, name in (
+                    ("OK", "span_ok_count"),
+                    ("ERROR", "span_error_count"),
+                    ("UNSET", "span_unset_count"),
+                )
+            ),
+            sa.literal(0).label("trace_count"),
+            sa.literal(0).label("span_cost_count"),
+            *(null.label(name) for name in _SUMS),
+        )
+        .select_from(spans.join(traces, spans.c.trace_rowid == traces.c.id))
+        .group_by(traces.c.project_rowid, span_bucket)
+    )
+    trace_totals = (
+        sa.select(
+            traces.c.project_rowid,
+            trace_bucket,
+            *(sa.literal(0) for _ in range(4)),
+            sa.func.count(traces.c.id),
+            sa.literal(0),
+            *(null for _ in _SUMS),
+        )
+        .select_from(traces)
+        .group_by(traces.c.project_rowid, trace_bucket)
+    )
+    cost_totals = (
+        sa.select(
+            traces.c.project_rowid,
+            trace_bucket,
+            *(sa.literal(0) for _ in range(5)),
+            sa.func.count(span_costs.c.id),
+            *(sa.func.sum(span_costs.c[name]) for name in _SUMS),
+        )
+        .select_from(traces.join(span_costs, span_costs.c.trace_rowid == traces.c.id))
+        .group_by(traces.c.project_rowid, trace_bucket)
+    )
+    totals = sa.union_all(span_totals, trace_totals, cost_totals).subquery()
+    return sa.select(
+        totals.c.project_rowid,
+        sa.literal("minute"),
+        totals.c.bucket_start,
+        *(sa.func.sum(totals.c[name]) for name in _COUNTS + _SUMS),
+    ).group_by(totals.c.project_rowid, totals.c.bucket_start)
+
+
+def _truncate(field: str, source: Any, dialect: str) -> Any:
+    if dialect == "postgresql":
+        # Literal columns make the expressions in the SELECT and GROUP BY clauses identical.
+        return sa.func.date_trunc(
+            sa.literal_column(f"'{field}'"),
+            source,
+            sa.literal_column("'UTC'"),
+        )
+    return sa.func.strftime(sa.literal_column(f"'{_SQLITE_FORMATS[field]}'"), source)
@@ -0,0 +1,34 @@
+"""add sweep_started_at on project_trace_retention_policies
+
+Revision ID: 8e2c5b7a9d41
+Revises: 4f3c1f1e8b2a
+Create Date: 2025-09-29 14:41:02.806133
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e2c5b7a9d41"
+down_revision: Union[str, None] = "4f3c1f1e8b2a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("project_trace_retention_policies") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "sweep_started_at",
+                sa.TIMESTAMP(timezone=True),
+                nullable=True,
+            ),
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("project_trace_retention_policies") as batch_op:
+        batch_op.drop_column("sweep_started_at")
@@ -0,0 +1,66 @@
+"""add experiment_jobs table
+
+Revision ID: a5e9d3b7c142
+Revises: f3a8b2c91d47
+Create Date: 2025-10-15 14:21:07.904531
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+_Integer = sa.Integer().with_variant(
+    sa.BigInteger(),
+    "postgresql",
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "a5e9d3b7c142"
+down_revision: Union[str, None] = "f3a8b2c91d47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "experiment_jobs",
+        sa.Column("id", _Integer, primary_key=True),
+        sa.Column(
+            "experiment_id",
+            _Integer,
+            sa.ForeignKey("experiments.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column(
+            "status",
+            sa.String,
+            sa.CheckConstraint(
+                "status IN ('RUNNING', 'COMPLETED', 'FAILED', 'INTERRUPTED')",
+                name="valid_status",
+            ),
+            nullable=False,
+        ),
+        sa.Column("total_count", sa.Integer, nullable=False),
+        sa.Column("completed_count", sa.Integer, nullable=False),
+        sa.Column("error", sa.String, nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+            onupdate=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("experiment_jobs")
@@ -0,0 +1,93 @@
+"""add project_rowid to spans
+
+Revision ID: b3f1e9c27d05
+Revises: 8e2c5b7a9d41
+Create Date: 2025-10-06 10:12:44.301822
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3f1e9c27d05"
+down_revision: Union[str, None] = "8e2c5b7a9d41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_Integer = sa.Integer().with_variant(
+    sa.BigInteger(),
+    "postgresql",
+)
+
+_BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    # The steps after the column is added are committed one at a time, so a failed
+    # upgrade can be retried with the column already in place.
+    if "project_rowid" not in {c["name"] for c in sa.inspect(op.get_bind()).get_columns("spans")}:
+        if op.get_bind().dialect.name == "sqlite":
+            # SQLite can add a foreign key column in place as long as it defaults to
+            # NULL, but Alembic would rebuild the table to add the constraint.
+            op.execute(
+                "ALTER TABLE spans ADD COLUMN project_rowid INTEGER "
+                "REFERENCES projects (id) ON DELETE CASCADE"
+            )
+        else:
+            # A nullable column without a default can be added without rewriting
+            # the table.
+            op.add_column("spans", sa.Column("project_rowid", _Integer, nullable=True))
+            # The constraint is validated after the backfill, since validating it
+            # here would scan the table while holding a lock that blocks writes.
+            op.create_foreign_key(
+                "fk_spans_project_rowid_projects",
+                "spans",
+                "projects",
+                ["project_rowid"],
+                ["id"],
+                ondelete="CASCADE",
+                postgresql_not_valid=True,
+            )
+
+    with op.get_context().autocommit_block():
+        # Backfill in bounded batches walking the primary key, each committed on its
+        # own, so that no single statement holds locks on the whole spans table.
+        connection = op.get_bind()
+        max_id = connection.scalar(sa.text("SELECT MAX(id) FROM spans"))
+        if max_id is not None:
+            for lower in range(0, max_id + 1, _BACKFILL_BATCH_SIZE):
+                connection.execute(
+                    sa.text(
+                        """
+                        UPDATE spans
+                        SET project_rowid = (
+                            SELECT traces.project_rowid
+                            FROM traces
+                            WHERE traces.id = spans.trace_rowid
+                        )
+                        WHERE spans.id > :lower AND spans.id <= :upper
+                        AND spans.project_rowid IS NULL
+                        """
+                    ),
+                    {"lower": lower, "upper": lower + _BACKFILL_BATCH_SIZE},
+                )
+        if connection.dialect.name == "postgresql":
+            op.execute("ALTER TABLE spans VALIDATE CONSTRAINT fk_spans_project_rowid_projects")
+        op.create_index(
+            "ix_spans_project_rowid_start_time_id",
+            "spans",
+            ["project_rowid", "start_time", "id"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_spans_project_rowid_start_time_id", table_name="spans", if_exists=True)
+    # Dropped in place rather than through a batch table rebuild, which on
+    # SQLite would discard the expression-based indexes on spans. The foreign
+    # key constraint is dropped along with the column.
+    op.drop_column("spans", "project_rowid")
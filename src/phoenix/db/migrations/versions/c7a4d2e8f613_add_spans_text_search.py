@@ -0,0 +1,142 @@
+"""add full-text search on span input and output values
+
+Revision ID: c7a4d2e8f613
+Revises: b3f1e9c27d05
+Create Date: 2025-10-08 16:27:09.558412
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from phoenix.config import get_env_enable_span_text_search_index
+
+# revision identifiers, used by Alembic.
+revision: str = "c7a4d2e8f613"
+down_revision: Union[str, None] = "b3f1e9c27d05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BACKFILL_BATCH_SIZE = 10_000
+
+_SQLITE_TRIGGERS = (
+    "spans_text_search_insert",
+    "spans_text_search_update",
+    "spans_text_search_delete",
+)
+
+
+def upgrade() -> None:
+    # The index is optional, since keeping it up to date slows down span ingestion.
+    if not get_env_enable_span_text_search_index():
+        return
+    if op.get_bind().dialect.name == "postgresql":
+        # The extension may not be installable by the current role, in which case the
+        # spans are not indexed and substring filters scan them as before.
+        op.execute(
+            """
+            DO $$
+            BEGIN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            EXCEPTION WHEN OTHERS THEN
+                RAISE NOTICE 'pg_trgm is unavailable, span text search will not be indexed';
+            END
+            $$
+            """
+        )
+        if not op.get_bind().scalar(
+            sa.text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        ):
+            return
+        # The indexes are built concurrently, outside of the transaction, so that writes
+        # to the spans table are not blocked while they are built.
+        with op.get_context().autocommit_block():
+            for key in ("input", "output"):
+                op.create_index(
+                    f"ix_spans_{key}_value_trgm",
+                    "spans",
+                    [sa.text(f"(attributes #>> '{{{key},value}}') gin_trgm_ops")],
+                    if_not_exists=True,
+                    postgresql_using="gin",
+                    postgresql_concurrently=True,
+                )
+        return
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS spans_text_search USING fts5(
+            input, output, content='', contentless_delete=1, tokenize='trigram'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS spans_text_search_insert AFTER INSERT ON spans
+        BEGIN
+            INSERT INTO spans_text_search (rowid, input, output)
+            VALUES (
+                new.id,
+                json_extract(new.attributes, '$.input.value'),
+                json_extract(new.attributes, '$.output.value')
+            );
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS spans_text_search_update AFTER UPDATE OF attributes ON spans
+        BEGIN
+            DELETE FROM spans_text_search WHERE rowid = old.id;
+            INSERT INTO spans_text_search (rowid, input, output)
+            VALUES (
+                new.id,
+                json_extract(new.attributes, '$.input.value'),
+                json_extract(new.attributes, '$.output.value')
+            );
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS spans_text_search_delete AFTER DELETE ON spans
+        BEGIN
+            DELETE FROM spans_text_search WHERE rowid = old.id;
+        END
+        """
+    )
+    # Index the existing spans in bounded batches walking the primary key.
+    connection = op.get_bind()
+    max_id = connection.scalar(sa.text("SELECT MAX(id) FROM spans"))
+    if max_id is not None:
+        for lower in range(0, max_id + 1, _BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text(
+                    """
+                    INSERT INTO spans_text_search (rowid, input, output)
+                    SELECT
+                        id,
+                        json_extract(attributes, '$.input.value'),
+                        json_extract(attributes, '$.output.value')
+                    FROM spans
+                    WHERE id > :lower AND id <= :upper
+                    """
+                ),
+                {"lower": lower, "upper": lower + _BACKFILL_BATCH_SIZE},
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for key in ("output", "input"):
+                op.drop_index(
+                    f"ix_spans_{key}_value_trgm",
+                    table_name="spans",
+                    if_exists=True,
+                    postgresql_concurrently=True,
+                )
+        return
+    for trigger in _SQLITE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS spans_text_search")
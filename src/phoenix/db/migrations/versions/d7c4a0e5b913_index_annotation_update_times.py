@@ -0,0 +1,40 @@
+"""index annotation update times
+
+Revision ID: d7c4a0e5b913
+Revises: a5e9d3b7c142
+Create Date: 2025-10-20 09:12:44.318207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7c4a0e5b913"
+down_revision: Union[str, None] = "a5e9d3b7c142"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLE_NAMES = (
+    "trace_annotations",
+    "span_annotations",
+    "document_annotations",
+)
+
+
+def upgrade() -> None:
+    for table_name in _TABLE_NAMES:
+        op.create_index(
+            f"ix_{table_name}_updated_at_id",
+            table_name,
+            ["updated_at", "id"],
+        )
+
+
+def downgrade() -> None:
+    for table_name in _TABLE_NAMES:
+        op.drop_index(
+            f"ix_{table_name}_updated_at_id",
+            table_name=table_name,
+        )
@@ -0,0 +1,177 @@
+"""add dataset_versions_dataset_examples snapshot table
+
+Revision ID: f3a8b2c91d47
+Revises: c7a4d2e8f613
+Create Date: 2025-10-14 10:02:41.318264
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+_Integer = sa.Integer().with_variant(
+    sa.BigInteger(),
+    "postgresql",
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a8b2c91d47"
+down_revision: Union[str, None] = "c7a4d2e8f613"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL = """\
+INSERT INTO dataset_versions_dataset_examples (
+    dataset_version_id,
+    dataset_example_id,
+    dataset_example_revision_id
+)
+SELECT
+    ranked.dataset_version_id,
+    ranked.dataset_example_id,
+    ranked.dataset_example_revision_id
+FROM (
+    SELECT
+        dv.id as dataset_version_id,
+        der.dataset_example_id,
+        der.id as dataset_example_revision_id,
+        der.revision_kind,
+        ROW_NUMBER() OVER (
+            PARTITION BY dv.id, der.dataset_example_id
+            ORDER BY der.dataset_version_id DESC
+        ) as rn
+    FROM dataset_versions dv
+        JOIN dataset_examples de ON de.dataset_id = dv.dataset_id
+        JOIN dataset_example_revisions der ON der.dataset_example_id = de.id
+    WHERE der.dataset_version_id <= dv.id
+) ranked
+WHERE ranked.rn = 1
+    AND ranked.revision_kind != 'DELETE'
+"""
+
+_COPY = """
+    INSERT INTO dataset_versions_dataset_examples (
+        dataset_version_id, dataset_example_id, dataset_example_revision_id
+    )
+    SELECT new.id, dataset_example_id, dataset_example_revision_id
+    FROM dataset_versions_dataset_examples
+    WHERE dataset_version_id = (
+        SELECT MAX(id) FROM dataset_versions WHERE dataset_id = new.dataset_id AND id < new.id
+    );
+"""
+
+_NEXT_REVISED_VERSION = """
+    COALESCE(
+        (
+            SELECT MIN(dataset_version_id) FROM dataset_example_revisions
+            WHERE dataset_example_id = new.dataset_example_id
+            AND dataset_version_id > new.dataset_version_id
+        ),
+        9223372036854775807
+    )
+"""
+
+_UPDATE = f"""
+    DELETE FROM dataset_versions_dataset_examples
+    WHERE dataset_example_id = new.dataset_example_id
+    AND dataset_version_id >= new.dataset_version_id
+    AND dataset_version_id < {_NEXT_REVISED_VERSION};
+    INSERT INTO dataset_versions_dataset_examples (
+        dataset_version_id, dataset_example_id, dataset_example_revision_id
+    )
+    SELECT dataset_versions.id, new.dataset_example_id, new.id
+    FROM dataset_versions
+    WHERE new.revision_kind != 'DELETE'
+    AND dataset_versions.dataset_id = (
+        SELECT dataset_id FROM dataset_versions WHERE id = new.dataset_version_id
+    )
+    AND dataset_versions.id >= new.dataset_version_id
+    AND dataset_versions.id < {_NEXT_REVISED_VERSION};
+"""
+
+_TRIGGERS = {
+    "dataset_versions_dataset_examples_copy": ("dataset_versions", _COPY),
+    "dataset_versions_dataset_examples_update": ("dataset_example_revisions", _UPDATE),
+}
+
+# Serializes appends to the same dataset on PostgreSQL, so that a new version never copies a
+# snapshot that is missing the revisions of a concurrent, not yet committed, append.
+_LOCK_POSTGRESQL = """
+    PERFORM pg_advisory_xact_lock(new.dataset_id);
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dataset_versions_dataset_examples",
+        sa.Column(
+            "dataset_version_id",
+            _Integer,
+            sa.ForeignKey("dataset_versions.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "dataset_example_id",
+            _Integer,
+            sa.ForeignKey("dataset_examples.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        ),
+        sa.Column(
+            "dataset_example_revision_id",
+            _Integer,
+            sa.ForeignKey("dataset_example_revisions.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        ),
+        sa.PrimaryKeyConstraint(
+            "dataset_version_id",
+            "dataset_example_id",
+        ),
+    )
+    op.execute(BACKFILL)
+    if op.get_bind().dialect.name == "postgresql":
+        for trigger, (table, body) in _TRIGGERS.items():
+            lock = _LOCK_POSTGRESQL if table == "dataset_versions" else ""
+            op.execute(
+                f"""
+                CREATE OR REPLACE FUNCTION {trigger}() RETURNS trigger AS $$
+                BEGIN
+                    {lock}
+                    {body}
+                    RETURN NULL;
+                END
+                $$ LANGUAGE plpgsql
+                """
+            )
+            op.execute(
+                f"""
+                CREATE TRIGGER {trigger}
+                AFTER INSERT ON {table}
+                FOR EACH ROW EXECUTE FUNCTION {trigger}()
+                """
+            )
+        return
+    for trigger, (table, body) in _TRIGGERS.items():
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {trigger}
+            AFTER INSERT ON {table}
+            BEGIN
+                {body}
+            END
+            """
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for trigger, (table, _) in _TRIGGERS.items():
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+            op.execute(f"DROP FUNCTION IF EXISTS {trigger}()")
+    else:
+        for trigger in _TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.drop_table("dataset_versions_dataset_examples")
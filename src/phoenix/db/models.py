@@ -7,6 +7,7 @@ import sqlalchemy as sa
 import sqlalchemy.sql as sql
 from openinference.semconv.trace import RerankerAttributes, SpanAttributes
 from sqlalchemy import (
+    DDL,
     JSON,
     NUMERIC,
     TIMESTAMP,
@@ -21,10 +22,12 @@ from sqlalchemy import (
     MetaData,
     Null,
     PrimaryKeyConstraint,
+    Select,
     String,
     TypeDecorator,
     UniqueConstraint,
     case,
+    event,
     func,
     insert,
     select,
@@ -47,7 +50,7 @@ from sqlalchemy.sql.compiler import SQLCompiler
 from sqlalchemy.sql.functions import coalesce
 from typing_extensions import TypeAlias
 
-from phoenix.config import get_env_database_schema
+from phoenix.config import get_env_database_schema, get_env_enable_span_text_search_index
 from phoenix.datetime_utils import normalize_datetime
 from phoenix.db.types.annotation_configs import (
     AnnotationConfig as AnnotationConfigModel,
@@ -500,6 +503,9 @@ class ProjectTraceRetentionPolicy(HasId):
         _TraceRetentionCronExpression, nullable=False
     )
     rule: Mapped[TraceRetentionRule] = mapped_column(_TraceRetentionRule, nullable=False)
+    # Set while the policy is being applied, so that a sweep interrupted by a restart can be
+    # resumed without waiting for the next scheduled run.
+    sweep_started_at: Mapped[Optional[datetime]] = mapped_column(UtcTimeStamp, nullable=True)
     projects: Mapped[list["Project"]] = relationship(
         "Project", back_populates="trace_retention_policy", uselist=True
     )
@@ -617,12 +623,33 @@ class Trace(HasId):
     )
 
 
+def _project_rowid_of_trace(context: Any) -> Optional[int]:
+    """
+    Falls back to the project of the parent trace when a span is inserted
+    without an explicit `project_rowid`.
+    """
+    trace_rowid = context.get_current_parameters()["trace_rowid"]
+    return cast(
+        Optional[int],
+        context.connection.scalar(select(Trace.project_rowid).where(Trace.id == trace_rowid)),
+    )
+
+
 class Span(HasId):
     __tablename__ = "spans"
     trace_rowid: Mapped[int] = mapped_column(
         ForeignKey("traces.id", ondelete="CASCADE"),
         index=True,
     )
+    # Denormalized from `traces.project_rowid` so that project-scoped span
+    # queries can be served by an index without joining the traces table.
+    # Nullable only so that the column can be added to existing databases
+    # without rewriting the table; the insertion path always populates it.
+    project_rowid: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=True,
+        default=_project_rowid_of_trace,
+    )
     span_id: Mapped[str]
     parent_id: Mapped[Optional[str]] = mapped_column(index=True)
     name: Mapped[str]
@@ -779,6 +806,7 @@ class Span(HasId):
             "ix_cumulative_llm_token_count_total",
             text("(cumulative_llm_token_count_prompt + cumulative_llm_token_count_completion)"),
         ),
+        Index("ix_spans_project_rowid_start_time_id", "project_rowid", "start_time", "id"),
     )
 
 
@@ -909,6 +937,160 @@ def _(element: Any, compiler: Any, **kw: Any) -> Any:
     return result
 
 
+SPANS_TEXT_SEARCH = "spans_text_search"
+"""
+Optional full-text index over the input and output values of spans, which is only created
+when PHOENIX_ENABLE_SPAN_TEXT_SEARCH_INDEX is set. On SQLite it is an FTS5 table with a
+trigram tokenizer that is kept in sync with the spans table by triggers. On PostgreSQL it
+is a pair of trigram GIN indexes on the spans table itself, which are only created when the
+`pg_trgm` extension is available.
+"""
+
+_SPANS_TEXT_SEARCH_DDL_SQLITE = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SPANS_TEXT_SEARCH} USING fts5(
+        input, output, content='', contentless_delete=1, tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SPANS_TEXT_SEARCH}_insert AFTER INSERT ON spans
+    BEGIN
+        INSERT INTO {SPANS_TEXT_SEARCH} (rowid, input, output)
+        VALUES (
+            new.id,
+            json_extract(new.attributes, '$.input.value'),
+            json_extract(new.attributes, '$.output.value')
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SPANS_TEXT_SEARCH}_update AFTER UPDATE OF attributes ON spans
+    BEGIN
+        DELETE FROM {SPANS_TEXT_SEARCH} WHERE rowid = old.id;
+        INSERT INTO {SPANS_TEXT_SEARCH} (rowid, input, output)
+        VALUES (
+            new.id,
+            json_extract(new.attributes, '$.input.value'),
+            json_extract(new.attributes, '$.output.value')
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SPANS_TEXT_SEARCH}_delete AFTER DELETE ON spans
+    BEGIN
+        DELETE FROM {SPANS_TEXT_SEARCH} WHERE rowid = old.id;
+    END
+    """,
+)
+
+_SPANS_TEXT_SEARCH_DDL_POSTGRESQL = (
+    """
+    DO $$
+    BEGIN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    EXCEPTION WHEN OTHERS THEN
+        RAISE NOTICE 'pg_trgm is unavailable, span text search will not be indexed';
+    END
+    $$
+    """,
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+            CREATE INDEX IF NOT EXISTS ix_spans_input_value_trgm
+            ON spans USING gin ((attributes #>> '{input,value}') gin_trgm_ops);
+            CREATE INDEX IF NOT EXISTS ix_spans_output_value_trgm
+            ON spans USING gin ((attributes #>> '{output,value}') gin_trgm_ops);
+        END IF;
+    EXCEPTION WHEN OTHERS THEN
+        RAISE NOTICE 'span text search indexes could not be created';
+    END
+    $$
+    """,
+)
+
+
+def _span_text_search_is_enabled(*_: Any, **__: Any) -> bool:
+    return get_env_enable_span_text_search_index()
+
+
+for _ddl in _SPANS_TEXT_SEARCH_DDL_SQLITE:
+    event.listen(
+        Span.__table__,
+        "after_create",
+        DDL(_ddl).execute_if(  # type: ignore[no-untyped-call]
+            dialect="sqlite",
+            callable_=_span_text_search_is_enabled,
+        ),
+    )
+for _ddl in _SPANS_TEXT_SEARCH_DDL_POSTGRESQL:
+    event.listen(
+        Span.__table__,
+        "after_create",
+        DDL(_ddl).execute_if(  # type: ignore[no-untyped-call]
+            dialect="postgresql",
+            callable_=_span_text_search_is_enabled,
+        ),
+    )
+
+
+class SpanTextSearch(expression.FunctionElement[bool]):
+    """
+    Coarse match of a substring against the input and/or output values of spans, served by
+    the full-text index. The match is case-insensitive and may include spans that do not
+    contain the substring, so it is only useful as a prefilter in conjunction with an exact
+    predicate such as `TextContains` or `CaseInsensitiveContains`. The substring must be at
+    least three characters long, since shorter ones have no trigrams to look up.
+
+    Arguments are the span rowid column, the span attributes column, the substring, and one
+    `literal_column` per key, i.e. "input" or "output".
+    """
+
+    # See https://docs.sqlalchemy.org/en/20/core/compiler.html
+    inherit_cache = True
+    type = Boolean()
+    name = "span_text_search"
+    # Keeps SQLite from rendering `... IN (...) = 1`, which can't be served by the rowid.
+    _is_implicitly_boolean = True
+
+
+@compiles(SpanTextSearch)
+def _(element: Any, compiler: Any, **kw: Any) -> Any:
+    return compiler.process(sql.true(), **kw)
+
+
+@compiles(SpanTextSearch, "postgresql")
+def _(element: Any, compiler: Any, **kw: Any) -> Any:
+    _, attributes, substring, *keys = list(element.clauses)
+    escaped = func.replace(
+        func.replace(func.replace(substring, "\\", "\\\\"), "%", "\\%"), "_", "\\_"
+    )
+    pattern = func.concat("%", escaped, "%")
+    # The JSON path is rendered inline so that the expression matches that of the index.
+    values = (
+        attributes.op("#>>", return_type=String)(sql.literal_column(f"'{{{key.name},value}}'"))
+        for key in keys
+    )
+    return compiler.process(sql.or_(*(value.ilike(pattern) for value in values)), **kw)
+
+
+@compiles(SpanTextSearch, "sqlite")
+def _(element: Any, compiler: Any, **kw: Any) -> Any:
+    span_rowid, _, substring, *keys = list(element.clauses)
+    # e.g. `{input output} : "some ""quoted"" text"`
+    query = (
+        literal("{" + " ".join(key.name for key in keys) + '} : "')
+        .concat(func.replace(substring, '"', '""'))
+        .concat('"')
+    )
+    rowids: Select[Any] = (
+        select(sql.literal_column("rowid"))
+        .select_from(sql.table(SPANS_TEXT_SEARCH))
+        .where(sql.literal_column(SPANS_TEXT_SEARCH).op("MATCH")(query))
+    )
+    return compiler.process(span_rowid.in_(rowids), **kw)
+
+
 async def init_models(engine: AsyncEngine) -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -957,6 +1139,7 @@ class SpanAnnotation(HasId):
             "span_rowid",
             "identifier",
         ),
+        Index("ix_span_annotations_updated_at_id", "updated_at", "id"),
     )
 
 
@@ -994,6 +1177,7 @@ class TraceAnnotation(HasId):
             "trace_rowid",
             "identifier",
         ),
+        Index("ix_trace_annotations_updated_at_id", "updated_at", "id"),
     )
 
 
@@ -1035,6 +1219,7 @@ class DocumentAnnotation(HasId):
             "document_position",
             "identifier",
         ),
+        Index("ix_document_annotations_updated_at_id", "updated_at", "id"),
     )
 
 
@@ -1249,6 +1434,152 @@ class DatasetExampleRevision(HasId):
     )
 
 
+class DatasetVersionDatasetExample(Base):
+    """
+    Snapshot of the examples in each dataset version, mapping every example that is present
+    in the version to its effective revision, i.e. the latest revision at or before the version,
+    unless that revision is a DELETE. It is maintained by triggers on the dataset versions and
+    dataset example revisions tables: a new version starts as a copy of the previous version of
+    its dataset, and a new revision replaces the example's entry in its own version as well as in
+    any later versions that do not revise the same example.
+
+    The table holds one row per example per version, so it grows as examples times versions.
+    That is the price of reading a version with a primary-key lookup instead of ranking the
+    whole revision history of its dataset, which is what every example listing, experiment and
+    export would otherwise do on each request.
+    """
+
+    __tablename__ = "dataset_versions_dataset_examples"
+    dataset_version_id: Mapped[int] = mapped_column(
+        ForeignKey("dataset_versions.id", ondelete="CASCADE"),
+    )
+    dataset_example_id: Mapped[int] = mapped_column(
+        ForeignKey("dataset_examples.id", ondelete="CASCADE"),
+        index=True,
+    )
+    dataset_example_revision_id: Mapped[int] = mapped_column(
+        ForeignKey("dataset_example_revisions.id", ondelete="CASCADE"),
+        index=True,
+    )
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "dataset_version_id",
+            "dataset_example_id",
+        ),
+    )
+
+
+_DATASET_VERSION_SNAPSHOT_COPY = """
+    INSERT INTO dataset_versions_dataset_examples (
+        dataset_version_id, dataset_example_id, dataset_example_revision_id
+    )
+    SELECT new.id, dataset_example_id, dataset_example_revision_id
+    FROM dataset_versions_dataset_examples
+    WHERE dataset_version_id = (
+        SELECT MAX(id) FROM dataset_versions WHERE dataset_id = new.dataset_id AND id < new.id
+    );
+"""
+
+# The versions affected by a new revision run from its own version up to, but excluding, the
+# next version that revises the same example.
+_DATASET_VERSION_SNAPSHOT_NEXT_REVISED_VERSION = """
+    COALESCE(
+        (
+            SELECT MIN(dataset_version_id) FROM dataset_example_revisions
+            WHERE dataset_example_id = new.dataset_example_id
+            AND dataset_version_id > new.dataset_version_id
+        ),
+        9223372036854775807
+    )
+"""
+
+_DATASET_VERSION_SNAPSHOT_UPDATE = f"""
+    DELETE FROM dataset_versions_dataset_examples
+    WHERE dataset_example_id = new.dataset_example_id
+    AND dataset_version_id >= new.dataset_version_id
+    AND dataset_version_id < {_DATASET_VERSION_SNAPSHOT_NEXT_REVISED_VERSION};
+    INSERT INTO dataset_versions_dataset_examples (
+        dataset_version_id, dataset_example_id, dataset_example_revision_id
+    )
+    SELECT dataset_versions.id, new.dataset_example_id, new.id
+    FROM dataset_versions
+    WHERE new.revision_kind != 'DELETE'
+    AND dataset_versions.dataset_id = (
+        SELECT dataset_id FROM dataset_versions WHERE id = new.dataset_version_id
+    )
+    AND dataset_versions.id >= new.dataset_version_id
+    AND dataset_versions.id < {_DATASET_VERSION_SNAPSHOT_NEXT_REVISED_VERSION};
+"""
+
+_DATASET_VERSION_SNAPSHOT_DDL_SQLITE = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS dataset_versions_dataset_examples_copy
+    AFTER INSERT ON dataset_versions
+    BEGIN
+        {_DATASET_VERSION_SNAPSHOT_COPY}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS dataset_versions_dataset_examples_update
+    AFTER INSERT ON dataset_example_revisions
+    BEGIN
+        {_DATASET_VERSION_SNAPSHOT_UPDATE}
+    END
+    """,
+)
+
+# Under READ COMMITTED, a version could otherwise copy a snapshot that is missing the revisions
+# of a concurrent append to the same dataset, while that append's update trigger cannot see the
+# new version either. The lock is held until commit, and revisions are always inserted in the
+# same transaction as their version, so appends to a dataset are serialized.
+_DATASET_VERSION_SNAPSHOT_LOCK_POSTGRESQL = """
+    PERFORM pg_advisory_xact_lock(new.dataset_id);
+"""
+
+_DATASET_VERSION_SNAPSHOT_DDL_POSTGRESQL = (
+    f"""
+    CREATE OR REPLACE FUNCTION dataset_versions_dataset_examples_copy() RETURNS trigger AS $$
+    BEGIN
+        {_DATASET_VERSION_SNAPSHOT_LOCK_POSTGRESQL}
+        {_DATASET_VERSION_SNAPSHOT_COPY}
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER dataset_versions_dataset_examples_copy
+    AFTER INSERT ON dataset_versions
+    FOR EACH ROW EXECUTE FUNCTION dataset_versions_dataset_examples_copy()
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION dataset_versions_dataset_examples_update() RETURNS trigger AS $$
+    BEGIN
+        {_DATASET_VERSION_SNAPSHOT_UPDATE}
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER dataset_versions_dataset_examples_update
+    AFTER INSERT ON dataset_example_revisions
+    FOR EACH ROW EXECUTE FUNCTION dataset_versions_dataset_examples_update()
+    """,
+)
+
+for _ddl in _DATASET_VERSION_SNAPSHOT_DDL_SQLITE:
+    event.listen(
+        DatasetVersionDatasetExample.__table__,
+        "after_create",
+        DDL(_ddl).execute_if(dialect="sqlite"),  # type: ignore[no-untyped-call]
+    )
+for _ddl in _DATASET_VERSION_SNAPSHOT_DDL_POSTGRESQL:
+    event.listen(
+        DatasetVersionDatasetExample.__table__,
+        "after_create",
+        DDL(_ddl).execute_if(dialect="postgresql"),  # type: ignore[no-untyped-call]
+    )
+
+
 class DatasetSplit(HasId):
     __tablename__ = "dataset_splits"
 
@@ -1385,6 +1716,33 @@ class ExperimentDatasetExample(Base):
     )
 
 
+class ExperimentJob(HasId):
+    """
+    Background job that runs a playground prompt over the examples of an experiment. Its
+    progress is the set of experiment runs already recorded, so an interrupted job is resumed
+    by running only the missing (example, repetition) pairs.
+    """
+
+    __tablename__ = "experiment_jobs"
+    experiment_id: Mapped[int] = mapped_column(
+        ForeignKey("experiments.id", ondelete="CASCADE"),
+        unique=True,
+    )
+    status: Mapped[str] = mapped_column(
+        CheckConstraint(
+            "status IN ('RUNNING', 'COMPLETED', 'FAILED', 'INTERRUPTED')",
+            name="valid_status",
+        ),
+    )
+    total_count: Mapped[int]
+    completed_count: Mapped[int]
+    error: Mapped[Optional[str]]
+    created_at: Mapped[datetime] = mapped_column(UtcTimeStamp, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        UtcTimeStamp, server_default=func.now(), onupdate=func.now()
+    )
+
+
 class ExperimentRun(HasId):
     __tablename__ = "experiment_runs"
     experiment_id: Mapped[int] = mapped_column(
@@ -2036,3 +2394,47 @@ class SpanCostDetail(HasId):
             "is_prompt",
         ),
     )
+
+
+class ProjectTimeSeriesRollup(HasId):
+    """
+    Span, trace and cost totals of a project in a minute, hour or day bucket, from which the
+    time series of project dashboards are computed without scanning the raw data. Spans are
+    bucketed by their own start times, whereas traces and their costs are bucketed by the
+    start times of the traces.
+    """
+
+    __tablename__ = "project_time_series_rollups"
+    project_rowid: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    granularity: Mapped[str] = mapped_column(
+        String,
+        CheckConstraint(
+            "granularity IN ('minute', 'hour', 'day')",
+            name="valid_granularity",
+        ),
+        nullable=False,
+    )
+    bucket_start: Mapped[datetime] = mapped_column(UtcTimeStamp, nullable=False)
+    span_count: Mapped[int] = mapped_column(nullable=False)
+    span_ok_count: Mapped[int] = mapped_column(nullable=False)
+    span_error_count: Mapped[int] = mapped_column(nullable=False)
+    span_unset_count: Mapped[int] = mapped_column(nullable=False)
+    trace_count: Mapped[int] = mapped_column(nullable=False)
+    span_cost_count: Mapped[int] = mapped_column(nullable=False)
+    prompt_tokens: Mapped[Optional[float]]
+    completion_tokens: Mapped[Optional[float]]
+    total_tokens: Mapped[Optional[float]]
+    prompt_cost: Mapped[Optional[float]]
+    completion_cost: Mapped[Optional[float]]
+    total_cost: Mapped[Optional[float]]
+
+    __table_args__ = (
+        UniqueConstraint(
+            "project_rowid",
+            "granularity",
+            "bucket_start",
+        ),
+    )
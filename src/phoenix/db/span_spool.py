@@ -0,0 +1,271 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from collections.abc import Iterable
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from typing_extensions import TypeAlias
+
+from phoenix.trace.schemas import Span
+from phoenix.trace.span_json_decoder import json_to_span
+from phoenix.trace.span_json_encoder import SpanJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+ProjectName: TypeAlias = str
+SegmentId: TypeAlias = int
+Position: TypeAlias = tuple[SegmentId, int]
+
+DEFAULT_MAX_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# Each record is prefixed by the length and the CRC32 checksum of its payload, so that
+# a record torn by a crash in the middle of a write is detected and skipped on replay.
+_HEADER = struct.Struct("<II")
+_SEGMENT_SUFFIX = ".segment"
+_CURSOR_FILE_NAME = "cursor.json"
+
+
+class SpanSpool:
+    """
+    An append-only spool of spans on disk, for spans that have been accepted by the
+    server but not yet inserted into the database.
+
+    Spans are appended to segment files in the spool directory, and are read back
+    in batches by memory-mapping the segments. A batch that has been read is either
+    committed, once its spans are in the database, or rewound, so that it is read
+    again. The position of the last commit is persisted in a cursor file, and fully
+    committed segments are deleted, so that the spans that remain are replayed when
+    the spool is reopened, e.g. after a restart or a crash. Replayed spans that did
+    make it into the database before the crash are skipped by the span insertion.
+
+    Records are written with unbuffered writes, so they survive the process being
+    killed as soon as `append` returns. `sync` flushes them to the storage device,
+    which is only needed to survive a crash of the host.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_segment_size: int = DEFAULT_MAX_SEGMENT_SIZE,
+    ) -> None:
+        self._directory = directory
+        self._max_segment_size = max_segment_size
+        self._lock = Lock()
+        self._segments: list[SegmentId] = []
+        self._sizes: dict[SegmentId, int] = {}
+        self._fd: Optional[int] = None
+        self._unsynced_fds: list[int] = []
+        self._committed: Position = (0, 0)
+        self._read_position: Position = (0, 0)
+        self._num_uncommitted = 0
+        self._num_read = 0
+
+    def __len__(self) -> int:
+        """
+        The number of spans in the spool that have not been committed yet.
+        """
+        return self._num_uncommitted
+
+    def open(self) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        segments = sorted(
+            int(path.stem)
+            for path in self._directory.glob(f"*{_SEGMENT_SUFFIX}")
+            if path.stem.isdigit()
+        )
+        committed = self._load_cursor()
+        for segment in segments:
+            if segment < committed[0]:
+                self._path(segment).unlink()
+                continue
+            offset = committed[1] if segment == committed[0] else 0
+            size, num_spans = self._scan(segment, offset)
+            self._segments.append(segment)
+            self._sizes[segment] = size
+            self._num_uncommitted += num_spans
+        if not self._segments or self._segments[0] != committed[0]:
+            committed = (self._segments[0] if self._segments else committed[0], 0)
+        self._committed = self._read_position = committed
+        # New spans always go to a new segment, so that a record torn by a crash is
+        # never followed by valid records within the same segment.
+        self._open_segment(max(self._segments[-1] + 1 if self._segments else 0, committed[0]))
+        if self._num_uncommitted:
+            logger.info(f"Replaying {self._num_uncommitted} spans from spool at {self._directory}")
+
+    def close(self) -> None:
+        self.sync()
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def append(self, items: Iterable[tuple[Span, ProjectName]]) -> None:
+        records = [_encode(span, project_name) for span, project_name in items]
+        if not records:
+            return
+        data = b"".join(records)
+        with self._lock:
+            segment = self._segments[-1]
+            if self._sizes[segment] and self._max_segment_size < self._sizes[segment] + len(data):
+                self._rotate()
+                segment = self._segments[-1]
+            assert self._fd is not None
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view) :]
+            self._sizes[segment] += len(data)
+            self._num_uncommitted += len(records)
+
+    def sync(self) -> None:
+        with self._lock:
+            fds, self._unsynced_fds = self._unsynced_fds, []
+            if self._fd is not None:
+                fds.append(os.dup(self._fd))
+        for fd in fds:
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def read(self, max_num_spans: int) -> list[tuple[Span, ProjectName]]:
+        """
+        Reads up to `max_num_spans` spans following the last read, which must then be
+        either committed or rewound.
+        """
+        spans: list[tuple[Span, ProjectName]] = []
+        num_records = 0
+        segment, offset = self._read_position
+        while num_records < max_num_spans:
+            with self._lock:
+                size = self._sizes[segment]
+                i = bisect_right(self._segments, segment)
+                next_segment = self._segments[i] if i < len(self._segments) else None
+            if size <= offset:
+                if next_segment is None:
+                    break
+                segment, offset = next_segment, 0
+                continue
+            with (
+                open(self._path(segment), "rb") as f,
+                mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as buffer,
+            ):
+                while offset < size and num_records < max_num_spans:
+                    payload = _payload(buffer, offset, size)
+                    if payload is None:
+                        logger.error(f"Skipping corrupted spool segment {self._path(segment)}")
+                        offset = size
+                        break
+                    offset += _HEADER.size + len(payload)
+                    num_records += 1
+                    try:
+                        spans.append(_decode(payload))
+                    except Exception:
+                        logger.exception("Failed to decode span from spool")
+        with self._lock:
+            self._read_position = (segment, offset)
+            self._num_read += num_records
+        return spans
+
+    def commit(self) -> int:
+        """
+        Marks the spans read so far as done, so that they are not replayed, and returns
+        their number.
+        """
+        with self._lock:
+            self._committed = self._read_position
+            num_committed, self._num_read = self._num_read, 0
+            self._num_uncommitted -= num_committed
+            done = [segment for segment in self._segments if segment < self._committed[0]]
+            self._segments = self._segments[len(done) :]
+            for segment in done:
+                del self._sizes[segment]
+        self._save_cursor(self._committed)
+        for segment in done:
+            self._path(segment).unlink(missing_ok=True)
+        return num_committed
+
+    def rewind(self) -> None:
+        """
+        Moves back to the last commit, so that the spans read since then are read again.
+        """
+        with self._lock:
+            self._read_position = self._committed
+            self._num_read = 0
+
+    def _path(self, segment: SegmentId) -> Path:
+        return self._directory / f"{segment:016d}{_SEGMENT_SUFFIX}"
+
+    def _open_segment(self, segment: SegmentId) -> None:
+        self._fd = os.open(
+            self._path(segment),
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND,
+            0o600,
+        )
+        self._segments.append(segment)
+        self._sizes[segment] = 0
+
+    def _rotate(self) -> None:
+        assert self._fd is not None
+        # The fsync of the full segment is left to the next `sync`.
+        self._unsynced_fds.append(self._fd)
+        self._open_segment(self._segments[-1] + 1)
+
+    def _scan(self, segment: SegmentId, offset: int) -> tuple[int, int]:
+        """
+        Returns the size of the valid part of the segment and the number of spans in
+        it after `offset`.
+        """
+        with open(self._path(segment), "rb") as f:
+            if (size := os.fstat(f.fileno()).st_size) <= offset:
+                return offset, 0
+            num_spans = 0
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as buffer:
+                while offset < size and (payload := _payload(buffer, offset, size)) is not None:
+                    offset += _HEADER.size + len(payload)
+                    num_spans += 1
+        if offset < size:
+            logger.warning(
+                f"Ignoring {size - offset} bytes at the end of spool segment {self._path(segment)}"
+            )
+        return offset, num_spans
+
+    def _load_cursor(self) -> Position:
+        try:
+            cursor = json.loads((self._directory / _CURSOR_FILE_NAME).read_text())
+            return int(cursor["segment"]), int(cursor["offset"])
+        except FileNotFoundError:
+            return 0, 0
+
+    def _save_cursor(self, position: Position) -> None:
+        path = self._directory / _CURSOR_FILE_NAME
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"segment": position[0], "offset": position[1]}))
+        os.replace(tmp, path)
+
+
+def _encode(span: Span, project_name: ProjectName) -> bytes:
+    payload = json.dumps([project_name, span], cls=SpanJSONEncoder).encode()
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _decode(payload: bytes) -> tuple[Span, ProjectName]:
+    project_name, span = json.loads(payload)
+    return json_to_span(span), project_name
+
+
+def _payload(buffer: mmap.mmap, offset: int, size: int) -> Optional[bytes]:
+    if size < offset + _HEADER.size:
+        return None
+    length, checksum = _HEADER.unpack_from(buffer, offset)
+    start = offset + _HEADER.size
+    if size < start + length:
+        return None
+    payload = buffer[start : start + length]
+    return payload if zlib.crc32(payload) == checksum else None
@@ -0,0 +1,356 @@
+"""
+Pre-aggregated time series of the spans, traces and costs of each project, kept in minute,
+hour and day buckets, so that project dashboards do not need to scan the raw data.
+
+Whenever spans, traces or costs are inserted or deleted, the buckets covering the affected
+time ranges are recomputed from the raw data by `refresh_time_series_rollups`. Minute
+buckets are recomputed from the raw data, hour buckets from minute buckets and day buckets
+from hour buckets, so each refresh only touches a handful of rows per bucket. Recomputing
+rather than adjusting the totals keeps them exact when a trace moves to an earlier bucket
+because one of its earlier spans arrived late, or when traces are deleted.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any, Literal, Optional, cast
+
+from sqlalchemy import ColumnElement, and_, case, delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+from typing_extensions import TypeAlias
+
+from phoenix.datetime_utils import normalize_datetime
+from phoenix.db import models
+from phoenix.db.helpers import SupportedSQLDialect, date_trunc
+from phoenix.db.insertion.helpers import chunked
+
+ProjectRowId: TypeAlias = int
+Granularity: TypeAlias = Literal["minute", "hour", "day"]
+TimeBinField: TypeAlias = Literal["minute", "hour", "day", "week", "month", "year"]
+
+AffectedTimeRange: TypeAlias = tuple[ProjectRowId, datetime, datetime]
+"""
+A project and the earliest and latest times, both inclusive, at which its data changed.
+"""
+
+GRANULARITIES: tuple[Granularity, ...] = ("minute", "hour", "day")
+
+_DURATIONS: dict[Granularity, timedelta] = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+_FINEST_GRANULARITY_OF_FIELD: dict[TimeBinField, Granularity] = {
+    "minute": "minute",
+    "hour": "hour",
+    "day": "day",
+    "week": "day",
+    "month": "day",
+    "year": "day",
+}
+
+_METRICS = (
+    "span_count",
+    "span_ok_count",
+    "span_error_count",
+    "span_unset_count",
+    "trace_count",
+    "span_cost_count",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "prompt_cost",
+    "completion_cost",
+    "total_cost",
+)
+
+_MAX_RANGES_PER_STATEMENT = 100
+"""
+Keeps the disjunction of time ranges in each statement well below the expression depth
+limit of SQLite (1000).
+"""
+
+_ADVISORY_LOCK_KEY = 0x7068_5F72_6F6C_6C75  # "ph_rollu"
+"""
+Serializes refreshes across replicas sharing a PostgreSQL database, so that a refresh
+reading the raw data before another replica commits cannot overwrite a newer refresh.
+"""
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def get_time_series_rollup_granularity(
+    field: TimeBinField,
+    utc_offset_minutes: int,
+    start: datetime,
+    end: Optional[datetime] = None,
+) -> Optional[Granularity]:
+    """
+    Returns the coarsest granularity of rollups from which time bins of the given field and
+    UTC offset can be computed exactly over the given time range, or None if the raw data
+    must be scanned instead.
+
+    Rollups are bucketed in UTC, so hour buckets only line up with local time bins when the
+    UTC offset is a whole number of hours, and day buckets only when there is no offset.
+    The bounds of the time range must also fall on bucket boundaries, because partial
+    buckets cannot be split.
+    """
+    finest = GRANULARITIES.index(_FINEST_GRANULARITY_OF_FIELD[field])
+    for granularity in reversed(GRANULARITIES[: finest + 1]):
+        if granularity == "hour" and utc_offset_minutes % 60:
+            continue
+        if granularity == "day" and utc_offset_minutes:
+            continue
+        if _floor(start, granularity) != _utc(start):
+            continue
+        if end is not None and _floor(end, granularity) != _utc(end):
+            continue
+        return granularity
+    return None
+
+
+async def refresh_time_series_rollups(
+    session: AsyncSession,
+    time_ranges: Iterable[AffectedTimeRange],
+) -> None:
+    """
+    Recomputes the rollups of every bucket overlapping the given time ranges. It must be
+    called after the raw data within those ranges has changed, either in the same
+    transaction or after that transaction has committed.
+    """
+    minute_ranges = _align(
+        ((p, start, _floor(end, "minute") + _DURATIONS["minute"]) for p, start, end in time_ranges),
+        "minute",
+    )
+    if not minute_ranges:
+        return
+    dialect = SupportedSQLDialect(session.bind.dialect.name)
+    if dialect is SupportedSQLDialect.POSTGRESQL:
+        await session.execute(select(func.pg_advisory_xact_lock(_ADVISORY_LOCK_KEY)))
+    hour_ranges = _align(minute_ranges, "hour")
+    day_ranges = _align(hour_ranges, "day")
+    for granularity, ranges in (
+        ("minute", minute_ranges),
+        ("hour", hour_ranges),
+        ("day", day_ranges),
+    ):
+        for chunk in chunked(ranges, _MAX_RANGES_PER_STATEMENT):
+            await _refresh(session, dialect, cast(Granularity, granularity), chunk)
+
+
+async def _refresh(
+    session: AsyncSession,
+    dialect: SupportedSQLDialect,
+    granularity: Granularity,
+    ranges: Sequence[AffectedTimeRange],
+) -> None:
+    rollup = models.ProjectTimeSeriesRollup
+    # The existing buckets are deleted before the new totals are computed, so that on
+    # SQLite the write lock is acquired before the raw data is read.
+    await session.execute(
+        delete(rollup).where(
+            rollup.granularity == granularity,
+            _in_ranges(rollup.project_rowid, rollup.bucket_start, ranges),
+        )
+    )
+    if granularity == "minute":
+        records = await _aggregate_raw_data(session, dialect, ranges)
+    else:
+        finer = GRANULARITIES[GRANULARITIES.index(granularity) - 1]
+        records = await _aggregate_rollups(session, dialect, granularity, finer, ranges)
+    if records:
+        await session.execute(
+            insert(rollup),
+            [
+                {
+                    "project_rowid": project_rowid,
+                    "granularity": granularity,
+                    "bucket_start": bucket_start,
+                    **metrics,
+                }
+                for (project_rowid, bucket_start), metrics in records.items()
+            ],
+        )
+
+
+async def _aggregate_raw_data(
+    session: AsyncSession,
+    dialect: SupportedSQLDialect,
+    ranges: Sequence[AffectedTimeRange],
+) -> dict[tuple[ProjectRowId, datetime], dict[str, Any]]:
+    records: dict[tuple[ProjectRowId, datetime], dict[str, Any]] = {}
+
+    def record(project_rowid: ProjectRowId, bucket_start: Any) -> dict[str, Any]:
+        key = (project_rowid, _as_datetime(bucket_start))
+        if key not in records:
+            records[key] = {name: (0 if name.endswith("_count") else None) for name in _METRICS}
+        return records[key]
+
+    span_bucket = date_trunc(dialect, "minute", models.Span.start_time)
+    spans = (
+        select(
+            models.Span.project_rowid,
+            span_bucket,
+            func.count(models.Span.id),
+            func.sum(case((models.Span.status_code == "OK", 1), else_=0)),
+            func.sum(case((models.Span.status_code == "ERROR", 1), else_=0)),
+            func.sum(case((models.Span.status_code == "UNSET", 1), else_=0)),
+        )
+        .where(_in_ranges(models.Span.project_rowid, models.Span.start_time, ranges))
+        .group_by(models.Span.project_rowid, span_bucket)
+    )
+    for (
+        project_rowid,
+        bucket_start,
+        count,
+        ok_count,
+        error_count,
+        unset_count,
+    ) in await session.execute(spans):
+        record(project_rowid, bucket_start).update(
+            span_count=count,
+            span_ok_count=ok_count,
+            span_error_count=error_count,
+            span_unset_count=unset_count,
+        )
+    trace_bucket = date_trunc(dialect, "minute", models.Trace.start_time)
+    traces = (
+        select(
+            models.Trace.project_rowid,
+            trace_bucket,
+            func.count(models.Trace.id),
+        )
+        .where(_in_ranges(models.Trace.project_rowid, models.Trace.start_time, ranges))
+        .group_by(models.Trace.project_rowid, trace_bucket)
+    )
+    for project_rowid, bucket_start, count in await session.execute(traces):
+        record(project_rowid, bucket_start)["trace_count"] = count
+    costs = (
+        select(
+            models.Trace.project_rowid,
+            trace_bucket,
+            func.count(models.SpanCost.id),
+            func.sum(models.SpanCost.prompt_tokens),
+            func.sum(models.SpanCost.completion_tokens),
+            func.sum(models.SpanCost.total_tokens),
+            func.sum(models.SpanCost.prompt_cost),
+            func.sum(models.SpanCost.completion_cost),
+            func.sum(models.SpanCost.total_cost),
+        )
+        .join_from(
+            models.Trace,
+            models.SpanCost,
+            onclause=models.SpanCost.trace_rowid == models.Trace.id,
+        )
+        .where(_in_ranges(models.Trace.project_rowid, models.Trace.start_time, ranges))
+        .group_by(models.Trace.project_rowid, trace_bucket)
+    )
+    for (
+        project_rowid,
+        bucket_start,
+        count,
+        prompt_tokens,
+        completion_tokens,
+        total_tokens,
+        prompt_cost,
+        completion_cost,
+        total_cost,
+    ) in await session.execute(costs):
+        record(project_rowid, bucket_start).update(
+            span_cost_count=count,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=total_tokens,
+            prompt_cost=prompt_cost,
+            completion_cost=completion_cost,
+            total_cost=total_cost,
+        )
+    return records
+
+
+async def _aggregate_rollups(
+    session: AsyncSession,
+    dialect: SupportedSQLDialect,
+    granularity: Granularity,
+    finer: Granularity,
+    ranges: Sequence[AffectedTimeRange],
+) -> dict[tuple[ProjectRowId, datetime], dict[str, Any]]:
+    rollup = models.ProjectTimeSeriesRollup
+    bucket = date_trunc(dialect, granularity, rollup.bucket_start)
+    stmt = (
+        select(
+            rollup.project_rowid,
+            bucket,
+            *(func.sum(getattr(rollup, name)) for name in _METRICS),
+        )
+        .where(
+            rollup.granularity == finer,
+            _in_ranges(rollup.project_rowid, rollup.bucket_start, ranges),
+        )
+        .group_by(rollup.project_rowid, bucket)
+    )
+    return {
+        (project_rowid, _as_datetime(bucket_start)): dict(zip(_METRICS, metrics))
+        for project_rowid, bucket_start, *metrics in await session.execute(stmt)
+    }
+
+
+def _in_ranges(
+    project_rowid: QueryableAttribute[int],
+    time: QueryableAttribute[datetime],
+    ranges: Iterable[AffectedTimeRange],
+) -> ColumnElement[bool]:
+    return or_(*(and_(project_rowid == p, start <= time, time < end) for p, start, end in ranges))
+
+
+def _align(
+    time_ranges: Iterable[AffectedTimeRange], granularity: Granularity
+) -> list[AffectedTimeRange]:
+    """
+    Widens half-open time ranges to bucket boundaries and merges the ranges that overlap
+    or touch within each project.
+    """
+    ranges_by_project: defaultdict[ProjectRowId, list[tuple[datetime, datetime]]] = defaultdict(
+        list
+    )
+    for project_rowid, start, end in time_ranges:
+        ranges_by_project[project_rowid].append(
+            (_floor(start, granularity), _ceil(end, granularity))
+        )
+    aligned: list[AffectedTimeRange] = []
+    for project_rowid, ranges in ranges_by_project.items():
+        ranges.sort()
+        start, end = ranges[0]
+        for next_start, next_end in ranges[1:]:
+            if next_start <= end:
+                end = max(end, next_end)
+                continue
+            aligned.append((project_rowid, start, end))
+            start, end = next_start, next_end
+        aligned.append((project_rowid, start, end))
+    return aligned
+
+
+def _floor(t: datetime, granularity: Granularity) -> datetime:
+    t = _utc(t)
+    return t - (t - _EPOCH) % _DURATIONS[granularity]
+
+
+def _ceil(t: datetime, granularity: Granularity) -> datetime:
+    floor = _floor(t, granularity)
+    return floor if floor == _utc(t) else floor + _DURATIONS[granularity]
+
+
+def _utc(t: datetime) -> datetime:
+    return cast(datetime, normalize_datetime(t, timezone.utc))
+
+
+def _as_datetime(value: Any) -> datetime:
+    # SQLite returns truncated timestamps as strings.
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return _utc(value)
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Iterable, Literal, Optional, Union
+from typing import Annotated, Iterable, Literal, Mapping, Optional, Union
 
 import sqlalchemy as sa
 from pydantic import AfterValidator, BaseModel, Field, RootModel
 from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.roles import InElementRole
+from typing_extensions import TypeAlias
 
 from phoenix.utilities import hour_of_week
 
+MaxCountCutoffs: TypeAlias = Mapping[int, tuple[datetime, int]]
+"""
+The start time and rowid of the oldest trace to keep in each project that has more traces
+than a max count rule allows. The traces before it, in order of start time and rowid, are
+the ones to delete.
+"""
+
 
 class _MaxDays(BaseModel):
     max_days: Annotated[float, Field(ge=0)]
@@ -30,11 +38,32 @@ class _MaxCount(BaseModel):
     def max_count_filter(
         self,
         project_rowids: Union[Iterable[int], InElementRole],
+        cutoffs: Optional[MaxCountCutoffs] = None,
     ) -> sa.ColumnElement[bool]:
+        """
+        Matches the traces beyond the max count of their project. If cutoffs are given,
+        e.g. when a project is swept in batches, they are compared against instead of
+        ranking all the traces of the projects again.
+        """
         if self.max_count <= 0:
             return sa.literal(False)
         from phoenix.db.models import Trace
 
+        if cutoffs is not None:
+            if not cutoffs:
+                return sa.literal(False)
+            return sa.or_(
+                *(
+                    sa.and_(
+                        Trace.project_rowid == project_rowid,
+                        sa.or_(
+                            Trace.start_time < start_time,
+                            sa.and_(Trace.start_time == start_time, Trace.id < rowid),
+                        ),
+                    )
+                    for project_rowid, (start_time, rowid) in cutoffs.items()
+                )
+            )
         ranked = (
             sa.select(
                 Trace.id,
@@ -47,6 +76,46 @@ class _MaxCount(BaseModel):
         )
         return Trace.id.in_(sa.select(ranked.c.id).where(ranked.c.rn > self.max_count))
 
+    async def get_max_count_cutoffs(
+        self,
+        session: AsyncSession,
+        project_rowids: Union[Iterable[int], InElementRole],
+    ) -> MaxCountCutoffs:
+        """
+        Ranks the traces of the projects once and returns the cutoffs of the projects that
+        have more traces than the max count.
+        """
+        if self.max_count <= 0:
+            return {}
+        from phoenix.db.models import Trace
+
+        ranked = (
+            sa.select(
+                Trace.project_rowid,
+                Trace.start_time,
+                Trace.id,
+                func.row_number()
+                .over(
+                    partition_by=Trace.project_rowid,
+                    order_by=(Trace.start_time.desc(), Trace.id.desc()),
+                )
+                .label("rn"),
+            )
+            .where(Trace.project_rowid.in_(project_rowids))
+            .subquery()
+        )
+        stmt = sa.select(
+            ranked.c.project_rowid, ranked.c.start_time, ranked.c.id, ranked.c.rn
+        ).where(ranked.c.rn.in_((self.max_count, self.max_count + 1)))
+        kept: dict[int, tuple[datetime, int]] = {}
+        exceeded: set[int] = set()
+        for project_rowid, start_time, rowid, rn in await session.execute(stmt):
+            if rn == self.max_count:
+                kept[project_rowid] = (start_time, rowid)
+            else:
+                exceeded.add(project_rowid)
+        return {project_rowid: kept[project_rowid] for project_rowid in exceeded}
+
 
 class MaxDaysRule(_MaxDays, BaseModel):
     type: Literal["max_days"] = "max_days"
@@ -58,18 +127,18 @@ class MaxDaysRule(_MaxDays, BaseModel):
         self,
         session: AsyncSession,
         project_rowids: Union[Iterable[int], InElementRole],
-    ) -> set[int]:
+        limit: Optional[int] = None,
+        max_count_cutoffs: Optional[MaxCountCutoffs] = None,
+    ) -> dict[int, int]:
         if self.max_days <= 0:
-            return set()
+            return {}
         from phoenix.db.models import Trace
 
-        stmt = (
-            sa.delete(Trace)
-            .where(Trace.project_rowid.in_(project_rowids))
-            .where(self.max_days_filter)
-            .returning(Trace.project_rowid)
+        whereclause = sa.and_(
+            Trace.project_rowid.in_(project_rowids),
+            self.max_days_filter,
         )
-        return set(await session.scalars(stmt))
+        return await _delete_traces(session, whereclause, limit)
 
 
 class MaxCountRule(_MaxCount, BaseModel):
@@ -82,18 +151,18 @@ class MaxCountRule(_MaxCount, BaseModel):
         self,
         session: AsyncSession,
         project_rowids: Union[Iterable[int], InElementRole],
-    ) -> set[int]:
+        limit: Optional[int] = None,
+        max_count_cutoffs: Optional[MaxCountCutoffs] = None,
+    ) -> dict[int, int]:
         if self.max_count <= 0:
-            return set()
+            return {}
         from phoenix.db.models import Trace
 
-        stmt = (
-            sa.delete(Trace)
-            .where(Trace.project_rowid.in_(project_rowids))
-            .where(self.max_count_filter(project_rowids))
-            .returning(Trace.project_rowid)
+        whereclause = sa.and_(
+            Trace.project_rowid.in_(project_rowids),
+            self.max_count_filter(project_rowids, max_count_cutoffs),
         )
-        return set(await session.scalars(stmt))
+        return await _delete_traces(session, whereclause, limit)
 
 
 class MaxDaysOrCountRule(_MaxDays, _MaxCount, BaseModel):
@@ -106,18 +175,59 @@ class MaxDaysOrCountRule(_MaxDays, _MaxCount, BaseModel):
         self,
         session: AsyncSession,
         project_rowids: Union[Iterable[int], InElementRole],
-    ) -> set[int]:
+        limit: Optional[int] = None,
+        max_count_cutoffs: Optional[MaxCountCutoffs] = None,
+    ) -> dict[int, int]:
         if self.max_days <= 0 and self.max_count <= 0:
-            return set()
+            return {}
         from phoenix.db.models import Trace
 
-        stmt = (
-            sa.delete(Trace)
-            .where(Trace.project_rowid.in_(project_rowids))
-            .where(sa.or_(self.max_days_filter, self.max_count_filter(project_rowids)))
-            .returning(Trace.project_rowid)
+        whereclause = sa.and_(
+            Trace.project_rowid.in_(project_rowids),
+            sa.or_(
+                self.max_days_filter,
+                self.max_count_filter(project_rowids, max_count_cutoffs),
+            ),
         )
-        return set(await session.scalars(stmt))
+        return await _delete_traces(session, whereclause, limit)
+
+
+async def _delete_traces(
+    session: AsyncSession,
+    whereclause: sa.ColumnElement[bool],
+    limit: Optional[int],
+) -> dict[int, int]:
+    """
+    Deletes the traces matching the clause, up to the limit if one is given, refreshes the
+    time series rollups over the time spanned by the deleted traces, and returns the number
+    of traces deleted from each affected project.
+    """
+    from phoenix.db.models import Trace
+    from phoenix.db.time_series_rollups import refresh_time_series_rollups
+
+    if limit is not None:
+        whereclause = Trace.id.in_(
+            sa.select(Trace.id).where(whereclause).order_by(Trace.start_time).limit(limit)
+        )
+    stmt = (
+        sa.delete(Trace)
+        .where(whereclause)
+        .returning(Trace.project_rowid, Trace.start_time, Trace.end_time)
+    )
+    counts: dict[int, int] = {}
+    time_ranges: dict[int, tuple[datetime, datetime]] = {}
+    for project_rowid, start_time, end_time in await session.execute(stmt):
+        counts[project_rowid] = counts.get(project_rowid, 0) + 1
+        if project_rowid in time_ranges:
+            min_start_time, max_end_time = time_ranges[project_rowid]
+            start_time = min(start_time, min_start_time)
+            end_time = max(end_time, max_end_time)
+        time_ranges[project_rowid] = (start_time, end_time)
+    await refresh_time_series_rollups(
+        session,
+        ((project_rowid, start, end) for project_rowid, (start, end) in time_ranges.items()),
+    )
+    return counts
 
 
 class TraceRetentionRule(RootModel[Union[MaxDaysRule, MaxCountRule, MaxDaysOrCountRule]]):
@@ -132,8 +242,30 @@ class TraceRetentionRule(RootModel[Union[MaxDaysRule, MaxCountRule, MaxDaysOrCou
         self,
         session: AsyncSession,
         project_rowids: Union[Iterable[int], InElementRole],
-    ) -> set[int]:
-        return await self.root.delete_traces(session, project_rowids)
+        limit: Optional[int] = None,
+        max_count_cutoffs: Optional[MaxCountCutoffs] = None,
+    ) -> dict[int, int]:
+        """
+        Deletes the traces that violate the rule and returns the number of traces deleted
+        from each affected project. If a limit is given, only that many of the oldest such
+        traces are deleted, so that large deletions can be split across transactions. The
+        batches of such a deletion should share the cutoffs from `get_max_count_cutoffs`,
+        so that the traces of the projects are not ranked again for every batch.
+        """
+        return await self.root.delete_traces(session, project_rowids, limit, max_count_cutoffs)
+
+    async def get_max_count_cutoffs(
+        self,
+        session: AsyncSession,
+        project_rowids: Union[Iterable[int], InElementRole],
+    ) -> Optional[MaxCountCutoffs]:
+        """
+        Returns the cutoffs of the projects that exceed the max count of the rule, or None
+        if the rule has no max count.
+        """
+        if isinstance(self.root, _MaxCount):
+            return await self.root.get_max_count_cutoffs(session, project_rowids)
+        return None
 
 
 def _time_of_next_run(
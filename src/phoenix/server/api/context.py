@@ -2,11 +2,13 @@ from asyncio import get_running_loop
 from dataclasses import dataclass
 from functools import cached_property, partial
 from pathlib import Path
-from typing import Any, Optional, cast
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Optional, TypeVar, cast, overload
 
 from starlette.datastructures import Secret
 from starlette.requests import Request as StarletteRequest
 from starlette.responses import Response as StarletteResponse
+from strawberry.dataloader import DataLoader
 from strawberry.fastapi import BaseContext
 
 from phoenix.auth import (
@@ -93,110 +95,498 @@ from phoenix.server.types import (
     UserId,
 )
 
+if TYPE_CHECKING:
+    from phoenix.server.daemons.playground_job_runner import PlaygroundJobRunner
+
 
 @dataclass
+class DataLoaderStats:
+    """
+    How a data loader was used during a request.
+    """
+
+    num_batches: int = 0
+    num_keys: int = 0
+    max_batch_size: int = 0
+    load_time: float = 0
+    """Seconds spent in the load function, i.e. mostly waiting on the database."""
+
+    def record(self, batch_size: int, load_time: float) -> None:
+        self.num_batches += 1
+        self.num_keys += batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.load_time += load_time
+
+
+_DataLoaderT = TypeVar("_DataLoaderT", bound=DataLoader[Any, Any])
+
+
+class _lazy_loader(cached_property[_DataLoaderT]):
+    """
+    Creates the data loader on first access and instruments its load function.
+    """
+
+    @overload
+    def __get__(
+        self, instance: None, owner: Optional[type[Any]] = None
+    ) -> "_lazy_loader[_DataLoaderT]": ...
+    @overload
+    def __get__(self, instance: object, owner: Optional[type[Any]] = None) -> _DataLoaderT: ...
+    def __get__(self, instance: Any, owner: Optional[type[Any]] = None) -> Any:
+        loader = super().__get__(instance, owner)
+        if isinstance(instance, DataLoaders):
+            assert self.attrname is not None
+            instance._instrument(self.attrname, loader)
+        return loader
+
+
 class DataLoaders:
-    annotation_configs_by_project: AnnotationConfigsByProjectDataLoader
-    annotation_summaries: AnnotationSummaryDataLoader
-    average_experiment_repeated_run_group_latency: (
-        AverageExperimentRepeatedRunGroupLatencyDataLoader
-    )
-    average_experiment_run_latency: AverageExperimentRunLatencyDataLoader
-    dataset_example_fields: TableFieldsDataLoader
-    dataset_example_revisions: DatasetExampleRevisionsDataLoader
-    dataset_example_spans: DatasetExampleSpansDataLoader
-    dataset_labels: DatasetLabelsDataLoader
-    dataset_label_fields: TableFieldsDataLoader
-    dataset_dataset_splits: DatasetDatasetSplitsDataLoader
-    dataset_examples_and_versions_by_experiment_run: (
-        DatasetExamplesAndVersionsByExperimentRunDataLoader
-    )
-    dataset_example_splits: DatasetExampleSplitsDataLoader
-    dataset_fields: TableFieldsDataLoader
-    dataset_split_fields: TableFieldsDataLoader
-    dataset_version_fields: TableFieldsDataLoader
-    document_annotation_fields: TableFieldsDataLoader
-    document_evaluation_summaries: DocumentEvaluationSummaryDataLoader
-    document_evaluations: DocumentEvaluationsDataLoader
-    document_retrieval_metrics: DocumentRetrievalMetricsDataLoader
-    experiment_annotation_summaries: ExperimentAnnotationSummaryDataLoader
-    experiment_dataset_splits: ExperimentDatasetSplitsDataLoader
-    experiment_error_rates: ExperimentErrorRatesDataLoader
-    experiment_fields: TableFieldsDataLoader
-    experiment_repeated_run_group_annotation_summaries: (
-        ExperimentRepeatedRunGroupAnnotationSummariesDataLoader
-    )
-    experiment_repeated_run_groups: ExperimentRepeatedRunGroupsDataLoader
-    experiment_run_annotation_fields: TableFieldsDataLoader
-    experiment_run_annotations: ExperimentRunAnnotations
-    experiment_run_counts: ExperimentRunCountsDataLoader
-    experiment_run_fields: TableFieldsDataLoader
-    experiment_runs_by_experiment_and_example: ExperimentRunsByExperimentAndExampleDataLoader
-    experiment_sequence_number: ExperimentSequenceNumberDataLoader
-    generative_model_fields: TableFieldsDataLoader
-    last_used_times_by_generative_model_id: LastUsedTimesByGenerativeModelIdDataLoader
-    latency_ms_quantile: LatencyMsQuantileDataLoader
-    min_start_or_max_end_times: MinStartOrMaxEndTimeDataLoader
-    num_child_spans: NumChildSpansDataLoader
-    num_spans_per_trace: NumSpansPerTraceDataLoader
-    project_by_name: ProjectByNameDataLoader
-    project_fields: TableFieldsDataLoader
-    project_trace_retention_policy_fields: TableFieldsDataLoader
-    projects_by_trace_retention_policy_id: ProjectIdsByTraceRetentionPolicyIdDataLoader
-    prompt_fields: TableFieldsDataLoader
-    prompt_label_fields: TableFieldsDataLoader
-    prompt_version_sequence_number: PromptVersionSequenceNumberDataLoader
-    prompt_version_tag_fields: TableFieldsDataLoader
-    project_session_annotation_fields: TableFieldsDataLoader
-    project_session_fields: TableFieldsDataLoader
-    record_counts: RecordCountDataLoader
-    session_annotations_by_session: SessionAnnotationsBySessionDataLoader
-    session_first_inputs: SessionIODataLoader
-    session_last_outputs: SessionIODataLoader
-    session_num_traces: SessionNumTracesDataLoader
-    session_num_traces_with_error: SessionNumTracesWithErrorDataLoader
-    session_token_usages: SessionTokenUsagesDataLoader
-    session_trace_latency_ms_quantile: SessionTraceLatencyMsQuantileDataLoader
-    span_annotation_fields: TableFieldsDataLoader
-    span_annotations: SpanAnnotationsDataLoader
-    span_by_id: SpanByIdDataLoader
-    span_cost_by_span: SpanCostBySpanDataLoader
-    span_cost_detail_fields: TableFieldsDataLoader
-    span_cost_detail_summary_entries_by_generative_model: (
-        SpanCostDetailSummaryEntriesByGenerativeModelDataLoader
-    )
-    span_cost_detail_summary_entries_by_project_session: (
-        SpanCostDetailSummaryEntriesByProjectSessionDataLoader
-    )
-    span_cost_detail_summary_entries_by_span: SpanCostDetailSummaryEntriesBySpanDataLoader
-    span_cost_detail_summary_entries_by_trace: SpanCostDetailSummaryEntriesByTraceDataLoader
-    span_cost_details_by_span_cost: SpanCostDetailsBySpanCostDataLoader
-    span_cost_fields: TableFieldsDataLoader
-    span_cost_summary_by_experiment: SpanCostSummaryByExperimentDataLoader
-    span_cost_summary_by_experiment_repeated_run_group: (
-        SpanCostSummaryByExperimentRepeatedRunGroupDataLoader
-    )
-    span_cost_summary_by_experiment_run: SpanCostSummaryByExperimentRunDataLoader
-    span_cost_summary_by_generative_model: SpanCostSummaryByGenerativeModelDataLoader
-    span_cost_summary_by_project: SpanCostSummaryByProjectDataLoader
-    span_cost_summary_by_project_session: SpanCostSummaryByProjectSessionDataLoader
-    span_cost_summary_by_trace: SpanCostSummaryByTraceDataLoader
-    span_dataset_examples: SpanDatasetExamplesDataLoader
-    span_descendants: SpanDescendantsDataLoader
-    span_fields: TableFieldsDataLoader
-    span_projects: SpanProjectsDataLoader
-    token_counts: TokenCountDataLoader
-    token_prices_by_model: TokenPricesByModelDataLoader
-    trace_annotation_fields: TableFieldsDataLoader
-    trace_annotations_by_trace: TraceAnnotationsByTraceDataLoader
-    trace_by_trace_ids: TraceByTraceIdsDataLoader
-    trace_fields: TableFieldsDataLoader
-    trace_retention_policy_id_by_project_id: TraceRetentionPolicyIdByProjectIdDataLoader
-    trace_root_spans: TraceRootSpansDataLoader
-    user_roles: UserRolesDataLoader
-    user_api_key_fields: TableFieldsDataLoader
-    user_fields: TableFieldsDataLoader
-    users: UsersDataLoader
+    """
+    The data loaders of a request. A data loader is only created when a resolver first
+    accesses it, because most requests need just a few of them. The usage of each loader is
+    recorded in `stats`.
+    """
+
+    def __init__(
+        self,
+        db: DbSessionFactory,
+        cache_for_dataloaders: Optional[CacheForDataLoaders] = None,
+    ) -> None:
+        self._db = db
+        self._cache_for_dataloaders = cache_for_dataloaders
+        self.stats: dict[str, DataLoaderStats] = {}
+
+    def _instrument(self, name: str, loader: DataLoader[Any, Any]) -> None:
+        stats = self.stats[name] = DataLoaderStats()
+        load_fn = loader.load_fn
+
+        async def instrumented_load_fn(keys: list[Any]) -> Any:
+            start_time = perf_counter()
+            try:
+                return await load_fn(keys)
+            finally:
+                stats.record(len(keys), perf_counter() - start_time)
+
+        loader.load_fn = instrumented_load_fn
+
+    @_lazy_loader
+    def annotation_configs_by_project(self) -> AnnotationConfigsByProjectDataLoader:
+        return AnnotationConfigsByProjectDataLoader(self._db)
+
+    @_lazy_loader
+    def annotation_summaries(self) -> AnnotationSummaryDataLoader:
+        return AnnotationSummaryDataLoader(
+            self._db,
+            cache_map=(
+                self._cache_for_dataloaders.annotation_summary
+                if self._cache_for_dataloaders
+                else None
+            ),
+        )
+
+    @_lazy_loader
+    def average_experiment_repeated_run_group_latency(
+        self,
+    ) -> AverageExperimentRepeatedRunGroupLatencyDataLoader:
+        return AverageExperimentRepeatedRunGroupLatencyDataLoader(self._db)
+
+    @_lazy_loader
+    def average_experiment_run_latency(self) -> AverageExperimentRunLatencyDataLoader:
+        return AverageExperimentRunLatencyDataLoader(self._db)
+
+    @_lazy_loader
+    def dataset_example_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.DatasetExample)
+
+    @_lazy_loader
+    def dataset_example_revisions(self) -> DatasetExampleRevisionsDataLoader:
+        return DatasetExampleRevisionsDataLoader(self._db)
+
+    @_lazy_loader
+    def dataset_example_spans(self) -> DatasetExampleSpansDataLoader:
+        return DatasetExampleSpansDataLoader(self._db)
+
+    @_lazy_loader
+    def dataset_labels(self) -> DatasetLabelsDataLoader:
+        return DatasetLabelsDataLoader(self._db)
+
+    @_lazy_loader
+    def dataset_label_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.DatasetLabel)
+
+    @_lazy_loader
+    def dataset_dataset_splits(self) -> DatasetDatasetSplitsDataLoader:
+        return DatasetDatasetSplitsDataLoader(self._db)
+
+    @_lazy_loader
+    def dataset_examples_and_versions_by_experiment_run(
+        self,
+    ) -> DatasetExamplesAndVersionsByExperimentRunDataLoader:
+        return DatasetExamplesAndVersionsByExperimentRunDataLoader(self._db)
+
+    @_lazy_loader
+    def dataset_example_splits(self) -> DatasetExampleSplitsDataLoader:
+        return DatasetExampleSplitsDataLoader(self._db)
+
+    @_lazy_loader
+    def dataset_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.Dataset)
+
+    @_lazy_loader
+    def dataset_split_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.DatasetSplit)
+
+    @_lazy_loader
+    def dataset_version_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.DatasetVersion)
+
+    @_lazy_loader
+    def document_annotation_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.DocumentAnnotation)
+
+    @_lazy_loader
+    def document_evaluation_summaries(self) -> DocumentEvaluationSummaryDataLoader:
+        return DocumentEvaluationSummaryDataLoader(
+            self._db,
+            cache_map=(
+                self._cache_for_dataloaders.document_evaluation_summary
+                if self._cache_for_dataloaders
+                else None
+            ),
+        )
+
+    @_lazy_loader
+    def document_evaluations(self) -> DocumentEvaluationsDataLoader:
+        return DocumentEvaluationsDataLoader(self._db)
+
+    @_lazy_loader
+    def document_retrieval_metrics(self) -> DocumentRetrievalMetricsDataLoader:
+        return DocumentRetrievalMetricsDataLoader(self._db)
+
+    @_lazy_loader
+    def experiment_annotation_summaries(self) -> ExperimentAnnotationSummaryDataLoader:
+        return ExperimentAnnotationSummaryDataLoader(self._db)
+
+    @_lazy_loader
+    def experiment_dataset_splits(self) -> ExperimentDatasetSplitsDataLoader:
+        return ExperimentDatasetSplitsDataLoader(self._db)
+
+    @_lazy_loader
+    def experiment_error_rates(self) -> ExperimentErrorRatesDataLoader:
+        return ExperimentErrorRatesDataLoader(self._db)
+
+    @_lazy_loader
+    def experiment_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.Experiment)
+
+    @_lazy_loader
+    def experiment_repeated_run_group_annotation_summaries(
+        self,
+    ) -> ExperimentRepeatedRunGroupAnnotationSummariesDataLoader:
+        return ExperimentRepeatedRunGroupAnnotationSummariesDataLoader(self._db)
+
+    @_lazy_loader
+    def experiment_repeated_run_groups(self) -> ExperimentRepeatedRunGroupsDataLoader:
+        return ExperimentRepeatedRunGroupsDataLoader(self._db)
+
+    @_lazy_loader
+    def experiment_run_annotation_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.ExperimentRunAnnotation)
+
+    @_lazy_loader
+    def experiment_run_annotations(self) -> ExperimentRunAnnotations:
+        return ExperimentRunAnnotations(self._db)
+
+    @_lazy_loader
+    def experiment_run_counts(self) -> ExperimentRunCountsDataLoader:
+        return ExperimentRunCountsDataLoader(self._db)
+
+    @_lazy_loader
+    def experiment_run_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.ExperimentRun)
+
+    @_lazy_loader
+    def experiment_runs_by_experiment_and_example(
+        self,
+    ) -> ExperimentRunsByExperimentAndExampleDataLoader:
+        return ExperimentRunsByExperimentAndExampleDataLoader(self._db)
+
+    @_lazy_loader
+    def experiment_sequence_number(self) -> ExperimentSequenceNumberDataLoader:
+        return ExperimentSequenceNumberDataLoader(self._db)
+
+    @_lazy_loader
+    def generative_model_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.GenerativeModel)
+
+    @_lazy_loader
+    def last_used_times_by_generative_model_id(self) -> LastUsedTimesByGenerativeModelIdDataLoader:
+        return LastUsedTimesByGenerativeModelIdDataLoader(self._db)
+
+    @_lazy_loader
+    def latency_ms_quantile(self) -> LatencyMsQuantileDataLoader:
+        return LatencyMsQuantileDataLoader(
+            self._db,
+            cache_map=(
+                self._cache_for_dataloaders.latency_ms_quantile
+                if self._cache_for_dataloaders
+                else None
+            ),
+        )
+
+    @_lazy_loader
+    def min_start_or_max_end_times(self) -> MinStartOrMaxEndTimeDataLoader:
+        return MinStartOrMaxEndTimeDataLoader(
+            self._db,
+            cache_map=(
+                self._cache_for_dataloaders.min_start_or_max_end_time
+                if self._cache_for_dataloaders
+                else None
+            ),
+        )
+
+    @_lazy_loader
+    def num_child_spans(self) -> NumChildSpansDataLoader:
+        return NumChildSpansDataLoader(self._db)
+
+    @_lazy_loader
+    def num_spans_per_trace(self) -> NumSpansPerTraceDataLoader:
+        return NumSpansPerTraceDataLoader(self._db)
+
+    @_lazy_loader
+    def project_by_name(self) -> ProjectByNameDataLoader:
+        return ProjectByNameDataLoader(self._db)
+
+    @_lazy_loader
+    def project_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.Project)
+
+    @_lazy_loader
+    def project_trace_retention_policy_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.ProjectTraceRetentionPolicy)
+
+    @_lazy_loader
+    def projects_by_trace_retention_policy_id(self) -> ProjectIdsByTraceRetentionPolicyIdDataLoader:
+        return ProjectIdsByTraceRetentionPolicyIdDataLoader(self._db)
+
+    @_lazy_loader
+    def prompt_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.Prompt)
+
+    @_lazy_loader
+    def prompt_label_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.PromptLabel)
+
+    @_lazy_loader
+    def prompt_version_sequence_number(self) -> PromptVersionSequenceNumberDataLoader:
+        return PromptVersionSequenceNumberDataLoader(self._db)
+
+    @_lazy_loader
+    def prompt_version_tag_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.PromptVersionTag)
+
+    @_lazy_loader
+    def project_session_annotation_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.ProjectSessionAnnotation)
+
+    @_lazy_loader
+    def project_session_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.ProjectSession)
+
+    @_lazy_loader
+    def record_counts(self) -> RecordCountDataLoader:
+        return RecordCountDataLoader(
+            self._db,
+            cache_map=self._cache_for_dataloaders.record_count
+            if self._cache_for_dataloaders
+            else None,
+        )
+
+    @_lazy_loader
+    def session_annotations_by_session(self) -> SessionAnnotationsBySessionDataLoader:
+        return SessionAnnotationsBySessionDataLoader(self._db)
+
+    @_lazy_loader
+    def session_first_inputs(self) -> SessionIODataLoader:
+        return SessionIODataLoader(self._db, "first_input")
+
+    @_lazy_loader
+    def session_last_outputs(self) -> SessionIODataLoader:
+        return SessionIODataLoader(self._db, "last_output")
+
+    @_lazy_loader
+    def session_num_traces(self) -> SessionNumTracesDataLoader:
+        return SessionNumTracesDataLoader(self._db)
+
+    @_lazy_loader
+    def session_num_traces_with_error(self) -> SessionNumTracesWithErrorDataLoader:
+        return SessionNumTracesWithErrorDataLoader(self._db)
+
+    @_lazy_loader
+    def session_token_usages(self) -> SessionTokenUsagesDataLoader:
+        return SessionTokenUsagesDataLoader(self._db)
+
+    @_lazy_loader
+    def session_trace_latency_ms_quantile(self) -> SessionTraceLatencyMsQuantileDataLoader:
+        return SessionTraceLatencyMsQuantileDataLoader(self._db)
+
+    @_lazy_loader
+    def span_annotation_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.SpanAnnotation)
+
+    @_lazy_loader
+    def span_annotations(self) -> SpanAnnotationsDataLoader:
+        return SpanAnnotationsDataLoader(self._db)
+
+    @_lazy_loader
+    def span_by_id(self) -> SpanByIdDataLoader:
+        return SpanByIdDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_by_span(self) -> SpanCostBySpanDataLoader:
+        return SpanCostBySpanDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_detail_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.SpanCostDetail)
+
+    @_lazy_loader
+    def span_cost_detail_summary_entries_by_generative_model(
+        self,
+    ) -> SpanCostDetailSummaryEntriesByGenerativeModelDataLoader:
+        return SpanCostDetailSummaryEntriesByGenerativeModelDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_detail_summary_entries_by_project_session(
+        self,
+    ) -> SpanCostDetailSummaryEntriesByProjectSessionDataLoader:
+        return SpanCostDetailSummaryEntriesByProjectSessionDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_detail_summary_entries_by_span(
+        self,
+    ) -> SpanCostDetailSummaryEntriesBySpanDataLoader:
+        return SpanCostDetailSummaryEntriesBySpanDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_detail_summary_entries_by_trace(
+        self,
+    ) -> SpanCostDetailSummaryEntriesByTraceDataLoader:
+        return SpanCostDetailSummaryEntriesByTraceDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_details_by_span_cost(self) -> SpanCostDetailsBySpanCostDataLoader:
+        return SpanCostDetailsBySpanCostDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.SpanCost)
+
+    @_lazy_loader
+    def span_cost_summary_by_experiment(self) -> SpanCostSummaryByExperimentDataLoader:
+        return SpanCostSummaryByExperimentDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_summary_by_experiment_repeated_run_group(
+        self,
+    ) -> SpanCostSummaryByExperimentRepeatedRunGroupDataLoader:
+        return SpanCostSummaryByExperimentRepeatedRunGroupDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_summary_by_experiment_run(self) -> SpanCostSummaryByExperimentRunDataLoader:
+        return SpanCostSummaryByExperimentRunDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_summary_by_generative_model(self) -> SpanCostSummaryByGenerativeModelDataLoader:
+        return SpanCostSummaryByGenerativeModelDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_summary_by_project(self) -> SpanCostSummaryByProjectDataLoader:
+        return SpanCostSummaryByProjectDataLoader(
+            self._db,
+            cache_map=self._cache_for_dataloaders.token_cost
+            if self._cache_for_dataloaders
+            else None,
+        )
+
+    @_lazy_loader
+    def span_cost_summary_by_project_session(self) -> SpanCostSummaryByProjectSessionDataLoader:
+        return SpanCostSummaryByProjectSessionDataLoader(self._db)
+
+    @_lazy_loader
+    def span_cost_summary_by_trace(self) -> SpanCostSummaryByTraceDataLoader:
+        return SpanCostSummaryByTraceDataLoader(self._db)
+
+    @_lazy_loader
+    def span_dataset_examples(self) -> SpanDatasetExamplesDataLoader:
+        return SpanDatasetExamplesDataLoader(self._db)
+
+    @_lazy_loader
+    def span_descendants(self) -> SpanDescendantsDataLoader:
+        return SpanDescendantsDataLoader(self._db)
+
+    @_lazy_loader
+    def span_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.Span)
+
+    @_lazy_loader
+    def span_projects(self) -> SpanProjectsDataLoader:
+        return SpanProjectsDataLoader(self._db)
+
+    @_lazy_loader
+    def token_counts(self) -> TokenCountDataLoader:
+        return TokenCountDataLoader(
+            self._db,
+            cache_map=self._cache_for_dataloaders.token_count
+            if self._cache_for_dataloaders
+            else None,
+        )
+
+    @_lazy_loader
+    def token_prices_by_model(self) -> TokenPricesByModelDataLoader:
+        return TokenPricesByModelDataLoader(self._db)
+
+    @_lazy_loader
+    def trace_annotation_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.TraceAnnotation)
+
+    @_lazy_loader
+    def trace_annotations_by_trace(self) -> TraceAnnotationsByTraceDataLoader:
+        return TraceAnnotationsByTraceDataLoader(self._db)
+
+    @_lazy_loader
+    def trace_by_trace_ids(self) -> TraceByTraceIdsDataLoader:
+        return TraceByTraceIdsDataLoader(self._db)
+
+    @_lazy_loader
+    def trace_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.Trace)
+
+    @_lazy_loader
+    def trace_retention_policy_id_by_project_id(
+        self,
+    ) -> TraceRetentionPolicyIdByProjectIdDataLoader:
+        return TraceRetentionPolicyIdByProjectIdDataLoader(self._db)
+
+    @_lazy_loader
+    def trace_root_spans(self) -> TraceRootSpansDataLoader:
+        return TraceRootSpansDataLoader(self._db)
+
+    @_lazy_loader
+    def user_roles(self) -> UserRolesDataLoader:
+        return UserRolesDataLoader(self._db)
+
+    @_lazy_loader
+    def user_api_key_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.ApiKey)
+
+    @_lazy_loader
+    def user_fields(self) -> TableFieldsDataLoader:
+        return TableFieldsDataLoader(self._db, models.User)
+
+    @_lazy_loader
+    def users(self) -> UsersDataLoader:
+        return UsersDataLoader(self._db)
 
 
 class _NoOp:
@@ -221,6 +611,7 @@ class Context(BaseContext):
     secret: Optional[Secret] = None
     token_store: Optional[TokenStore] = None
     email_sender: Optional[EmailSender] = None
+    playground_job_runner: Optional["PlaygroundJobRunner"] = None
 
     def get_secret(self) -> Secret:
         """A type-safe way to get the application secret. Throws an error if the secret is not set.
@@ -13,6 +13,7 @@ from phoenix.db import models
 from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.api.types.AnnotationSummary import AnnotationSummary
+from phoenix.server.prometheus import count_span_filter_cache_lookup
 from phoenix.server.session_filters import get_filtered_session_rowids_subquery
 from phoenix.server.types import DbSessionFactory
 from phoenix.trace.dsl import SpanFilter
@@ -220,6 +221,7 @@ def _get_stmt(
         base_stmt = base_stmt.where(models.Trace.project_rowid == project_rowid)
         if filter_condition:
             sf = SpanFilter(filter_condition)
+            count_span_filter_cache_lookup(sf.cache_hit)
             base_stmt = sf(base_stmt)
     elif kind == "trace":
         base_stmt = base_stmt.join(cast(Type[models.Trace], entity_model))
@@ -5,12 +5,18 @@ but we need to invalidate subsets of keys, e.g. all those associated with a
 specific project, very frequently (i.e. essentially at each span insertion). In a
 single-tier system we would need to check all the keys to see if they are in the
 subset that we want to invalidate.
+
+Within a section, entries can also be updated in place when the change is known, e.g.
+adding the counts of newly inserted spans to a cached count, so that entries unaffected
+by the change, such as those for closed historical time ranges, remain valid.
 """
 
 from abc import ABC, abstractmethod
-from asyncio import Future
+from asyncio import Future, get_running_loop
 from collections.abc import Callable
+from time import perf_counter
 from typing import Any, Generic, Optional, TypeVar
+from weakref import WeakKeyDictionary
 
 from cachetools import Cache
 from strawberry.dataloader import AbstractCache
@@ -37,6 +43,8 @@ class TwoTierCache(
         super().__init__(*args, **kwargs)
         self._cache = main_cache
         self._sub_cache_factory = sub_cache_factory
+        # perf_counter() readings taken when each cached future was settled
+        self._settled_at: "WeakKeyDictionary[Future[_Result], float]" = WeakKeyDictionary()
 
     @abstractmethod
     def _cache_key(self, key: _Key) -> tuple[_Section, _SubKey]: ...
@@ -45,6 +53,42 @@ class TwoTierCache(
         if sub_cache := self._cache.get(section):
             sub_cache.clear()
 
+    def update_section(
+        self,
+        section: _Section,
+        update: Callable[[_SubKey, _Result], Optional[_Result]],
+        *,
+        is_affected: Callable[[_SubKey], bool],
+        settled_before: float,
+    ) -> None:
+        """
+        Brings a section up to date after a change that affects the entries whose sub-keys
+        satisfy `is_affected`. An affected entry is replaced by the result of `update` if it
+        settled successfully before `settled_before`, i.e. before the change could have
+        been visible to it, and `update` does not return None. Otherwise it is removed.
+        Entries that are not affected are left untouched.
+        """
+        if not (sub_cache := self._cache.get(section)):
+            return
+        for sub_key, future in list(sub_cache.items()):
+            if not is_affected(sub_key):
+                continue
+            result: Optional[_Result] = None
+            if (
+                future.done()
+                and not future.cancelled()
+                and future.exception() is None
+                and self._settled_at.get(future, settled_before) < settled_before
+            ):
+                result = update(sub_key, future.result())
+            if result is None:
+                del sub_cache[sub_key]
+                continue
+            updated: Future[_Result] = get_running_loop().create_future()
+            updated.set_result(result)
+            self._settled_at[updated] = self._settled_at[future]
+            sub_cache[sub_key] = updated
+
     def get(self, key: _Key) -> Optional["Future[_Result]"]:
         section, sub_key = self._cache_key(key)
         if not (sub_cache := self._cache.get(section)):
@@ -56,6 +100,10 @@ class TwoTierCache(
         if (sub_cache := self._cache.get(section)) is None:
             self._cache[section] = sub_cache = self._sub_cache_factory()
         sub_cache[sub_key] = value
+        value.add_done_callback(self._record_settled_at)
+
+    def _record_settled_at(self, future: "Future[_Result]") -> None:
+        self._settled_at[future] = perf_counter()
 
     def delete(self, key: _Key) -> None:
         section, sub_key = self._cache_key(key)
@@ -15,6 +15,7 @@ from phoenix.metrics.retrieval_metrics import RetrievalMetrics
 from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.api.types.DocumentEvaluationSummary import DocumentEvaluationSummary
+from phoenix.server.prometheus import count_span_filter_cache_lookup
 from phoenix.server.types import DbSessionFactory
 from phoenix.trace.dsl import SpanFilter
 
@@ -140,5 +141,6 @@ def _get_stmt(
         stmt = stmt.where(models.Span.start_time < end_time)
     if filter_condition:
         span_filter = SpanFilter(condition=filter_condition)
+        count_span_filter_cache_lookup(span_filter.cache_hit)
         stmt = span_filter(stmt)
     return stmt
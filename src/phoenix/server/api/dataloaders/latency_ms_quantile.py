@@ -25,6 +25,8 @@ from phoenix.db import models
 from phoenix.db.helpers import SupportedSQLDialect
 from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
+from phoenix.server.dml_event import InsertedSpans
+from phoenix.server.prometheus import count_span_filter_cache_lookup
 from phoenix.server.session_filters import get_filtered_session_rowids_subquery
 from phoenix.server.types import DbSessionFactory
 from phoenix.trace.dsl import SpanFilter
@@ -48,6 +50,7 @@ ResultPosition: TypeAlias = int
 DEFAULT_VALUE: Result = None
 
 FloatCol: TypeAlias = SQLColumnExpression[Float[float]]
+IntCol: TypeAlias = SQLColumnExpression[int]
 
 
 def _cache_key_fn(key: Key) -> tuple[Segment, Param]:
@@ -90,6 +93,27 @@ class LatencyMsQuantileCache(
             probability,
         )
 
+    def update_with_inserted_spans(
+        self,
+        project_rowid: ProjectRowId,
+        inserted_spans: InsertedSpans,
+    ) -> None:
+        # Quantiles cannot be merged, so only the entries whose time intervals overlap
+        # the inserted spans are invalidated.
+        self.update_section(
+            project_rowid,
+            lambda sub_key, quantile: None,
+            is_affected=lambda sub_key: _is_affected(sub_key, inserted_spans),
+            settled_before=inserted_spans.started_at,
+        )
+
+
+def _is_affected(sub_key: _SubKey, inserted_spans: InsertedSpans) -> bool:
+    interval, _, session_filter_condition, _, _ = sub_key
+    # Inserted traces can change which sessions match a session filter, which in turn
+    # changes the results for other time intervals.
+    return bool(session_filter_condition) or inserted_spans.overlaps(*interval)
+
 
 class LatencyMsQuantileDataLoader(DataLoader[Key, Result]):
     def __init__(
@@ -130,12 +154,14 @@ async def _get_results(
     params: Mapping[Param, list[ResultPosition]],
 ) -> AsyncIterator[tuple[ResultPosition, QuantileValue]]:
     kind, (start_time, end_time), filter_condition, session_filter_condition = segment
-    stmt = select(models.Trace.project_rowid)
+    pid = models.Span.project_rowid if kind == "span" else models.Trace.project_rowid
+    stmt = select(pid)
     if kind == "trace":
         latency_column = cast(FloatCol, models.Trace.latency_ms)
         time_column = models.Trace.start_time
         if filter_condition:
             sf = SpanFilter(filter_condition)
+            count_span_filter_cache_lookup(sf.cache_hit)
             stmt = stmt.where(
                 models.Trace.id.in_(
                     sf(select(models.Span.trace_rowid).distinct()).scalar_subquery()
@@ -144,9 +170,12 @@ async def _get_results(
     elif kind == "span":
         latency_column = cast(FloatCol, models.Span.latency_ms)
         time_column = models.Span.start_time
-        stmt = stmt.join(models.Span)
+        if filter_condition or session_filter_condition:
+            # traces are only joined when filtering, since filters can refer to them
+            stmt = stmt.join_from(models.Span, models.Trace)
         if filter_condition:
             sf = SpanFilter(filter_condition)
+            count_span_filter_cache_lookup(sf.cache_hit)
             stmt = sf(stmt)
     else:
         assert_never(kind)
@@ -164,9 +193,9 @@ async def _get_results(
     if end_time:
         stmt = stmt.where(time_column < end_time)
     if dialect is SupportedSQLDialect.POSTGRESQL:
-        results = _get_results_postgresql(session, stmt, latency_column, params)
+        results = _get_results_postgresql(session, stmt, pid, latency_column, params)
     elif dialect is SupportedSQLDialect.SQLITE:
-        results = _get_results_sqlite(session, stmt, latency_column, params)
+        results = _get_results_sqlite(session, stmt, pid, latency_column, params)
     else:
         assert_never(dialect)
     async for position, quantile_value in results:
@@ -176,13 +205,13 @@ async def _get_results(
 async def _get_results_sqlite(
     session: AsyncSession,
     base_stmt: Select[Any],
+    pid: IntCol,
     latency_column: FloatCol,
     params: Mapping[Param, list[ResultPosition]],
 ) -> AsyncIterator[tuple[ResultPosition, QuantileValue]]:
     projects_per_prob: defaultdict[Probability, list[ProjectRowId]] = defaultdict(list)
     for project_rowid, probability in params.keys():
         projects_per_prob[probability].append(project_rowid)
-    pid = models.Trace.project_rowid
     for probability, project_rowids in projects_per_prob.items():
         pctl: FloatCol = func.percentile(latency_column, probability * 100)
         stmt = base_stmt.add_columns(pctl)
@@ -197,6 +226,7 @@ async def _get_results_sqlite(
 async def _get_results_postgresql(
     session: AsyncSession,
     base_stmt: Select[Any],
+    pid: IntCol,
     latency_column: FloatCol,
     params: Mapping[Param, list[ResultPosition]],
 ) -> AsyncIterator[tuple[ResultPosition, QuantileValue]]:
@@ -208,7 +238,6 @@ async def _get_results_postgresql(
         column("probabilities", ARRAY(Float[float])),
         name="project_probabilities",
     ).data(probs_per_project.items())  # type: ignore
-    pid = models.Trace.project_rowid
     pctl: FloatCol = percentile_cont(pp.c.probabilities).within_group(latency_column)
     stmt = base_stmt.add_columns(pp.c.probabilities, pctl)
     stmt = stmt.join(pp, pid == pp.c.project_rowid)
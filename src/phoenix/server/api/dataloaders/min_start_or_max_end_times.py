@@ -9,6 +9,7 @@ from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
 from phoenix.server.api.dataloaders.cache import TwoTierCache
+from phoenix.server.dml_event import InsertedSpans
 from phoenix.server.types import DbSessionFactory
 
 Kind: TypeAlias = Literal["start", "end"]
@@ -38,6 +39,27 @@ class MinStartOrMaxEndTimeCache(
     def _cache_key(self, key: Key) -> tuple[_Section, _SubKey]:
         return key
 
+    def update_with_inserted_spans(
+        self,
+        project_rowid: ProjectRowId,
+        inserted_spans: InsertedSpans,
+    ) -> None:
+        # Trace start times only move earlier and end times only move later as spans
+        # are inserted, so the cached extremes only need to be widened.
+        def update(kind: Kind, time: Result) -> Result:
+            if kind == "start":
+                return min(time, inserted_spans.min_time) if time else inserted_spans.min_time
+            if kind == "end":
+                return max(time, inserted_spans.max_time) if time else inserted_spans.max_time
+            assert_never(kind)
+
+        self.update_section(
+            project_rowid,
+            update,
+            is_affected=lambda kind: True,
+            settled_before=inserted_spans.started_at,
+        )
+
 
 class MinStartOrMaxEndTimeDataLoader(DataLoader[Key, Result]):
     def __init__(
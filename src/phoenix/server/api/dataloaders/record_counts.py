@@ -10,6 +10,8 @@ from typing_extensions import TypeAlias, assert_never
 from phoenix.db import models
 from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
+from phoenix.server.dml_event import InsertedSpans
+from phoenix.server.prometheus import count_span_filter_cache_lookup
 from phoenix.server.session_filters import get_filtered_session_rowids_subquery
 from phoenix.server.types import DbSessionFactory
 from phoenix.trace.dsl import SpanFilter
@@ -67,6 +69,30 @@ class RecordCountCache(
         )
         return project_rowid, (interval, filter_condition, session_filter_condition, kind)
 
+    def update_with_inserted_spans(
+        self,
+        project_rowid: ProjectRowId,
+        inserted_spans: InsertedSpans,
+    ) -> None:
+        def update(sub_key: _SubKey, count: Result) -> Optional[Result]:
+            interval, filter_condition, session_filter_condition, kind = sub_key
+            if kind != "span" or filter_condition or session_filter_condition:
+                return None
+            return count + inserted_spans.num_spans(*interval)
+
+        def is_affected(sub_key: _SubKey) -> bool:
+            interval, _, session_filter_condition, _ = sub_key
+            # Inserted traces can change which sessions match a session filter, which in
+            # turn changes the counts for other time intervals.
+            return bool(session_filter_condition) or inserted_spans.overlaps(*interval)
+
+        self.update_section(
+            project_rowid,
+            update,
+            is_affected=is_affected,
+            settled_before=inserted_spans.started_at,
+        )
+
 
 class RecordCountDataLoader(DataLoader[Key, Result]):
     def __init__(
@@ -105,13 +131,16 @@ def _get_stmt(
     *project_rowids: Param,
 ) -> Select[Any]:
     kind, (start_time, end_time), filter_condition, session_filter_condition = segment
-    pid = models.Trace.project_rowid
+    pid = models.Span.project_rowid if kind == "span" else models.Trace.project_rowid
     stmt = select(pid)
     if kind == "span":
         time_column = models.Span.start_time
-        stmt = stmt.join(models.Span)
+        if filter_condition or session_filter_condition:
+            # traces are only joined when filtering, since filters can refer to them
+            stmt = stmt.join_from(models.Span, models.Trace)
         if filter_condition:
             sf = SpanFilter(filter_condition)
+            count_span_filter_cache_lookup(sf.cache_hit)
             stmt = sf(stmt)
         stmt = stmt.add_columns(func.count().label("count"))
     elif kind == "trace":
@@ -120,6 +149,7 @@ def _get_stmt(
             stmt = stmt.join(models.Span, models.Trace.id == models.Span.trace_rowid)
             stmt = stmt.add_columns(func.count(distinct(models.Trace.id)).label("count"))
             sf = SpanFilter(filter_condition)
+            count_span_filter_cache_lookup(sf.cache_hit)
             stmt = sf(stmt)
         else:
             stmt = stmt.add_columns(func.count().label("count"))
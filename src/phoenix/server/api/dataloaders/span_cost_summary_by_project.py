@@ -12,6 +12,7 @@ from phoenix.db import models
 from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.dataloaders.types import CostBreakdown, SpanCostSummary
 from phoenix.server.api.input_types.TimeRange import TimeRange
+from phoenix.server.prometheus import count_span_filter_cache_lookup
 from phoenix.server.session_filters import get_filtered_session_rowids_subquery
 from phoenix.server.types import DbSessionFactory
 from phoenix.trace.dsl import SpanFilter
@@ -138,6 +139,7 @@ def _get_stmt(
 
     if filter_condition:
         sf = SpanFilter(filter_condition)
+        count_span_filter_cache_lookup(sf.cache_hit)
         stmt = sf(stmt.join_from(models.SpanCost, models.Span))
 
     if session_filter_condition:
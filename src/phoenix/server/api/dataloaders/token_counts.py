@@ -6,11 +6,13 @@ from cachetools import LFUCache, TTLCache
 from sqlalchemy import Select, func, select
 from sqlalchemy.sql.functions import coalesce
 from strawberry.dataloader import AbstractCache, DataLoader
-from typing_extensions import TypeAlias
+from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
 from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
+from phoenix.server.dml_event import InsertedSpans
+from phoenix.server.prometheus import count_span_filter_cache_lookup
 from phoenix.server.types import DbSessionFactory
 from phoenix.trace.dsl import SpanFilter
 
@@ -57,6 +59,31 @@ class TokenCountCache(
         (interval, filter_condition), (project_rowid, kind) = _cache_key_fn(key)
         return project_rowid, (interval, filter_condition, kind)
 
+    def update_with_inserted_spans(
+        self,
+        project_rowid: ProjectRowId,
+        inserted_spans: InsertedSpans,
+    ) -> None:
+        def update(sub_key: _SubKey, token_count: Result) -> Optional[Result]:
+            interval, filter_condition, kind = sub_key
+            if filter_condition:
+                return None
+            prompt, completion = inserted_spans.token_counts(*interval)
+            if kind == "prompt":
+                return token_count + prompt
+            if kind == "completion":
+                return token_count + completion
+            if kind == "total":
+                return token_count + prompt + completion
+            assert_never(kind)
+
+        self.update_section(
+            project_rowid,
+            update,
+            is_affected=lambda sub_key: inserted_spans.overlaps(*sub_key[0]),
+            settled_before=inserted_spans.started_at,
+        )
+
 
 class TokenCountDataLoader(DataLoader[Key, Result]):
     def __init__(
@@ -102,23 +129,21 @@ def _get_stmt(
     prompt = coalesce(func.sum(models.Span.llm_token_count_prompt), 0)
     completion = coalesce(func.sum(models.Span.llm_token_count_completion), 0)
     total = prompt + completion
-    pid = models.Trace.project_rowid
-    stmt: Select[Any] = (
-        select(
-            pid,
-            prompt.label("prompt"),
-            completion.label("completion"),
-            total.label("total"),
-        )
-        .join_from(models.Trace, models.Span)
-        .group_by(pid)
-    )
+    pid = models.Span.project_rowid
+    stmt: Select[Any] = select(
+        pid,
+        prompt.label("prompt"),
+        completion.label("completion"),
+        total.label("total"),
+    ).group_by(pid)
     if start_time:
         stmt = stmt.where(start_time <= models.Span.start_time)
     if end_time:
         stmt = stmt.where(models.Span.start_time < end_time)
     if filter_condition:
         sf = SpanFilter(filter_condition)
-        stmt = sf(stmt)
+        count_span_filter_cache_lookup(sf.cache_hit)
+        # traces are only joined when filtering, since filters can refer to them
+        stmt = sf(stmt.join_from(models.Span, models.Trace))
     stmt = stmt.where(pid.in_([rowid for rowid, _ in params]))
     return stmt
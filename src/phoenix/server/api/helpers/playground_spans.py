@@ -197,6 +197,7 @@ def get_db_span(
     completion_tokens = get_attribute_value(span.attributes, LLM_TOKEN_COUNT_COMPLETION) or 0
     return models.Span(
         trace_rowid=db_trace.id,
+        project_rowid=db_trace.project_rowid,
         span_id=span.span_id,
         parent_id=None,
         name="ChatCompletion",
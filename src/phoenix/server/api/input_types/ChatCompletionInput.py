@@ -45,3 +45,11 @@ class ChatCompletionOverDatasetInput:
     experiment_description: Optional[str] = None
     experiment_metadata: Optional[JSON] = strawberry.field(default_factory=dict)
     prompt_name: Optional[Identifier] = None
+    experiment_id: Optional[GlobalID] = strawberry.field(
+        default=None,
+        description=(
+            "The ID of an experiment previously started from the playground. When provided, "
+            "the runs that are missing from the experiment are resumed instead of starting a new "
+            "experiment."
+        ),
+    )
@@ -30,6 +30,7 @@ from phoenix.db.helpers import (
     get_dataset_example_revisions,
     insert_experiment_with_examples_snapshot,
 )
+from phoenix.db.time_series_rollups import refresh_time_series_rollups
 from phoenix.server.api.auth import IsLocked, IsNotReadOnly, IsNotViewer
 from phoenix.server.api.context import Context
 from phoenix.server.api.exceptions import BadRequest, CustomGraphQLError, NotFound
@@ -507,6 +508,7 @@ class ChatCompletionMutationMixin:
             )
             span = models.Span(
                 trace_rowid=trace.id,
+                project_rowid=project_id,
                 span_id=span_id,
                 parent_id=None,
                 name="ChatCompletion",
@@ -540,6 +542,9 @@ class ChatCompletionMutationMixin:
                 span_cost.trace_rowid = trace.id
                 session.add(span_cost)
                 await session.flush()
+            await refresh_time_series_rollups(
+                session, [(trace.project_rowid, trace.start_time, trace.end_time)]
+            )
 
         gql_span = Span(id=span.id, db_record=span)
 
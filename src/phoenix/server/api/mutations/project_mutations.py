@@ -8,6 +8,7 @@ from strawberry.types import Info
 
 from phoenix.config import DEFAULT_PROJECT_NAME
 from phoenix.db import models
+from phoenix.db.time_series_rollups import refresh_time_series_rollups
 from phoenix.server.api.auth import IsNotReadOnly, IsNotViewer
 from phoenix.server.api.context import Context
 from phoenix.server.api.exceptions import BadRequest, Conflict
@@ -77,15 +78,22 @@ class ProjectMutationMixin:
         delete_statement = (
             delete(models.Trace)
             .where(models.Trace.project_rowid == project_id)
-            .returning(models.Trace.project_session_rowid)
+            .returning(
+                models.Trace.project_session_rowid,
+                models.Trace.start_time,
+                models.Trace.end_time,
+            )
         )
         if input.end_time:
             delete_statement = delete_statement.where(models.Trace.start_time < input.end_time)
         async with info.context.db() as session:
-            deleted_trace_project_session_ids = await session.scalars(delete_statement)
-            session_ids_to_delete = [
-                id_ for id_ in set(deleted_trace_project_session_ids) if id_ is not None
-            ]
+            deleted_traces = (await session.execute(delete_statement)).all()
+            session_ids_to_delete = list({id_ for id_, _, _ in deleted_traces if id_ is not None})
+            if deleted_traces:
+                _, start_times, end_times = zip(*deleted_traces)
+                await refresh_time_series_rollups(
+                    session, [(project_id, min(start_times), max(end_times))]
+                )
             # Process deletions in chunks of 10000 to avoid PostgreSQL argument limit
             chunk_size = 10000
             stmt = delete(models.ProjectSession)
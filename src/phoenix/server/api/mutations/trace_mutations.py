@@ -6,6 +6,7 @@ from strawberry.relay import GlobalID
 from strawberry.types import Info
 
 from phoenix.db import models
+from phoenix.db.time_series_rollups import refresh_time_series_rollups
 from phoenix.server.api.auth import IsNotReadOnly, IsNotViewer
 from phoenix.server.api.context import Context
 from phoenix.server.api.exceptions import BadRequest
@@ -39,7 +40,12 @@ class TraceMutationMixin:
                     .where(models.Trace.id.in_(trace_rowids))
                     .returning(models.Trace)
                     .options(
-                        load_only(models.Trace.project_rowid, models.Trace.project_session_rowid)
+                        load_only(
+                            models.Trace.project_rowid,
+                            models.Trace.project_session_rowid,
+                            models.Trace.start_time,
+                            models.Trace.end_time,
+                        )
                     )
                 )
             ).all()
@@ -70,6 +76,10 @@ class TraceMutationMixin:
                         )
                     )
                 )
+            await refresh_time_series_rollups(
+                session,
+                ((trace.project_rowid, trace.start_time, trace.end_time) for trace in traces),
+            )
             info.context.event_queue.put(SpanDeleteEvent(project_ids))
         return Query()
 
@@ -114,5 +124,18 @@ class TraceMutationMixin:
                 .where(models.Trace.id.in_(trace_rowids))
                 .values(project_rowid=dest_project_rowid)
             )
+            await session.execute(
+                update(models.Span)
+                .where(models.Span.trace_rowid.in_(trace_rowids))
+                .values(project_rowid=dest_project_rowid)
+            )
+            await refresh_time_series_rollups(
+                session,
+                (
+                    (project_rowid, trace.start_time, trace.end_time)
+                    for trace in traces
+                    for project_rowid in (*source_project_ids, dest_project_rowid)
+                ),
+            )
 
         return Query()
@@ -3,18 +3,31 @@ import gzip
 import io
 import json
 import logging
+import pickle
+import tempfile
 import urllib
 import zlib
 from asyncio import QueueFull
 from collections import Counter
-from collections.abc import Awaitable, Callable, Coroutine, Iterator, Mapping, Sequence
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
 from datetime import datetime
 from enum import Enum
 from functools import partial
-from typing import Any, Optional, Union, cast
+from itertools import chain, count
+from typing import Any, BinaryIO, Optional, Union, cast
 
 import pandas as pd
 import pyarrow as pa
+import pyarrow.parquet as pq
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Query
 from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy import and_, case, delete, func, select
@@ -47,6 +60,7 @@ from phoenix.server.api.utils import delete_projects, delete_traces
 from phoenix.server.authorization import is_not_locked
 from phoenix.server.bearer_auth import PhoenixUser
 from phoenix.server.dml_event import DatasetInsertEvent
+from phoenix.server.types import DbSessionFactory
 
 from .models import V1RoutesBaseModel
 from .utils import (
@@ -341,7 +355,7 @@ class UploadDatasetResponseBody(ResponseBody[UploadDatasetData]):
     "/datasets/upload",
     dependencies=[Depends(is_not_locked)],
     operation_id="uploadDataset",
-    summary="Upload dataset from JSON, CSV, or PyArrow",
+    summary="Upload dataset from JSON, JSONL, CSV, or PyArrow",
     responses=add_errors_to_responses(
         [
             {
@@ -418,6 +432,7 @@ async def upload_dataset(
             status_code=400,
         )
     examples: Union[Examples, Awaitable[Examples]]
+    content: Optional[BinaryIO] = None
     if request_content_type.startswith("application/json"):
         try:
             examples, action, name, description = await run_in_threadpool(
@@ -459,7 +474,7 @@ async def upload_dataset(
                             detail=f"Dataset with the same name already exists: {name=}",
                             status_code=409,
                         )
-            content = await file.read()
+            content = await _spool(file)
         try:
             file_content_type = FileContentType(file.content_type)
             if file_content_type is FileContentType.CSV:
@@ -467,11 +482,17 @@ async def upload_dataset(
                 examples = await _process_csv(
                     content, encoding, input_keys, output_keys, metadata_keys
                 )
+            elif file_content_type is FileContentType.JSONL:
+                encoding = FileContentEncoding(file.headers.get("content-encoding"))
+                examples = await _process_jsonl(
+                    content, encoding, input_keys, output_keys, metadata_keys
+                )
             elif file_content_type is FileContentType.PYARROW:
                 examples = await _process_pyarrow(content, input_keys, output_keys, metadata_keys)
             else:
                 assert_never(file_content_type)
         except ValueError as e:
+            content.close()
             raise HTTPException(
                 detail=str(e),
                 status_code=422,
@@ -481,6 +502,17 @@ async def upload_dataset(
             detail="Invalid request Content-Type",
             status_code=422,
         )
+    if content is not None and not sync:
+        # The file is parsed before the request is acknowledged, so that a malformed row is
+        # reported to the client instead of only being logged when the insertion runs.
+        try:
+            spooled_examples = await run_in_threadpool(_spool_examples, cast(Examples, examples))
+        except ValueError as e:
+            raise HTTPException(
+                detail=str(e),
+                status_code=422,
+            )
+        content, examples = spooled_examples, _read_spooled_examples(spooled_examples)
     user_id: Optional[int] = None
     if request.app.state.authentication_enabled and isinstance(request.user, PhoenixUser):
         user_id = int(request.user.identity)
@@ -496,10 +528,16 @@ async def upload_dataset(
         ),
     )
     if sync:
-        async with request.app.state.db() as session:
-            event = await operation(session)
-            dataset_id = event.dataset_id
-            version_id = event.dataset_version_id
+        try:
+            async with request.app.state.db() as session:
+                event = await operation(session)
+                dataset_id = event.dataset_id
+                version_id = event.dataset_version_id
+        except ValueError as e:
+            raise HTTPException(
+                detail=str(e),
+                status_code=422,
+            )
         request.state.event_queue.put(DatasetInsertEvent((dataset_id,)))
         return UploadDatasetResponseBody(
             data=UploadDatasetData(
@@ -512,12 +550,15 @@ async def upload_dataset(
     except QueueFull:
         if isinstance(examples, Coroutine):
             examples.close()
+        if content is not None:
+            content.close()
         raise HTTPException(detail="Too many requests.", status_code=429)
     return None
 
 
 class FileContentType(Enum):
     CSV = "text/csv"
+    JSONL = "application/jsonl"
     PYARROW = "application/x-pandas-pyarrow"
 
     @classmethod
@@ -580,59 +621,169 @@ def _process_json(
     return iter(examples), action, name, description
 
 
+_UPLOAD_CHUNK_SIZE = 1 << 20  # bytes
+
+
+async def _spool(file: UploadFile) -> BinaryIO:
+    """
+    Copies an uploaded file into a temporary file that outlives the request form, so that the
+    file can be parsed incrementally, including by operations that run after the response.
+    """
+    spool = tempfile.TemporaryFile()
+    while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+        await run_in_threadpool(spool.write, chunk)
+    spool.seek(0)
+    return spool
+
+
+class _InflatingReader(io.RawIOBase):
+    """
+    Decompresses a zlib stream as it is read.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._decompressor = zlib.decompressobj()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = b""
+        while not data and not self._decompressor.eof:
+            if not (chunk := self._decompressor.unconsumed_tail or self._file.read(1 << 16)):
+                break
+            data = self._decompressor.decompress(chunk, len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _decompress(file: BinaryIO, content_encoding: FileContentEncoding) -> BinaryIO:
+    if content_encoding is FileContentEncoding.GZIP:
+        return cast(BinaryIO, gzip.GzipFile(fileobj=file, mode="rb"))
+    if content_encoding is FileContentEncoding.DEFLATE:
+        return cast(BinaryIO, io.BufferedReader(_InflatingReader(file)))
+    if content_encoding is FileContentEncoding.NONE:
+        return file
+    assert_never(content_encoding)
+
+
+def _get_examples(
+    file: BinaryIO,
+    rows: Iterable[Mapping[str, Any]],
+    input_keys: InputKeys,
+    output_keys: OutputKeys,
+    metadata_keys: MetadataKeys,
+) -> Examples:
+    with file:
+        rows = iter(rows)
+        for row_number in count(1):
+            try:
+                row = next(rows, None)
+            except Exception as e:
+                raise ValueError(f"Failed to read row {row_number} of the file: {e}") from e
+            if row is None:
+                return
+            yield ExampleContent(
+                input={k: row.get(k) for k in input_keys},
+                output={k: row.get(k) for k in output_keys},
+                metadata={k: row.get(k) for k in metadata_keys},
+            )
+
+
+def _spool_examples(examples: Examples) -> BinaryIO:
+    """
+    Parses all the examples of an uploaded file into a temporary file, from which they are
+    read back by `_read_spooled_examples` when the insertion runs after the response.
+    """
+    spool = tempfile.TemporaryFile()
+    try:
+        for example in examples:
+            pickle.dump(example, spool, protocol=pickle.HIGHEST_PROTOCOL)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def _read_spooled_examples(file: BinaryIO) -> Examples:
+    with file:
+        while True:
+            try:
+                yield cast(ExampleContent, pickle.load(file))
+            except EOFError:
+                return
+
+
 async def _process_csv(
-    content: bytes,
+    file: BinaryIO,
     content_encoding: FileContentEncoding,
     input_keys: InputKeys,
     output_keys: OutputKeys,
     metadata_keys: MetadataKeys,
 ) -> Examples:
-    if content_encoding is FileContentEncoding.GZIP:
-        content = await run_in_threadpool(gzip.decompress, content)
-    elif content_encoding is FileContentEncoding.DEFLATE:
-        content = await run_in_threadpool(zlib.decompress, content)
-    elif content_encoding is not FileContentEncoding.NONE:
-        assert_never(content_encoding)
-    reader = await run_in_threadpool(lambda c: csv.DictReader(io.StringIO(c.decode())), content)
-    if reader.fieldnames is None:
+    text = io.TextIOWrapper(_decompress(file, content_encoding), encoding="utf-8", newline="")
+    reader = csv.DictReader(text)
+    try:
+        fieldnames = await run_in_threadpool(lambda: reader.fieldnames)
+    except Exception as e:
+        raise ValueError(f"Failed to read CSV column header: {e}") from e
+    if fieldnames is None:
         raise ValueError("Missing CSV column header")
-    (header, freq), *_ = Counter(reader.fieldnames).most_common(1)
+    (header, freq), *_ = Counter(fieldnames).most_common(1)
     if freq > 1:
         raise ValueError(f"Duplicated column header in CSV file: {header}")
-    column_headers = frozenset(reader.fieldnames)
+    column_headers = frozenset(fieldnames)
     _check_keys_exist(column_headers, input_keys, output_keys, metadata_keys)
-    return (
-        ExampleContent(
-            input={k: row.get(k) for k in input_keys},
-            output={k: row.get(k) for k in output_keys},
-            metadata={k: row.get(k) for k in metadata_keys},
-        )
-        for row in iter(reader)
-    )
+    return _get_examples(file, reader, input_keys, output_keys, metadata_keys)
+
+
+def _read_jsonl(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    for line in lines:
+        if not line.strip():
+            continue
+        if not isinstance(record := json.loads(line), dict):
+            raise ValueError("Each line of a JSONL file must be a JSON object")
+        yield record
+
+
+async def _process_jsonl(
+    file: BinaryIO,
+    content_encoding: FileContentEncoding,
+    input_keys: InputKeys,
+    output_keys: OutputKeys,
+    metadata_keys: MetadataKeys,
+) -> Examples:
+    records = _read_jsonl(io.TextIOWrapper(_decompress(file, content_encoding), encoding="utf-8"))
+    try:
+        first = await run_in_threadpool(next, records, None)
+    except Exception as e:
+        raise ValueError(f"Failed to read row 1 of the file: {e}") from e
+    if first is None:
+        raise ValueError("JSONL file has no records")
+    _check_keys_exist(frozenset(first), input_keys, output_keys, metadata_keys)
+    return _get_examples(file, chain([first], records), input_keys, output_keys, metadata_keys)
 
 
 async def _process_pyarrow(
-    content: bytes,
+    file: BinaryIO,
     input_keys: InputKeys,
     output_keys: OutputKeys,
     metadata_keys: MetadataKeys,
-) -> Awaitable[Examples]:
+) -> Examples:
     try:
-        reader = pa.ipc.open_stream(content)
+        reader = await run_in_threadpool(pa.ipc.open_stream, file)
     except pa.ArrowInvalid as e:
         raise ValueError("File is not valid pyarrow") from e
     column_headers = frozenset(reader.schema.names)
     _check_keys_exist(column_headers, input_keys, output_keys, metadata_keys)
-
-    def get_examples() -> Iterator[ExampleContent]:
-        for row in reader.read_pandas().to_dict(orient="records"):
-            yield ExampleContent(
-                input={k: row.get(k) for k in input_keys},
-                output={k: row.get(k) for k in output_keys},
-                metadata={k: row.get(k) for k in metadata_keys},
-            )
-
-    return run_in_threadpool(get_examples)
+    rows = (
+        row
+        for batch in reader
+        for row in pa.Table.from_batches([batch]).to_pandas().to_dict(orient="records")
+    )
+    return _get_examples(file, rows, input_keys, output_keys, metadata_keys)
 
 
 async def _check_table_exists(session: AsyncSession, name: str) -> bool:
@@ -766,12 +917,6 @@ async def get_dataset_examples(
                 status_code=404,
             )
 
-        # Subquery to find the maximum created_at for each dataset_example_id
-        # timestamp tiebreaks are resolved by the largest id
-        partial_subquery = select(
-            func.max(models.DatasetExampleRevision.id).label("max_id"),
-        ).group_by(models.DatasetExampleRevision.dataset_example_id)
-
         if version_gid:
             if (
                 resolved_version_id := await session.scalar(
@@ -787,10 +932,6 @@ async def get_dataset_examples(
                     detail=f"No dataset version with id {version_id} can be found.",
                     status_code=404,
                 )
-            # if a version_id is provided, filter the subquery to only include revisions from that
-            partial_subquery = partial_subquery.filter(
-                models.DatasetExampleRevision.dataset_version_id <= resolved_version_id
-            )
         else:
             if (
                 resolved_version_id := await session.scalar(
@@ -804,24 +945,23 @@ async def get_dataset_examples(
                     status_code=404,
                 )
 
-        subquery = partial_subquery.subquery()
-
-        # Query for the most recent example revisions that are not deleted
+        # Query for the effective revisions in the snapshot of the version, which excludes
+        # deleted examples
         query = (
             select(
                 models.DatasetExample,
                 models.DatasetExampleRevision,
             )
             .join(
-                models.DatasetExampleRevision,
-                models.DatasetExample.id == models.DatasetExampleRevision.dataset_example_id,
+                models.DatasetVersionDatasetExample,
+                models.DatasetExample.id == models.DatasetVersionDatasetExample.dataset_example_id,
             )
             .join(
-                subquery,
-                (subquery.c.max_id == models.DatasetExampleRevision.id),
+                models.DatasetExampleRevision,
+                models.DatasetVersionDatasetExample.dataset_example_revision_id
+                == models.DatasetExampleRevision.id,
             )
-            .filter(models.DatasetExample.dataset_id == resolved_dataset_id)
-            .filter(models.DatasetExampleRevision.revision_kind != "DELETE")
+            .filter(models.DatasetVersionDatasetExample.dataset_version_id == resolved_version_id)
             .order_by(models.DatasetExample.id.asc())
         )
 
@@ -866,6 +1006,19 @@ async def get_dataset_examples(
     )
 
 
+EXPORT_BATCH_SIZE = 1_000
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+_EXPORT_SCHEMA = pa.schema(
+    [
+        pa.field("example_id", pa.string(), nullable=False),
+        pa.field("input", pa.string(), nullable=False),
+        pa.field("output", pa.string(), nullable=False),
+        pa.field("metadata", pa.string(), nullable=False),
+    ]
+)
+
+
 @router.get(
     "/datasets/{id}/csv",
     operation_id="getDatasetCsv",
@@ -879,7 +1032,6 @@ async def get_dataset_examples(
 )
 async def get_dataset_csv(
     request: Request,
-    response: Response,
     id: str = Path(description="The ID of the dataset"),
     version_id: Optional[str] = Query(
         default=None,
@@ -888,17 +1040,13 @@ async def get_dataset_csv(
         ),
     ),
 ) -> Response:
-    try:
-        async with request.app.state.db() as session:
-            dataset_name, examples = await _get_db_examples(
-                session=session, id=id, version_id=version_id
-            )
-    except ValueError as e:
-        raise HTTPException(detail=str(e), status_code=422)
-    content = await run_in_threadpool(_get_content_csv, examples)
+    db: DbSessionFactory = request.app.state.db
+    dataset_name, dataset_version_id = await _resolve_dataset_version(
+        db=db, id=id, version_id=version_id
+    )
     encoded_dataset_name = urllib.parse.quote(dataset_name)
-    return Response(
-        content=content,
+    return StreamingResponse(
+        content=_stream_csv(db, dataset_version_id),
         headers={
             "content-disposition": f"attachment; filename*=UTF-8''{encoded_dataset_name}.csv",
             "content-type": "text/csv",
@@ -922,7 +1070,6 @@ async def get_dataset_csv(
 )
 async def get_dataset_jsonl_openai_ft(
     request: Request,
-    response: Response,
     id: str = Path(description="The ID of the dataset"),
     version_id: Optional[str] = Query(
         default=None,
@@ -930,20 +1077,19 @@ async def get_dataset_jsonl_openai_ft(
             "The ID of the dataset version (if omitted, returns data from the latest version)"
         ),
     ),
-) -> bytes:
-    try:
-        async with request.app.state.db() as session:
-            dataset_name, examples = await _get_db_examples(
-                session=session, id=id, version_id=version_id
-            )
-    except ValueError as e:
-        raise HTTPException(detail=str(e), status_code=422)
-    content = await run_in_threadpool(_get_content_jsonl_openai_ft, examples)
+) -> Response:
+    db: DbSessionFactory = request.app.state.db
+    dataset_name, dataset_version_id = await _resolve_dataset_version(
+        db=db, id=id, version_id=version_id
+    )
     encoded_dataset_name = urllib.parse.quote(dataset_name)
-    response.headers["content-disposition"] = (
-        f"attachment; filename*=UTF-8''{encoded_dataset_name}.jsonl"
+    return StreamingResponse(
+        content=_stream_encoded_examples(db, dataset_version_id, _get_content_jsonl_openai_ft),
+        media_type="text/plain",
+        headers={
+            "content-disposition": f"attachment; filename*=UTF-8''{encoded_dataset_name}.jsonl"
+        },
     )
-    return content
 
 
 @router.get(
@@ -962,7 +1108,6 @@ async def get_dataset_jsonl_openai_ft(
 )
 async def get_dataset_jsonl_openai_evals(
     request: Request,
-    response: Response,
     id: str = Path(description="The ID of the dataset"),
     version_id: Optional[str] = Query(
         default=None,
@@ -970,39 +1115,225 @@ async def get_dataset_jsonl_openai_evals(
             "The ID of the dataset version (if omitted, returns data from the latest version)"
         ),
     ),
-) -> bytes:
-    try:
-        async with request.app.state.db() as session:
-            dataset_name, examples = await _get_db_examples(
-                session=session, id=id, version_id=version_id
-            )
-    except ValueError as e:
-        raise HTTPException(detail=str(e), status_code=422)
-    content = await run_in_threadpool(_get_content_jsonl_openai_evals, examples)
+) -> Response:
+    db: DbSessionFactory = request.app.state.db
+    dataset_name, dataset_version_id = await _resolve_dataset_version(
+        db=db, id=id, version_id=version_id
+    )
     encoded_dataset_name = urllib.parse.quote(dataset_name)
-    response.headers["content-disposition"] = (
-        f"attachment; filename*=UTF-8''{encoded_dataset_name}.jsonl"
+    return StreamingResponse(
+        content=_stream_encoded_examples(db, dataset_version_id, _get_content_jsonl_openai_evals),
+        media_type="text/plain",
+        headers={
+            "content-disposition": f"attachment; filename*=UTF-8''{encoded_dataset_name}.jsonl"
+        },
     )
-    return content
-
-
-def _get_content_csv(examples: list[models.DatasetExampleRevision]) -> bytes:
-    records = [
-        {
-            "example_id": GlobalID(
-                type_name=DatasetExampleNodeType.__name__,
-                node_id=str(ex.dataset_example_id),
-            ),
-            **{f"input_{k}": v for k, v in ex.input.items()},
-            **{f"output_{k}": v for k, v in ex.output.items()},
-            **{f"metadata_{k}": v for k, v in ex.metadata_.items()},
-        }
-        for ex in examples
-    ]
-    return str(pd.DataFrame.from_records(records).to_csv(index=False)).encode()
 
 
-def _get_content_jsonl_openai_ft(examples: list[models.DatasetExampleRevision]) -> bytes:
+@router.get(
+    "/datasets/{id}/parquet",
+    operation_id="getDatasetParquet",
+    summary="Download dataset examples as Parquet file",
+    description=(
+        "Each row is an example with its `example_id` and its `input`, `output` and `metadata` "
+        "encoded as JSON strings."
+    ),
+    response_class=StreamingResponse,
+    status_code=200,
+    responses={
+        **add_errors_to_responses([422]),
+        200: {
+            "content": {
+                PARQUET_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            }
+        },
+    },
+)
+async def get_dataset_parquet(
+    request: Request,
+    id: str = Path(description="The ID of the dataset"),
+    version_id: Optional[str] = Query(
+        default=None,
+        description=(
+            "The ID of the dataset version (if omitted, returns data from the latest version)"
+        ),
+    ),
+) -> Response:
+    db: DbSessionFactory = request.app.state.db
+    dataset_name, dataset_version_id = await _resolve_dataset_version(
+        db=db, id=id, version_id=version_id
+    )
+    encoded_dataset_name = urllib.parse.quote(dataset_name)
+    return StreamingResponse(
+        content=_stream_record_batches(
+            db, dataset_version_id, partial(pq.ParquetWriter, schema=_EXPORT_SCHEMA)
+        ),
+        media_type=PARQUET_MEDIA_TYPE,
+        headers={
+            "content-disposition": f"attachment; filename*=UTF-8''{encoded_dataset_name}.parquet"
+        },
+    )
+
+
+@router.get(
+    "/datasets/{id}/arrow",
+    operation_id="getDatasetArrow",
+    summary="Download dataset examples as Arrow IPC stream",
+    description=(
+        "Each row is an example with its `example_id` and its `input`, `output` and `metadata` "
+        "encoded as JSON strings."
+    ),
+    response_class=StreamingResponse,
+    status_code=200,
+    responses={
+        **add_errors_to_responses([422]),
+        200: {
+            "content": {
+                ARROW_STREAM_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            }
+        },
+    },
+)
+async def get_dataset_arrow(
+    request: Request,
+    id: str = Path(description="The ID of the dataset"),
+    version_id: Optional[str] = Query(
+        default=None,
+        description=(
+            "The ID of the dataset version (if omitted, returns data from the latest version)"
+        ),
+    ),
+) -> Response:
+    db: DbSessionFactory = request.app.state.db
+    dataset_name, dataset_version_id = await _resolve_dataset_version(
+        db=db, id=id, version_id=version_id
+    )
+    encoded_dataset_name = urllib.parse.quote(dataset_name)
+    return StreamingResponse(
+        content=_stream_record_batches(
+            db, dataset_version_id, partial(pa.ipc.new_stream, schema=_EXPORT_SCHEMA)
+        ),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers={
+            "content-disposition": f"attachment; filename*=UTF-8''{encoded_dataset_name}.arrows"
+        },
+    )
+
+
+async def _stream_csv(
+    db: DbSessionFactory, dataset_version_id: Optional[int]
+) -> AsyncIterator[bytes]:
+    """
+    The header of a CSV file needs the union of the keys of all examples, so the examples are
+    read twice: once to collect the columns and once to encode the rows.
+    """
+    columns: dict[str, None] = {}
+    async for examples in _stream_db_examples(db, dataset_version_id):
+        for ex in examples:
+            columns.update(dict.fromkeys(_get_csv_record(ex)))
+    header = True
+    async for examples in _stream_db_examples(db, dataset_version_id):
+        yield await run_in_threadpool(_get_content_csv, examples, list(columns), header)
+        header = False
+    if header:
+        yield _get_content_csv([], list(columns))
+
+
+async def _stream_encoded_examples(
+    db: DbSessionFactory,
+    dataset_version_id: Optional[int],
+    encode: Callable[[Sequence[models.DatasetExampleRevision]], bytes],
+) -> AsyncIterator[bytes]:
+    async for examples in _stream_db_examples(db, dataset_version_id):
+        yield await run_in_threadpool(encode, examples)
+
+
+async def _stream_record_batches(
+    db: DbSessionFactory,
+    dataset_version_id: Optional[int],
+    open_writer: Callable[[BinaryIO], Union[pq.ParquetWriter, pa.ipc.RecordBatchStreamWriter]],
+) -> AsyncIterator[bytes]:
+    sink = _DrainableSink()
+    writer = open_writer(cast(BinaryIO, sink))
+    async for examples in _stream_db_examples(db, dataset_version_id):
+        batch = await run_in_threadpool(_get_record_batch, examples)
+        await run_in_threadpool(writer.write_batch, batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+class _DrainableSink(io.RawIOBase):
+    """
+    A write-only file whose content can be handed off in pieces while a writer is still
+    writing to it, so that a file can be streamed as it is being encoded.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        self._buffer += b
+        self._position += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _get_csv_record(ex: models.DatasetExampleRevision) -> dict[str, Any]:
+    return {
+        "example_id": GlobalID(
+            type_name=DatasetExampleNodeType.__name__,
+            node_id=str(ex.dataset_example_id),
+        ),
+        **{f"input_{k}": v for k, v in ex.input.items()},
+        **{f"output_{k}": v for k, v in ex.output.items()},
+        **{f"metadata_{k}": v for k, v in ex.metadata_.items()},
+    }
+
+
+def _get_content_csv(
+    examples: Sequence[models.DatasetExampleRevision],
+    columns: Sequence[str],
+    header: bool = True,
+) -> bytes:
+    records = [_get_csv_record(ex) for ex in examples]
+    return str(
+        pd.DataFrame.from_records(records, columns=columns).to_csv(index=False, header=header)
+    ).encode()
+
+
+def _get_record_batch(examples: Sequence[models.DatasetExampleRevision]) -> pa.RecordBatch:
+    return pa.RecordBatch.from_pylist(
+        [
+            {
+                "example_id": str(
+                    GlobalID(
+                        type_name=DatasetExampleNodeType.__name__,
+                        node_id=str(ex.dataset_example_id),
+                    )
+                ),
+                "input": json.dumps(ex.input, ensure_ascii=False),
+                "output": json.dumps(ex.output, ensure_ascii=False),
+                "metadata": json.dumps(ex.metadata_, ensure_ascii=False),
+            }
+            for ex in examples
+        ],
+        schema=_EXPORT_SCHEMA,
+    )
+
+
+def _get_content_jsonl_openai_ft(examples: Sequence[models.DatasetExampleRevision]) -> bytes:
     records = io.BytesIO()
     for ex in examples:
         input_messages = ex.input.get("messages", [])
@@ -1026,7 +1357,7 @@ def _get_content_jsonl_openai_ft(examples: list[models.DatasetExampleRevision])
     return records.read()
 
 
-def _get_content_jsonl_openai_evals(examples: list[models.DatasetExampleRevision]) -> bytes:
+def _get_content_jsonl_openai_evals(examples: Sequence[models.DatasetExampleRevision]) -> bytes:
     records = io.BytesIO()
     for ex in examples:
         records.write(
@@ -1053,9 +1384,13 @@ def _get_content_jsonl_openai_evals(examples: list[models.DatasetExampleRevision
     return records.read()
 
 
-async def _get_db_examples(
-    *, session: Any, id: str, version_id: Optional[str]
-) -> tuple[str, list[models.DatasetExampleRevision]]:
+async def _resolve_dataset_version(
+    *, db: DbSessionFactory, id: str, version_id: Optional[str]
+) -> tuple[str, Optional[int]]:
+    """
+    Returns the name of the dataset and the ID of the requested version, which is the latest
+    version if none is specified. The ID is None if the dataset has no such version.
+    """
     try:
         dataset_id = from_global_id_with_expected_type(GlobalID.from_id(id), DATASET_NODE_NAME)
     except Exception as e:
@@ -1075,44 +1410,70 @@ async def _get_db_examples(
                 detail=f"Invalid dataset version ID format: {version_id}",
                 status_code=422,
             ) from e
-    latest_version = (
-        select(
-            models.DatasetExampleRevision.dataset_example_id,
-            func.max(models.DatasetExampleRevision.dataset_version_id).label("dataset_version_id"),
+    if dataset_version_id is None:
+        resolved_version_id = (
+            select(func.max(models.DatasetVersion.id))
+            .where(models.DatasetVersion.dataset_id == dataset_id)
+            .scalar_subquery()
         )
-        .group_by(models.DatasetExampleRevision.dataset_example_id)
-        .join(models.DatasetExample)
-        .where(models.DatasetExample.dataset_id == dataset_id)
-    )
-    if dataset_version_id is not None:
-        max_dataset_version_id = (
+    else:
+        resolved_version_id = (
             select(models.DatasetVersion.id)
             .where(models.DatasetVersion.id == dataset_version_id)
             .where(models.DatasetVersion.dataset_id == dataset_id)
         ).scalar_subquery()
-        latest_version = latest_version.where(
-            models.DatasetExampleRevision.dataset_version_id <= max_dataset_version_id
-        )
-    subq = latest_version.subquery("latest_version")
+    async with db() as session:
+        row = (
+            await session.execute(
+                select(models.Dataset.name, resolved_version_id).where(
+                    models.Dataset.id == dataset_id
+                )
+            )
+        ).first()
+    if row is None or not row[0]:
+        raise HTTPException(detail="Dataset does not exist.", status_code=422)
+    dataset_name, resolved_id = row
+    return dataset_name, resolved_id
+
+
+async def _stream_db_examples(
+    db: DbSessionFactory,
+    dataset_version_id: Optional[int],
+) -> AsyncIterator[list[models.DatasetExampleRevision]]:
+    """
+    Yields the example revisions of the dataset version in batches ordered by example ID. Each
+    batch is read in its own short-lived session, paginating by the last example ID, so that
+    large datasets are neither held in memory nor read in a long-running transaction.
+    """
+    if dataset_version_id is None:
+        return
+    batch_size = EXPORT_BATCH_SIZE
     stmt = (
         select(models.DatasetExampleRevision)
         .join(
-            subq,
-            onclause=and_(
-                models.DatasetExampleRevision.dataset_example_id == subq.c.dataset_example_id,
-                models.DatasetExampleRevision.dataset_version_id == subq.c.dataset_version_id,
-            ),
+            models.DatasetVersionDatasetExample,
+            models.DatasetVersionDatasetExample.dataset_example_revision_id
+            == models.DatasetExampleRevision.id,
         )
-        .where(models.DatasetExampleRevision.revision_kind != "DELETE")
-        .order_by(models.DatasetExampleRevision.dataset_example_id)
+        .where(models.DatasetVersionDatasetExample.dataset_version_id == dataset_version_id)
+        .order_by(models.DatasetVersionDatasetExample.dataset_example_id)
+        .limit(batch_size)
     )
-    dataset_name: Optional[str] = await session.scalar(
-        select(models.Dataset.name).where(models.Dataset.id == dataset_id)
-    )
-    if not dataset_name:
-        raise ValueError("Dataset does not exist.")
-    examples = [r async for r in await session.stream_scalars(stmt)]
-    return dataset_name, examples
+    after: Optional[int] = None
+    while True:
+        async with db() as session:
+            examples = list(
+                await session.scalars(
+                    stmt
+                    if after is None
+                    else stmt.where(models.DatasetVersionDatasetExample.dataset_example_id > after)
+                )
+            )
+        if examples:
+            yield examples
+        if len(examples) < batch_size:
+            return
+        after = examples[-1].dataset_example_id
 
 
 def _is_all_dict(seq: Sequence[Any]) -> bool:
@@ -7,8 +7,7 @@ from starlette.requests import Request
 from strawberry.relay import GlobalID
 
 from phoenix.db import models
-from phoenix.db.helpers import SupportedSQLDialect
-from phoenix.db.insertion.helpers import as_kv, insert_on_conflict
+from phoenix.db.insertion.helpers import as_kv, chunked, upsert_rows
 from phoenix.server.api.routers.v1.annotations import SpanDocumentAnnotationData
 from phoenix.server.api.types.DocumentAnnotation import DocumentAnnotation
 from phoenix.server.authorization import is_not_locked
@@ -16,7 +15,13 @@ from phoenix.server.bearer_auth import PhoenixUser
 from phoenix.server.dml_event import DocumentAnnotationInsertEvent
 
 from .models import V1RoutesBaseModel
-from .utils import RequestBody, ResponseBody, add_errors_to_responses
+from .utils import (
+    ANNOTATION_QUEUE_IS_FULL,
+    RequestBody,
+    ResponseBody,
+    add_errors_to_responses,
+    ensure_annotation_queue_is_not_full,
+)
 
 # Since the document annotations are spans related, we place it under spans
 router = APIRouter(tags=["spans"])
@@ -48,6 +53,7 @@ class AnnotateSpanDocumentsResponseBody(ResponseBody[list[InsertedSpanDocumentAn
                 "status_code": 422,
                 "description": "Invalid request - non-empty identifier not supported",
             },
+            ANNOTATION_QUEUE_IS_FULL,
         ]
     ),
     response_description="Span document annotation inserted successfully",
@@ -81,20 +87,23 @@ async def annotate_span_documents(
         annotation.as_precursor(user_id=user_id) for annotation in span_document_annotations
     ]
     if not sync:
+        ensure_annotation_queue_is_not_full(request, models.DocumentAnnotation)
         await request.state.enqueue_annotations(*precursors)
         return AnnotateSpanDocumentsResponseBody(data=[])
 
     span_ids = {p.span_id for p in precursors}
     # Account for the fact that the spans could arrive after the annotation
     async with request.app.state.db() as session:
-        existing_spans = {
-            span_id: (id_, num_docs)
-            async for span_id, id_, num_docs in await session.stream(
-                select(models.Span.span_id, models.Span.id, models.Span.num_documents).filter(
-                    models.Span.span_id.in_(span_ids)
+        existing_spans: dict[str, tuple[int, int]] = {}
+        for span_ids_chunk in chunked(list(span_ids)):
+            existing_spans.update(
+                (span_id, (id_, num_docs))
+                for span_id, id_, num_docs in await session.execute(
+                    select(models.Span.span_id, models.Span.id, models.Span.num_documents).filter(
+                        models.Span.span_id.in_(span_ids_chunk)
+                    )
                 )
             )
-        }
 
         missing_span_ids = span_ids - set(existing_spans.keys())
         # We prefer to fail the entire operation if there are missing spans in sync mode
@@ -114,21 +123,16 @@ async def annotate_span_documents(
                     status_code=422,  # Unprocessable Entity
                 )
 
-        inserted_document_annotation_ids = []
-        dialect = SupportedSQLDialect(session.bind.dialect.name)
-        for anno in precursors:
-            span_rowid, _ = existing_spans[anno.span_id]
-            values = dict(as_kv(anno.as_insertable(span_rowid).row))
-            span_document_annotation_id = await session.scalar(
-                insert_on_conflict(
-                    values,
-                    dialect=dialect,
-                    table=models.DocumentAnnotation,
-                    unique_by=("name", "span_rowid", "identifier", "document_position"),
-                    constraint_name="uq_document_annotations_name_span_rowid_document_pos_identifier",
-                ).returning(models.DocumentAnnotation.id)
-            )
-            inserted_document_annotation_ids.append(span_document_annotation_id)
+        inserted_document_annotation_ids = await upsert_rows(
+            session,
+            [
+                dict(as_kv(anno.as_insertable(existing_spans[anno.span_id][0]).row))
+                for anno in precursors
+            ],
+            table=models.DocumentAnnotation,
+            unique_by=("name", "span_rowid", "identifier", "document_position"),
+            constraint_name="uq_document_annotations_name_span_rowid_document_pos_identifier",
+        )
 
     # We queue an event to let the application know that annotations have changed
     request.state.event_queue.put(
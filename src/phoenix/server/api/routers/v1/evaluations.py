@@ -1,17 +1,20 @@
+import base64
 import gzip
 from collections.abc import Callable
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from itertools import chain
-from typing import Any, Iterator, Optional, Union, cast
+from typing import Any, Iterator, Literal, Optional, Union, cast
 
 import pandas as pd
 import pyarrow as pa
 from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from google.protobuf.message import DecodeError
 from pandas import DataFrame
-from sqlalchemy import select
+from sqlalchemy import Select, select, tuple_
 from sqlalchemy.engine import Connectable
 from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 from starlette.datastructures import State
 from starlette.requests import Request
 from starlette.responses import Response, StreamingResponse
@@ -19,10 +22,18 @@ from typing_extensions import TypeAlias
 
 import phoenix.trace.v1 as pb
 from phoenix.config import DEFAULT_PROJECT_NAME
+from phoenix.datetime_utils import normalize_datetime
 from phoenix.db import models
+from phoenix.db.insertion.constants import DEFAULT_CHUNK_SIZE
+from phoenix.db.insertion.helpers import chunked
 from phoenix.db.insertion.types import Precursors
 from phoenix.exceptions import PhoenixEvaluationNameIsMissing
 from phoenix.server.api.routers.utils import table_to_bytes
+from phoenix.server.api.types.pagination import (
+    Cursor,
+    CursorSortColumn,
+    CursorSortColumnDataType,
+)
 from phoenix.server.authorization import is_not_locked
 from phoenix.server.types import DbSessionFactory
 from phoenix.trace.span_evaluations import (
@@ -32,7 +43,11 @@ from phoenix.trace.span_evaluations import (
     TraceEvaluations,
 )
 
-from .utils import add_errors_to_responses
+from .utils import (
+    ANNOTATION_QUEUE_IS_FULL,
+    add_errors_to_responses,
+    ensure_annotation_queue_is_not_full,
+)
 
 EvaluationName: TypeAlias = str
 
@@ -54,6 +69,7 @@ router = APIRouter(tags=["traces"], include_in_schema=True)
                 ),
             },
             422,
+            ANNOTATION_QUEUE_IS_FULL,
         ]
     ),
     openapi_extra={
@@ -94,11 +110,28 @@ async def post_evaluations(
     return Response()
 
 
+EVALUATIONS_NEXT_CURSOR_HEADER = "X-Phoenix-Next-Cursor"
+"""
+Response header holding the cursor of the next page of evaluations, if there is one.
+"""
+
+_EvaluationKind: TypeAlias = Literal["trace", "span", "document"]
+_EVALUATION_KINDS: tuple[_EvaluationKind, ...] = ("trace", "span", "document")
+
+
 @router.get(
     "/evaluations",
     operation_id="getEvaluations",
     summary="Get span, trace, or document evaluations from a project",
-    responses=add_errors_to_responses([404]),
+    description=(
+        "Streams the evaluations as pandas-arrow tables, one per evaluation name and kind. "
+        "When `limit` is set, evaluations are returned in pages ordered by the time they were "
+        "last updated, and the cursor of the next page, if any, is returned in the "
+        f"`{EVALUATIONS_NEXT_CURSOR_HEADER}` response header. Combined with `updated_after`, "
+        "this allows evaluations to be synced incrementally. Pages go through trace, span and "
+        "document evaluations in turn, and a response of 404 means that no evaluations are left."
+    ),
+    responses=add_errors_to_responses([404, 422]),
 )
 async def get_evaluations(
     request: Request,
@@ -109,6 +142,34 @@ async def get_evaluations(
             f"evaluations will be drawn from the `{DEFAULT_PROJECT_NAME}` project)"
         ),
     ),
+    updated_after: Optional[datetime] = Query(
+        default=None,
+        description=(
+            "Only get evaluations created or updated after this time. Update times are "
+            "assigned when a write begins rather than when it commits, so an evaluation can "
+            "become visible with an update time slightly earlier than that of evaluations "
+            "already returned. When syncing incrementally, pass a time that overlaps the "
+            "previous sync by a safety window (e.g. one minute before the latest update time "
+            "seen) and deduplicate the results"
+        ),
+    ),
+    eval_names: Optional[list[str]] = Query(
+        default=None,
+        description="Only get evaluations with these names",
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="A cursor for pagination, from the response to the previous page",
+    ),
+    limit: Optional[int] = Query(
+        default=None,
+        gt=0,
+        le=100000,
+        description=(
+            "The maximum number of evaluations to return in a single request (if omitted, "
+            "all evaluations are returned at once)"
+        ),
+    ),
 ) -> Response:
     project_name = (
         project_name
@@ -116,22 +177,75 @@ async def get_evaluations(
         or request.headers.get("project-name")  # read from headers for backwards compatibility
         or DEFAULT_PROJECT_NAME
     )
+    if cursor and limit is None:
+        raise HTTPException(status_code=422, detail="A cursor requires a limit")
+    kind, after = _EVALUATION_KINDS[0], None
+    if cursor:
+        try:
+            kind, after = _decode_cursor(cursor)
+        except Exception:
+            raise HTTPException(status_code=422, detail="Invalid cursor value")
+    filters = _EvaluationFilters(
+        updated_after=normalize_datetime(updated_after, timezone.utc) if updated_after else None,
+        eval_names=tuple(eval_names or ()),
+        after=after,
+        limit=limit,
+    )
 
+    trace_evals_dataframe = span_evals_dataframe = document_evals_dataframe = DataFrame()
+    next_cursor: Optional[str] = None
     db: DbSessionFactory = request.app.state.db
     async with db() as session:
         connection = await session.connection()
-        trace_evals_dataframe = await connection.run_sync(
-            _read_sql_trace_evaluations_into_dataframe,
-            project_name,
-        )
-        span_evals_dataframe = await connection.run_sync(
-            _read_sql_span_evaluations_into_dataframe,
-            project_name,
-        )
-        document_evals_dataframe = await connection.run_sync(
-            _read_sql_document_evaluations_into_dataframe,
-            project_name,
-        )
+        if limit is None:
+            trace_evals_dataframe = await connection.run_sync(
+                _read_sql_trace_evaluations_into_dataframe,
+                project_name,
+                filters,
+            )
+            span_evals_dataframe = await connection.run_sync(
+                _read_sql_span_evaluations_into_dataframe,
+                project_name,
+                filters,
+            )
+            document_evals_dataframe = await connection.run_sync(
+                _read_sql_document_evaluations_into_dataframe,
+                project_name,
+                filters,
+            )
+        else:
+            # Kinds are paged through one after another, and the page stops at the first
+            # kind with evaluations left, so a page is empty only when all are exhausted.
+            for kind in _EVALUATION_KINDS[_EVALUATION_KINDS.index(kind) :]:
+                dataframe = await connection.run_sync(
+                    _READ_SQL_EVALUATIONS_INTO_DATAFRAME[kind],
+                    project_name,
+                    filters,
+                )
+                filters = replace(filters, after=None)
+                if not dataframe.empty:
+                    break
+            if len(dataframe) > limit:
+                extra = dataframe.iloc[limit]
+                dataframe = dataframe.iloc[:limit]
+                next_cursor = _encode_cursor(
+                    kind,
+                    Cursor(
+                        rowid=int(extra["id"]),
+                        sort_column=CursorSortColumn(
+                            type=CursorSortColumnDataType.DATETIME,
+                            value=pd.Timestamp(extra["updated_at"]).to_pydatetime(),
+                        ),
+                    ),
+                )
+            elif kind != _EVALUATION_KINDS[-1]:
+                next_cursor = _encode_cursor(_EVALUATION_KINDS[_EVALUATION_KINDS.index(kind) + 1])
+            if kind == "trace":
+                trace_evals_dataframe = dataframe
+            elif kind == "span":
+                span_evals_dataframe = dataframe
+            else:
+                document_evals_dataframe = dataframe
     if (
         trace_evals_dataframe.empty
         and span_evals_dataframe.empty
@@ -157,6 +271,7 @@ async def get_evaluations(
     return StreamingResponse(
         content=bytestream,
         media_type="application/x-pandas-arrow",
+        headers={EVALUATIONS_NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None,
     )
 
 
@@ -181,112 +296,173 @@ async def _process_pyarrow(request: Request) -> Response:
             detail="Invalid data in request body",
             status_code=422,
         )
+    ensure_annotation_queue_is_not_full(request, _get_annotation_table(evaluations))
     return Response(background=BackgroundTask(_add_evaluations, request.state, evaluations))
 
 
+def _get_annotation_table(evaluations: Evaluations) -> type[models.Base]:
+    if isinstance(evaluations, DocumentEvaluations):
+        return models.DocumentAnnotation
+    if isinstance(evaluations, TraceEvaluations):
+        return models.TraceAnnotation
+    return models.SpanAnnotation
+
+
 async def _add_evaluations(state: State, evaluations: Evaluations) -> None:
+    precursors = await run_in_threadpool(_get_annotation_precursors, evaluations)
+    for precursors_chunk in chunked(precursors, DEFAULT_CHUNK_SIZE):
+        await state.enqueue_annotations(*precursors_chunk)
+
+
+_AnnotationPrecursor: TypeAlias = Union[
+    Precursors.SpanAnnotation,
+    Precursors.TraceAnnotation,
+    Precursors.DocumentAnnotation,
+]
+
+
+def _get_annotation_precursors(evaluations: Evaluations) -> list[_AnnotationPrecursor]:
+    """
+    Converts the evaluations into annotation precursors column by column, instead of
+    row by row, so that large uploads are not bottlenecked by pandas row access.
+    """
     dataframe = evaluations.dataframe
     eval_name = evaluations.eval_name
-    names = dataframe.index.names
+    index = dataframe.index
+    names = index.names
+    updated_at = datetime.now(timezone.utc)
+    results = list(
+        zip(
+            _get_column(dataframe, "score"),
+            _get_column(dataframe, "label"),
+            _get_column(dataframe, "explanation"),
+        )
+    )
     if (
         len(names) == 2
         and "document_position" in names
         and ("context.span_id" in names or "span_id" in names)
     ):
-        cls = _document_annotation_factory(
-            names.index("span_id") if "span_id" in names else names.index("context.span_id"),
-            names.index("document_position"),
-        )
-        for index, row in dataframe.iterrows():
-            score, label, explanation = _get_annotation_result(row)
-            document_annotation = cls(cast(Union[tuple[str, int], tuple[int, str]], index))(
-                name=eval_name,
-                identifier="",
-                source="API",
-                annotator_kind="LLM",
-                score=score,
-                label=label,
-                explanation=explanation,
-                metadata_={},
+        span_ids = index.get_level_values("span_id" if "span_id" in names else "context.span_id")
+        document_positions = index.get_level_values("document_position")
+        return [
+            Precursors.DocumentAnnotation(
+                updated_at,
+                span_id=str(span_id),
+                document_position=int(document_position),
+                obj=models.DocumentAnnotation(
+                    document_position=int(document_position),
+                    **_annotation_kwargs(eval_name, score, label, explanation),
+                ),
             )
-            await state.enqueue_annotations(document_annotation)
-    elif len(names) == 1 and names[0] in ("context.span_id", "span_id"):
-        for index, row in dataframe.iterrows():
-            score, label, explanation = _get_annotation_result(row)
-            span_annotation = _span_annotation_factory(cast(str, index))(
-                name=eval_name,
-                identifier="",
-                source="API",
-                annotator_kind="LLM",
-                score=score,
-                label=label,
-                explanation=explanation,
-                metadata_={},
+            for span_id, document_position, (score, label, explanation) in zip(
+                span_ids.tolist(), document_positions.tolist(), results
             )
-            await state.enqueue_annotations(span_annotation)
-    elif len(names) == 1 and names[0] in ("context.trace_id", "trace_id"):
-        for index, row in dataframe.iterrows():
-            score, label, explanation = _get_annotation_result(row)
-            trace_annotation = _trace_annotation_factory(cast(str, index))(
-                name=eval_name,
-                identifier="",
-                source="API",
-                annotator_kind="LLM",
-                score=score,
-                label=label,
-                explanation=explanation,
-                metadata_={},
+        ]
+    if len(names) == 1 and names[0] in ("context.span_id", "span_id"):
+        return [
+            Precursors.SpanAnnotation(
+                updated_at,
+                span_id=str(span_id),
+                obj=models.SpanAnnotation(
+                    **_annotation_kwargs(eval_name, score, label, explanation),
+                ),
             )
-            await state.enqueue_annotations(trace_annotation)
-
-
-def _get_annotation_result(
-    row: "pd.Series[Any]",
-) -> tuple[Optional[float], Optional[str], Optional[str]]:
-    return (
-        cast(Optional[float], row.get("score")),
-        cast(Optional[str], row.get("label")),
-        cast(Optional[str], row.get("explanation")),
+            for span_id, (score, label, explanation) in zip(index.tolist(), results)
+        ]
+    if len(names) == 1 and names[0] in ("context.trace_id", "trace_id"):
+        return [
+            Precursors.TraceAnnotation(
+                updated_at,
+                trace_id=str(trace_id),
+                obj=models.TraceAnnotation(
+                    **_annotation_kwargs(eval_name, score, label, explanation),
+                ),
+            )
+            for trace_id, (score, label, explanation) in zip(index.tolist(), results)
+        ]
+    return []
+
+
+def _get_column(dataframe: DataFrame, name: str) -> list[Any]:
+    if name not in dataframe.columns:
+        return [None] * len(dataframe)
+    return cast(list[Any], dataframe[name].tolist())
+
+
+def _annotation_kwargs(
+    eval_name: str,
+    score: Optional[float],
+    label: Optional[str],
+    explanation: Optional[str],
+) -> dict[str, Any]:
+    return dict(
+        name=eval_name,
+        identifier="",
+        source="API",
+        annotator_kind="LLM",
+        score=score,
+        label=label,
+        explanation=explanation,
+        metadata_={},
     )
 
 
-def _document_annotation_factory(
-    span_id_idx: int,
-    document_position_idx: int,
-) -> Callable[
-    [Union[tuple[str, int], tuple[int, str]]],
-    Callable[..., Precursors.DocumentAnnotation],
-]:
-    return lambda index: lambda **kwargs: Precursors.DocumentAnnotation(
-        datetime.now(timezone.utc),
-        span_id=str(index[span_id_idx]),
-        document_position=int(index[document_position_idx]),
-        obj=models.DocumentAnnotation(
-            document_position=int(index[document_position_idx]),
-            **kwargs,
-        ),
-    )
+@dataclass(frozen=True)
+class _EvaluationFilters:
+    updated_after: Optional[datetime] = None
+    eval_names: tuple[str, ...] = ()
+    after: Optional[Cursor] = None
+    limit: Optional[int] = None
+
+    def apply(
+        self,
+        stmt: Select[Any],
+        table: Union[
+            type[models.TraceAnnotation],
+            type[models.SpanAnnotation],
+            type[models.DocumentAnnotation],
+        ],
+    ) -> Select[Any]:
+        if self.updated_after is not None:
+            stmt = stmt.where(table.updated_at > self.updated_after)
+        if self.eval_names:
+            stmt = stmt.where(table.name.in_(self.eval_names))
+        if self.after is not None:
+            assert self.after.sort_column is not None
+            stmt = stmt.where(
+                tuple_(table.updated_at, table.id)
+                >= (self.after.sort_column.value, self.after.rowid)
+            )
+        if self.limit is not None:
+            # over-fetch by one to determine whether there's a next page
+            stmt = stmt.order_by(table.updated_at, table.id).limit(self.limit + 1)
+        return stmt
 
 
-def _span_annotation_factory(span_id: str) -> Callable[..., Precursors.SpanAnnotation]:
-    return lambda **kwargs: Precursors.SpanAnnotation(
-        datetime.now(timezone.utc),
-        span_id=str(span_id),
-        obj=models.SpanAnnotation(**kwargs),
-    )
+def _encode_cursor(kind: _EvaluationKind, after: Optional[Cursor] = None) -> str:
+    return base64.b64encode(f"{kind}:{after or ''}".encode()).decode()
 
 
-def _trace_annotation_factory(trace_id: str) -> Callable[..., Precursors.TraceAnnotation]:
-    return lambda **kwargs: Precursors.TraceAnnotation(
-        datetime.now(timezone.utc),
-        trace_id=str(trace_id),
-        obj=models.TraceAnnotation(**kwargs),
-    )
+def _decode_cursor(cursor: str) -> tuple[_EvaluationKind, Optional[Cursor]]:
+    kind, after = base64.b64decode(cursor).decode().split(":", 1)
+    if kind not in _EVALUATION_KINDS:
+        raise ValueError(f"Invalid evaluation kind: {kind}")
+    if not after:
+        return cast(_EvaluationKind, kind), None
+    after_cursor = Cursor.from_string(after)
+    if (
+        after_cursor.sort_column is None
+        or after_cursor.sort_column.type is not CursorSortColumnDataType.DATETIME
+    ):
+        raise ValueError("Cursor must be positioned on an update time")
+    return cast(_EvaluationKind, kind), after_cursor
 
 
 def _read_sql_trace_evaluations_into_dataframe(
     connectable: Connectable,
     project_name: str,
+    filters: _EvaluationFilters,
 ) -> DataFrame:
     """
     Reads a project's trace evaluations into a pandas dataframe.
@@ -297,11 +473,14 @@ def _read_sql_trace_evaluations_into_dataframe(
     https://stackoverflow.com/questions/70848256/how-can-i-use-pandas-read-sql-on-an-async-connection
     """
     return pd.read_sql(
-        select(models.TraceAnnotation, models.Trace.trace_id)
-        .join_from(models.TraceAnnotation, models.Trace)
-        .join_from(models.Trace, models.Project)
-        .where(models.Project.name == project_name)
-        .where(models.TraceAnnotation.annotator_kind == "LLM"),
+        filters.apply(
+            select(models.TraceAnnotation, models.Trace.trace_id)
+            .join_from(models.TraceAnnotation, models.Trace)
+            .join_from(models.Trace, models.Project)
+            .where(models.Project.name == project_name)
+            .where(models.TraceAnnotation.annotator_kind == "LLM"),
+            models.TraceAnnotation,
+        ),
         connectable,
         index_col="trace_id",
     )
@@ -310,6 +489,7 @@ def _read_sql_trace_evaluations_into_dataframe(
 def _read_sql_span_evaluations_into_dataframe(
     connectable: Connectable,
     project_name: str,
+    filters: _EvaluationFilters,
 ) -> DataFrame:
     """
     Reads a project's span evaluations into a pandas dataframe.
@@ -320,12 +500,15 @@ def _read_sql_span_evaluations_into_dataframe(
     https://stackoverflow.com/questions/70848256/how-can-i-use-pandas-read-sql-on-an-async-connection
     """
     return pd.read_sql_query(
-        select(models.SpanAnnotation, models.Span.span_id)
-        .join_from(models.SpanAnnotation, models.Span)
-        .join_from(models.Span, models.Trace)
-        .join_from(models.Trace, models.Project)
-        .where(models.Project.name == project_name)
-        .where(models.SpanAnnotation.annotator_kind == "LLM"),
+        filters.apply(
+            select(models.SpanAnnotation, models.Span.span_id)
+            .join_from(models.SpanAnnotation, models.Span)
+            .join_from(models.Span, models.Trace)
+            .join_from(models.Trace, models.Project)
+            .where(models.Project.name == project_name)
+            .where(models.SpanAnnotation.annotator_kind == "LLM"),
+            models.SpanAnnotation,
+        ),
         connectable,
         index_col="span_id",
     )
@@ -334,6 +517,7 @@ def _read_sql_span_evaluations_into_dataframe(
 def _read_sql_document_evaluations_into_dataframe(
     connectable: Connectable,
     project_name: str,
+    filters: _EvaluationFilters,
 ) -> DataFrame:
     """
     Reads a project's document evaluations into a pandas dataframe.
@@ -344,18 +528,32 @@ def _read_sql_document_evaluations_into_dataframe(
     https://stackoverflow.com/questions/70848256/how-can-i-use-pandas-read-sql-on-an-async-connection
     """
     return pd.read_sql(
-        select(models.DocumentAnnotation, models.Span.span_id)
-        .join_from(models.DocumentAnnotation, models.Span)
-        .join_from(models.Span, models.Trace)
-        .join_from(models.Trace, models.Project)
-        .where(models.Project.name == project_name)
-        .where(models.DocumentAnnotation.annotator_kind == "LLM"),
+        filters.apply(
+            select(models.DocumentAnnotation, models.Span.span_id)
+            .join_from(models.DocumentAnnotation, models.Span)
+            .join_from(models.Span, models.Trace)
+            .join_from(models.Trace, models.Project)
+            .where(models.Project.name == project_name)
+            .where(models.DocumentAnnotation.annotator_kind == "LLM"),
+            models.DocumentAnnotation,
+        ),
         connectable,
     ).set_index(["span_id", "document_position"])
 
 
+_READ_SQL_EVALUATIONS_INTO_DATAFRAME: dict[
+    _EvaluationKind, Callable[[Connectable, str, _EvaluationFilters], DataFrame]
+] = {
+    "trace": _read_sql_trace_evaluations_into_dataframe,
+    "span": _read_sql_span_evaluations_into_dataframe,
+    "document": _read_sql_document_evaluations_into_dataframe,
+}
+
+
 def _groupby_eval_name(
     evals_dataframe: DataFrame,
 ) -> Iterator[tuple[EvaluationName, DataFrame]]:
+    if evals_dataframe.empty:
+        return
     for eval_name, evals_dataframe_for_name in evals_dataframe.groupby("name", as_index=False):
         yield str(eval_name), evals_dataframe_for_name
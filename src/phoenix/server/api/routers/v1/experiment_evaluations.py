@@ -4,18 +4,19 @@ from typing import Any, Literal, Optional
 from dateutil.parser import isoparse
 from fastapi import APIRouter, HTTPException
 from pydantic import Field, model_validator
+from sqlalchemy import select
 from starlette.requests import Request
 from strawberry.relay import GlobalID
 from typing_extensions import Self
 
 from phoenix.db import models
 from phoenix.db.helpers import SupportedSQLDialect
-from phoenix.db.insertion.helpers import insert_on_conflict
+from phoenix.db.insertion.helpers import chunked, insert_on_conflict
 from phoenix.server.api.types.node import from_global_id_with_expected_type
 from phoenix.server.dml_event import ExperimentRunAnnotationInsertEvent
 
 from .models import V1RoutesBaseModel
-from .utils import ResponseBody, add_errors_to_responses
+from .utils import RequestBody, ResponseBody, add_errors_to_responses
 
 router = APIRouter(tags=["experiments"], include_in_schema=True)
 
@@ -124,3 +125,115 @@ async def upsert_experiment_evaluation(
     return UpsertExperimentEvaluationResponseBody(
         data=UpsertExperimentEvaluationResponseBodyData(id=str(evaluation_gid))
     )
+
+
+class UpsertExperimentEvaluationsRequestBody(
+    RequestBody[list[UpsertExperimentEvaluationRequestBody]]
+):
+    pass
+
+
+class UpsertExperimentEvaluationsResponseBodyData(V1RoutesBaseModel):
+    id: Optional[str] = Field(
+        default=None, description="The ID of the upserted experiment evaluation"
+    )
+    error: Optional[str] = Field(
+        default=None, description="Why the experiment evaluation was not recorded, if it was not"
+    )
+
+
+class UpsertExperimentEvaluationsResponseBody(
+    ResponseBody[list[UpsertExperimentEvaluationsResponseBodyData]]
+):
+    pass
+
+
+_INSERT_CHUNK_SIZE = 1_000
+"""
+Upper bound on the number of rows written by a single multi-row insert statement.
+"""
+
+
+@router.post(
+    "/experiment_evaluations/batch",
+    operation_id="upsertExperimentEvaluations",
+    summary="Create or update evaluations for experiment runs in bulk",
+    description=(
+        "Record many experiment evaluations with one request. Each evaluation is handled as in "
+        "`upsertExperimentEvaluation`, but an evaluation that cannot be recorded does not fail "
+        "the request: the response holds one result per submitted evaluation, in the same order."
+    ),
+)
+async def upsert_experiment_evaluations(
+    request: Request, request_body: UpsertExperimentEvaluationsRequestBody
+) -> UpsertExperimentEvaluationsResponseBody:
+    evaluations = request_body.data
+    results = [UpsertExperimentEvaluationsResponseBodyData() for _ in evaluations]
+    experiment_run_rowids: dict[int, int] = {}
+    for i, evaluation in enumerate(evaluations):
+        try:
+            experiment_run_gid = GlobalID.from_id(evaluation.experiment_run_id)
+            experiment_run_rowids[i] = from_global_id_with_expected_type(
+                experiment_run_gid, "ExperimentRun"
+            )
+        except ValueError:
+            results[
+                i
+            ].error = f"ExperimentRun with ID {evaluation.experiment_run_id} does not exist"
+
+    async with request.app.state.db() as session:
+        known_experiment_run_rowids: set[int] = set()
+        for chunk in chunked(list(set(experiment_run_rowids.values()))):
+            known_experiment_run_rowids.update(
+                await session.scalars(
+                    select(models.ExperimentRun.id).where(models.ExperimentRun.id.in_(chunk))
+                )
+            )
+
+        records: dict[int, dict[str, Any]] = {}
+        for i, experiment_run_rowid in experiment_run_rowids.items():
+            evaluation = evaluations[i]
+            if experiment_run_rowid not in known_experiment_run_rowids:
+                results[
+                    i
+                ].error = f"ExperimentRun with ID {evaluation.experiment_run_id} does not exist"
+                continue
+            result = evaluation.result
+            records[i] = dict(
+                experiment_run_id=experiment_run_rowid,
+                name=evaluation.name,
+                annotator_kind=evaluation.annotator_kind,
+                label=result.label if result else None,
+                score=result.score if result else None,
+                explanation=result.explanation if result else None,
+                error=evaluation.error,
+                metadata_=evaluation.metadata or {},  # `metadata_` must match database
+                start_time=evaluation.start_time,
+                end_time=evaluation.end_time,
+                trace_id=evaluation.trace_id,
+            )
+
+        dialect = SupportedSQLDialect(session.bind.dialect.name)
+        upserted_rowids: dict[tuple[int, str], int] = {}
+        for records_chunk in chunked(list(records.values()), _INSERT_CHUNK_SIZE):
+            stmt = insert_on_conflict(
+                *records_chunk,
+                dialect=dialect,
+                table=models.ExperimentRunAnnotation,
+                unique_by=("experiment_run_id", "name"),
+            ).returning(
+                models.ExperimentRunAnnotation.id,
+                models.ExperimentRunAnnotation.experiment_run_id,
+                models.ExperimentRunAnnotation.name,
+            )
+            for rowid, experiment_run_rowid, name in await session.execute(stmt):
+                upserted_rowids[(experiment_run_rowid, name)] = rowid
+
+    for i, record in records.items():
+        rowid = upserted_rowids[(record["experiment_run_id"], record["name"])]
+        results[i].id = str(GlobalID("ExperimentEvaluation", str(rowid)))
+    if upserted_rowids:
+        request.state.event_queue.put(
+            ExperimentRunAnnotationInsertEvent(tuple(upserted_rowids.values()))
+        )
+    return UpsertExperimentEvaluationsResponseBody(data=results)
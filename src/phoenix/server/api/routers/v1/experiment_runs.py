@@ -10,7 +10,7 @@ from strawberry.relay import GlobalID
 
 from phoenix.db import models
 from phoenix.db.helpers import get_runs_with_incomplete_evaluations_query
-from phoenix.db.insertion.helpers import OnConflict, insert_on_conflict
+from phoenix.db.insertion.helpers import OnConflict, chunked, insert_on_conflict
 from phoenix.db.models import ExperimentRunOutput
 from phoenix.server.api.routers.v1.datasets import DatasetExample
 from phoenix.server.api.types.node import from_global_id_with_expected_type
@@ -18,7 +18,7 @@ from phoenix.server.authorization import is_not_locked
 from phoenix.server.dml_event import ExperimentRunInsertEvent
 
 from .models import V1RoutesBaseModel
-from .utils import PaginatedResponseBody, ResponseBody, add_errors_to_responses
+from .utils import PaginatedResponseBody, RequestBody, ResponseBody, add_errors_to_responses
 
 router = APIRouter(tags=["experiments"], include_in_schema=True)
 
@@ -146,6 +146,151 @@ async def create_experiment_run(
     )
 
 
+class CreateExperimentRunsRequestBody(RequestBody[list[ExperimentRunData]]):
+    pass
+
+
+class CreateExperimentRunsResponseBodyData(V1RoutesBaseModel):
+    id: Optional[str] = Field(
+        default=None,
+        description=(
+            "The ID of the experiment run, or of the existing successful run when the run "
+            "was rejected as a duplicate"
+        ),
+    )
+    error: Optional[str] = Field(
+        default=None, description="Why the experiment run was not recorded, if it was not"
+    )
+
+
+class CreateExperimentRunsResponseBody(ResponseBody[list[CreateExperimentRunsResponseBodyData]]):
+    pass
+
+
+_INSERT_CHUNK_SIZE = 1_000
+"""
+Upper bound on the number of rows written by a single multi-row insert statement.
+"""
+
+
+@router.post(
+    "/experiments/{experiment_id}/runs/batch",
+    dependencies=[Depends(is_not_locked)],
+    operation_id="createExperimentRuns",
+    summary="Create runs for an experiment in bulk",
+    description=(
+        "Record many experiment runs with one request. Each run is handled as in "
+        "`createExperimentRun`, but a run that cannot be recorded does not fail the request: "
+        "the response holds one result per submitted run, in the same order."
+    ),
+    response_description="Experiment runs processed successfully",
+    responses=add_errors_to_responses(
+        [{"status_code": 404, "description": "Experiment not found"}]
+    ),
+)
+async def create_experiment_runs(
+    request: Request, experiment_id: str, request_body: CreateExperimentRunsRequestBody
+) -> CreateExperimentRunsResponseBody:
+    try:
+        experiment_gid = GlobalID.from_id(experiment_id)
+        experiment_rowid = from_global_id_with_expected_type(experiment_gid, "Experiment")
+    except ValueError:
+        raise HTTPException(
+            detail=f"Experiment with ID {experiment_id} does not exist",
+            status_code=404,
+        )
+
+    runs = request_body.data
+    results = [CreateExperimentRunsResponseBodyData() for _ in runs]
+    example_rowids: dict[int, int] = {}
+    for i, run in enumerate(runs):
+        try:
+            example_gid = GlobalID.from_id(run.dataset_example_id)
+            example_rowids[i] = from_global_id_with_expected_type(example_gid, "DatasetExample")
+        except ValueError:
+            results[i].error = f"DatasetExample with ID {run.dataset_example_id} does not exist"
+
+    async with request.app.state.db() as session:
+        dataset_id = await session.scalar(
+            select(models.Experiment.dataset_id).where(models.Experiment.id == experiment_rowid)
+        )
+        if dataset_id is None:
+            raise HTTPException(
+                detail=f"Experiment with ID {experiment_gid} does not exist",
+                status_code=404,
+            )
+        known_example_rowids: set[int] = set()
+        successful_runs: dict[tuple[int, int], int] = {}
+        for chunk in chunked(list(set(example_rowids.values()))):
+            known_example_rowids.update(
+                await session.scalars(
+                    select(models.DatasetExample.id)
+                    .where(models.DatasetExample.dataset_id == dataset_id)
+                    .where(models.DatasetExample.id.in_(chunk))
+                )
+            )
+            for run_rowid, example_rowid, repetition_number in await session.execute(
+                select(
+                    models.ExperimentRun.id,
+                    models.ExperimentRun.dataset_example_id,
+                    models.ExperimentRun.repetition_number,
+                )
+                .where(models.ExperimentRun.experiment_id == experiment_rowid)
+                .where(models.ExperimentRun.dataset_example_id.in_(chunk))
+                .where(models.ExperimentRun.error.is_(None))
+            ):
+                successful_runs[(example_rowid, repetition_number)] = run_rowid
+
+        records: dict[int, dict[str, Any]] = {}
+        for i, example_rowid in example_rowids.items():
+            run = runs[i]
+            if example_rowid not in known_example_rowids:
+                results[i].error = f"DatasetExample with ID {run.dataset_example_id} does not exist"
+            elif (
+                run_rowid := successful_runs.get((example_rowid, run.repetition_number))
+            ) is not None:
+                run_gid = GlobalID("ExperimentRun", str(run_rowid))
+                results[i].id = str(run_gid)
+                results[i].error = (
+                    f"Experiment run {run_gid} already exists with a successful result "
+                    "and cannot be updated"
+                )
+            else:
+                records[i] = {
+                    "experiment_id": experiment_rowid,
+                    "dataset_example_id": example_rowid,
+                    "trace_id": run.trace_id,
+                    "output": ExperimentRunOutput(task_output=run.output),
+                    "repetition_number": run.repetition_number,
+                    "start_time": run.start_time,
+                    "end_time": run.end_time,
+                    "error": run.error,
+                }
+
+        inserted_rowids: dict[tuple[int, int], int] = {}
+        for records_chunk in chunked(list(records.values()), _INSERT_CHUNK_SIZE):
+            stmt = insert_on_conflict(
+                *records_chunk,
+                table=models.ExperimentRun,
+                dialect=request.app.state.db.dialect,
+                unique_by=["experiment_id", "dataset_example_id", "repetition_number"],
+                on_conflict=OnConflict.DO_UPDATE,
+            ).returning(
+                models.ExperimentRun.id,
+                models.ExperimentRun.dataset_example_id,
+                models.ExperimentRun.repetition_number,
+            )
+            for run_rowid, example_rowid, repetition_number in await session.execute(stmt):
+                inserted_rowids[(example_rowid, repetition_number)] = run_rowid
+
+    for i, record in records.items():
+        run_rowid = inserted_rowids[(record["dataset_example_id"], record["repetition_number"])]
+        results[i].id = str(GlobalID("ExperimentRun", str(run_rowid)))
+    if inserted_rowids:
+        request.state.event_queue.put(ExperimentRunInsertEvent(tuple(inserted_rowids.values())))
+    return CreateExperimentRunsResponseBody(data=results)
+
+
 class ExperimentRun(ExperimentRunData):
     id: str = Field(description="The ID of the experiment run")
     experiment_id: str = Field(description="The ID of the experiment")
@@ -9,14 +9,19 @@ from sqlalchemy import select
 from starlette.requests import Request
 
 from phoenix.db import models
-from phoenix.db.helpers import SupportedSQLDialect
-from phoenix.db.insertion.helpers import as_kv, insert_on_conflict
+from phoenix.db.insertion.helpers import as_kv, chunked, upsert_rows
 from phoenix.server.api.routers.v1.models import V1RoutesBaseModel
 from phoenix.server.authorization import is_not_locked
 from phoenix.server.bearer_auth import PhoenixUser
 
 from .annotations import SessionAnnotationData
-from .utils import RequestBody, ResponseBody, add_errors_to_responses
+from .utils import (
+    ANNOTATION_QUEUE_IS_FULL,
+    RequestBody,
+    ResponseBody,
+    add_errors_to_responses,
+    ensure_annotation_queue_is_not_full,
+)
 
 router = APIRouter(tags=["sessions"])
 
@@ -38,7 +43,9 @@ class AnnotateSessionsResponseBody(ResponseBody[list[InsertedSessionAnnotation]]
     dependencies=[Depends(is_not_locked)],
     operation_id="annotateSessions",
     summary="Create session annotations",
-    responses=add_errors_to_responses([{"status_code": 404, "description": "Session not found"}]),
+    responses=add_errors_to_responses(
+        [{"status_code": 404, "description": "Session not found"}, ANNOTATION_QUEUE_IS_FULL]
+    ),
     response_description="Session annotations inserted successfully",
     include_in_schema=True,
 )
@@ -66,19 +73,18 @@ async def annotate_sessions(
         )
     precursors = [d.as_precursor(user_id=user_id) for d in filtered_session_annotations]
     if not sync:
+        ensure_annotation_queue_is_not_full(request, models.ProjectSessionAnnotation)
         await request.state.enqueue_annotations(*precursors)
         return AnnotateSessionsResponseBody(data=[])
 
     session_ids = {p.session_id for p in precursors}
     async with request.app.state.db() as session:
-        existing_sessions = {
-            session_id: rowid
-            async for session_id, rowid in await session.stream(
-                select(models.ProjectSession.session_id, models.ProjectSession.id).filter(
-                    models.ProjectSession.session_id.in_(session_ids)
-                )
+        existing_sessions: dict[str, int] = {}
+        for session_ids_chunk in chunked(list(session_ids)):
+            stmt = select(models.ProjectSession.session_id, models.ProjectSession.id).filter(
+                models.ProjectSession.session_id.in_(session_ids_chunk)
             )
-        }
+            existing_sessions.update((await session.execute(stmt)).all())
 
     missing_session_ids = session_ids - set(existing_sessions.keys())
     # We prefer to fail the entire operation if there are missing sessions in sync mode
@@ -89,19 +95,12 @@ async def annotate_sessions(
         )
 
     async with request.app.state.db() as session:
-        inserted_ids = []
-        dialect = SupportedSQLDialect(session.bind.dialect.name)
-        for p in precursors:
-            values = dict(as_kv(p.as_insertable(existing_sessions[p.session_id]).row))
-            session_annotation_id = await session.scalar(
-                insert_on_conflict(
-                    values,
-                    dialect=dialect,
-                    table=models.ProjectSessionAnnotation,
-                    unique_by=("name", "project_session_id", "identifier"),
-                ).returning(models.ProjectSessionAnnotation.id)
-            )
-            inserted_ids.append(session_annotation_id)
+        inserted_ids = await upsert_rows(
+            session,
+            [dict(as_kv(p.as_insertable(existing_sessions[p.session_id]).row)) for p in precursors],
+            table=models.ProjectSessionAnnotation,
+            unique_by=("name", "project_session_id", "identifier"),
+        )
 
     return AnnotateSessionsResponseBody(
         data=[InsertedSessionAnnotation(id=str(inserted_id)) for inserted_id in inserted_ids]
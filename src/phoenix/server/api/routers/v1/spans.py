@@ -1,13 +1,14 @@
 import json
 import warnings
 from asyncio import get_running_loop
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime, timezone
 from enum import Enum
 from secrets import token_urlsafe
 from typing import Annotated, Any, Optional, Union
 
 import pandas as pd
+import pyarrow as pa
 import sqlalchemy as sa
 from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query
 from pydantic import BaseModel, Field
@@ -20,14 +21,17 @@ from strawberry.relay import GlobalID
 from phoenix.config import DEFAULT_PROJECT_NAME
 from phoenix.datetime_utils import normalize_datetime
 from phoenix.db import models
-from phoenix.db.helpers import SupportedSQLDialect, get_ancestor_span_rowids
-from phoenix.db.insertion.helpers import as_kv, insert_on_conflict
-from phoenix.server.api.routers.utils import df_to_bytes
+from phoenix.db.helpers import get_ancestor_span_rowids
+from phoenix.db.insertion.helpers import as_kv, chunked, upsert_rows
+from phoenix.db.time_series_rollups import refresh_time_series_rollups
+from phoenix.server.api.routers.utils import df_to_bytes, table_to_bytes
 from phoenix.server.api.routers.v1.annotations import SpanAnnotationData
 from phoenix.server.api.types.node import from_global_id_with_expected_type
 from phoenix.server.authorization import is_not_locked
 from phoenix.server.bearer_auth import PhoenixUser
 from phoenix.server.dml_event import SpanAnnotationInsertEvent, SpanDeleteEvent
+from phoenix.server.prometheus import count_span_filter_cache_lookup
+from phoenix.server.types import DbSessionFactory
 from phoenix.trace.attributes import flatten, unflatten
 from phoenix.trace.dsl import SpanQuery as SpanQuery_
 from phoenix.trace.schemas import (
@@ -47,14 +51,19 @@ from phoenix.utilities.json import encode_df_as_json_string
 
 from .models import V1RoutesBaseModel
 from .utils import (
+    ANNOTATION_QUEUE_IS_FULL,
     PaginatedResponseBody,
     RequestBody,
     ResponseBody,
     _get_project_by_identifier,
     add_errors_to_responses,
+    ensure_annotation_queue_is_not_full,
 )
 
 DEFAULT_SPAN_LIMIT = 1000
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_QUERY_INDEX_KEY = "phoenix.query_index"
+_ARROW_STREAM_PAGE_SIZE = 1000
 
 router = APIRouter(tags=["spans"])
 
@@ -464,6 +473,26 @@ async def query_spans_handler(
             detail=f"Invalid query: {e}",
             status_code=422,
         )
+    for span_query in span_queries:
+        if span_query.span_filter:
+            count_span_filter_cache_lookup(span_query.span_filter.cache_hit)
+
+    if accept == ARROW_STREAM_MEDIA_TYPE:
+        if not span_queries:
+            raise HTTPException(status_code=404)
+        return StreamingResponse(
+            content=_arrow_stream(
+                request.app.state.db,
+                span_queries,
+                project_name=project_name,
+                start_time=normalize_datetime(request_body.start_time, timezone.utc),
+                end_time=normalize_datetime(end_time, timezone.utc),
+                limit=request_body.limit,
+                root_spans_only=request_body.root_spans_only,
+                orphan_span_as_root_span=request_body.orphan_span_as_root_span,
+            ),
+            media_type=ARROW_STREAM_MEDIA_TYPE,
+        )
 
     async with request.app.state.db() as session:
         results: list[pd.DataFrame] = []
@@ -504,6 +533,88 @@ async def query_spans_handler(
     )
 
 
+async def _arrow_stream(
+    db: DbSessionFactory,
+    span_queries: list[SpanQuery_],
+    *,
+    project_name: str,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    limit: int,
+    root_spans_only: Optional[bool],
+    orphan_span_as_root_span: bool,
+) -> AsyncIterator[bytes]:
+    """
+    Pages through the results of each query, newest spans first, and yields each page as a
+    self-contained Arrow IPC stream as soon as it is ready, so that only one page at a time
+    is held in memory. Each page carries its own schema, because the columns of flattened
+    attributes can differ between pages, and records the position of its query among the
+    queries in the schema metadata.
+    """
+    for query_index, query in enumerate(span_queries):
+        rowids = query.select_span_rowids(
+            project_name,
+            start_time,
+            end_time,
+            root_spans_only,
+            orphan_span_as_root_span=orphan_span_as_root_span,
+        )
+        remaining = limit
+        last_page: Sequence[sa.Row[tuple[int, datetime]]] = ()
+        while True:
+            stmt = rowids.limit(min(remaining, _ARROW_STREAM_PAGE_SIZE))
+            if last_page:
+                last_rowid, last_start_time = last_page[-1]
+                stmt = stmt.where(
+                    sa.or_(
+                        models.Span.start_time < last_start_time,
+                        sa.and_(
+                            models.Span.start_time == last_start_time,
+                            models.Span.id < last_rowid,
+                        ),
+                    )
+                )
+            async with db() as session:
+                page = (await session.execute(stmt)).all()
+                if not page and last_page:
+                    break
+                df = await session.run_sync(
+                    query,
+                    project_name=project_name,
+                    limit=None,
+                    orphan_span_as_root_span=orphan_span_as_root_span,
+                    span_rowids=[rowid for rowid, _ in page],
+                )
+            table = _table_from_df(df)
+            metadata = {**(table.schema.metadata or {}), ARROW_QUERY_INDEX_KEY: str(query_index)}
+            yield table_to_bytes(table.replace_schema_metadata(metadata))
+            remaining -= len(page)
+            if remaining <= 0 or len(page) < _ARROW_STREAM_PAGE_SIZE:
+                break
+            last_page = page
+
+
+def _table_from_df(df: pd.DataFrame) -> pa.Table:
+    """
+    Converts a page of spans to an Arrow table. Attribute values of different types under
+    the same key, e.g. a number for one span and a string for another, cannot share an Arrow
+    column, so the values of such columns are converted to strings.
+    """
+    try:
+        return pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    df = df.copy(deep=False)
+    for name in df.columns:
+        if df[name].dtype != object:
+            continue
+        try:
+            pa.array(df[name], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[name] = df[name].map(lambda v: v if v is None or v is pd.NA else str(v))
+    return pa.Table.from_pandas(df)
+
+
 async def _json_multipart(
     results: list[pd.DataFrame],
     boundary_token: str,
@@ -598,7 +709,7 @@ async def span_search_otlpv1(
             models.Trace.trace_id,
         )
         .join(models.Trace, onclause=models.Trace.id == models.Span.trace_rowid)
-        .where(models.Trace.project_rowid == project_id)
+        .where(models.Span.project_rowid == project_id)
         .order_by(*order_by)
     )
 
@@ -733,7 +844,7 @@ async def span_search(
             models.Trace.trace_id,
         )
         .join(models.Trace, onclause=models.Trace.id == models.Span.trace_rowid)
-        .where(models.Trace.project_rowid == project_id)
+        .where(models.Span.project_rowid == project_id)
         .order_by(*order_by)
     )
 
@@ -862,7 +973,9 @@ class AnnotateSpansResponseBody(ResponseBody[list[InsertedSpanAnnotation]]):
     dependencies=[Depends(is_not_locked)],
     operation_id="annotateSpans",
     summary="Create span annotations",
-    responses=add_errors_to_responses([{"status_code": 404, "description": "Span not found"}]),
+    responses=add_errors_to_responses(
+        [{"status_code": 404, "description": "Span not found"}, ANNOTATION_QUEUE_IS_FULL]
+    ),
     response_description="Span annotations inserted successfully",
     include_in_schema=True,
 )
@@ -890,19 +1003,18 @@ async def annotate_spans(
         )
     precursors = [d.as_precursor(user_id=user_id) for d in filtered_span_annotations]
     if not sync:
+        ensure_annotation_queue_is_not_full(request, models.SpanAnnotation)
         await request.state.enqueue_annotations(*precursors)
         return AnnotateSpansResponseBody(data=[])
 
     span_ids = {p.span_id for p in precursors}
     async with request.app.state.db() as session:
-        existing_spans = {
-            span_id: id_
-            async for span_id, id_ in await session.stream(
-                select(models.Span.span_id, models.Span.id).filter(
-                    models.Span.span_id.in_(span_ids)
-                )
+        existing_spans: dict[str, int] = {}
+        for span_ids_chunk in chunked(list(span_ids)):
+            stmt = select(models.Span.span_id, models.Span.id).filter(
+                models.Span.span_id.in_(span_ids_chunk)
             )
-        }
+            existing_spans.update((await session.execute(stmt)).all())
 
         missing_span_ids = span_ids - set(existing_spans.keys())
         if missing_span_ids:
@@ -910,19 +1022,12 @@ async def annotate_spans(
                 detail=f"Spans with IDs {', '.join(missing_span_ids)} do not exist.",
                 status_code=404,
             )
-        inserted_ids = []
-        dialect = SupportedSQLDialect(session.bind.dialect.name)
-        for p in precursors:
-            values = dict(as_kv(p.as_insertable(existing_spans[p.span_id]).row))
-            span_annotation_id = await session.scalar(
-                insert_on_conflict(
-                    values,
-                    dialect=dialect,
-                    table=models.SpanAnnotation,
-                    unique_by=("name", "span_rowid", "identifier"),
-                ).returning(models.SpanAnnotation.id)
-            )
-            inserted_ids.append(span_annotation_id)
+        inserted_ids = await upsert_rows(
+            session,
+            [dict(as_kv(p.as_insertable(existing_spans[p.span_id]).row)) for p in precursors],
+            table=models.SpanAnnotation,
+            unique_by=("name", "span_rowid", "identifier"),
+        )
     request.state.event_queue.put(SpanAnnotationInsertEvent(tuple(inserted_ids)))
     return AnnotateSpansResponseBody(
         data=[
@@ -1169,6 +1274,13 @@ async def delete_span(
 
         # Store values needed for later operations
         trace_rowid = target_span.trace_rowid
+        project_rowid, trace_start_time = (
+            await session.execute(
+                select(models.Trace.project_rowid, models.Trace.start_time).where(
+                    models.Trace.id == trace_rowid
+                )
+            )
+        ).one()
         parent_id = target_span.parent_id
         cumulative_error_count = target_span.cumulative_error_count
         cumulative_llm_token_count_prompt = target_span.cumulative_llm_token_count_prompt
@@ -1206,6 +1318,15 @@ async def delete_span(
                     ),
                 )
             )
+
+        # Step 4: Refresh the time series rollups of the buckets of the span and its trace
+        await refresh_time_series_rollups(
+            session,
+            [
+                (project_rowid, target_span.start_time, target_span.start_time),
+                (project_rowid, trace_start_time, trace_start_time),
+            ],
+        )
     # Trigger cache invalidation event
     request.state.event_queue.put(SpanDeleteEvent((trace_rowid,)))
 
@@ -17,8 +17,8 @@ from starlette.responses import Response
 from strawberry.relay import GlobalID
 
 from phoenix.db import models
-from phoenix.db.helpers import SupportedSQLDialect
-from phoenix.db.insertion.helpers import as_kv, insert_on_conflict
+from phoenix.db.insertion.helpers import as_kv, chunked, upsert_rows
+from phoenix.db.time_series_rollups import refresh_time_series_rollups
 from phoenix.server.api.routers.v1.annotations import TraceAnnotationData
 from phoenix.server.api.types.node import from_global_id_with_expected_type
 from phoenix.server.authorization import is_not_locked
@@ -30,9 +30,11 @@ from phoenix.utilities.project import get_project_name
 
 from .models import V1RoutesBaseModel
 from .utils import (
+    ANNOTATION_QUEUE_IS_FULL,
     RequestBody,
     ResponseBody,
     add_errors_to_responses,
+    ensure_annotation_queue_is_not_full,
 )
 
 router = APIRouter(tags=["traces"])
@@ -98,6 +100,19 @@ async def post_traces(
         body = await run_in_threadpool(gzip.decompress, body)
     elif content_encoding == "deflate":
         body = await run_in_threadpool(zlib.decompress, body)
+    if (decoder_pool := request.state.otlp_decoder_pool) is not None:
+        # The whole request is parsed and decoded in a worker process, which leaves
+        # nothing but enqueueing the decoded spans for the event loop to do.
+        try:
+            spans = await decoder_pool.decode(body)
+        except DecodeError:
+            raise HTTPException(
+                detail="Request body is invalid ExportTraceServiceRequest",
+                status_code=422,
+            )
+        for span, project_name in spans:
+            await request.state.enqueue_span(span, project_name)
+        return _export_trace_service_response()
     req = ExportTraceServiceRequest()
     try:
         await run_in_threadpool(req.ParseFromString, body)
@@ -107,7 +122,10 @@ async def post_traces(
             status_code=422,
         )
     background_tasks.add_task(_add_spans, req, request.state)
+    return _export_trace_service_response()
 
+
+def _export_trace_service_response() -> Response:
     # "The server MUST use the same Content-Type in the response as it received in the request"
     response_message = ExportTraceServiceResponse()
     response_bytes = response_message.SerializeToString()
@@ -135,7 +153,9 @@ class AnnotateTracesResponseBody(ResponseBody[list[InsertedTraceAnnotation]]):
     dependencies=[Depends(is_not_locked)],
     operation_id="annotateTraces",
     summary="Create trace annotations",
-    responses=add_errors_to_responses([{"status_code": 404, "description": "Trace not found"}]),
+    responses=add_errors_to_responses(
+        [{"status_code": 404, "description": "Trace not found"}, ANNOTATION_QUEUE_IS_FULL]
+    ),
 )
 async def annotate_traces(
     request: Request,
@@ -151,19 +171,18 @@ async def annotate_traces(
 
     precursors = [d.as_precursor(user_id=user_id) for d in request_body.data]
     if not sync:
+        ensure_annotation_queue_is_not_full(request, models.TraceAnnotation)
         await request.state.enqueue_annotations(*precursors)
         return AnnotateTracesResponseBody(data=[])
 
     trace_ids = {p.trace_id for p in precursors}
     async with request.app.state.db() as session:
-        existing_traces = {
-            trace_id: id_
-            async for trace_id, id_ in await session.stream(
-                select(models.Trace.trace_id, models.Trace.id).filter(
-                    models.Trace.trace_id.in_(trace_ids)
-                )
+        existing_traces: dict[str, int] = {}
+        for trace_ids_chunk in chunked(list(trace_ids)):
+            stmt = select(models.Trace.trace_id, models.Trace.id).filter(
+                models.Trace.trace_id.in_(trace_ids_chunk)
             )
-        }
+            existing_traces.update((await session.execute(stmt)).all())
 
         missing_trace_ids = trace_ids - set(existing_traces.keys())
         if missing_trace_ids:
@@ -171,19 +190,12 @@ async def annotate_traces(
                 detail=f"Traces with IDs {', '.join(missing_trace_ids)} do not exist.",
                 status_code=404,
             )
-        inserted_ids = []
-        dialect = SupportedSQLDialect(session.bind.dialect.name)
-        for p in precursors:
-            values = dict(as_kv(p.as_insertable(existing_traces[p.trace_id]).row))
-            trace_annotation_id = await session.scalar(
-                insert_on_conflict(
-                    values,
-                    dialect=dialect,
-                    table=models.TraceAnnotation,
-                    unique_by=("name", "trace_rowid", "identifier"),
-                ).returning(models.TraceAnnotation.id)
-            )
-            inserted_ids.append(trace_annotation_id)
+        inserted_ids = await upsert_rows(
+            session,
+            [dict(as_kv(p.as_insertable(existing_traces[p.trace_id]).row)) for p in precursors],
+            table=models.TraceAnnotation,
+            unique_by=("name", "trace_rowid", "identifier"),
+        )
     request.state.event_queue.put(TraceAnnotationInsertEvent(tuple(inserted_ids)))
     return AnnotateTracesResponseBody(
         data=[
@@ -244,7 +256,11 @@ async def delete_trace(
             delete_stmt = (
                 delete(models.Trace)
                 .where(models.Trace.id == trace_rowid)
-                .returning(models.Trace.project_rowid)
+                .returning(
+                    models.Trace.project_rowid,
+                    models.Trace.start_time,
+                    models.Trace.end_time,
+                )
             )
             error_detail = f"Trace with relay ID '{trace_identifier}' not found"
         except Exception:
@@ -252,17 +268,23 @@ async def delete_trace(
             delete_stmt = (
                 delete(models.Trace)
                 .where(models.Trace.trace_id == trace_identifier)
-                .returning(models.Trace.project_rowid)
+                .returning(
+                    models.Trace.project_rowid,
+                    models.Trace.start_time,
+                    models.Trace.end_time,
+                )
             )
             error_detail = f"Trace with trace_id '{trace_identifier}' not found"
 
-        project_id = await session.scalar(delete_stmt)
+        deleted_trace = (await session.execute(delete_stmt)).first()
 
-        if project_id is None:
+        if deleted_trace is None:
             raise HTTPException(
                 status_code=404,
                 detail=error_detail,
             )
+        project_id, start_time, end_time = deleted_trace
+        await refresh_time_series_rollups(session, [(project_id, start_time, end_time)])
 
     # Trigger cache invalidation event
     request.state.event_queue.put(SpanDeleteEvent((project_id,)))
@@ -3,12 +3,14 @@ from typing import Any, Generic, Optional, TypedDict, TypeVar, Union
 from fastapi import HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
 from strawberry.relay import GlobalID
 from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
 from phoenix.server.api.types.node import from_global_id_with_expected_type
 from phoenix.server.api.types.Project import Project as ProjectNodeType
+from phoenix.server.prometheus import ANNOTATION_QUEUE_REJECTIONS
 
 from .models import V1RoutesBaseModel
 
@@ -86,6 +88,25 @@ def add_errors_to_responses(
     return output_responses
 
 
+ANNOTATION_QUEUE_IS_FULL: StatusCodeWithDescription = {
+    "status_code": 503,
+    "description": "Server is at capacity and cannot queue more annotations",
+}
+
+
+def ensure_annotation_queue_is_not_full(request: Request, table: type[models.Base]) -> None:
+    """
+    Rejects a request to queue annotations for insertion when the queue for the table
+    of the annotations is full, so that clients back off instead of growing the queue.
+    """
+    if request.app.state.annotation_queue_is_full(table):
+        ANNOTATION_QUEUE_REJECTIONS.labels(table=table.__tablename__).inc()
+        raise HTTPException(
+            detail=ANNOTATION_QUEUE_IS_FULL["description"],
+            status_code=ANNOTATION_QUEUE_IS_FULL["status_code"],
+        )
+
+
 def add_text_csv_content_to_responses(
     status_code: StatusCode, /, *, responses: Optional[Responses] = None
 ) -> Responses:
@@ -1,3 +1,4 @@
+import logging
 from itertools import chain
 from typing import Any, Iterable, Iterator, Optional, Union
 
@@ -5,6 +6,7 @@ import strawberry
 from strawberry.extensions import SchemaExtension
 from strawberry.types.base import StrawberryObjectDefinition, StrawberryType
 
+from phoenix.server.api.context import DataLoaders
 from phoenix.server.api.exceptions import get_mask_errors_extension
 from phoenix.server.api.mutations import Mutation
 from phoenix.server.api.queries import Query
@@ -13,6 +15,8 @@ from phoenix.server.api.types.ChatCompletionSubscriptionPayload import (
     ChatCompletionSubscriptionPayload,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def build_graphql_schema(
     extensions: Optional[Iterable[Union[type[SchemaExtension], SchemaExtension]]] = None,
@@ -23,12 +27,40 @@ def build_graphql_schema(
     return strawberry.Schema(
         query=Query,
         mutation=Mutation,
-        extensions=list(chain(extensions or [], [get_mask_errors_extension()])),
+        extensions=list(
+            chain(extensions or [], [get_mask_errors_extension(), DataLoaderStatsLogger])
+        ),
         subscription=Subscription,
         types=_implementing_types(ChatCompletionSubscriptionPayload),
     )
 
 
+class DataLoaderStatsLogger(SchemaExtension):
+    """
+    Logs at debug level which data loaders each GraphQL operation used, with their batch sizes
+    and the time spent loading.
+    """
+
+    def on_operation(self) -> Iterator[None]:
+        yield
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        data_loaders = getattr(self.execution_context.context, "data_loaders", None)
+        if not isinstance(data_loaders, DataLoaders) or not data_loaders.stats:
+            return
+        logger.debug(
+            "GraphQL operation %s used data loaders: %s",
+            self.execution_context.operation_name,
+            ", ".join(
+                f"{name} (batches={stats.num_batches}, keys={stats.num_keys}, "
+                f"max_batch_size={stats.max_batch_size}, load_time={stats.load_time:.3f}s)"
+                for name, stats in sorted(
+                    data_loaders.stats.items(), key=lambda item: item[1].load_time, reverse=True
+                )
+            ),
+        )
+
+
 def _implementing_types(interface: Any) -> Iterator[StrawberryType]:
     """
     Iterates over strawberry types implementing the given strawberry interface.
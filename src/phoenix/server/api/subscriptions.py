@@ -3,9 +3,9 @@ import logging
 from collections import deque
 from collections.abc import AsyncIterator, Iterator
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from typing import (
     Any,
-    AsyncGenerator,
     Callable,
     Coroutine,
     Iterable,
@@ -20,7 +20,7 @@ import strawberry
 from openinference.instrumentation import safe_json_dumps
 from openinference.semconv.trace import SpanAttributes
 from sqlalchemy import and_, insert, select
-from sqlalchemy.orm import load_only
+from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.relay.types import GlobalID
 from strawberry.types import Info
 from typing_extensions import TypeAlias, assert_never
@@ -29,9 +29,9 @@ from phoenix.config import PLAYGROUND_PROJECT_NAME
 from phoenix.datetime_utils import local_now, normalize_datetime
 from phoenix.db import models
 from phoenix.db.helpers import (
-    get_dataset_example_revisions,
     insert_experiment_with_examples_snapshot,
 )
+from phoenix.db.time_series_rollups import refresh_time_series_rollups
 from phoenix.server.api.auth import IsLocked, IsNotReadOnly, IsNotViewer
 from phoenix.server.api.context import Context
 from phoenix.server.api.exceptions import BadRequest, CustomGraphQLError, NotFound
@@ -65,10 +65,16 @@ from phoenix.server.api.types.ChatCompletionSubscriptionPayload import (
 from phoenix.server.api.types.Dataset import Dataset
 from phoenix.server.api.types.DatasetExample import DatasetExample
 from phoenix.server.api.types.DatasetVersion import DatasetVersion
-from phoenix.server.api.types.Experiment import to_gql_experiment
+from phoenix.server.api.types.Experiment import Experiment, to_gql_experiment
 from phoenix.server.api.types.ExperimentRun import ExperimentRun
 from phoenix.server.api.types.node import from_global_id_with_expected_type
 from phoenix.server.api.types.Span import Span
+from phoenix.server.daemons.playground_job_runner import (
+    ChatCompletionResult,
+    ChatStream,
+    PlaygroundJob,
+    get_experiment_example_revisions,
+)
 from phoenix.server.daemons.span_cost_calculator import SpanCostCalculator
 from phoenix.server.dml_event import SpanInsertEvent
 from phoenix.server.experiments.utils import generate_experiment_project_name
@@ -90,11 +96,6 @@ initialize_playground_clients()
 ChatCompletionMessage: TypeAlias = tuple[
     ChatCompletionMessageRole, str, Optional[str], Optional[list[str]]
 ]
-DatasetExampleID: TypeAlias = GlobalID
-ChatCompletionResult: TypeAlias = tuple[
-    DatasetExampleID, Optional[models.Span], models.ExperimentRun
-]
-ChatStream: TypeAlias = AsyncGenerator[ChatCompletionSubscriptionPayload, None]
 
 
 async def _stream_single_chat_completion(
@@ -178,6 +179,14 @@ async def _chat_completion_span_result_payloads(
                     span_cost.trace_rowid = span.trace_rowid
                     session.add(span_cost)
         await session.flush()
+        await refresh_time_series_rollups(
+            session,
+            [
+                (span.trace.project_rowid, span.start_time, span.start_time)
+                for span, _ in results
+                if span
+            ],
+        )
     for span, repetition_number in results:
         if span:
             yield ChatCompletionSubscriptionResult(
@@ -339,6 +348,10 @@ class Subscription:
     async def chat_completion_over_dataset(
         self, info: Info[Context, None], input: ChatCompletionOverDatasetInput
     ) -> AsyncIterator[ChatCompletionSubscriptionPayload]:
+        if (runner := info.context.playground_job_runner) is None:
+            # Jobs need a runner that is started and stopped with the server, so that they
+            # are heartbeated and marked as interrupted on shutdown.
+            raise CustomGraphQLError("Playground jobs are not available on this server")
         provider_key = input.model.provider_key
         llm_client_class = PLAYGROUND_CLIENT_REGISTRY.get_client(provider_key, input.model.name)
         if llm_client_class is None:
@@ -365,192 +378,152 @@ class Subscription:
             )
 
         dataset_id = from_global_id_with_expected_type(input.dataset_id, Dataset.__name__)
-        version_id = (
-            from_global_id_with_expected_type(
-                global_id=input.dataset_version_id, expected_type_name=DatasetVersion.__name__
-            )
-            if input.dataset_version_id
-            else None
-        )
+        revisions: list[models.DatasetExampleRevision] = []
         async with info.context.db() as session:
             if (
                 await session.scalar(select(models.Dataset).where(models.Dataset.id == dataset_id))
             ) is None:
                 raise NotFound(f"Could not find dataset with ID {dataset_id}")
-            if version_id is None:
+            if input.experiment_id is not None:
+                experiment_id = from_global_id_with_expected_type(
+                    input.experiment_id, Experiment.__name__
+                )
                 if (
-                    resolved_version_id := await session.scalar(
-                        select(models.DatasetVersion.id)
-                        .where(models.DatasetVersion.dataset_id == dataset_id)
-                        .order_by(models.DatasetVersion.id.desc())
-                        .limit(1)
-                    )
-                ) is None:
-                    raise NotFound(f"No versions found for dataset with ID {dataset_id}")
+                    experiment := await session.get(models.Experiment, experiment_id)
+                ) is None or experiment.dataset_id != dataset_id:
+                    raise NotFound(f"Could not find experiment with ID {experiment_id}")
+                project_name = experiment.project_name or generate_experiment_project_name()
             else:
-                if (
-                    resolved_version_id := await session.scalar(
-                        select(models.DatasetVersion.id).where(
-                            and_(
-                                models.DatasetVersion.dataset_id == dataset_id,
-                                models.DatasetVersion.id == version_id,
-                            )
-                        )
-                    )
-                ) is None:
-                    raise NotFound(f"Could not find dataset version with ID {version_id}")
-
-            # Parse split IDs if provided
-            resolved_split_ids: Optional[list[int]] = None
-            if input.split_ids is not None and len(input.split_ids) > 0:
-                resolved_split_ids = [
-                    from_global_id_with_expected_type(split_id, models.DatasetSplit.__name__)
-                    for split_id in input.split_ids
-                ]
-
-            if not (
-                revisions := [
-                    rev
-                    async for rev in await session.stream_scalars(
-                        get_dataset_example_revisions(
-                            resolved_version_id,
-                            split_ids=resolved_split_ids,
-                        )
-                        .order_by(models.DatasetExampleRevision.dataset_example_id.asc())
-                        .options(
-                            load_only(
-                                models.DatasetExampleRevision.dataset_example_id,
-                                models.DatasetExampleRevision.input,
-                            )
-                        )
-                    )
-                ]
-            ):
-                raise NotFound("No examples found for the given dataset and version")
-            project_name = generate_experiment_project_name()
-            if (
-                playground_project_id := await session.scalar(
-                    select(models.Project.id).where(models.Project.name == project_name)
+                project_name = generate_experiment_project_name()
+                experiment = await _create_experiment(
+                    session, input, dataset_id, project_name, get_user(info)
                 )
-            ) is None:
-                playground_project_id = await session.scalar(
-                    insert(models.Project)
-                    .returning(models.Project.id)
-                    .values(
-                        name=project_name,
-                        description="Traces from prompt playground",
-                    )
-                )
-            user_id = get_user(info)
-            experiment = models.Experiment(
-                dataset_id=from_global_id_with_expected_type(input.dataset_id, Dataset.__name__),
-                dataset_version_id=resolved_version_id,
-                name=input.experiment_name
-                or _default_playground_experiment_name(input.prompt_name),
-                description=input.experiment_description,
-                repetitions=input.repetitions,
-                metadata_=input.experiment_metadata or dict(),
-                project_name=project_name,
-                user_id=user_id,
+                if not (
+                    revisions := [
+                        rev
+                        async for rev in await session.stream_scalars(
+                            get_experiment_example_revisions(experiment.id)
+                        )
+                    ]
+                ):
+                    raise NotFound("No examples found for the given dataset and version")
+            playground_project_id = await _get_or_create_project_id(session, project_name)
+        run_example = partial(
+            _stream_chat_completion_over_dataset_example,
+            input=input,
+            llm_client=llm_client,
+            experiment_id=experiment.id,
+            project_id=playground_project_id,
+        )
+        write_results = partial(
+            _chat_completion_result_payloads,
+            db=info.context.db,
+            span_cost_calculator=info.context.span_cost_calculator,
+        )
+        if input.experiment_id is None:
+            job: Optional[PlaygroundJob] = await runner.create(
+                experiment,
+                items=[
+                    (revision, repetition_number)
+                    for revision in revisions
+                    for repetition_number in range(1, input.repetitions + 1)
+                ],
+                run_example=run_example,
+                write_results=write_results,
             )
-            if resolved_split_ids:
-                experiment.experiment_dataset_splits = [
-                    models.ExperimentDatasetSplit(dataset_split_id=split_id)
-                    for split_id in resolved_split_ids
-                ]
-            await insert_experiment_with_examples_snapshot(session, experiment)
+        else:
+            job = await runner.resume(
+                experiment, run_example=run_example, write_results=write_results
+            )
+        # subscribes before yielding so that no progress is missed while the consumer catches up
+        events = job.subscribe() if job else None
         yield ChatCompletionSubscriptionExperiment(
             experiment=to_gql_experiment(experiment)
         )  # eagerly yields experiment so it can be linked by consumers of the subscription
+        if events is not None:
+            async for payload in events:
+                yield payload
 
-        results: asyncio.Queue[ChatCompletionResult] = asyncio.Queue()
-        not_started: list[tuple[DatasetExampleID, ChatStream]] = [
-            (
-                GlobalID(DatasetExample.__name__, str(revision.dataset_example_id)),
-                _stream_chat_completion_over_dataset_example(
-                    input=input,
-                    llm_client=llm_client,
-                    revision=revision,
-                    results=results,
-                    repetition_number=repetition_number,
-                    experiment_id=experiment.id,
-                    project_id=playground_project_id,
-                ),
+
+async def _create_experiment(
+    session: AsyncSession,
+    input: ChatCompletionOverDatasetInput,
+    dataset_id: int,
+    project_name: str,
+    user_id: Optional[int],
+) -> models.Experiment:
+    version_id = (
+        from_global_id_with_expected_type(
+            global_id=input.dataset_version_id, expected_type_name=DatasetVersion.__name__
+        )
+        if input.dataset_version_id
+        else None
+    )
+    if version_id is None:
+        if (
+            resolved_version_id := await session.scalar(
+                select(models.DatasetVersion.id)
+                .where(models.DatasetVersion.dataset_id == dataset_id)
+                .order_by(models.DatasetVersion.id.desc())
+                .limit(1)
             )
-            for revision in revisions
-            for repetition_number in reversed(
-                range(1, input.repetitions + 1)
-            )  # since we pop right, this runs the repetitions in increasing order
-        ]
-        in_progress: list[
-            tuple[
-                Optional[DatasetExampleID],
-                ChatStream,
-                asyncio.Task[ChatCompletionSubscriptionPayload],
-            ]
-        ] = []
-        max_in_progress = 3
-        write_batch_size = 10
-        write_interval = timedelta(seconds=10)
-        last_write_time = datetime.now()
-        while not_started or in_progress:
-            while not_started and len(in_progress) < max_in_progress:
-                ex_id, stream = not_started.pop()
-                task = _create_task_with_timeout(stream)
-                in_progress.append((ex_id, stream, task))
-            async_tasks_to_run = [task for _, _, task in in_progress]
-            completed_tasks, _ = await asyncio.wait(
-                async_tasks_to_run, return_when=asyncio.FIRST_COMPLETED
+        ) is None:
+            raise NotFound(f"No versions found for dataset with ID {dataset_id}")
+    else:
+        if (
+            resolved_version_id := await session.scalar(
+                select(models.DatasetVersion.id).where(
+                    and_(
+                        models.DatasetVersion.dataset_id == dataset_id,
+                        models.DatasetVersion.id == version_id,
+                    )
+                )
             )
-            for completed_task in completed_tasks:
-                idx = [task for _, _, task in in_progress].index(completed_task)
-                example_id, stream, _ = in_progress[idx]
-                try:
-                    yield completed_task.result()
-                except StopAsyncIteration:
-                    del in_progress[idx]  # removes exhausted stream
-                except asyncio.TimeoutError:
-                    del in_progress[idx]  # removes timed-out stream
-                    if example_id is not None:
-                        yield ChatCompletionSubscriptionError(
-                            message="Playground task timed out", dataset_example_id=example_id
-                        )
-                except Exception as error:
-                    del in_progress[idx]  # removes failed stream
-                    if example_id is not None:
-                        yield ChatCompletionSubscriptionError(
-                            message="An unexpected error occurred", dataset_example_id=example_id
-                        )
-                    logger.exception(error)
-                else:
-                    task = _create_task_with_timeout(stream)
-                    in_progress[idx] = (example_id, stream, task)
+        ) is None:
+            raise NotFound(f"Could not find dataset version with ID {version_id}")
+
+    # Parse split IDs if provided
+    resolved_split_ids: Optional[list[int]] = None
+    if input.split_ids is not None and len(input.split_ids) > 0:
+        resolved_split_ids = [
+            from_global_id_with_expected_type(split_id, models.DatasetSplit.__name__)
+            for split_id in input.split_ids
+        ]
+    experiment = models.Experiment(
+        dataset_id=dataset_id,
+        dataset_version_id=resolved_version_id,
+        name=input.experiment_name or _default_playground_experiment_name(input.prompt_name),
+        description=input.experiment_description,
+        repetitions=input.repetitions,
+        metadata_=input.experiment_metadata or dict(),
+        project_name=project_name,
+        user_id=user_id,
+    )
+    if resolved_split_ids:
+        experiment.experiment_dataset_splits = [
+            models.ExperimentDatasetSplit(dataset_split_id=split_id)
+            for split_id in resolved_split_ids
+        ]
+    await insert_experiment_with_examples_snapshot(session, experiment)
+    return experiment
 
-                exceeded_write_batch_size = results.qsize() >= write_batch_size
-                exceeded_write_interval = datetime.now() - last_write_time > write_interval
-                write_already_in_progress = any(
-                    _is_result_payloads_stream(stream) for _, stream, _ in in_progress
-                )
-                if (
-                    not results.empty()
-                    and (exceeded_write_batch_size or exceeded_write_interval)
-                    and not write_already_in_progress
-                ):
-                    result_payloads_stream = _chat_completion_result_payloads(
-                        db=info.context.db,
-                        results=_drain_no_wait(results),
-                        span_cost_calculator=info.context.span_cost_calculator,
-                    )
-                    task = _create_task_with_timeout(result_payloads_stream)
-                    in_progress.append((None, result_payloads_stream, task))
-                    last_write_time = datetime.now()
-        if remaining_results := await _drain(results):
-            async for result_payload in _chat_completion_result_payloads(
-                db=info.context.db,
-                results=remaining_results,
-                span_cost_calculator=info.context.span_cost_calculator,
-            ):
-                yield result_payload
+
+async def _get_or_create_project_id(session: AsyncSession, project_name: str) -> int:
+    if (
+        project_id := await session.scalar(
+            select(models.Project.id).where(models.Project.name == project_name)
+        )
+    ) is None:
+        project_id = await session.scalar(
+            insert(models.Project)
+            .returning(models.Project.id)
+            .values(
+                name=project_name,
+                description="Traces from prompt playground",
+            )
+        )
+    assert project_id is not None
+    return project_id
 
 
 async def _stream_chat_completion_over_dataset_example(
@@ -669,6 +642,14 @@ async def _chat_completion_result_payloads(
                     session.add(span_cost)
             session.add(run)
         await session.flush()
+        await refresh_time_series_rollups(
+            session,
+            [
+                (span.trace.project_rowid, span.start_time, span.start_time)
+                for _, span, _ in results
+                if span
+            ],
+        )
     for example_id, span, run in results:
         yield ChatCompletionSubscriptionResult(
             span=Span(id=span.id, db_record=span) if span else None,
@@ -678,16 +659,6 @@ async def _chat_completion_result_payloads(
         )
 
 
-def _is_result_payloads_stream(
-    stream: ChatStream,
-) -> bool:
-    """
-    Checks if the given generator was instantiated from
-    `_chat_completion_result_payloads`
-    """
-    return stream.ag_code == _chat_completion_result_payloads.__code__  # type: ignore
-
-
 def _create_task_with_timeout(
     iterable: AsyncIterator[GenericType], timeout_in_seconds: int = 90
 ) -> asyncio.Task[GenericType]:
@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, Annotated, Any, Literal, Optional, cast
 import strawberry
 from aioitertools.itertools import groupby, islice
 from openinference.semconv.trace import SpanAttributes
-from sqlalchemy import and_, case, desc, distinct, exists, func, or_, select
+from sqlalchemy import ColumnElement, and_, case, desc, distinct, exists, func, or_, select
 from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.sql.expression import tuple_
 from sqlalchemy.sql.functions import percentile_cont
@@ -17,6 +17,7 @@ from typing_extensions import assert_never
 from phoenix.datetime_utils import get_timestamp_range, normalize_datetime, right_open_time_range
 from phoenix.db import models
 from phoenix.db.helpers import SupportedSQLDialect, date_trunc
+from phoenix.db.time_series_rollups import Granularity, get_time_series_rollup_granularity
 from phoenix.server.api.context import Context
 from phoenix.server.api.exceptions import BadRequest
 from phoenix.server.api.input_types.ProjectSessionSort import (
@@ -47,6 +48,7 @@ from phoenix.server.api.types.SpanCostSummary import SpanCostSummary
 from phoenix.server.api.types.TimeSeries import TimeSeries, TimeSeriesDataPoint
 from phoenix.server.api.types.Trace import Trace
 from phoenix.server.api.types.ValidationResult import ValidationResult
+from phoenix.server.prometheus import count_span_filter_cache_lookup
 from phoenix.server.session_filters import get_filtered_session_rowids_subquery
 from phoenix.server.types import DbSessionFactory
 from phoenix.trace.dsl import SpanFilter
@@ -327,12 +329,7 @@ class Project(Node):
                 sort=sort,
                 orphan_span_as_root_span=orphan_span_as_root_span,
             )
-        stmt = (
-            select(models.Span.id)
-            .select_from(models.Span)
-            .join(models.Trace)
-            .where(models.Trace.project_rowid == self.id)
-        )
+        stmt = select(models.Span.id).where(models.Span.project_rowid == self.id)
         if time_range:
             if time_range.start:
                 stmt = stmt.where(time_range.start <= models.Span.start_time)
@@ -340,7 +337,9 @@ class Project(Node):
                 stmt = stmt.where(models.Span.start_time < time_range.end)
         if filter_condition:
             span_filter = SpanFilter(condition=filter_condition)
-            stmt = span_filter(stmt)
+            count_span_filter_cache_lookup(span_filter.cache_hit)
+            # traces are only joined for filters, which can refer to e.g. the trace id
+            stmt = span_filter(stmt.join(models.Trace))
         sort_config: Optional[SpanSortConfig] = None
         cursor_rowid_column: Any = models.Span.id
         if sort:
@@ -678,6 +677,7 @@ class Project(Node):
                 condition=condition,
                 # valid_eval_names=valid_eval_names,
             )
+            count_span_filter_cache_lookup(span_filter.cache_hit)
             stmt = span_filter(select(models.Span))
             dialect = info.context.db.dialect
             if dialect is SupportedSQLDialect.POSTGRESQL:
@@ -777,31 +777,53 @@ class Project(Node):
                 field = "month"
             elif time_bin_config.scale is TimeBinScale.YEAR:
                 field = "year"
-        bucket = date_trunc(dialect, field, models.Span.start_time, utc_offset_minutes)
-        stmt = (
-            select(
-                bucket,
-                func.count(models.Span.id).label("total_count"),
-                func.sum(case((models.Span.status_code == "OK", 1), else_=0)).label("ok_count"),
-                func.sum(case((models.Span.status_code == "ERROR", 1), else_=0)).label(
-                    "error_count"
-                ),
-                func.sum(case((models.Span.status_code == "UNSET", 1), else_=0)).label(
-                    "unset_count"
-                ),
+        if not filter_condition and (
+            granularity := get_time_series_rollup_granularity(
+                field, utc_offset_minutes, time_range.start, time_range.end
             )
-            .join_from(models.Span, models.Trace)
-            .where(models.Trace.project_rowid == self.id)
-            .group_by(bucket)
-            .order_by(bucket)
-        )
-        if time_range.start:
-            stmt = stmt.where(time_range.start <= models.Span.start_time)
-        if time_range.end:
-            stmt = stmt.where(models.Span.start_time < time_range.end)
-        if filter_condition:
-            span_filter = SpanFilter(condition=filter_condition)
-            stmt = span_filter(stmt)
+        ):
+            rollup = models.ProjectTimeSeriesRollup
+            bucket = date_trunc(dialect, field, rollup.bucket_start, utc_offset_minutes)
+            stmt = (
+                select(
+                    bucket,
+                    func.sum(rollup.span_count),
+                    func.sum(rollup.span_ok_count),
+                    func.sum(rollup.span_error_count),
+                    func.sum(rollup.span_unset_count),
+                )
+                .where(*_time_series_rollup_filters(self.id, granularity, time_range))
+                .group_by(bucket)
+                .having(func.sum(rollup.span_count) > 0)
+                .order_by(bucket)
+            )
+        else:
+            bucket = date_trunc(dialect, field, models.Span.start_time, utc_offset_minutes)
+            stmt = (
+                select(
+                    bucket,
+                    func.count(models.Span.id).label("total_count"),
+                    func.sum(case((models.Span.status_code == "OK", 1), else_=0)).label("ok_count"),
+                    func.sum(case((models.Span.status_code == "ERROR", 1), else_=0)).label(
+                        "error_count"
+                    ),
+                    func.sum(case((models.Span.status_code == "UNSET", 1), else_=0)).label(
+                        "unset_count"
+                    ),
+                )
+                .where(models.Span.project_rowid == self.id)
+                .group_by(bucket)
+                .order_by(bucket)
+            )
+            if time_range.start:
+                stmt = stmt.where(time_range.start <= models.Span.start_time)
+            if time_range.end:
+                stmt = stmt.where(models.Span.start_time < time_range.end)
+            if filter_condition:
+                span_filter = SpanFilter(condition=filter_condition)
+                count_span_filter_cache_lookup(span_filter.cache_hit)
+                # traces are only joined for filters, which can refer to e.g. the trace id
+                stmt = span_filter(stmt.join_from(models.Span, models.Trace))
 
         data = {}
         async with info.context.db() as session:
@@ -862,18 +884,31 @@ class Project(Node):
                 field = "month"
             elif time_bin_config.scale is TimeBinScale.YEAR:
                 field = "year"
-        bucket = date_trunc(dialect, field, models.Trace.start_time, utc_offset_minutes)
-        stmt = (
-            select(bucket, func.count(models.Trace.id))
-            .where(models.Trace.project_rowid == self.id)
-            .group_by(bucket)
-            .order_by(bucket)
-        )
-        if time_range:
-            if time_range.start:
-                stmt = stmt.where(time_range.start <= models.Trace.start_time)
-            if time_range.end:
-                stmt = stmt.where(models.Trace.start_time < time_range.end)
+        if granularity := get_time_series_rollup_granularity(
+            field, utc_offset_minutes, time_range.start, time_range.end
+        ):
+            rollup = models.ProjectTimeSeriesRollup
+            bucket = date_trunc(dialect, field, rollup.bucket_start, utc_offset_minutes)
+            stmt = (
+                select(bucket, func.sum(rollup.trace_count))
+                .where(*_time_series_rollup_filters(self.id, granularity, time_range))
+                .group_by(bucket)
+                .having(func.sum(rollup.trace_count) > 0)
+                .order_by(bucket)
+            )
+        else:
+            bucket = date_trunc(dialect, field, models.Trace.start_time, utc_offset_minutes)
+            stmt = (
+                select(bucket, func.count(models.Trace.id))
+                .where(models.Trace.project_rowid == self.id)
+                .group_by(bucket)
+                .order_by(bucket)
+            )
+            if time_range:
+                if time_range.start:
+                    stmt = stmt.where(time_range.start <= models.Trace.start_time)
+                if time_range.end:
+                    stmt = stmt.where(models.Trace.start_time < time_range.end)
         data = {}
         async with info.context.db() as session:
             async for t, v in await session.stream(stmt):
@@ -1122,28 +1157,46 @@ class Project(Node):
                 field = "month"
             elif time_bin_config.scale is TimeBinScale.YEAR:
                 field = "year"
-        bucket = date_trunc(dialect, field, models.Trace.start_time, utc_offset_minutes)
-        stmt = (
-            select(
-                bucket,
-                func.sum(models.SpanCost.total_tokens),
-                func.sum(models.SpanCost.prompt_tokens),
-                func.sum(models.SpanCost.completion_tokens),
+        if granularity := get_time_series_rollup_granularity(
+            field, utc_offset_minutes, time_range.start, time_range.end
+        ):
+            rollup = models.ProjectTimeSeriesRollup
+            bucket = date_trunc(dialect, field, rollup.bucket_start, utc_offset_minutes)
+            stmt = (
+                select(
+                    bucket,
+                    func.sum(rollup.total_tokens),
+                    func.sum(rollup.prompt_tokens),
+                    func.sum(rollup.completion_tokens),
+                )
+                .where(*_time_series_rollup_filters(self.id, granularity, time_range))
+                .group_by(bucket)
+                .having(func.sum(rollup.span_cost_count) > 0)
+                .order_by(bucket)
             )
-            .join_from(
-                models.Trace,
-                models.SpanCost,
-                onclause=models.SpanCost.trace_rowid == models.Trace.id,
+        else:
+            bucket = date_trunc(dialect, field, models.Trace.start_time, utc_offset_minutes)
+            stmt = (
+                select(
+                    bucket,
+                    func.sum(models.SpanCost.total_tokens),
+                    func.sum(models.SpanCost.prompt_tokens),
+                    func.sum(models.SpanCost.completion_tokens),
+                )
+                .join_from(
+                    models.Trace,
+                    models.SpanCost,
+                    onclause=models.SpanCost.trace_rowid == models.Trace.id,
+                )
+                .where(models.Trace.project_rowid == self.id)
+                .group_by(bucket)
+                .order_by(bucket)
             )
-            .where(models.Trace.project_rowid == self.id)
-            .group_by(bucket)
-            .order_by(bucket)
-        )
-        if time_range:
-            if time_range.start:
-                stmt = stmt.where(time_range.start <= models.Trace.start_time)
-            if time_range.end:
-                stmt = stmt.where(models.Trace.start_time < time_range.end)
+            if time_range:
+                if time_range.start:
+                    stmt = stmt.where(time_range.start <= models.Trace.start_time)
+                if time_range.end:
+                    stmt = stmt.where(models.Trace.start_time < time_range.end)
         data: dict[datetime, TraceTokenCountTimeSeriesDataPoint] = {}
         async with info.context.db() as session:
             async for (
@@ -1205,28 +1258,46 @@ class Project(Node):
                 field = "month"
             elif time_bin_config.scale is TimeBinScale.YEAR:
                 field = "year"
-        bucket = date_trunc(dialect, field, models.Trace.start_time, utc_offset_minutes)
-        stmt = (
-            select(
-                bucket,
-                func.sum(models.SpanCost.total_cost),
-                func.sum(models.SpanCost.prompt_cost),
-                func.sum(models.SpanCost.completion_cost),
+        if granularity := get_time_series_rollup_granularity(
+            field, utc_offset_minutes, time_range.start, time_range.end
+        ):
+            rollup = models.ProjectTimeSeriesRollup
+            bucket = date_trunc(dialect, field, rollup.bucket_start, utc_offset_minutes)
+            stmt = (
+                select(
+                    bucket,
+                    func.sum(rollup.total_cost),
+                    func.sum(rollup.prompt_cost),
+                    func.sum(rollup.completion_cost),
+                )
+                .where(*_time_series_rollup_filters(self.id, granularity, time_range))
+                .group_by(bucket)
+                .having(func.sum(rollup.span_cost_count) > 0)
+                .order_by(bucket)
             )
-            .join_from(
-                models.Trace,
-                models.SpanCost,
-                onclause=models.SpanCost.trace_rowid == models.Trace.id,
+        else:
+            bucket = date_trunc(dialect, field, models.Trace.start_time, utc_offset_minutes)
+            stmt = (
+                select(
+                    bucket,
+                    func.sum(models.SpanCost.total_cost),
+                    func.sum(models.SpanCost.prompt_cost),
+                    func.sum(models.SpanCost.completion_cost),
+                )
+                .join_from(
+                    models.Trace,
+                    models.SpanCost,
+                    onclause=models.SpanCost.trace_rowid == models.Trace.id,
+                )
+                .where(models.Trace.project_rowid == self.id)
+                .group_by(bucket)
+                .order_by(bucket)
             )
-            .where(models.Trace.project_rowid == self.id)
-            .group_by(bucket)
-            .order_by(bucket)
-        )
-        if time_range:
-            if time_range.start:
-                stmt = stmt.where(time_range.start <= models.Trace.start_time)
-            if time_range.end:
-                stmt = stmt.where(models.Trace.start_time < time_range.end)
+            if time_range:
+                if time_range.start:
+                    stmt = stmt.where(time_range.start <= models.Trace.start_time)
+                if time_range.end:
+                    stmt = stmt.where(models.Trace.start_time < time_range.end)
         data: dict[datetime, TraceTokenCostTimeSeriesDataPoint] = {}
         async with info.context.db() as session:
             async for (
@@ -1582,6 +1653,23 @@ INPUT_VALUE = SpanAttributes.INPUT_VALUE.split(".")
 OUTPUT_VALUE = SpanAttributes.OUTPUT_VALUE.split(".")
 
 
+def _time_series_rollup_filters(
+    project_rowid: int,
+    granularity: Granularity,
+    time_range: TimeRange,
+) -> list[ColumnElement[bool]]:
+    rollup = models.ProjectTimeSeriesRollup
+    filters = [
+        rollup.project_rowid == project_rowid,
+        rollup.granularity == granularity,
+    ]
+    if time_range.start:
+        filters.append(time_range.start <= rollup.bucket_start)
+    if time_range.end:
+        filters.append(rollup.bucket_start < time_range.end)
+    return filters
+
+
 def _as_datetime(value: Any) -> datetime:
     if isinstance(value, datetime):
         return value
@@ -1,6 +1,7 @@
 from sqlalchemy import delete
 
 from phoenix.db import models
+from phoenix.db.time_series_rollups import refresh_time_series_rollups
 from phoenix.server.types import DbSessionFactory
 
 
@@ -28,7 +29,20 @@ async def delete_traces(
     stmt = (
         delete(models.Trace)
         .where(models.Trace.trace_id.in_(set(trace_ids)))
-        .returning(models.Trace.id)
+        .returning(
+            models.Trace.id,
+            models.Trace.project_rowid,
+            models.Trace.start_time,
+            models.Trace.end_time,
+        )
     )
     async with db() as session:
-        return list(await session.scalars(stmt))
+        deleted = (await session.execute(stmt)).all()
+        await refresh_time_series_rollups(
+            session,
+            (
+                (project_rowid, start_time, end_time)
+                for _, project_rowid, start_time, end_time in deleted
+            ),
+        )
+    return [trace_rowid for trace_rowid, *_ in deleted]
@@ -57,18 +57,26 @@ from phoenix.config import (
     DEFAULT_PROJECT_NAME,
     ENV_PHOENIX_CSRF_TRUSTED_ORIGINS,
     SERVER_DIR,
+    CumulativeCountsConsistency,
     OAuth2ClientConfig,
     get_env_allow_external_resources,
     get_env_csrf_trusted_origins,
+    get_env_cumulative_counts_consistency,
+    get_env_cumulative_counts_rollup_interval_seconds,
     get_env_database_allocated_storage_capacity_gibibytes,
     get_env_database_usage_insertion_blocking_threshold_percentage,
     get_env_fastapi_middleware_paths,
     get_env_gql_extension_paths,
     get_env_grpc_interceptor_paths,
     get_env_host,
+    get_env_max_annotations_queue_size,
     get_env_max_spans_queue_size,
+    get_env_otlp_decode_workers,
     get_env_port,
+    get_env_span_spool_dir,
     get_env_support_email,
+    get_env_trace_retention_batch_pause_seconds,
+    get_env_trace_retention_batch_size,
     server_instrumentation_is_enabled,
     verify_server_environment_variables,
 )
@@ -78,77 +86,14 @@ from phoenix.db.bulk_inserter import BulkInserter
 from phoenix.db.engines import create_engine
 from phoenix.db.facilitator import Facilitator
 from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.db.span_spool import SpanSpool
 from phoenix.exceptions import PhoenixMigrationError
 from phoenix.pointcloud.umap_parameters import UMAPParameters
 from phoenix.server.api.auth_messages import AUTH_ERROR_MESSAGES, AuthErrorCode
 from phoenix.server.api.context import Context, DataLoaders
 from phoenix.server.api.dataloaders import (
-    AnnotationConfigsByProjectDataLoader,
-    AnnotationSummaryDataLoader,
-    AverageExperimentRepeatedRunGroupLatencyDataLoader,
-    AverageExperimentRunLatencyDataLoader,
     CacheForDataLoaders,
-    DatasetDatasetSplitsDataLoader,
-    DatasetExampleRevisionsDataLoader,
-    DatasetExamplesAndVersionsByExperimentRunDataLoader,
-    DatasetExampleSpansDataLoader,
-    DatasetExampleSplitsDataLoader,
-    DocumentEvaluationsDataLoader,
-    DocumentEvaluationSummaryDataLoader,
-    DocumentRetrievalMetricsDataLoader,
-    ExperimentAnnotationSummaryDataLoader,
-    ExperimentDatasetSplitsDataLoader,
-    ExperimentErrorRatesDataLoader,
-    ExperimentRepeatedRunGroupAnnotationSummariesDataLoader,
-    ExperimentRepeatedRunGroupsDataLoader,
-    ExperimentRunAnnotations,
-    ExperimentRunCountsDataLoader,
-    ExperimentRunsByExperimentAndExampleDataLoader,
-    ExperimentSequenceNumberDataLoader,
-    LastUsedTimesByGenerativeModelIdDataLoader,
-    LatencyMsQuantileDataLoader,
-    MinStartOrMaxEndTimeDataLoader,
-    NumChildSpansDataLoader,
-    NumSpansPerTraceDataLoader,
-    ProjectByNameDataLoader,
-    ProjectIdsByTraceRetentionPolicyIdDataLoader,
-    PromptVersionSequenceNumberDataLoader,
-    RecordCountDataLoader,
-    SessionAnnotationsBySessionDataLoader,
-    SessionIODataLoader,
-    SessionNumTracesDataLoader,
-    SessionNumTracesWithErrorDataLoader,
-    SessionTokenUsagesDataLoader,
-    SessionTraceLatencyMsQuantileDataLoader,
-    SpanAnnotationsDataLoader,
-    SpanByIdDataLoader,
-    SpanCostBySpanDataLoader,
-    SpanCostDetailsBySpanCostDataLoader,
-    SpanCostDetailSummaryEntriesByGenerativeModelDataLoader,
-    SpanCostDetailSummaryEntriesByProjectSessionDataLoader,
-    SpanCostDetailSummaryEntriesBySpanDataLoader,
-    SpanCostDetailSummaryEntriesByTraceDataLoader,
-    SpanCostSummaryByExperimentDataLoader,
-    SpanCostSummaryByExperimentRepeatedRunGroupDataLoader,
-    SpanCostSummaryByExperimentRunDataLoader,
-    SpanCostSummaryByGenerativeModelDataLoader,
-    SpanCostSummaryByProjectDataLoader,
-    SpanCostSummaryByProjectSessionDataLoader,
-    SpanCostSummaryByTraceDataLoader,
-    SpanDatasetExamplesDataLoader,
-    SpanDescendantsDataLoader,
-    SpanProjectsDataLoader,
-    TableFieldsDataLoader,
-    TokenCountDataLoader,
-    TokenPricesByModelDataLoader,
-    TraceAnnotationsByTraceDataLoader,
-    TraceByTraceIdsDataLoader,
-    TraceRetentionPolicyIdByProjectIdDataLoader,
-    TraceRootSpansDataLoader,
-    UserRolesDataLoader,
-    UsersDataLoader,
 )
-from phoenix.server.api.dataloaders.dataset_labels import DatasetLabelsDataLoader
 from phoenix.server.api.routers import (
     auth_router,
     create_embeddings_router,
@@ -158,16 +103,20 @@ from phoenix.server.api.routers import (
 from phoenix.server.api.routers.v1 import REST_API_VERSION
 from phoenix.server.api.schema import build_graphql_schema
 from phoenix.server.bearer_auth import BearerTokenAuthBackend, is_authenticated
+from phoenix.server.daemons.cumulative_counts_rollup import CumulativeCountsRollup
 from phoenix.server.daemons.db_disk_usage_monitor import DbDiskUsageMonitor
 from phoenix.server.daemons.generative_model_store import GenerativeModelStore
+from phoenix.server.daemons.playground_job_runner import PlaygroundJobRunner
 from phoenix.server.daemons.span_cost_calculator import SpanCostCalculator
 from phoenix.server.dml_event import DmlEvent
 from phoenix.server.dml_event_handler import DmlEventHandler
+from phoenix.server.dml_event_notifier import DmlEventNotifier
 from phoenix.server.email.types import EmailSender
 from phoenix.server.grpc_server import GrpcServer
 from phoenix.server.jwt_store import JwtStore
 from phoenix.server.middleware.gzip import GZipMiddleware
 from phoenix.server.oauth2 import OAuth2Clients
+from phoenix.server.otlp_decoder import OtlpDecoderPool
 from phoenix.server.prometheus import SPAN_QUEUE_REJECTIONS
 from phoenix.server.retention import TraceDataSweeper
 from phoenix.server.telemetry import initialize_opentelemetry_tracer_provider
@@ -579,6 +528,9 @@ def _lifespan(
     span_cost_calculator: SpanCostCalculator,
     generative_model_store: GenerativeModelStore,
     db_disk_usage_monitor: DbDiskUsageMonitor,
+    playground_job_runner: PlaygroundJobRunner,
+    cumulative_counts_rollup: Optional[CumulativeCountsRollup] = None,
+    otlp_decoder_pool: Optional[OtlpDecoderPool] = None,
     token_store: Optional[TokenStore] = None,
     tracer_provider: Optional["TracerProvider"] = None,
     enable_prometheus: bool = False,
@@ -595,12 +547,18 @@ def _lifespan(
                 await res
         db.lock = asyncio.Lock() if db.dialect is SupportedSQLDialect.SQLITE else None
         async with AsyncExitStack() as stack:
+            if cumulative_counts_rollup:
+                # Entered before the bulk inserter so that it is stopped after it, and
+                # can drain the traces dirtied by the last spans inserted.
+                await stack.enter_async_context(cumulative_counts_rollup)
             (
                 enqueue_annotations,
                 enqueue_span,
                 enqueue_evaluation,
                 enqueue_operation,
             ) = await stack.enter_async_context(bulk_inserter)
+            if otlp_decoder_pool:
+                await stack.enter_async_context(otlp_decoder_pool)
             interceptors = [
                 CapacityInterceptor(bulk_inserter),
                 *user_grpc_interceptors(),
@@ -613,6 +571,7 @@ def _lifespan(
                 enable_prometheus=enable_prometheus,
                 token_store=token_store,
                 interceptors=interceptors,
+                decoder_pool=otlp_decoder_pool,
             )
             await stack.enter_async_context(grpc_server)
             await stack.enter_async_context(dml_event_handler)
@@ -621,6 +580,7 @@ def _lifespan(
             await stack.enter_async_context(span_cost_calculator)
             await stack.enter_async_context(generative_model_store)
             await stack.enter_async_context(db_disk_usage_monitor)
+            await stack.enter_async_context(playground_job_runner)
             if scaffolder_config:
                 scaffolder = Scaffolder(
                     config=scaffolder_config,
@@ -636,6 +596,7 @@ def _lifespan(
                 "enqueue_span": enqueue_span,
                 "enqueue_evaluation": enqueue_evaluation,
                 "enqueue_operation": enqueue_operation,
+                "otlp_decoder_pool": otlp_decoder_pool,
             }
         for callback in shutdown_callbacks:
             if isinstance((res := callback()), Awaitable):
@@ -669,6 +630,7 @@ def create_graphql_router(
     last_updated_at: CanGetLastUpdatedAt,
     authentication_enabled: bool,
     span_cost_calculator: SpanCostCalculator,
+    playground_job_runner: Optional[PlaygroundJobRunner] = None,
     corpus: Optional[Model] = None,
     cache_for_dataloaders: Optional[CacheForDataLoaders] = None,
     event_queue: CanPutItem[DmlEvent],
@@ -687,6 +649,8 @@ def create_graphql_router(
         last_updated_at (CanGetLastUpdatedAt): How to get the last updated timestamp for updates.
         authentication_enabled (bool): Whether authentication is enabled.
         span_cost_calculator (SpanCostCalculator): The span cost calculator for calculating costs.
+        playground_job_runner (Optional[PlaygroundJobRunner], optional): Runs playground
+            experiments in the background. Defaults to None.
         event_queue (CanPutItem[DmlEvent]): The event queue for DML events.
         corpus (Optional[Model], optional): the corpus for UMAP projection. Defaults to None.
         cache_for_dataloaders (Optional[CacheForDataLoaders], optional): GraphQL data loaders.
@@ -707,162 +671,7 @@ def create_graphql_router(
             export_path=export_path,
             last_updated_at=last_updated_at,
             event_queue=event_queue,
-            data_loaders=DataLoaders(
-                annotation_configs_by_project=AnnotationConfigsByProjectDataLoader(db),
-                average_experiment_repeated_run_group_latency=AverageExperimentRepeatedRunGroupLatencyDataLoader(
-                    db
-                ),
-                average_experiment_run_latency=AverageExperimentRunLatencyDataLoader(db),
-                dataset_dataset_splits=DatasetDatasetSplitsDataLoader(db),
-                dataset_example_fields=TableFieldsDataLoader(db, models.DatasetExample),
-                dataset_example_revisions=DatasetExampleRevisionsDataLoader(db),
-                dataset_example_spans=DatasetExampleSpansDataLoader(db),
-                dataset_examples_and_versions_by_experiment_run=DatasetExamplesAndVersionsByExperimentRunDataLoader(
-                    db
-                ),
-                dataset_example_splits=DatasetExampleSplitsDataLoader(db),
-                dataset_fields=TableFieldsDataLoader(db, models.Dataset),
-                dataset_split_fields=TableFieldsDataLoader(db, models.DatasetSplit),
-                dataset_version_fields=TableFieldsDataLoader(db, models.DatasetVersion),
-                dataset_labels=DatasetLabelsDataLoader(db),
-                dataset_label_fields=TableFieldsDataLoader(db, models.DatasetLabel),
-                document_evaluation_summaries=DocumentEvaluationSummaryDataLoader(
-                    db,
-                    cache_map=(
-                        cache_for_dataloaders.document_evaluation_summary
-                        if cache_for_dataloaders
-                        else None
-                    ),
-                ),
-                document_annotation_fields=TableFieldsDataLoader(db, models.DocumentAnnotation),
-                document_evaluations=DocumentEvaluationsDataLoader(db),
-                document_retrieval_metrics=DocumentRetrievalMetricsDataLoader(db),
-                annotation_summaries=AnnotationSummaryDataLoader(
-                    db,
-                    cache_map=(
-                        cache_for_dataloaders.annotation_summary if cache_for_dataloaders else None
-                    ),
-                ),
-                experiment_annotation_summaries=ExperimentAnnotationSummaryDataLoader(db),
-                experiment_dataset_splits=ExperimentDatasetSplitsDataLoader(db),
-                experiment_error_rates=ExperimentErrorRatesDataLoader(db),
-                experiment_fields=TableFieldsDataLoader(db, models.Experiment),
-                experiment_repeated_run_group_annotation_summaries=ExperimentRepeatedRunGroupAnnotationSummariesDataLoader(
-                    db
-                ),
-                experiment_repeated_run_groups=ExperimentRepeatedRunGroupsDataLoader(db),
-                experiment_run_annotation_fields=TableFieldsDataLoader(
-                    db, models.ExperimentRunAnnotation
-                ),
-                experiment_run_annotations=ExperimentRunAnnotations(db),
-                experiment_run_counts=ExperimentRunCountsDataLoader(db),
-                experiment_run_fields=TableFieldsDataLoader(db, models.ExperimentRun),
-                experiment_runs_by_experiment_and_example=ExperimentRunsByExperimentAndExampleDataLoader(
-                    db
-                ),
-                experiment_sequence_number=ExperimentSequenceNumberDataLoader(db),
-                generative_model_fields=TableFieldsDataLoader(db, models.GenerativeModel),
-                last_used_times_by_generative_model_id=LastUsedTimesByGenerativeModelIdDataLoader(
-                    db
-                ),
-                latency_ms_quantile=LatencyMsQuantileDataLoader(
-                    db,
-                    cache_map=(
-                        cache_for_dataloaders.latency_ms_quantile if cache_for_dataloaders else None
-                    ),
-                ),
-                min_start_or_max_end_times=MinStartOrMaxEndTimeDataLoader(
-                    db,
-                    cache_map=(
-                        cache_for_dataloaders.min_start_or_max_end_time
-                        if cache_for_dataloaders
-                        else None
-                    ),
-                ),
-                num_child_spans=NumChildSpansDataLoader(db),
-                num_spans_per_trace=NumSpansPerTraceDataLoader(db),
-                project_fields=TableFieldsDataLoader(db, models.Project),
-                projects_by_trace_retention_policy_id=ProjectIdsByTraceRetentionPolicyIdDataLoader(
-                    db
-                ),
-                prompt_fields=TableFieldsDataLoader(db, models.Prompt),
-                prompt_label_fields=TableFieldsDataLoader(db, models.PromptLabel),
-                prompt_version_sequence_number=PromptVersionSequenceNumberDataLoader(db),
-                prompt_version_tag_fields=TableFieldsDataLoader(db, models.PromptVersionTag),
-                project_session_annotation_fields=TableFieldsDataLoader(
-                    db, models.ProjectSessionAnnotation
-                ),
-                project_session_fields=TableFieldsDataLoader(db, models.ProjectSession),
-                record_counts=RecordCountDataLoader(
-                    db,
-                    cache_map=cache_for_dataloaders.record_count if cache_for_dataloaders else None,
-                ),
-                session_annotations_by_session=SessionAnnotationsBySessionDataLoader(db),
-                session_first_inputs=SessionIODataLoader(db, "first_input"),
-                session_last_outputs=SessionIODataLoader(db, "last_output"),
-                session_num_traces=SessionNumTracesDataLoader(db),
-                session_num_traces_with_error=SessionNumTracesWithErrorDataLoader(db),
-                session_token_usages=SessionTokenUsagesDataLoader(db),
-                session_trace_latency_ms_quantile=SessionTraceLatencyMsQuantileDataLoader(db),
-                span_annotation_fields=TableFieldsDataLoader(db, models.SpanAnnotation),
-                span_annotations=SpanAnnotationsDataLoader(db),
-                span_fields=TableFieldsDataLoader(db, models.Span),
-                span_by_id=SpanByIdDataLoader(db),
-                span_cost_by_span=SpanCostBySpanDataLoader(db),
-                span_cost_detail_summary_entries_by_generative_model=SpanCostDetailSummaryEntriesByGenerativeModelDataLoader(
-                    db
-                ),
-                span_cost_detail_summary_entries_by_project_session=SpanCostDetailSummaryEntriesByProjectSessionDataLoader(
-                    db
-                ),
-                span_cost_detail_summary_entries_by_span=SpanCostDetailSummaryEntriesBySpanDataLoader(
-                    db
-                ),
-                span_cost_detail_summary_entries_by_trace=SpanCostDetailSummaryEntriesByTraceDataLoader(
-                    db
-                ),
-                span_cost_details_by_span_cost=SpanCostDetailsBySpanCostDataLoader(db),
-                span_cost_detail_fields=TableFieldsDataLoader(db, models.SpanCostDetail),
-                span_cost_fields=TableFieldsDataLoader(db, models.SpanCost),
-                span_cost_summary_by_experiment=SpanCostSummaryByExperimentDataLoader(db),
-                span_cost_summary_by_experiment_repeated_run_group=SpanCostSummaryByExperimentRepeatedRunGroupDataLoader(
-                    db
-                ),
-                span_cost_summary_by_experiment_run=SpanCostSummaryByExperimentRunDataLoader(db),
-                span_cost_summary_by_generative_model=SpanCostSummaryByGenerativeModelDataLoader(
-                    db
-                ),
-                span_cost_summary_by_project=SpanCostSummaryByProjectDataLoader(
-                    db,
-                    cache_map=cache_for_dataloaders.token_cost if cache_for_dataloaders else None,
-                ),
-                span_cost_summary_by_project_session=SpanCostSummaryByProjectSessionDataLoader(db),
-                span_cost_summary_by_trace=SpanCostSummaryByTraceDataLoader(db),
-                span_dataset_examples=SpanDatasetExamplesDataLoader(db),
-                span_descendants=SpanDescendantsDataLoader(db),
-                span_projects=SpanProjectsDataLoader(db),
-                token_counts=TokenCountDataLoader(
-                    db,
-                    cache_map=cache_for_dataloaders.token_count if cache_for_dataloaders else None,
-                ),
-                token_prices_by_model=TokenPricesByModelDataLoader(db),
-                trace_annotation_fields=TableFieldsDataLoader(db, models.TraceAnnotation),
-                trace_annotations_by_trace=TraceAnnotationsByTraceDataLoader(db),
-                trace_by_trace_ids=TraceByTraceIdsDataLoader(db),
-                trace_fields=TableFieldsDataLoader(db, models.Trace),
-                trace_retention_policy_id_by_project_id=TraceRetentionPolicyIdByProjectIdDataLoader(
-                    db
-                ),
-                project_trace_retention_policy_fields=TableFieldsDataLoader(
-                    db, models.ProjectTraceRetentionPolicy
-                ),
-                trace_root_spans=TraceRootSpansDataLoader(db),
-                project_by_name=ProjectByNameDataLoader(db),
-                users=UsersDataLoader(db),
-                user_api_key_fields=TableFieldsDataLoader(db, models.ApiKey),
-                user_fields=TableFieldsDataLoader(db, models.User),
-                user_roles=UserRolesDataLoader(db),
-            ),
+            data_loaders=DataLoaders(db, cache_for_dataloaders),
             cache_for_dataloaders=cache_for_dataloaders,
             read_only=read_only,
             auth_enabled=authentication_enabled,
@@ -870,6 +679,7 @@ def create_graphql_router(
             token_store=token_store,
             email_sender=email_sender,
             span_cost_calculator=span_cost_calculator,
+            playground_job_runner=playground_job_runner,
         )
 
     return GraphQLRouter(
@@ -992,6 +802,7 @@ def create_app(
     bulk_inserter_factory: Optional[Callable[..., BulkInserter]] = None,
     allowed_origins: Optional[list[str]] = None,
     management_url: Optional[str] = None,
+    dml_event_notifier: Optional[DmlEventNotifier] = None,
 ) -> FastAPI:
     verify_server_environment_variables()
     if model.embedding_dimensions:
@@ -1017,8 +828,12 @@ def create_app(
         )
     )
     initial_batch_of_evaluations = () if initial_evaluations is None else initial_evaluations
+    # Without a notifier, a PostgreSQL database may be shared by replicas whose changes
+    # would never invalidate the cache of this one.
     cache_for_dataloaders = (
-        CacheForDataLoaders() if db.dialect is SupportedSQLDialect.SQLITE else None
+        CacheForDataLoaders()
+        if db.dialect is SupportedSQLDialect.SQLITE or dml_event_notifier is not None
+        else None
     )
     last_updated_at = LastUpdatedAt()
     middlewares: list[Middleware] = [Middleware(HeadersMiddleware)]
@@ -1052,20 +867,36 @@ def create_app(
         db=db,
         cache_for_dataloaders=cache_for_dataloaders,
         last_updated_at=last_updated_at,
+        notifier=dml_event_notifier,
     )
     trace_data_sweeper = TraceDataSweeper(
         db=db,
         dml_event_handler=dml_event_handler,
+        batch_size=get_env_trace_retention_batch_size(),
+        batch_pause_seconds=get_env_trace_retention_batch_pause_seconds(),
     )
     generative_model_store = GenerativeModelStore(db)
     span_cost_calculator = SpanCostCalculator(db, generative_model_store)
+    playground_job_runner = PlaygroundJobRunner(db)
+    cumulative_counts_rollup = (
+        CumulativeCountsRollup(
+            db,
+            event_queue=dml_event_handler,
+            sleep_seconds=get_env_cumulative_counts_rollup_interval_seconds(),
+        )
+        if get_env_cumulative_counts_consistency() is CumulativeCountsConsistency.EVENTUAL
+        else None
+    )
     bulk_inserter = bulk_inserter_factory(
         db,
         span_cost_calculator=span_cost_calculator,
+        cumulative_counts_rollup=cumulative_counts_rollup,
         event_queue=dml_event_handler,
         initial_batch_of_spans=initial_batch_of_spans,
         initial_batch_of_evaluations=initial_batch_of_evaluations,
         max_spans_queue_size=get_env_max_spans_queue_size(),
+        max_annotations_queue_size=get_env_max_annotations_queue_size(),
+        span_spool=SpanSpool(spool_dir) if (spool_dir := get_env_span_spool_dir()) else None,
     )
     tracer_provider = None
     graphql_schema_extensions: list[Union[type[SchemaExtension], SchemaExtension]] = []
@@ -1105,6 +936,7 @@ def create_app(
         token_store=token_store,
         email_sender=email_sender,
         span_cost_calculator=span_cost_calculator,
+        playground_job_runner=playground_job_runner,
     )
     if enable_prometheus:
         from phoenix.server.prometheus import PrometheusMiddleware
@@ -1124,6 +956,13 @@ def create_app(
             span_cost_calculator=span_cost_calculator,
             generative_model_store=generative_model_store,
             db_disk_usage_monitor=DbDiskUsageMonitor(db, email_sender),
+            playground_job_runner=playground_job_runner,
+            cumulative_counts_rollup=cumulative_counts_rollup,
+            otlp_decoder_pool=(
+                OtlpDecoderPool(num_workers)
+                if (num_workers := get_env_otlp_decode_workers())
+                else None
+            ),
             grpc_interceptors=grpc_interceptors,
             token_store=token_store,
             tracer_provider=tracer_provider,
@@ -1198,6 +1037,7 @@ def create_app(
     app.state.email_sender = email_sender
     app.state.span_cost_calculator = span_cost_calculator
     app.state.span_queue_is_full = lambda: bulk_inserter.is_full
+    app.state.annotation_queue_is_full = lambda table: bulk_inserter.annotation_queue_is_full(table)
     app = _add_get_secret_method(app=app, secret=secret)
     app = _add_get_token_store_method(app=app, token_store=token_store)
     if tracer_provider:
@@ -1,17 +1,30 @@
+import re
+import sys
+from bisect import bisect_right
 from datetime import datetime
 from typing import Any, Iterable, Mapping, Optional
 
+from cachetools import LRUCache
 from openinference.semconv.trace import SpanAttributes
 from typing_extensions import TypeAlias
 
 from phoenix.datetime_utils import is_timezone_aware
 from phoenix.db import models
 from phoenix.server.cost_tracking import regex_specificity
+from phoenix.server.prometheus import COST_MODEL_LOOKUPS
 from phoenix.trace.attributes import get_attribute_value
 
+if sys.version_info >= (3, 11):
+    import re._parser as _regex_parser  # type: ignore[import-not-found]
+else:
+    import sre_parse as _regex_parser
+
 _RegexPatternStr: TypeAlias = str
 _RegexSpecificityScore: TypeAlias = int
 _TieBreakerId: TypeAlias = int
+_ModelName: TypeAlias = str
+_Provider: TypeAlias = str
+_StartTimeBucket: TypeAlias = int
 
 
 class CostModelLookup:
@@ -23,9 +36,19 @@ class CostModelLookup:
         self._model_priority: dict[
             int, tuple[_RegexSpecificityScore, float, _TieBreakerId]
         ] = {}  # higher is better
+        # literals one of which a model name must contain to match the model's pattern
+        self._required_literals: dict[int, Optional[tuple[str, ...]]] = {}
+        # distinct start times of the models, which bound the intervals of span start times
+        # over which the set of active models is the same
+        self._start_times: list[datetime] = []
+        self._resolved: LRUCache[
+            tuple[_ModelName, _Provider, _StartTimeBucket],
+            Optional[models.GenerativeModel],
+        ] = LRUCache(maxsize=10_000)
 
         for m in generative_models:
             self._add_or_update_model(m)
+        self._reindex()
 
     def _add_or_update_model(self, model: models.GenerativeModel) -> None:
         """Add or update a single model in the lookup."""
@@ -42,6 +65,7 @@ class CostModelLookup:
             model.start_time.timestamp() if model.start_time else 0.0,
             tie_breaker,
         )
+        self._required_literals[model.id] = _required_literals(model.name_pattern)
 
     def _remove_model(self, model_id: int) -> None:
         """Remove a model from the lookup."""
@@ -49,6 +73,14 @@ class CostModelLookup:
             del self._models_by_id[model_id]
         if model_id in self._model_priority:
             del self._model_priority[model_id]
+        self._required_literals.pop(model_id, None)
+
+    def _reindex(self) -> None:
+        """Rebuild the start time intervals and forget resolved models after a change."""
+        self._start_times = sorted(
+            {model.start_time for model in self._models_by_id.values() if model.start_time}
+        )
+        self._resolved.clear()
 
     def merge(self, models: Iterable[models.GenerativeModel]) -> None:
         """
@@ -58,14 +90,20 @@ class CostModelLookup:
         - If deleted_at is set, remove it from the lookup
         - Otherwise, add or update it in the lookup
 
+        Models resolved by previous lookups are forgotten if any model is merged.
+
         Args:
             models: An iterable of GenerativeModel objects to merge
         """
+        merged = False
         for model in models:
+            merged = True
             if model.deleted_at is not None:
                 self._remove_model(model.id)
             else:
                 self._add_or_update_model(model)
+        if merged:
+            self._reindex()
 
     def find_model(
         self,
@@ -132,11 +170,36 @@ class CostModelLookup:
         if not model_name:
             return None
 
-        # 2. only include models that are active and match the regex pattern
+        provider = str(get_attribute_value(attributes, SpanAttributes.LLM_PROVIDER) or "").strip()
+
+        # the result only depends on the model name, the provider, and which models are active,
+        # so it is the same for all start times between two consecutive model start times
+        key = (model_name, provider, bisect_right(self._start_times, start_time))
+        try:
+            model = self._resolved[key]
+        except KeyError:
+            COST_MODEL_LOOKUPS.labels(result="miss").inc()
+            model = self._resolved[key] = self._resolve(start_time, model_name, provider)
+        else:
+            COST_MODEL_LOOKUPS.labels(result="hit").inc()
+        return model
+
+    def _resolve(
+        self,
+        start_time: datetime,
+        model_name: str,
+        provider: str,
+    ) -> Optional[models.GenerativeModel]:
+        # 2. only include models that are active and match the regex pattern, skipping the
+        # regex for models whose pattern requires literals that the model name lacks
         candidates = [
             model
             for model in self._models_by_id.values()
             if (not model.start_time or model.start_time <= start_time)
+            and (
+                (literals := self._required_literals.get(model.id)) is None
+                or any(literal in model_name for literal in literals)
+            )
             and model.name_pattern.search(model_name)
         ]
         if not candidates:
@@ -146,8 +209,6 @@ class CostModelLookup:
         if len(candidates) == 1:
             return candidates[0]
 
-        provider = str(get_attribute_value(attributes, SpanAttributes.LLM_PROVIDER) or "").strip()
-
         # 4. priority-based selection: user-defined models first, then built-in models
         for is_built_in in (False, True):  # False = user-defined, True = built-in
             # get candidates for current tier (user-defined or built-in)
@@ -177,3 +238,46 @@ class CostModelLookup:
 
         # 7. no suitable model found
         return None
+
+
+def _required_literals(pattern: "re.Pattern[str]") -> Optional[tuple[str, ...]]:
+    """
+    Returns literals one of which every string matched by the pattern must contain, derived
+    from the literal characters the pattern (or each of its top-level alternatives) starts
+    with, or None if there are no such literals. Case-insensitive patterns are not analyzed,
+    since case folding can match characters that differ in both upper and lower case.
+    """
+    if pattern.flags & re.IGNORECASE:
+        return None
+    try:
+        parsed = _regex_parser.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    literals = _leading_literals(list(parsed))
+    return tuple(literals) if literals else None
+
+
+def _leading_literals(items: list[Any]) -> Optional[list[str]]:
+    chars: list[str] = []
+    for op, av in items:
+        if op is _regex_parser.AT and not chars:
+            continue  # anchors and word boundaries match no characters
+        if op is _regex_parser.LITERAL:
+            chars.append(chr(av))
+            continue
+        if chars:
+            break
+        if op is _regex_parser.BRANCH:
+            alternatives: list[str] = []
+            for branch in av[1]:
+                if not (literals := _leading_literals(list(branch))):
+                    return None
+                alternatives.extend(literals)
+            return alternatives
+        if op is _regex_parser.SUBPATTERN:
+            _, add_flags, del_flags, subpattern = av
+            if add_flags or del_flags:
+                return None
+            return _leading_literals(list(subpattern))
+        return None
+    return ["".join(chars)] if chars else None
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+from asyncio import CancelledError, gather, sleep
+from time import perf_counter
+from typing import Optional
+
+from typing_extensions import TypeAlias
+
+from phoenix.db.insertion.cumulative_counts import recompute_cumulative_counts
+from phoenix.server.dml_event import DmlEvent, SpanInsertEvent
+from phoenix.server.prometheus import (
+    CUMULATIVE_COUNTS_ROLLUP_DIRTY_TRACES,
+    CUMULATIVE_COUNTS_ROLLUP_TIME,
+)
+from phoenix.server.types import CanPutItem, DaemonTask, DbSessionFactory
+
+logger = logging.getLogger(__name__)
+
+_TraceRowId: TypeAlias = int
+
+
+class CumulativeCountsRollup(DaemonTask):
+    """
+    Recomputes the cumulative error and token counts of the spans of recently
+    modified traces in the background.
+
+    Instead of updating every ancestor each time a span is inserted, the inserter
+    marks the trace as dirty, and the rollup recomputes each dirty trace in one
+    bottom-up pass, regardless of how many of its spans arrived in the meantime.
+    """
+
+    def __init__(
+        self,
+        db: DbSessionFactory,
+        *,
+        event_queue: Optional[CanPutItem[DmlEvent]] = None,
+        sleep_seconds: float = 5,
+        max_traces_per_transaction: int = 1000,
+    ) -> None:
+        super().__init__()
+        self._db = db
+        self._event_queue = event_queue
+        self._sleep_seconds = sleep_seconds
+        self._max_traces_per_transaction = max_traces_per_transaction
+        # A dict is used as an insertion-ordered set, so that the oldest dirty
+        # traces are recomputed first.
+        self._dirty: dict[_TraceRowId, None] = {}
+
+    @property
+    def empty(self) -> bool:
+        return not self._dirty
+
+    def put_nowait(self, *trace_rowids: _TraceRowId) -> None:
+        self._dirty.update(dict.fromkeys(trace_rowids))
+        CUMULATIVE_COUNTS_ROLLUP_DIRTY_TRACES.set(len(self._dirty))
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks)
+        await super().stop()
+        await gather(*tasks, return_exceptions=True)
+        # Drains the traces that are still dirty, so that a graceful shutdown does not
+        # leave their cumulative counts stale until they are repaired by hand.
+        while self._dirty:
+            if not await self.flush():
+                logger.error(
+                    f"Cumulative counts of {len(self._dirty)} traces were not recomputed "
+                    "before shutdown"
+                )
+                break
+
+    async def _run(self) -> None:
+        while self._running:
+            await sleep(self._sleep_seconds)
+            while self._dirty:
+                if not await self.flush():
+                    await sleep(self._sleep_seconds)
+
+    async def flush(self) -> bool:
+        """
+        Recomputes the oldest batch of dirty traces. Traces that fail to be recomputed
+        are marked as dirty again to be retried on the next run.
+
+        Returns whether the batch was recomputed.
+        """
+        trace_rowids = list(self._dirty)[: self._max_traces_per_transaction]
+        for trace_rowid in trace_rowids:
+            self._dirty.pop(trace_rowid, None)
+        CUMULATIVE_COUNTS_ROLLUP_DIRTY_TRACES.set(len(self._dirty))
+        if not trace_rowids:
+            return True
+        start = perf_counter()
+        try:
+            async with self._db() as session:
+                project_rowids = await recompute_cumulative_counts(session, trace_rowids)
+        except CancelledError:
+            self.put_nowait(*trace_rowids)
+            raise
+        except Exception:
+            logger.exception("Failed to recompute cumulative counts")
+            self.put_nowait(*trace_rowids)
+            return False
+        CUMULATIVE_COUNTS_ROLLUP_TIME.observe(perf_counter() - start)
+        if project_rowids and self._event_queue is not None:
+            self._event_queue.put(SpanInsertEvent(tuple(project_rowids)))
+        return True
@@ -0,0 +1,415 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Iterable, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Protocol
+
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.orm import load_only
+from strawberry.relay import GlobalID
+from typing_extensions import TypeAlias
+
+from phoenix.db import models
+from phoenix.evals.executors import ConcurrencyController
+from phoenix.server.api.exceptions import Conflict
+from phoenix.server.api.types.ChatCompletionSubscriptionPayload import (
+    ChatCompletionSubscriptionError,
+    ChatCompletionSubscriptionPayload,
+)
+from phoenix.server.api.types.DatasetExample import DatasetExample
+from phoenix.server.types import DaemonTask, DbSessionFactory
+
+logger = logging.getLogger(__name__)
+
+DatasetExampleID: TypeAlias = GlobalID
+ChatCompletionResult: TypeAlias = tuple[
+    DatasetExampleID, Optional[models.Span], models.ExperimentRun
+]
+ChatStream: TypeAlias = AsyncGenerator[ChatCompletionSubscriptionPayload, None]
+JobItem: TypeAlias = tuple[models.DatasetExampleRevision, int]
+"""A dataset example revision and the repetition number to run it for."""
+
+
+class RunExample(Protocol):
+    def __call__(
+        self,
+        *,
+        revision: models.DatasetExampleRevision,
+        repetition_number: int,
+        results: asyncio.Queue[ChatCompletionResult],
+    ) -> ChatStream: ...
+
+
+class WriteResults(Protocol):
+    def __call__(self, *, results: Sequence[ChatCompletionResult]) -> ChatStream: ...
+
+
+_MAX_CONCURRENCY = 20
+_INITIAL_CONCURRENCY = 3
+_TIMEOUT_IN_SECONDS = 90
+_WRITE_BATCH_SIZE = 10
+_WRITE_INTERVAL_IN_SECONDS = 10
+_HEARTBEAT_INTERVAL_IN_SECONDS = 60
+_STALE_AFTER = timedelta(minutes=5)
+"""
+A job that is marked as running but has not been touched for this long is assumed to have
+been abandoned by a server process that exited without cleaning up.
+"""
+
+
+class PlaygroundJob:
+    """
+    Runs a playground prompt over dataset examples with adaptive concurrency and records the
+    results as experiment runs. Progress is published to any number of subscribers, and the job
+    keeps running when they go away.
+    """
+
+    def __init__(
+        self,
+        *,
+        experiment_id: int,
+        items: Iterable[JobItem],
+        run_example: RunExample,
+        write_results: WriteResults,
+        db: DbSessionFactory,
+    ) -> None:
+        self.experiment_id = experiment_id
+        self._items = deque(items)
+        self._run_example = run_example
+        self._write_results = write_results
+        self._db = db
+        self._subscribers: set[asyncio.Queue[Optional[ChatCompletionSubscriptionPayload]]] = set()
+        self._done = False
+        self._controller = ConcurrencyController(
+            max_concurrency=_MAX_CONCURRENCY,
+            initial_target=_INITIAL_CONCURRENCY,
+        )
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def subscribe(self) -> AsyncIterator[ChatCompletionSubscriptionPayload]:
+        """
+        Returns the progress events published from now on until the job finishes.
+        """
+        queue: asyncio.Queue[Optional[ChatCompletionSubscriptionPayload]] = asyncio.Queue()
+        if self._done:
+            queue.put_nowait(None)
+        else:
+            self._subscribers.add(queue)
+        return self._consume(queue)
+
+    async def _consume(
+        self, queue: asyncio.Queue[Optional[ChatCompletionSubscriptionPayload]]
+    ) -> AsyncIterator[ChatCompletionSubscriptionPayload]:
+        try:
+            while (payload := await queue.get()) is not None:
+                yield payload
+        finally:
+            self._subscribers.discard(queue)
+
+    def _publish(self, payload: Optional[ChatCompletionSubscriptionPayload]) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(payload)
+
+    async def run(self) -> None:
+        try:
+            status, error = "COMPLETED", None
+            try:
+                await self._run()
+            except Exception as e:
+                logger.exception(e)
+                status, error = "FAILED", str(e)
+            async with self._db() as session:
+                await session.execute(
+                    update(models.ExperimentJob)
+                    .where(models.ExperimentJob.experiment_id == self.experiment_id)
+                    .values(status=status, error=error)
+                )
+        finally:
+            self._done = True
+            self._publish(None)
+            self._subscribers.clear()
+
+    async def _run(self) -> None:
+        results: asyncio.Queue[ChatCompletionResult] = asyncio.Queue()
+        running: set[asyncio.Task[None]] = set()
+        write: Optional[asyncio.Task[None]] = None
+        last_write_time = time.monotonic()
+        try:
+            while self._items or running:
+                while self._items and len(running) < self._controller.target_concurrency:
+                    revision, repetition_number = self._items.popleft()
+                    running.add(
+                        asyncio.create_task(self._run_item(revision, repetition_number, results))
+                    )
+                done, _ = await asyncio.wait(
+                    [*running, *([write] if write else [])],
+                    timeout=self._controller.inactive_check_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                running.difference_update(done)
+                if write is not None and write.done():
+                    write.result()
+                    write = None
+                if (
+                    write is None
+                    and not results.empty()
+                    and (
+                        results.qsize() >= _WRITE_BATCH_SIZE
+                        or time.monotonic() - last_write_time > _WRITE_INTERVAL_IN_SECONDS
+                    )
+                ):
+                    write = asyncio.create_task(self._write(_drain_no_wait(results)))
+                    last_write_time = time.monotonic()
+        finally:
+            for task in running:
+                task.cancel()
+            # The results received so far are recorded even when the job is cancelled, e.g.
+            # on shutdown, so that resuming the job does not run them again.
+            if write is not None:
+                await write
+            if remaining_results := _drain_no_wait(results):
+                await self._write(remaining_results)
+
+    async def _run_item(
+        self,
+        revision: models.DatasetExampleRevision,
+        repetition_number: int,
+        results: asyncio.Queue[ChatCompletionResult],
+    ) -> None:
+        example_id = GlobalID(DatasetExample.__name__, str(revision.dataset_example_id))
+        stream = self._run_example(
+            revision=revision,
+            repetition_number=repetition_number,
+            results=results,
+        )
+        start_time = time.monotonic()
+        failed = False
+        try:
+            while True:
+                try:
+                    payload = await asyncio.wait_for(stream.__anext__(), _TIMEOUT_IN_SECONDS)
+                except StopAsyncIteration:
+                    break
+                failed = failed or isinstance(payload, ChatCompletionSubscriptionError)
+                self._publish(payload)
+        except asyncio.TimeoutError:
+            self._controller.record_timeout()
+            self._publish(
+                ChatCompletionSubscriptionError(
+                    message="Playground task timed out",
+                    dataset_example_id=example_id,
+                    repetition_number=repetition_number,
+                )
+            )
+            return
+        except Exception as error:
+            self._controller.record_error()
+            self._publish(
+                ChatCompletionSubscriptionError(
+                    message="An unexpected error occurred",
+                    dataset_example_id=example_id,
+                    repetition_number=repetition_number,
+                )
+            )
+            logger.exception(error)
+            return
+        if failed:
+            self._controller.record_error()
+        else:
+            self._controller.record_success(time.monotonic() - start_time)
+
+    async def _write(self, results: Sequence[ChatCompletionResult]) -> None:
+        async for payload in self._write_results(results=results):
+            self._publish(payload)
+        async with self._db() as session:
+            await session.execute(
+                update(models.ExperimentJob)
+                .where(models.ExperimentJob.experiment_id == self.experiment_id)
+                .values(completed_count=models.ExperimentJob.completed_count + len(results))
+            )
+
+
+class PlaygroundJobRunner(DaemonTask):
+    """
+    Runs playground jobs in the background of the server, independently of the subscriptions
+    that started them, and keeps the persisted status of the jobs up to date.
+    """
+
+    def __init__(self, db: DbSessionFactory) -> None:
+        super().__init__()
+        self._db = db
+        self._jobs: dict[int, PlaygroundJob] = {}
+
+    def get(self, experiment_id: int) -> Optional[PlaygroundJob]:
+        """
+        Returns the job of the experiment if it is running in this process.
+        """
+        return self._jobs.get(experiment_id)
+
+    async def create(
+        self,
+        experiment: models.Experiment,
+        *,
+        items: Sequence[JobItem],
+        run_example: RunExample,
+        write_results: WriteResults,
+    ) -> PlaygroundJob:
+        async with self._db() as session:
+            session.add(
+                models.ExperimentJob(
+                    experiment_id=experiment.id,
+                    status="RUNNING",
+                    total_count=len(items),
+                    completed_count=0,
+                )
+            )
+        return self._start(experiment.id, items, run_example, write_results)
+
+    async def resume(
+        self,
+        experiment: models.Experiment,
+        *,
+        run_example: RunExample,
+        write_results: WriteResults,
+    ) -> Optional[PlaygroundJob]:
+        """
+        Resumes the job of the experiment by running the examples and repetitions that do not
+        have an experiment run yet. Returns None if there is nothing left to run.
+        """
+        if job := self._jobs.get(experiment.id):
+            return job
+        async with self._db() as session:
+            if (
+                record := await session.scalar(
+                    select(models.ExperimentJob).filter_by(experiment_id=experiment.id)
+                )
+            ) is None:
+                raise Conflict("The experiment was not run from the playground")
+            if (
+                record.status == "RUNNING"
+                and datetime.now(timezone.utc) - record.updated_at < _STALE_AFTER
+            ):
+                raise Conflict("The experiment is being run by another server")
+            revisions = (
+                await session.scalars(get_experiment_example_revisions(experiment.id))
+            ).all()
+            completed = set(
+                (
+                    await session.execute(
+                        select(
+                            models.ExperimentRun.dataset_example_id,
+                            models.ExperimentRun.repetition_number,
+                        ).where(models.ExperimentRun.experiment_id == experiment.id)
+                    )
+                ).tuples()
+            )
+            items = [
+                (revision, repetition_number)
+                for revision in revisions
+                for repetition_number in range(1, experiment.repetitions + 1)
+                if (revision.dataset_example_id, repetition_number) not in completed
+            ]
+            record.status = "RUNNING" if items else "COMPLETED"
+            record.error = None
+            record.total_count = len(revisions) * experiment.repetitions
+            record.completed_count = len(completed)
+        if not items:
+            return None
+        return self._start(experiment.id, items, run_example, write_results)
+
+    def _start(
+        self,
+        experiment_id: int,
+        items: Iterable[JobItem],
+        run_example: RunExample,
+        write_results: WriteResults,
+    ) -> PlaygroundJob:
+        job = PlaygroundJob(
+            experiment_id=experiment_id,
+            items=items,
+            run_example=run_example,
+            write_results=write_results,
+            db=self._db,
+        )
+        self._jobs[experiment_id] = job
+        task = asyncio.create_task(job.run())
+        self._tasks.append(task)
+
+        def done(_: asyncio.Task[None]) -> None:
+            self._jobs.pop(experiment_id, None)
+            if task in self._tasks:
+                self._tasks.remove(task)
+
+        task.add_done_callback(done)
+        return job
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks)
+        if experiment_ids := list(self._jobs):
+            try:
+                async with self._db() as session:
+                    await session.execute(
+                        update(models.ExperimentJob)
+                        .where(models.ExperimentJob.experiment_id.in_(experiment_ids))
+                        .values(status="INTERRUPTED")
+                    )
+            except Exception as e:
+                logger.exception(e)
+        await super().stop()
+        # Waits for the cancelled jobs to record the results they have already received.
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._jobs.clear()
+
+    async def _run(self) -> None:
+        while self._running:
+            await asyncio.sleep(_HEARTBEAT_INTERVAL_IN_SECONDS)
+            if not (experiment_ids := list(self._jobs)):
+                continue
+            try:
+                async with self._db() as session:
+                    await session.execute(
+                        update(models.ExperimentJob)
+                        .where(models.ExperimentJob.experiment_id.in_(experiment_ids))
+                        .values(updated_at=func.now())
+                    )
+            except Exception as e:
+                logger.exception(e)
+
+
+def get_experiment_example_revisions(
+    experiment_id: int,
+) -> Select[tuple[models.DatasetExampleRevision]]:
+    """
+    Returns the example revisions in the snapshot of the experiment, ordered by example.
+    """
+    return (
+        select(models.DatasetExampleRevision)
+        .join(
+            models.ExperimentDatasetExample,
+            models.ExperimentDatasetExample.dataset_example_revision_id
+            == models.DatasetExampleRevision.id,
+        )
+        .where(models.ExperimentDatasetExample.experiment_id == experiment_id)
+        .order_by(models.DatasetExampleRevision.dataset_example_id.asc())
+        .options(
+            load_only(
+                models.DatasetExampleRevision.dataset_example_id,
+                models.DatasetExampleRevision.input,
+            )
+        )
+    )
+
+
+def _drain_no_wait(queue: asyncio.Queue[ChatCompletionResult]) -> list[ChatCompletionResult]:
+    values: list[ChatCompletionResult] = []
+    while True:
+        try:
+            values.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return values
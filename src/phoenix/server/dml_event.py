@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, field
-from typing import ClassVar
+from datetime import datetime
+from typing import ClassVar, Optional
 
 from phoenix.db import models
 
@@ -42,7 +44,65 @@ class SpanDmlEvent(ProjectDmlEvent): ...
 
 
 @dataclass(frozen=True)
-class SpanInsertEvent(SpanDmlEvent): ...
+class InsertedSpans:
+    """
+    Summary of the spans inserted into a project by a single transaction, from which
+    cached aggregates of the project can be brought up to date without recomputing them.
+    """
+
+    started_at: float
+    """
+    A `time.perf_counter()` reading taken before the transaction started. Any cached
+    result settled before then cannot have seen the inserted spans.
+    """
+    min_time: datetime
+    """The earliest start time of the traces that the inserted spans belong to."""
+    max_time: datetime
+    """The latest end time of the traces that the inserted spans belong to."""
+    spans: tuple[tuple[datetime, int, int], ...]
+    """The start time and the prompt and completion token counts of each inserted span."""
+
+    def overlaps(self, start: Optional[datetime], end: Optional[datetime]) -> bool:
+        """
+        Whether the right-exclusive time interval can contain anything affected by the
+        insertion, including traces whose start or end times moved to accommodate the
+        inserted spans.
+        """
+        return (start is None or start <= self.max_time) and (end is None or self.min_time < end)
+
+    def num_spans(self, start: Optional[datetime], end: Optional[datetime]) -> int:
+        """The number of inserted spans that start within the right-exclusive interval."""
+        return sum(1 for _ in self._spans_in(start, end))
+
+    def token_counts(self, start: Optional[datetime], end: Optional[datetime]) -> tuple[int, int]:
+        """
+        The total prompt and completion token counts of the inserted spans that start
+        within the right-exclusive interval.
+        """
+        prompt = completion = 0
+        for _, llm_token_count_prompt, llm_token_count_completion in self._spans_in(start, end):
+            prompt += llm_token_count_prompt
+            completion += llm_token_count_completion
+        return prompt, completion
+
+    def _spans_in(
+        self,
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> Iterator[tuple[datetime, int, int]]:
+        for span in self.spans:
+            start_time = span[0]
+            if (start is None or start <= start_time) and (end is None or start_time < end):
+                yield span
+
+
+@dataclass(frozen=True)
+class SpanInsertEvent(SpanDmlEvent):
+    inserted_spans: Mapping[int, InsertedSpans] = field(default_factory=dict, hash=False)
+    """
+    When available, a summary of the inserted spans keyed by project rowid, which allows
+    cached aggregates of those projects to be updated incrementally instead of cleared.
+    """
 
 
 @dataclass(frozen=True)
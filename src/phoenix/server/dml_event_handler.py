@@ -26,8 +26,10 @@ from phoenix.server.dml_event import (
     SpanAnnotationDmlEvent,
     SpanDeleteEvent,
     SpanDmlEvent,
+    SpanInsertEvent,
     TraceAnnotationDmlEvent,
 )
+from phoenix.server.dml_event_notifier import DmlEventNotifier
 from phoenix.server.types import (
     BatchedCaller,
     CanSetLastUpdatedAt,
@@ -113,7 +115,7 @@ class _GenericDmlEventHandler(_DmlEventHandler[DmlEvent]):
 class _SpanDmlEventHandler(_DmlEventHandler[SpanDmlEvent]):
     async def __call__(self) -> None:
         if cache := self._cache_for_dataloaders:
-            for id_ in set(chain.from_iterable(e.ids for e in self._batch)):
+            for id_ in set(chain.from_iterable(map(_ids_to_clear, self._batch))):
                 self._clear(cache, id_)
 
     @staticmethod
@@ -125,6 +127,29 @@ class _SpanDmlEventHandler(_DmlEventHandler[SpanDmlEvent]):
         cache.min_start_or_max_end_time.invalidate(project_id)
 
 
+def _ids_to_clear(event: SpanDmlEvent) -> Iterator[int]:
+    # Projects for which the inserted spans are known are handled incrementally by
+    # _SpanInsertEventHandler instead.
+    inserted_spans = event.inserted_spans if isinstance(event, SpanInsertEvent) else {}
+    return (id_ for id_ in event.ids if id_ not in inserted_spans)
+
+
+class _SpanInsertEventHandler(_DmlEventHandler[SpanInsertEvent]):
+    async def __call__(self) -> None:
+        if cache := self._cache_for_dataloaders:
+            for e in self._batch:
+                for project_id, inserted_spans in e.inserted_spans.items():
+                    cache.latency_ms_quantile.update_with_inserted_spans(project_id, inserted_spans)
+                    cache.token_count.update_with_inserted_spans(project_id, inserted_spans)
+                    cache.record_count.update_with_inserted_spans(project_id, inserted_spans)
+                    cache.min_start_or_max_end_time.update_with_inserted_spans(
+                        project_id, inserted_spans
+                    )
+                    # Costs are calculated and written asynchronously after the spans
+                    # are inserted, so they cannot be derived from the inserted spans.
+                    cache.token_cost.invalidate(project_id)
+
+
 class _SpanDeleteEventHandler(_SpanDmlEventHandler):
     @staticmethod
     def _clear(cache: CacheForDataLoaders, project_id: int) -> None:
@@ -226,7 +251,13 @@ class DmlEventHandler:
         last_updated_at: CanSetLastUpdatedAt,
         cache_for_dataloaders: Optional[CacheForDataLoaders] = None,
         sleep_seconds: float = 0.1,
+        notifier: Optional[DmlEventNotifier] = None,
     ) -> None:
+        """
+        :param notifier: If provided, events are also published to other server replicas
+        sharing the same database, and events published by those replicas are handled as
+        if they had been put here.
+        """
         kwargs = _HandlerParams(
             db=db,
             last_updated_at=last_updated_at,
@@ -236,22 +267,35 @@ class DmlEventHandler:
         self._handlers: Mapping[type[DmlEvent], Iterable[_DmlEventHandler[Any]]] = {
             DmlEvent: [_GenericDmlEventHandler(**kwargs)],
             SpanDmlEvent: [_SpanDmlEventHandler(**kwargs)],
+            SpanInsertEvent: [_SpanInsertEventHandler(**kwargs)],
             SpanDeleteEvent: [_SpanDeleteEventHandler(**kwargs)],
             SpanAnnotationDmlEvent: [_SpanAnnotationDmlEventHandler(**kwargs)],
             TraceAnnotationDmlEvent: [_TraceAnnotationDmlEventHandler(**kwargs)],
             DocumentAnnotationDmlEvent: [_DocumentAnnotationDmlEventHandler(**kwargs)],
         }
         self._all_handlers = frozenset(chain.from_iterable(self._handlers.values()))
+        self._notifier = notifier
+        if notifier:
+            notifier.subscribe(self._dispatch)
 
     async def __aenter__(self) -> None:
         await gather(*(h.start() for h in self._all_handlers))
+        if self._notifier:
+            await self._notifier.__aenter__()
 
     async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        if self._notifier:
+            await self._notifier.__aexit__(*args, **kwargs)
         await gather(*(h.stop() for h in self._all_handlers))
 
     def put(self, event: DmlEvent) -> None:
         if not (isinstance(event, DmlEvent) and event):
             return
+        if self._notifier:
+            self._notifier.publish(event)
+        self._dispatch(event)
+
+    def _dispatch(self, event: DmlEvent) -> None:
         for cls in getmro(type(event)):
             if not (issubclass(cls, DmlEvent) and (handlers := self._handlers.get(cls))):
                 continue
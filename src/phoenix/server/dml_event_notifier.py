@@ -0,0 +1,194 @@
+"""
+Notifiers relay DML events between server replicas sharing the same database, so that
+each replica can invalidate its own caches in response to changes made by the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache
+from typing import Any, Optional
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from phoenix.server.dml_event import DmlEvent
+from phoenix.server.types import DaemonTask
+
+logger = logging.getLogger(__name__)
+
+_MAX_IDS_PER_PAYLOAD = 500
+"""
+Keeps each payload well below the 8000-byte limit of a Postgres notification.
+"""
+
+
+def encode_dml_events(events: Iterable[DmlEvent], sender: str) -> Iterator[str]:
+    """
+    Encodes DML events as JSON payloads, merging the ids of events of the same type.
+    Details that only make sense within the originating replica, such as the summary of
+    inserted spans, are dropped.
+    """
+    ids_by_type: dict[str, set[int]] = {}
+    for event in events:
+        ids_by_type.setdefault(type(event).__name__, set()).update(event.ids)
+    for type_name, ids in ids_by_type.items():
+        sorted_ids = sorted(ids)
+        for i in range(0, len(sorted_ids), _MAX_IDS_PER_PAYLOAD):
+            yield json.dumps(
+                {
+                    "sender": sender,
+                    "type": type_name,
+                    "ids": sorted_ids[i : i + _MAX_IDS_PER_PAYLOAD],
+                }
+            )
+
+
+def decode_dml_event(payload: str) -> tuple[str, Optional[DmlEvent]]:
+    """
+    Decodes a payload produced by `encode_dml_events`, returning the sender and the event,
+    or None if the event type is unknown, e.g. when sent by a newer version of Phoenix.
+    """
+    data = json.loads(payload)
+    if (cls := _dml_event_types().get(data["type"])) is None:
+        return data["sender"], None
+    return data["sender"], cls(ids=tuple(data["ids"]))
+
+
+@cache
+def _dml_event_types() -> dict[str, type[DmlEvent]]:
+    types: dict[str, type[DmlEvent]] = {}
+    stack: list[type[DmlEvent]] = [DmlEvent]
+    while stack:
+        cls = stack.pop()
+        types[cls.__name__] = cls
+        stack.extend(cls.__subclasses__())
+    return types
+
+
+class DmlEventNotifier(ABC):
+    """
+    Publishes the DML events of this replica to the other replicas, and delivers the DML
+    events of the other replicas to the subscribers of this replica.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._id = uuid4().hex
+        self._subscribers: list[Callable[[DmlEvent], None]] = []
+
+    def subscribe(self, callback: Callable[[DmlEvent], None]) -> None:
+        self._subscribers.append(callback)
+
+    @abstractmethod
+    def publish(self, event: DmlEvent) -> None:
+        """Sends an event to the other replicas without blocking."""
+        ...
+
+    def _receive(self, payload: str) -> None:
+        try:
+            sender, event = decode_dml_event(payload)
+        except Exception:
+            logger.exception(f"Failed to decode DML event notification: {payload}")
+            return
+        if sender == self._id or event is None:
+            return
+        for callback in self._subscribers:
+            callback(event)
+
+    async def __aenter__(self) -> None:
+        pass
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class InProcessDmlEventNotifier(DmlEventNotifier):
+    """
+    Relays events between notifiers in the same process that share a channel, which
+    stands in for the database when testing multiple replicas.
+    """
+
+    def __init__(self, channel: list[InProcessDmlEventNotifier]) -> None:
+        super().__init__()
+        self._channel = channel
+        channel.append(self)
+
+    def publish(self, event: DmlEvent) -> None:
+        for payload in encode_dml_events([event], self._id):
+            for notifier in self._channel:
+                notifier._receive(payload)
+
+
+class PostgresDmlEventNotifier(DmlEventNotifier, DaemonTask):
+    """
+    Relays events between replicas through Postgres LISTEN/NOTIFY on a dedicated
+    connection. Events published in quick succession are merged into as few notifications
+    as possible. Notifications sent while the connection is down are missed, in which
+    case cached results can remain stale until they expire.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        channel: str = "phoenix_dml_events",
+        retry_seconds: float = 1,
+    ) -> None:
+        super().__init__()
+        self._engine = engine
+        self._channel = channel
+        self._retry_seconds = retry_seconds
+        self._queue: asyncio.Queue[DmlEvent] = asyncio.Queue()
+        self._listening = asyncio.Event()
+
+    def publish(self, event: DmlEvent) -> None:
+        self._queue.put_nowait(event)
+
+    async def __aenter__(self) -> None:
+        await self.start()
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        await self.stop()
+
+    async def wait_until_listening(self) -> None:
+        await self._listening.wait()
+
+    async def _run(self) -> None:
+        while self._running:
+            try:
+                await self._listen_and_notify()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("DML event notifier lost its connection; reconnecting")
+            finally:
+                self._listening.clear()
+            await asyncio.sleep(self._retry_seconds)
+
+    async def _listen_and_notify(self) -> None:
+        async with self._engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            raw_connection = await conn.get_raw_connection()
+            driver_connection: Any = raw_connection.driver_connection
+
+            def listener(_: Any, __: int, ___: str, payload: str) -> None:
+                self._receive(payload)
+
+            await driver_connection.add_listener(self._channel, listener)
+            self._listening.set()
+            try:
+                while self._running:
+                    events = [await self._queue.get()]
+                    while not self._queue.empty():
+                        events.append(self._queue.get_nowait())
+                    for payload in encode_dml_events(events, self._id):
+                        await driver_connection.execute(
+                            "SELECT pg_notify($1, $2)", self._channel, payload
+                        )
+            finally:
+                await driver_connection.remove_listener(self._channel, listener)
@@ -1,7 +1,8 @@
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Optional
 
 import grpc
-from grpc.aio import RpcContext, Server, ServerInterceptor
+from google.protobuf.message import DecodeError
+from grpc.aio import RpcContext, Server, ServerInterceptor, ServicerContext
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest,
     ExportTraceServiceResponse,
@@ -21,6 +22,7 @@ from phoenix.config import (
     get_env_tls_enabled_for_grpc,
 )
 from phoenix.server.bearer_auth import ApiKeyInterceptor
+from phoenix.server.otlp_decoder import OtlpDecoderPool
 from phoenix.trace.otel import decode_otlp_span
 from phoenix.trace.schemas import Span
 from phoenix.utilities.project import get_project_name
@@ -35,9 +37,11 @@ class Servicer(TraceServiceServicer):  # type: ignore[misc,unused-ignore]
     def __init__(
         self,
         enqueue_span: Callable[[Span, ProjectName], Awaitable[None]],
+        decoder_pool: Optional[OtlpDecoderPool] = None,
     ) -> None:
         super().__init__()
         self._enqueue_span = enqueue_span
+        self._decoder_pool = decoder_pool
 
     async def Export(
         self,
@@ -52,6 +56,44 @@ class Servicer(TraceServiceServicer):  # type: ignore[misc,unused-ignore]
                     await self._enqueue_span(span, project_name)
         return ExportTraceServiceResponse()
 
+    async def ExportSerialized(
+        self,
+        request: bytes,
+        context: ServicerContext[bytes, ExportTraceServiceResponse],
+    ) -> ExportTraceServiceResponse:
+        """
+        Same as `Export`, except that the request is received as raw bytes and both
+        parsed and decoded by the decoder pool.
+        """
+        assert self._decoder_pool is not None
+        try:
+            spans = await self._decoder_pool.decode(request)
+        except DecodeError:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                "Request is invalid ExportTraceServiceRequest",
+            )
+        for span, project_name in spans:
+            await self._enqueue_span(span, project_name)
+        return ExportTraceServiceResponse()
+
+
+def _add_serialized_trace_service_servicer_to_server(servicer: Servicer, server: Server) -> None:
+    """
+    Registers the trace service like `add_TraceServiceServicer_to_server`, but without a
+    request deserializer, so that requests reach the servicer as raw bytes.
+    """
+    rpc_method_handlers = {
+        "Export": grpc.unary_unary_rpc_method_handler(
+            servicer.ExportSerialized,
+            response_serializer=ExportTraceServiceResponse.SerializeToString,
+        ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+        "opentelemetry.proto.collector.trace.v1.TraceService", rpc_method_handlers
+    )
+    server.add_generic_rpc_handlers((generic_handler,))
+
 
 class GrpcServer:
     def __init__(
@@ -62,8 +104,10 @@ class GrpcServer:
         disabled: bool = False,
         token_store: Optional[CanReadToken] = None,
         interceptors: Iterable[ServerInterceptor] = (),
+        decoder_pool: Optional[OtlpDecoderPool] = None,
     ) -> None:
         self._enqueue_span = enqueue_span
+        self._decoder_pool = decoder_pool
         self._server: Optional[Server] = None
         self._tracer_provider = tracer_provider
         self._enable_prometheus = enable_prometheus
@@ -106,7 +150,11 @@ class GrpcServer:
             server.add_secure_port(f"[::]:{get_env_grpc_port()}", server_credentials)
         else:
             server.add_insecure_port(f"[::]:{get_env_grpc_port()}")
-        add_TraceServiceServicer_to_server(Servicer(self._enqueue_span), server)  # type: ignore[no-untyped-call,unused-ignore]
+        servicer = Servicer(self._enqueue_span, self._decoder_pool)
+        if self._decoder_pool is not None:
+            _add_serialized_trace_service_servicer_to_server(servicer, server)
+        else:
+            add_TraceServiceServicer_to_server(servicer, server)  # type: ignore[no-untyped-call,unused-ignore]
         await server.start()
         self._server = server
 
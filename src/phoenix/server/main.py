@@ -24,6 +24,7 @@ from phoenix.config import (
     get_env_database_schema,
     get_env_db_logging_level,
     get_env_disable_migrations,
+    get_env_enable_postgres_dataloader_cache,
     get_env_enable_prometheus,
     get_env_fullstory_org,
     get_env_grpc_port,
@@ -50,6 +51,7 @@ from phoenix.config import (
 )
 from phoenix.core.model_schema_adapter import create_model_from_inferences
 from phoenix.db import get_printable_db_url
+from phoenix.db.helpers import SupportedSQLDialect
 from phoenix.inferences.fixtures import FIXTURES, get_inferences
 from phoenix.inferences.inferences import EMPTY_INFERENCES, Inferences
 from phoenix.logging import setup_logging
@@ -66,6 +68,7 @@ from phoenix.server.app import (
     create_engine_and_run_migrations,
     instrument_engine_if_enabled,
 )
+from phoenix.server.dml_event_notifier import PostgresDmlEventNotifier
 from phoenix.server.email.sender import SimpleEmailSender
 from phoenix.server.email.types import EmailSender
 from phoenix.server.types import DbSessionFactory
@@ -373,6 +376,12 @@ def main() -> None:
     engine = create_engine_and_run_migrations(db_connection_str)
     instrumentation_cleanups = instrument_engine_if_enabled(engine)
     factory = DbSessionFactory(db=_db(engine), dialect=engine.dialect.name)
+    dml_event_notifier = (
+        PostgresDmlEventNotifier(engine)
+        if factory.dialect is SupportedSQLDialect.POSTGRESQL
+        and get_env_enable_postgres_dataloader_cache()
+        else None
+    )
     corpus_model = (
         None if corpus_inferences is None else create_model_from_inferences(corpus_inferences)
     )
@@ -458,6 +467,7 @@ def main() -> None:
         oauth2_client_configs=get_env_oauth2_settings(),
         allowed_origins=allowed_origins,
         management_url=management_url,
+        dml_event_notifier=dml_event_notifier,
     )
 
     # Configure server with TLS if enabled
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from typing_extensions import TypeAlias
+
+from phoenix.trace.otel import decode_otlp_span
+from phoenix.trace.schemas import Span
+from phoenix.utilities.project import get_project_name
+
+logger = logging.getLogger(__name__)
+
+ProjectName: TypeAlias = str
+
+
+def decode_export_trace_service_request(
+    request: ExportTraceServiceRequest,
+) -> list[tuple[Span, ProjectName]]:
+    """
+    Decodes every span in an OTLP trace export request, in the order they appear.
+    """
+    spans: list[tuple[Span, ProjectName]] = []
+    for resource_spans in request.resource_spans:
+        project_name = get_project_name(resource_spans.resource.attributes)
+        for scope_span in resource_spans.scope_spans:
+            for otlp_span in scope_span.spans:
+                spans.append((decode_otlp_span(otlp_span), project_name))
+    return spans
+
+
+def decode_serialized_export_trace_service_request(
+    data: bytes,
+) -> list[tuple[Span, ProjectName]]:
+    """
+    Parses and decodes a serialized OTLP trace export request. This is the function that
+    runs in the worker processes, so that neither parsing nor decoding holds the GIL of the
+    server process.
+
+    Raises:
+        DecodeError: If the bytes are not a valid ExportTraceServiceRequest.
+    """
+    request = ExportTraceServiceRequest()
+    request.ParseFromString(data)
+    return decode_export_trace_service_request(request)
+
+
+class OtlpDecoderPool:
+    """
+    A pool of worker processes that decode serialized OTLP trace export requests.
+
+    Each request is shipped to a worker as raw bytes and comes back as a batch of spans
+    ready to be handed to the bulk inserter. The workers share nothing with the server
+    process, so decoding throughput scales with the number of workers.
+    """
+
+    def __init__(self, num_workers: int) -> None:
+        assert num_workers > 0
+        self._num_workers = num_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def __aenter__(self) -> "OtlpDecoderPool":
+        self._executor = self._create_executor()
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # Workers are spawned rather than forked, because forking a process that is
+        # running an event loop and gRPC threads is not safe.
+        return ProcessPoolExecutor(
+            max_workers=self._num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    async def decode(self, data: bytes) -> list[tuple[Span, ProjectName]]:
+        """
+        Decodes a serialized ExportTraceServiceRequest in one of the worker processes.
+
+        Raises:
+            DecodeError: If the bytes are not a valid ExportTraceServiceRequest.
+        """
+        assert self._executor is not None, "OtlpDecoderPool has not been started"
+        executor = self._executor
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                executor,
+                decode_serialized_export_trace_service_request,
+                data,
+            )
+        except BrokenProcessPool:
+            # A worker died abruptly, which renders the whole executor unusable, so it is
+            # replaced for subsequent requests. The request itself is not retried in case
+            # it is what brought the worker down.
+            logger.exception("OTLP decoder worker terminated abruptly; restarting the pool")
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._create_executor()
+            raise
@@ -41,7 +41,13 @@ BULK_LOADER_SPAN_INSERTION_TIME = Histogram(
     namespace="phoenix",
     name="bulk_loader_span_insertion_time_seconds",
     documentation="Histogram of span database insertion time (seconds)",
-    buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 180.0],  # 500ms to 3min
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 180.0],  # 10ms to 3min
+)
+
+BULK_LOADER_SPAN_INSERTIONS = Counter(
+    namespace="phoenix",
+    name="bulk_loader_span_insertions_total",
+    documentation="Total count of spans committed to the database by the bulk loader",
 )
 
 BULK_LOADER_SPAN_EXCEPTIONS = Counter(
@@ -50,6 +56,25 @@ BULK_LOADER_SPAN_EXCEPTIONS = Counter(
     documentation="Total count of span insertion exceptions",
 )
 
+BULK_LOADER_SPAN_BATCH_FALLBACKS = Counter(
+    namespace="phoenix",
+    name="bulk_loader_span_batch_fallbacks_total",
+    documentation="Total count of span batches that fell back to one-at-a-time insertion",
+)
+
+CUMULATIVE_COUNTS_ROLLUP_TIME = Histogram(
+    namespace="phoenix",
+    name="cumulative_counts_rollup_time_seconds",
+    documentation="Histogram of the time to recompute cumulative counts of a batch of traces",
+    buckets=[0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+)
+
+CUMULATIVE_COUNTS_ROLLUP_DIRTY_TRACES = Gauge(
+    namespace="phoenix",
+    name="cumulative_counts_rollup_dirty_traces",
+    documentation="Current number of traces waiting for their cumulative counts to be recomputed",
+)
+
 BULK_LOADER_EVALUATION_INSERTIONS = Counter(
     name="bulk_loader_evaluation_insertions_total",
     documentation="Total count of bulk loader evaluation insertions",
@@ -113,12 +138,50 @@ SPAN_QUEUE_SIZE = Gauge(
     documentation="Current number of spans in the processing queue",
 )
 
+ANNOTATION_QUEUE_REJECTIONS = Counter(
+    namespace="phoenix",
+    name="annotation_queue_rejections_total",
+    documentation="Total count of requests rejected due to an annotation queue being full",
+    labelnames=["table"],
+)
+
+ANNOTATION_QUEUE_SIZE = Gauge(
+    namespace="phoenix",
+    name="annotation_queue_size",
+    documentation="Current number of annotations in the processing queue by table",
+    labelnames=["table"],
+)
+
+ANNOTATION_QUEUE_LATENCY = Gauge(
+    namespace="phoenix",
+    name="annotation_queue_latency_seconds",
+    documentation=(
+        "Time the oldest annotation of the latest batch taken from the processing queue "
+        "spent waiting in it by table (seconds)"
+    ),
+    labelnames=["table"],
+)
+
 BULK_LOADER_LAST_ACTIVITY = Gauge(
     namespace="phoenix",
     name="bulk_loader_last_activity_timestamp_seconds",
     documentation="Unix timestamp when bulk loader last processed items",
 )
 
+COST_MODEL_LOOKUPS = Counter(
+    namespace="phoenix",
+    name="cost_model_lookups_total",
+    documentation="Total number of lookups of the generative model for span costs by result",
+    labelnames=["result"],
+)
+
+SPAN_FILTER_CACHE_LOOKUPS = Counter(
+    namespace="phoenix",
+    name="span_filter_cache_lookups_total",
+    documentation="Total number of lookups of compiled span filter conditions by result",
+    labelnames=["result"],
+)
+
 RETENTION_SWEEPER_LAST_RUN = Gauge(
     namespace="phoenix",
     name="retention_sweeper_last_run_seconds",
@@ -132,6 +195,28 @@ RETENTION_POLICY_EXECUTIONS = Counter(
     labelnames=["status"],
 )
 
+RETENTION_TRACES_DELETED = Counter(
+    namespace="phoenix",
+    name="retention_traces_deleted_total",
+    documentation="Total number of traces deleted by retention policies",
+)
+
+RETENTION_BATCH_DELETION_TIME = Histogram(
+    namespace="phoenix",
+    name="retention_batch_deletion_time_seconds",
+    documentation="Histogram of the time to delete a batch of traces under a retention policy",
+    buckets=[0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+)
+
+
+def count_span_filter_cache_lookup(cache_hit: Optional[bool]) -> None:
+    """
+    Counts a lookup of a compiled span filter condition, as reported by the `cache_hit` of a
+    span filter, which is None when the filter has no condition and so nothing was looked up.
+    """
+    if cache_hit is not None:
+        SPAN_FILTER_CACHE_LOOKUPS.labels(result="hit" if cache_hit else "miss").inc()
+
 
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
@@ -3,7 +3,8 @@ from __future__ import annotations
 import logging
 from asyncio import create_task, gather, sleep
 from datetime import datetime, timedelta, timezone
-from time import time
+from time import perf_counter, time
+from typing import Optional
 
 import sqlalchemy as sa
 from sqlalchemy.orm import selectinload
@@ -13,8 +14,10 @@ from phoenix.db.models import Project, ProjectTraceRetentionPolicy
 from phoenix.server.dml_event import SpanDeleteEvent
 from phoenix.server.dml_event_handler import DmlEventHandler
 from phoenix.server.prometheus import (
+    RETENTION_BATCH_DELETION_TIME,
     RETENTION_POLICY_EXECUTIONS,
     RETENTION_SWEEPER_LAST_RUN,
+    RETENTION_TRACES_DELETED,
 )
 from phoenix.server.types import DaemonTask, DbSessionFactory
 from phoenix.utilities import hour_of_week
@@ -23,28 +26,53 @@ logger = logging.getLogger(__name__)
 
 
 class TraceDataSweeper(DaemonTask):
-    def __init__(self, db: DbSessionFactory, dml_event_handler: DmlEventHandler):
+    """
+    Applies trace retention policies on their schedules. Traces are deleted in batches, each
+    in its own transaction, so that a sweep over a large project does not hold locks for long
+    or starve span ingestion. A policy is marked as being swept until all of its batches are
+    done, so that a sweep interrupted by a restart is resumed when the sweeper starts again.
+    """
+
+    def __init__(
+        self,
+        db: DbSessionFactory,
+        dml_event_handler: DmlEventHandler,
+        *,
+        batch_size: int = 1000,
+        batch_pause_seconds: float = 0.1,
+    ):
+        assert batch_size > 0
+        assert batch_pause_seconds >= 0
         super().__init__()
         self._db = db
         self._dml_event_handler = dml_event_handler
+        self._batch_size = batch_size
+        self._batch_pause_seconds = batch_pause_seconds
 
     async def _run(self) -> None:
-        """Check hourly and apply policies."""
+        """Resume interrupted sweeps, then check hourly and apply policies."""
+        await self._sweep(current_hour=None)
         while self._running:
             await self._sleep_until_next_hour()
             RETENTION_SWEEPER_LAST_RUN.set(time())
-            try:
-                if not (policies := await self._get_policies()):
-                    continue
-                current_hour = self._current_hour()
-                if tasks := [
-                    create_task(self._apply(policy))
-                    for policy in policies
-                    if self._should_apply(policy, current_hour)
-                ]:
-                    await gather(*tasks, return_exceptions=True)
-            except Exception:
-                logger.exception("Unexpected error in retention sweeper main loop")
+            await self._sweep(current_hour=self._current_hour())
+
+    async def _sweep(self, current_hour: Optional[int]) -> None:
+        """
+        Applies the policies that are due in the current hour, along with those whose last
+        sweep was interrupted. If the current hour is None, only the latter are applied.
+        """
+        try:
+            if not (policies := await self._get_policies()):
+                return
+            if tasks := [
+                create_task(self._apply(policy))
+                for policy in policies
+                if self._should_apply(policy, current_hour)
+            ]:
+                await gather(*tasks, return_exceptions=True)
+        except Exception:
+            logger.exception("Unexpected error in retention sweeper main loop")
 
     async def _get_policies(self) -> list[ProjectTraceRetentionPolicy]:
         stmt = sa.select(ProjectTraceRetentionPolicy).options(
@@ -62,11 +90,17 @@ class TraceDataSweeper(DaemonTask):
     def _current_hour(self) -> int:
         return hour_of_week(self._now())
 
-    def _should_apply(self, policy: ProjectTraceRetentionPolicy, current_hour: int) -> bool:
-        if current_hour != policy.cron_expression.get_hour_of_prev_run():
-            return False
+    def _should_apply(
+        self,
+        policy: ProjectTraceRetentionPolicy,
+        current_hour: Optional[int],
+    ) -> bool:
         if policy.id != DEFAULT_PROJECT_TRACE_RETENTION_POLICY_ID and not policy.projects:
             return False
+        if policy.sweep_started_at is not None:
+            return True
+        if current_hour != policy.cron_expression.get_hour_of_prev_run():
+            return False
         return True
 
     async def _apply(self, policy: ProjectTraceRetentionPolicy) -> None:
@@ -76,14 +110,50 @@ class TraceDataSweeper(DaemonTask):
                 if policy.id == DEFAULT_PROJECT_TRACE_RETENTION_POLICY_ID
                 else [p.id for p in policy.projects]
             )
+            if policy.sweep_started_at is None:
+                await self._set_sweep_started_at(policy.id, self._now())
+            else:
+                logger.info(
+                    f"Resuming retention policy '{policy.name}' (id={policy.id}) "
+                    f"interrupted after starting at {policy.sweep_started_at.isoformat()}"
+                )
+            # The traces beyond the max count, if any, are determined once for the sweep
+            # rather than for every batch.
             async with self._db() as session:
-                result = await policy.rule.delete_traces(session, project_rowids)
-            self._dml_event_handler.put(SpanDeleteEvent(tuple(result)))
+                max_count_cutoffs = await policy.rule.get_max_count_cutoffs(session, project_rowids)
+            while True:
+                start = perf_counter()
+                async with self._db() as session:
+                    result = await policy.rule.delete_traces(
+                        session,
+                        project_rowids,
+                        limit=self._batch_size,
+                        max_count_cutoffs=max_count_cutoffs,
+                    )
+                RETENTION_BATCH_DELETION_TIME.observe(perf_counter() - start)
+                if not result:
+                    break
+                num_traces = sum(result.values())
+                RETENTION_TRACES_DELETED.inc(num_traces)
+                self._dml_event_handler.put(SpanDeleteEvent(tuple(result)))
+                if num_traces < self._batch_size:
+                    break
+                await sleep(self._batch_pause_seconds)
+            await self._set_sweep_started_at(policy.id, None)
             RETENTION_POLICY_EXECUTIONS.labels(status="success").inc()
         except Exception:
             logger.exception(f"Failed to apply retention policy '{policy.name}' (id={policy.id})")
             RETENTION_POLICY_EXECUTIONS.labels(status="error").inc()
 
+    async def _set_sweep_started_at(self, policy_id: int, value: Optional[datetime]) -> None:
+        stmt = (
+            sa.update(ProjectTraceRetentionPolicy)
+            .where(ProjectTraceRetentionPolicy.id == policy_id)
+            .values(sweep_started_at=value)
+        )
+        async with self._db() as session:
+            await session.execute(stmt)
+
     async def _sleep_until_next_hour(self) -> None:
         next_hour = self._now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
         await sleep((next_hour - self._now()).total_seconds())
@@ -6,6 +6,7 @@ from sqlalchemy import distinct, or_, select
 from sqlalchemy.sql.selectable import ScalarSelect
 
 from phoenix.db import models
+from phoenix.db.helpers import span_text_search
 
 
 def get_filtered_session_rowids_subquery(
@@ -23,6 +24,7 @@ def get_filtered_session_rowids_subquery(
         .join_from(models.Trace, models.Span)
         .where(models.Trace.project_rowid.in_(project_rowids))
         .where(models.Span.parent_id.is_(None))
+        .where(span_text_search(session_filter_condition, "input", "output"))
         .where(
             or_(
                 models.CaseInsensitiveContains(
@@ -2,8 +2,10 @@ import csv
 import gzip
 import logging
 import re
-from collections import Counter
-from collections.abc import Iterable, Mapping, Sequence
+import time
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
@@ -18,6 +20,7 @@ from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTrace
 from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
 from opentelemetry.proto.resource.v1.resource_pb2 import Resource
 from opentelemetry.proto.trace.v1.trace_pb2 import ResourceSpans, ScopeSpans
+from opentelemetry.proto.trace.v1.trace_pb2 import Span as OtlpSpan
 from pyarrow import ArrowInvalid, Table
 from typing_extensions import TypeAlias, assert_never, deprecated
 
@@ -41,6 +44,21 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT_IN_SECONDS = 5
 
+DEFAULT_TRACE_BATCH_SIZE = 1_000
+"""
+Maximum number of spans sent in one request by `Client.log_traces`.
+"""
+DEFAULT_TRACE_BATCH_BYTES = 4 * 1024 * 1024
+"""
+Maximum size in bytes of the uncompressed spans sent in one request by `Client.log_traces`.
+"""
+DEFAULT_TRACE_UPLOAD_CONCURRENCY = 4
+"""
+Number of requests sent concurrently by `Client.log_traces`.
+"""
+_TRACE_UPLOAD_MAX_RETRIES = 5
+_TRACE_UPLOAD_RETRY_DELAY_SEC = 0.5
+
 DatasetAction: TypeAlias = Literal["create", "append"]
 
 
@@ -328,7 +346,15 @@ class Client(TraceDataExtractor):
             ).raise_for_status()
 
     @deprecated("Migrate to using client.spans.log_spans via arize-phoenix-client")
-    def log_traces(self, trace_dataset: TraceDataset, project_name: Optional[str] = None) -> None:
+    def log_traces(
+        self,
+        trace_dataset: TraceDataset,
+        project_name: Optional[str] = None,
+        *,
+        batch_size: int = DEFAULT_TRACE_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_TRACE_BATCH_BYTES,
+        concurrency: int = DEFAULT_TRACE_UPLOAD_CONCURRENCY,
+    ) -> None:
         """
         .. deprecated::
             This method is deprecated. Use ``client.spans.log_spans()`` via
@@ -343,33 +369,52 @@ class Client(TraceDataExtractor):
             project_name (str, optional): The project name under which to log the evaluations.
                 This can be set using environment variables. If not provided, falls back to the
                 default project.
+            batch_size (int, optional): The maximum number of spans sent in one request.
+            max_batch_bytes (int, optional): The maximum size in bytes of the uncompressed
+                spans sent in one request.
+            concurrency (int, optional): The number of requests sent concurrently. With 1,
+                requests are sent one after another on the calling thread.
 
         Returns:
             None
         """
         project_name = project_name or get_env_project_name()
-        spans = trace_dataset.to_spans()
-        otlp_spans = [
+        resource = Resource(
+            attributes=[
+                KeyValue(
+                    key="openinference.project.name",
+                    value=AnyValue(string_value=project_name),
+                )
+            ]
+        )
+        otlp_spans = map(encode_span_to_otlp, trace_dataset.to_spans())
+        requests = (
             ExportTraceServiceRequest(
                 resource_spans=[
-                    ResourceSpans(
-                        resource=Resource(
-                            attributes=[
-                                KeyValue(
-                                    key="openinference.project.name",
-                                    value=AnyValue(string_value=project_name),
-                                )
-                            ]
-                        ),
-                        scope_spans=[ScopeSpans(spans=[encode_span_to_otlp(span)])],
-                    )
+                    ResourceSpans(resource=resource, scope_spans=[ScopeSpans(spans=batch)])
                 ],
             )
-            for span in spans
-        ]
-        for otlp_span in otlp_spans:
-            serialized = otlp_span.SerializeToString()
-            content = gzip.compress(serialized)
+            for batch in _batch_otlp_spans(otlp_spans, batch_size, max_batch_bytes)
+        )
+        if concurrency <= 1:
+            for request in requests:
+                self._post_traces(request)
+            return
+        # Spans are encoded on this thread while the batches encoded so far are being
+        # compressed and sent on the worker threads.
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending: deque[Future[None]] = deque()
+            for request in requests:
+                # bounds the number of batches held in memory
+                while len(pending) >= 2 * concurrency:
+                    pending.popleft().result()
+                pending.append(executor.submit(self._post_traces, request))
+            for future in pending:
+                future.result()
+
+    def _post_traces(self, request: ExportTraceServiceRequest) -> None:
+        content = gzip.compress(request.SerializeToString())
+        for attempt in range(_TRACE_UPLOAD_MAX_RETRIES + 1):
             response = self._client.post(
                 url="v1/traces",
                 content=content,
@@ -378,7 +423,11 @@ class Client(TraceDataExtractor):
                     "content-encoding": "gzip",
                 },
             )
-            response.raise_for_status()
+            # the server rejects spans with 503 while its span queue is full
+            if response.status_code != 503 or attempt == _TRACE_UPLOAD_MAX_RETRIES:
+                break
+            time.sleep(_TRACE_UPLOAD_RETRY_DELAY_SEC * 2**attempt)
+        response.raise_for_status()
 
     def _get_dataset_id_by_name(self, name: str) -> str:
         """
@@ -850,6 +899,24 @@ FileType: TypeAlias = str
 FileHeaders: TypeAlias = dict[str, str]
 
 
+def _batch_otlp_spans(
+    otlp_spans: Iterable[OtlpSpan],
+    batch_size: int,
+    max_batch_bytes: int,
+) -> Iterator[list[OtlpSpan]]:
+    batch: list[OtlpSpan] = []
+    num_bytes = 0
+    for otlp_span in otlp_spans:
+        size = otlp_span.ByteSize()
+        if batch and (batch_size <= len(batch) or max_batch_bytes < num_bytes + size):
+            yield batch
+            batch, num_bytes = [], 0
+        batch.append(otlp_span)
+        num_bytes += size
+    if batch:
+        yield batch
+
+
 def _get_csv_column_headers(path: Path) -> tuple[str, ...]:
     path = path.resolve()
     if not path.is_file():
@@ -5,18 +5,21 @@ import typing
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 from itertools import chain
+from threading import Lock
 from types import MappingProxyType
 from uuid import uuid4
 
 import sqlalchemy
+from cachetools import LRUCache
 from sqlalchemy import case, literal
-from sqlalchemy.orm import Mapped, aliased
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm.util import AliasedClass
 from sqlalchemy.sql.expression import ColumnElement, Select
 from typing_extensions import TypeAlias, TypeGuard, assert_never
 
 import phoenix.trace.v1 as pb
 from phoenix.db import models
+from phoenix.db.helpers import span_text_search
 
 _VALID_EVAL_ATTRIBUTES: tuple[str, ...] = tuple(
     field.name for field in pb.Evaluation.Result.DESCRIPTOR.fields
@@ -152,37 +155,33 @@ class SpanFilter:
     valid_eval_names: typing.Optional[typing.Sequence[str]] = None
     translated: ast.Expression = field(init=False, repr=False)
     compiled: typing.Any = field(init=False, repr=False)
-    _aliased_annotation_relations: tuple[AliasedAnnotationRelation] = field(init=False, repr=False)
-    _aliased_annotation_attributes: dict[str, Mapped[typing.Any]] = field(init=False, repr=False)
+    _aliased_annotation_relations: tuple[AliasedAnnotationRelation, ...] = field(
+        init=False, repr=False
+    )
+    _aliased_annotation_attributes: typing.Mapping[str, ColumnElement[typing.Any]] = field(
+        init=False, repr=False
+    )
+    cache_hit: typing.Optional[bool] = field(default=None, init=False, repr=False, compare=False)
+    """
+    Whether the compiled condition was found in the cache, or None if there is no condition.
+    """
 
     def __bool__(self) -> bool:
         return bool(self.condition)
 
     def __post_init__(self) -> None:
-        if not (source := self.condition):
+        if not self.condition:
             return
-        root = ast.parse(source, mode="eval")
-        _validate_expression(root, valid_eval_names=self.valid_eval_names)
-        source, aliased_annotation_relations = _apply_eval_aliasing(source)
-        root = ast.parse(source, mode="eval")
-        translated = _FilterTranslator(
-            reserved_keywords=(
-                alias
-                for aliased_annotation in aliased_annotation_relations
-                for alias, _ in aliased_annotation.attributes
-            ),
-        ).visit(root)
-        ast.fix_missing_locations(translated)
-        compiled = compile(translated, filename="", mode="eval")
-        aliased_annotation_attributes = {
-            alias: attribute
-            for aliased_annotation in aliased_annotation_relations
-            for alias, attribute in aliased_annotation.attributes
-        }
-        object.__setattr__(self, "translated", translated)
-        object.__setattr__(self, "compiled", compiled)
-        object.__setattr__(self, "_aliased_annotation_relations", aliased_annotation_relations)
-        object.__setattr__(self, "_aliased_annotation_attributes", aliased_annotation_attributes)
+        compiled, cache_hit = _compile_span_filter(self.condition, self.valid_eval_names)
+        object.__setattr__(self, "cache_hit", cache_hit)
+        object.__setattr__(self, "translated", compiled.translated)
+        object.__setattr__(self, "compiled", compiled.compiled)
+        object.__setattr__(
+            self, "_aliased_annotation_relations", compiled.aliased_annotation_relations
+        )
+        object.__setattr__(
+            self, "_aliased_annotation_attributes", compiled.aliased_annotation_attributes
+        )
 
     def __call__(self, select: Select[typing.Any]) -> Select[typing.Any]:
         if not self.condition:
@@ -200,6 +199,7 @@ class SpanFilter:
                     "Float": sqlalchemy.Float,
                     "String": sqlalchemy.String,
                     "TextContains": models.TextContains,
+                    "span_text_search": span_text_search,
                 },
             )
         )
@@ -249,6 +249,70 @@ class SpanFilter:
         return stmt
 
 
+@dataclass(frozen=True)
+class _CompiledSpanFilter:
+    """
+    The products of parsing and compiling a filter condition, which depend only on the
+    condition and the valid eval names, and can therefore be shared by all filters with the
+    same condition.
+    """
+
+    translated: ast.Expression
+    compiled: typing.Any
+    aliased_annotation_relations: tuple[AliasedAnnotationRelation, ...]
+    aliased_annotation_attributes: typing.Mapping[str, ColumnElement[typing.Any]]
+
+
+_COMPILED_SPAN_FILTERS: LRUCache[
+    tuple[str, typing.Optional[tuple[str, ...]]],
+    _CompiledSpanFilter,
+] = LRUCache(maxsize=1024)
+_COMPILED_SPAN_FILTERS_LOCK = Lock()
+
+
+def _compile_span_filter(
+    condition: str,
+    valid_eval_names: typing.Optional[typing.Sequence[str]],
+) -> tuple[_CompiledSpanFilter, bool]:
+    """
+    Returns the compiled filter for the condition, compiling it only if it's not already in
+    the process-wide cache, along with whether it was found there. Invalid conditions raise on
+    every call and are never cached.
+    """
+    key = (condition, None if valid_eval_names is None else tuple(valid_eval_names))
+    with _COMPILED_SPAN_FILTERS_LOCK:
+        cached = _COMPILED_SPAN_FILTERS.get(key)
+    if cached is not None:
+        return cached, True
+    root = ast.parse(condition, mode="eval")
+    _validate_expression(root, valid_eval_names=valid_eval_names)
+    source, aliased_annotation_relations = _apply_eval_aliasing(condition)
+    root = ast.parse(source, mode="eval")
+    translated = _FilterTranslator(
+        reserved_keywords=(
+            alias
+            for aliased_annotation in aliased_annotation_relations
+            for alias, _ in aliased_annotation.attributes
+        ),
+    ).visit(root)
+    ast.fix_missing_locations(translated)
+    compiled = _CompiledSpanFilter(
+        translated=translated,
+        compiled=compile(translated, filename="", mode="eval"),
+        aliased_annotation_relations=aliased_annotation_relations,
+        aliased_annotation_attributes=MappingProxyType(
+            {
+                alias: attribute
+                for aliased_annotation in aliased_annotation_relations
+                for alias, attribute in aliased_annotation.attributes
+            }
+        ),
+    )
+    with _COMPILED_SPAN_FILTERS_LOCK:
+        _COMPILED_SPAN_FILTERS[key] = compiled
+    return compiled, False
+
+
 @dataclass(frozen=True)
 class Projector:
     expression: str
@@ -291,6 +355,20 @@ def _is_string_attribute(node: typing.Any) -> TypeGuard[ast.Call]:
     )
 
 
+def _get_text_search_key(node: typing.Any) -> typing.Optional[str]:
+    # e.g. `attributes[['input', 'value']].as_string()` -> `"input"`
+    if not _is_string_attribute(node):
+        return None
+    assert isinstance(func := node.func, ast.Attribute)
+    assert isinstance(value := func.value, ast.Subscript)
+    if not isinstance(keys := value.slice, ast.List):
+        return None
+    path = [key.value if isinstance(key, ast.Constant) else None for key in keys.elts]
+    if path in (["input", "value"], ["output", "value"]):
+        return typing.cast(str, path[0])
+    return None
+
+
 def _is_float_attribute(node: typing.Any) -> TypeGuard[ast.Call]:
     return (
         isinstance(node, ast.Call)
@@ -471,6 +549,16 @@ class _FilterTranslator(_ProjectionTranslator):
                     call = ast.Call(
                         func=ast.Name(id="not_", ctx=ast.Load()), args=[call], keywords=[]
                     )
+                elif (key := _get_text_search_key(right)) and _is_string_constant(left):
+                    # e.g. `'abc' in input.value` is narrowed down by the full-text index
+                    search = ast.Call(
+                        func=ast.Name(id="span_text_search", ctx=ast.Load()),
+                        args=[left, ast.Constant(value=key, kind=None)],
+                        keywords=[],
+                    )
+                    call = ast.Call(
+                        func=ast.Name(id="and_", ctx=ast.Load()), args=[search, call], keywords=[]
+                    )
                 return call
             elif isinstance(right, (ast.List, ast.Tuple)):
                 attr = "in_" if isinstance(op, ast.In) else "not_in"
@@ -14,6 +14,7 @@ from openinference.semconv.trace import SpanAttributes
 from sqlalchemy import JSON, Column, Label, Select, SQLColumnExpression, and_, func, or_, select
 from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import ScalarSelect
 from typing_extensions import assert_never
 
 from phoenix.config import DEFAULT_PROJECT_NAME
@@ -445,6 +446,10 @@ class SpanQuery(_HasTmpSuffix):
     def __bool__(self) -> bool:
         return bool(self._select) or bool(self._filter) or bool(self._explode) or bool(self._concat)
 
+    @property
+    def span_filter(self) -> Optional[SpanFilter]:
+        return self._filter
+
     def select(self, *args: str, **kwargs: str) -> "SpanQuery":
         _select = {
             _unalias(name): Projection(key) for name, key in (*zip(args, args), *kwargs.items())
@@ -510,6 +515,7 @@ class SpanQuery(_HasTmpSuffix):
         stop_time: Optional[datetime] = None,
         *,
         orphan_span_as_root_span: bool = True,
+        span_rowids: Optional[Sequence[int]] = None,
     ) -> pd.DataFrame:
         """Execute the span query and return results as a pandas DataFrame.
 
@@ -529,6 +535,9 @@ class SpanQuery(_HasTmpSuffix):
             orphan_span_as_root_span (bool): If True, orphan spans are treated as root spans. An
                 orphan span has a non-null `parent_id` but a span with that ID is currently not
                 found in the database. Default True.
+            span_rowids (Sequence[int], optional): If provided, only the spans with these row IDs
+                are considered, e.g. a page of the row IDs selected by `select_span_rowids`.
+                Default None.
 
         Returns:
             pd.DataFrame: A DataFrame containing the query results. The structure of the DataFrame
@@ -562,6 +571,7 @@ class SpanQuery(_HasTmpSuffix):
                 limit=limit,
                 root_spans_only=root_spans_only,
                 orphan_span_as_root_span=orphan_span_as_root_span,
+                span_rowids=span_rowids,
             )
         assert session.bind is not None
         dialect = SupportedSQLDialect(session.bind.dialect.name)
@@ -571,9 +581,10 @@ class SpanQuery(_HasTmpSuffix):
             # it's too complex for the post hoc processing step in pandas.
             select(row_id)
             .join(models.Trace)
-            .join(models.Project)
-            .where(models.Project.name == project_name)
+            .where(models.Span.project_rowid == _project_rowid(project_name))
         )
+        if span_rowids is not None:
+            stmt = stmt.where(models.Span.id.in_(span_rowids))
         if start_time:
             stmt = stmt.where(start_time <= models.Span.start_time)
         if end_time:
@@ -654,6 +665,45 @@ class SpanQuery(_HasTmpSuffix):
         df = df.rename(self._rename, axis=1, errors="ignore")
         return df
 
+    def select_span_rowids(
+        self,
+        project_name: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        root_spans_only: Optional[bool] = None,
+        *,
+        orphan_span_as_root_span: bool = True,
+    ) -> Select[tuple[int, datetime]]:
+        """Build a statement selecting the row IDs and start times of the spans matched by the
+        query, newest first.
+
+        Results too large to be fetched at once can be paged through by adding a limit and
+        a condition on the start time and row ID of the last span of the previous page to
+        this statement, and passing each page of row IDs as `span_rowids` when executing the
+        query. The arguments have the same meaning as when executing the query.
+        """
+        if not project_name:
+            project_name = DEFAULT_PROJECT_NAME
+        stmt = select(models.Span.id, models.Span.start_time).where(
+            models.Span.project_rowid == _project_rowid(project_name)
+        )
+        if start_time:
+            stmt = stmt.where(start_time <= models.Span.start_time)
+        if end_time:
+            stmt = stmt.where(models.Span.start_time < end_time)
+        if root_spans_only:
+            if orphan_span_as_root_span:
+                parent_spans = select(models.Span.span_id).alias("parent_spans")
+                stmt = stmt.where(
+                    ~select(1).where(models.Span.parent_id == parent_spans.c.span_id).exists(),
+                )
+            else:
+                stmt = stmt.where(models.Span.parent_id.is_(None))
+        if self._filter:
+            # traces are only joined when filtering, since filters can refer to them
+            stmt = self._filter(stmt.join(models.Trace))
+        return stmt.order_by(models.Span.start_time.desc(), models.Span.id.desc())
+
     def to_dict(self) -> dict[str, Any]:
         return {
             **(
@@ -733,6 +783,7 @@ def _get_spans_dataframe(
     limit: Optional[int] = DEFAULT_SPAN_LIMIT,
     root_spans_only: Optional[bool] = None,
     orphan_span_as_root_span: bool = True,
+    span_rowids: Optional[Sequence[int]] = None,
     # Deprecated
     stop_time: Optional[datetime] = None,
 ) -> pd.DataFrame:
@@ -753,6 +804,8 @@ def _get_spans_dataframe(
         orphan_span_as_root_span (bool): If True, orphan spans are treated as root spans. An
             orphan span has a non-null `parent_id` but a span with that ID is currently not
             found in the database. Default True.
+        span_rowids (Sequence[int], optional): If provided, only the spans with these row IDs
+            are considered. Default None.
         stop_time (datetime, optional): Deprecated. Use end_time instead. Default None.
 
     Returns:
@@ -798,9 +851,10 @@ def _get_spans_dataframe(
             models.Span.attributes,
         )
         .join(models.Trace)
-        .join(models.Project)
-        .where(models.Project.name == project_name)
+        .where(models.Span.project_rowid == _project_rowid(project_name))
     )
+    if span_rowids is not None:
+        stmt = stmt.where(models.Span.id.in_(span_rowids))
     if span_filter:
         stmt = span_filter(stmt)
     if start_time:
@@ -847,6 +901,12 @@ def _get_spans_dataframe(
     return df
 
 
+def _project_rowid(project_name: str) -> ScalarSelect[int]:
+    # Spans are filtered on their denormalized `project_rowid` so that the
+    # (project_rowid, start_time, id) index can serve the scan.
+    return select(models.Project.id).where(models.Project.name == project_name).scalar_subquery()
+
+
 def _outer_join(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
     if (columns_intersection := left.columns.intersection(right.columns)).empty:
         df = left.join(right, how="outer")
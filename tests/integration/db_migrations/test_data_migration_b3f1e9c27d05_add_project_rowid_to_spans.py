@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from secrets import token_hex
+
+import pytest
+from alembic.config import Config
+from sqlalchemy import Engine, inspect, text
+
+from . import _down, _up, _version_num
+
+
+def test_project_rowid_is_backfilled_on_spans(
+    _engine: Engine,
+    _alembic_config: Config,
+    _schema: str,
+) -> None:
+    with pytest.raises(BaseException, match="alembic_version"):
+        _version_num(_engine, _schema)
+
+    _up(_engine, _alembic_config, "8e2c5b7a9d41", _schema)
+
+    now = datetime.now(timezone.utc)
+    expected: dict[int, int] = {}
+    with _engine.connect() as conn:
+        for _ in range(2):
+            project_rowid = conn.execute(
+                text("INSERT INTO projects (name) VALUES (:name) RETURNING id"),
+                {"name": token_hex(8)},
+            ).scalar_one()
+            for _ in range(3):
+                trace_rowid = conn.execute(
+                    text(
+                        """
+                        INSERT INTO traces (project_rowid, trace_id, start_time, end_time)
+                        VALUES (:project_rowid, :trace_id, :t, :t)
+                        RETURNING id
+                        """
+                    ),
+                    {"project_rowid": project_rowid, "trace_id": token_hex(16), "t": now},
+                ).scalar_one()
+                for _ in range(2):
+                    span_rowid = conn.execute(
+                        text(
+                            """
+                            INSERT INTO spans (
+                                trace_rowid, span_id, name, span_kind, start_time, end_time,
+                                attributes, events, status_code, status_message,
+                                cumulative_error_count, cumulative_llm_token_count_prompt,
+                                cumulative_llm_token_count_completion
+                            )
+                            VALUES (
+                                :trace_rowid, :span_id, 'span', 'UNKNOWN', :t, :t,
+                                '{}', '[]', 'OK', '', 0, 0, 0
+                            )
+                            RETURNING id
+                            """
+                        ),
+                        {"trace_rowid": trace_rowid, "span_id": token_hex(8), "t": now},
+                    ).scalar_one()
+                    expected[span_rowid] = project_rowid
+        conn.commit()
+
+    _up(_engine, _alembic_config, "b3f1e9c27d05", _schema)
+
+    with _engine.connect() as conn:
+        actual = dict(conn.execute(text("SELECT id, project_rowid FROM spans")).all())
+        foreign_keys = inspect(conn).get_foreign_keys("spans", schema=_schema or None)
+    assert actual == expected
+    assert any(
+        fk["constrained_columns"] == ["project_rowid"]
+        and fk["referred_table"] == "projects"
+        and fk["options"].get("ondelete") == "CASCADE"
+        for fk in foreign_keys
+    )
+
+    _down(_engine, _alembic_config, "8e2c5b7a9d41", _schema)
+
+    with _engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM spans")).scalar() == len(expected)
@@ -0,0 +1,110 @@
+from secrets import token_hex
+
+import pytest
+from alembic.config import Config
+from sqlalchemy import Connection, Engine, text
+
+from . import _down, _up, _version_num
+
+
+def _insert_version(conn: Connection, dataset_id: int) -> int:
+    version_id: int = conn.execute(
+        text(
+            """
+            INSERT INTO dataset_versions (dataset_id, metadata)
+            VALUES (:dataset_id, '{}')
+            RETURNING id
+            """
+        ),
+        {"dataset_id": dataset_id},
+    ).scalar_one()
+    return version_id
+
+
+def _insert_example(conn: Connection, dataset_id: int) -> int:
+    example_id: int = conn.execute(
+        text("INSERT INTO dataset_examples (dataset_id) VALUES (:dataset_id) RETURNING id"),
+        {"dataset_id": dataset_id},
+    ).scalar_one()
+    return example_id
+
+
+def _insert_revision(conn: Connection, example_id: int, version_id: int, kind: str) -> int:
+    revision_id: int = conn.execute(
+        text(
+            """
+            INSERT INTO dataset_example_revisions (
+                dataset_example_id, dataset_version_id, input, output, metadata, revision_kind
+            )
+            VALUES (:example_id, :version_id, '{}', '{}', '{}', :kind)
+            RETURNING id
+            """
+        ),
+        {"example_id": example_id, "version_id": version_id, "kind": kind},
+    ).scalar_one()
+    return revision_id
+
+
+def _snapshot(conn: Connection) -> set[tuple[int, int, int]]:
+    rows = conn.execute(
+        text(
+            """
+            SELECT dataset_version_id, dataset_example_id, dataset_example_revision_id
+            FROM dataset_versions_dataset_examples
+            """
+        )
+    ).all()
+    return {(row[0], row[1], row[2]) for row in rows}
+
+
+def test_dataset_version_snapshots_are_backfilled_and_maintained(
+    _engine: Engine,
+    _alembic_config: Config,
+    _schema: str,
+) -> None:
+    with pytest.raises(BaseException, match="alembic_version"):
+        _version_num(_engine, _schema)
+
+    _up(_engine, _alembic_config, "c7a4d2e8f613", _schema)
+
+    with _engine.connect() as conn:
+        dataset_id = conn.execute(
+            text("INSERT INTO datasets (name, metadata) VALUES (:name, '{}') RETURNING id"),
+            {"name": token_hex(8)},
+        ).scalar_one()
+        v1 = _insert_version(conn, dataset_id)
+        v2 = _insert_version(conn, dataset_id)
+        v3 = _insert_version(conn, dataset_id)
+        e1 = _insert_example(conn, dataset_id)
+        e2 = _insert_example(conn, dataset_id)
+        r1 = _insert_revision(conn, e1, v1, "CREATE")
+        r2 = _insert_revision(conn, e1, v2, "PATCH")
+        r3 = _insert_revision(conn, e2, v2, "CREATE")
+        _insert_revision(conn, e1, v3, "DELETE")
+        conn.commit()
+
+    _up(_engine, _alembic_config, "f3a8b2c91d47", _schema)
+
+    with _engine.connect() as conn:
+        assert _snapshot(conn) == {
+            (v1, e1, r1),
+            (v2, e1, r2),
+            (v2, e2, r3),
+            (v3, e2, r3),
+        }
+        v4 = _insert_version(conn, dataset_id)
+        r4 = _insert_revision(conn, e2, v4, "PATCH")
+        conn.commit()
+        assert _snapshot(conn) == {
+            (v1, e1, r1),
+            (v2, e1, r2),
+            (v2, e2, r3),
+            (v3, e2, r3),
+            (v4, e2, r4),
+        }
+
+    _down(_engine, _alembic_config, "c7a4d2e8f613", _schema)
+
+    with _engine.connect() as conn:
+        count = conn.execute(text("SELECT COUNT(*) FROM dataset_example_revisions")).scalar()
+        assert count == 5
@@ -243,6 +243,7 @@ def _get_expected_schema_info(
     db_backend: _DBBackend,
     additional_columns: Sequence[str] = (),
     additional_nullable_columns: Sequence[str] = (),
+    additional_index_names: Sequence[str] = (),
 ) -> _TableSchemaInfo:
     """
     Build complete schema info for an annotation table.
@@ -261,6 +262,7 @@ def _get_expected_schema_info(
         db_backend: Database backend type ('postgresql' or 'sqlite')
         additional_columns: Any additional columns specific to this table (e.g., ['document_position'] for document_annotations)
         additional_nullable_columns: Any additional nullable columns specific to this table
+        additional_index_names: Any additional indexes specific to this table
 
     Returns:
         Complete schema information including all columns, indexes, constraints, and nullable columns
@@ -282,6 +284,8 @@ def _get_expected_schema_info(
     # Build index names
     foreign_key_index = _get_foreign_key_index_name(table_name, foreign_key_column)
     index_names = {foreign_key_index}
+    if additional_index_names:
+        index_names.update(additional_index_names)
 
     # Build constraint names
     constraint_names = _get_common_constraint_names(table_name)
@@ -319,13 +323,15 @@ class TestDBSchema:
     """
 
     @pytest.mark.parametrize(
-        "table_name,foreign_key_column,additional_columns,additional_nullable_columns",
+        "table_name,foreign_key_column,additional_columns,additional_nullable_columns,"
+        "additional_index_names",
         [
             pytest.param(
                 "span_annotations",
                 "span_rowid",
                 [],
                 [],
+                ["ix_span_annotations_updated_at_id"],
                 id="span_annotations",
             ),
             pytest.param(
@@ -333,6 +339,7 @@ class TestDBSchema:
                 "trace_rowid",
                 [],
                 [],
+                ["ix_trace_annotations_updated_at_id"],
                 id="trace_annotations",
             ),
             pytest.param(
@@ -340,6 +347,7 @@ class TestDBSchema:
                 "project_session_id",
                 [],
                 [],  # no additional nullable columns - uses same as other annotation tables
+                [],
                 id="project_session_annotations",
             ),
             pytest.param(
@@ -347,6 +355,7 @@ class TestDBSchema:
                 "span_rowid",
                 ["document_position"],  # Additional column for document position within spans
                 [],
+                ["ix_document_annotations_updated_at_id"],
                 id="document_annotations",
             ),
         ],
@@ -357,6 +366,7 @@ class TestDBSchema:
         foreign_key_column: str,
         additional_columns: list[str],
         additional_nullable_columns: list[str],
+        additional_index_names: list[str],
         _engine: Engine,
         _alembic_config: Config,
         _db_backend: _DBBackend,
@@ -375,6 +385,7 @@ class TestDBSchema:
             table_name: Name of annotation table to test
             foreign_key_column: Foreign key column name for this table
             additional_columns: Any table-specific additional columns
+            additional_index_names: Any table-specific additional indexes
             _engine: SQLAlchemy database engine (pytest fixture)
             _alembic_config: Alembic configuration (pytest fixture)
             _db_backend: Database backend type (pytest fixture)
@@ -390,6 +401,7 @@ class TestDBSchema:
             db_backend=_db_backend,
             additional_columns=additional_columns,
             additional_nullable_columns=additional_nullable_columns,
+            additional_index_names=additional_index_names,
         )
 
         # Get actual schema from database
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from phoenix.db import models
+from phoenix.db.insertion.cumulative_counts import (
+    recompute_cumulative_counts,
+    recompute_project_cumulative_counts,
+)
+from phoenix.db.insertion.span import insert_spans
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+
+def _span(trace_id: str, span_id: str, parent_id: str | None, prompt_tokens: int) -> Span:
+    start_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return Span(
+        name=span_id,
+        context=SpanContext(trace_id=trace_id, span_id=span_id),
+        parent_id=parent_id,
+        span_kind=SpanKind.LLM,
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=1),
+        attributes={"llm": {"token_count": {"prompt": prompt_tokens, "completion": 1}}},
+        events=[],
+        status_code=SpanStatusCode.ERROR,
+        status_message="",
+        conversation=None,
+    )
+
+
+async def _cumulative_counts(db: DbSessionFactory) -> dict[str, tuple[int, int, int]]:
+    async with db() as session:
+        return {
+            span_id: (error_count, prompt, completion)
+            for span_id, error_count, prompt, completion in await session.execute(
+                select(
+                    models.Span.span_id,
+                    models.Span.cumulative_error_count,
+                    models.Span.cumulative_llm_token_count_prompt,
+                    models.Span.cumulative_llm_token_count_completion,
+                )
+            )
+        }
+
+
+async def _insert_chain_leaf_first(db: DbSessionFactory, trace_id: str) -> None:
+    # root <- child <- grandchild, each arriving in its own batch, leaf first
+    for span in [
+        _span(trace_id, f"{trace_id}-grandchild", f"{trace_id}-child", 1),
+        _span(trace_id, f"{trace_id}-child", f"{trace_id}-root", 10),
+        _span(trace_id, f"{trace_id}-root", None, 100),
+    ]:
+        async with db() as session:
+            await insert_spans(session, [(span, "project")], propagate_cumulative_counts=False)
+
+
+class TestRecomputeCumulativeCounts:
+    async def test_recomputes_counts_of_spans_inserted_without_propagation(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        await _insert_chain_leaf_first(db, "a")
+        await _insert_chain_leaf_first(db, "b")
+        # without propagation, each span only has its own counts
+        assert (await _cumulative_counts(db))["a-root"] == (1, 100, 1)
+        async with db() as session:
+            trace_rowid = await session.scalar(select(models.Trace.id).filter_by(trace_id="a"))
+            project_rowid = await session.scalar(select(models.Project.id))
+        assert trace_rowid is not None
+        async with db() as session:
+            assert await recompute_cumulative_counts(session, [trace_rowid]) == {project_rowid}
+        counts = await _cumulative_counts(db)
+        assert counts["a-root"] == (3, 111, 3)
+        assert counts["a-child"] == (2, 11, 2)
+        assert counts["a-grandchild"] == (1, 1, 1)
+        # other traces are left untouched
+        assert counts["b-root"] == (1, 100, 1)
+        # nothing changes the second time around
+        async with db() as session:
+            assert await recompute_cumulative_counts(session, [trace_rowid]) == set()
+
+    async def test_recomputes_all_traces_of_a_project(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        for trace_id in "abc":
+            await _insert_chain_leaf_first(db, trace_id)
+        async with db() as session:
+            project_rowid = await session.scalar(select(models.Project.id))
+        assert project_rowid is not None
+        num_traces = await recompute_project_cumulative_counts(db, project_rowid, traces_per_pass=2)
+        assert num_traces == 3
+        counts = await _cumulative_counts(db)
+        for trace_id in "abc":
+            assert counts[f"{trace_id}-root"] == (3, 111, 3)
@@ -1,6 +1,8 @@
+import pytest
 from sqlalchemy import select
 
 from phoenix.db import models
+from phoenix.db.insertion import dataset
 from phoenix.db.insertion.dataset import ExampleContent, add_dataset_examples
 from phoenix.server.types import DbSessionFactory
 
@@ -37,3 +39,32 @@ async def test_create_dataset(
     assert rev.input == {"x": 11, "y": 22}
     assert rev.output == {"z": 33}
     assert rev.metadata_ == {"zz": 44}
+
+
+async def test_create_dataset_in_multiple_batches(
+    db: DbSessionFactory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(dataset, "EXAMPLES_BATCH_SIZE", 2)
+    async with db() as session:
+        await add_dataset_examples(
+            session=session,
+            examples=(
+                ExampleContent(input={"x": i}, output={"y": i}, metadata={"z": i}) for i in range(5)
+            ),
+            name="abc",
+        )
+    async with db() as session:
+        revisions = list(
+            await session.scalars(
+                select(models.DatasetExampleRevision)
+                .join(models.DatasetExample)
+                .join_from(models.DatasetExample, models.Dataset)
+                .where(models.Dataset.name == "abc")
+                .order_by(models.DatasetExample.id)
+            )
+        )
+    assert [rev.input for rev in revisions] == [{"x": i} for i in range(5)]
+    assert [rev.output for rev in revisions] == [{"y": i} for i in range(5)]
+    assert [rev.metadata_ for rev in revisions] == [{"z": i} for i in range(5)]
+    assert len({rev.dataset_version_id for rev in revisions}) == 1
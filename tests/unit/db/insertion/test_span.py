@@ -0,0 +1,302 @@
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.event import listen, remove
+
+from phoenix.db import models
+from phoenix.db.insertion.span import insert_span, insert_spans
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+
+def _span(
+    trace_id: str,
+    span_id: str,
+    parent_id: Optional[str],
+    start_time: datetime,
+    *,
+    error: bool = False,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    session_id: Optional[str] = None,
+) -> Span:
+    attributes: dict[str, object] = {}
+    if prompt_tokens or completion_tokens:
+        attributes["llm"] = {
+            "token_count": {"prompt": prompt_tokens, "completion": completion_tokens}
+        }
+    if session_id:
+        attributes["session"] = {"id": session_id}
+    return Span(
+        name=span_id,
+        context=SpanContext(trace_id=trace_id, span_id=span_id),
+        parent_id=parent_id,
+        span_kind=SpanKind.LLM,
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=1),
+        attributes=attributes,
+        events=[],
+        status_code=SpanStatusCode.ERROR if error else SpanStatusCode.OK,
+        status_message="",
+        conversation=None,
+    )
+
+
+def _random_spans(seed: int) -> list[tuple[Span, str]]:
+    rng = random.Random(seed)
+    t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    spans: list[tuple[Span, str]] = []
+    for t in range(5):
+        trace_id = f"trace-{t}"
+        session_id = f"session-{t % 2}" if t < 4 else None
+        span_ids: list[str] = []
+        for s in range(30):
+            span_id = f"{trace_id}-span-{s}"
+            parent_id = rng.choice(span_ids) if span_ids else None
+            span_ids.append(span_id)
+            span = _span(
+                trace_id,
+                span_id,
+                parent_id,
+                t0 + timedelta(minutes=rng.randint(0, 1000)),
+                error=rng.random() < 0.3,
+                prompt_tokens=rng.randint(0, 10),
+                completion_tokens=rng.randint(0, 10),
+                session_id=session_id if rng.random() < 0.5 else None,
+            )
+            spans.append((span, f"project-{t % 3}"))
+    rng.shuffle(spans)
+    return spans
+
+
+def _expected_cumulative_counts(spans: list[tuple[Span, str]]) -> dict[str, tuple[int, int, int]]:
+    children: defaultdict[str, list[Span]] = defaultdict(list)
+    for span, _ in spans:
+        if span.parent_id is not None:
+            children[span.parent_id].append(span)
+
+    def counts(span: Span) -> tuple[int, int, int]:
+        token_count = span.attributes.get("llm", {}).get("token_count", {})
+        error_count = int(span.status_code is SpanStatusCode.ERROR)
+        prompt = token_count.get("prompt", 0)
+        completion = token_count.get("completion", 0)
+        for child in children[span.context.span_id]:
+            e, p, c = counts(child)
+            error_count, prompt, completion = error_count + e, prompt + p, completion + c
+        return error_count, prompt, completion
+
+    return {span.context.span_id: counts(span) for span, _ in spans}
+
+
+class TestInsertSpans:
+    @pytest.mark.parametrize("batch_size", [1, 7, 1000])
+    async def test_batch_insertion_matches_span_by_span_insertion(
+        self,
+        db: DbSessionFactory,
+        batch_size: int,
+    ) -> None:
+        spans = _random_spans(seed=batch_size)
+        # a handful of spans are inserted one at a time beforehand to exercise
+        # the merging with pre-existing traces, sessions and ancestors
+        preexisting, rest = spans[:10], spans[10:]
+        async with db() as session:
+            for span, project_name in preexisting:
+                await insert_span(session, span, project_name)
+        events = []
+        for i in range(0, len(rest), batch_size):
+            async with db() as session:
+                events.extend(await insert_spans(session, rest[i : i + batch_size]))
+        # duplicates are ignored
+        async with db() as session:
+            assert await insert_spans(session, spans[:5] + spans[:5]) == []
+
+        assert [span.context.span_id for span, _ in events] == [
+            span.context.span_id for span, _ in rest
+        ]
+        async with db() as session:
+            db_spans = {span.span_id: span for span in await session.scalars(select(models.Span))}
+            traces = {trace.id: trace for trace in await session.scalars(select(models.Trace))}
+            projects = {
+                project.id: project.name
+                for project in await session.scalars(select(models.Project))
+            }
+            sessions = {
+                project_session.id: project_session
+                for project_session in await session.scalars(select(models.ProjectSession))
+            }
+        for span, event in events:
+            db_span = db_spans[span.context.span_id]
+            assert event.span_rowid == db_span.id
+            assert event.trace_rowid == db_span.trace_rowid
+            assert event.project_rowid == traces[db_span.trace_rowid].project_rowid
+
+        expected = _expected_cumulative_counts(spans)
+        assert len(db_spans) == len(spans)
+        for span_id, db_span in db_spans.items():
+            assert db_span.project_rowid == traces[db_span.trace_rowid].project_rowid
+            assert (
+                db_span.cumulative_error_count,
+                db_span.cumulative_llm_token_count_prompt,
+                db_span.cumulative_llm_token_count_completion,
+            ) == expected[span_id]
+
+        first_project_names = {}
+        trace_times: dict[str, tuple[datetime, datetime]] = {}
+        for span, project_name in spans:
+            trace_id = span.context.trace_id
+            first_project_names.setdefault(trace_id, project_name)
+            start_time, end_time = trace_times.get(trace_id, (span.start_time, span.end_time))
+            trace_times[trace_id] = (
+                min(start_time, span.start_time),
+                max(end_time, span.end_time),
+            )
+        assert len(traces) == len(trace_times)
+        session_times: dict[int, tuple[datetime, datetime]] = {}
+        for trace in traces.values():
+            assert projects[trace.project_rowid] == first_project_names[trace.trace_id]
+            assert (trace.start_time, trace.end_time) == trace_times[trace.trace_id]
+            if trace.project_session_rowid is not None:
+                start_time, end_time = session_times.get(
+                    trace.project_session_rowid, (trace.start_time, trace.end_time)
+                )
+                session_times[trace.project_session_rowid] = (
+                    min(start_time, trace.start_time),
+                    max(end_time, trace.end_time),
+                )
+        assert {
+            id_: (project_session.start_time, project_session.end_time)
+            for id_, project_session in sessions.items()
+        } == session_times
+        assert sorted(s.session_id for s in sessions.values()) == ["session-0", "session-1"]
+
+    async def test_trace_and_session_rows_are_written_only_when_widened(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        async with db() as session:
+            await insert_spans(
+                session,
+                [
+                    (_span("trace", "root", None, t0, session_id="session"), "project"),
+                    (_span("trace", "last", "root", t0 + timedelta(seconds=10)), "project"),
+                ],
+            )
+        updates: list[str] = []
+
+        def record_updates(*args: object) -> None:
+            statement = str(args[2])
+            if statement.startswith("UPDATE"):
+                updates.append(statement.split()[1])
+
+        async with db() as session:
+            assert session.bind is not None
+            engine = session.bind.engine
+        listen(engine, "before_cursor_execute", record_updates)
+        try:
+            # late-arriving spans within the recorded time range leave the rows alone
+            async with db() as session:
+                await insert_spans(
+                    session,
+                    [
+                        (_span("trace", f"late-{i}", "root", t0 + timedelta(seconds=i)), "project")
+                        for i in range(1, 6)
+                    ],
+                )
+            assert updates == []
+            # a batch widening the range writes each row once
+            async with db() as session:
+                await insert_spans(
+                    session,
+                    [
+                        (
+                            _span("trace", f"later-{i}", "root", t0 + timedelta(seconds=10 + i)),
+                            "project",
+                        )
+                        for i in range(1, 6)
+                    ],
+                )
+            assert sorted(updates) == ["project_sessions", "traces"]
+        finally:
+            remove(engine, "before_cursor_execute", record_updates)
+        async with db() as session:
+            trace = await session.scalar(select(models.Trace))
+            project_session = await session.scalar(select(models.ProjectSession))
+        assert trace is not None and project_session is not None
+        expected = (t0, t0 + timedelta(seconds=16))
+        assert (trace.start_time, trace.end_time) == expected
+        assert (project_session.start_time, project_session.end_time) == expected
+
+    async def test_deep_trace_arriving_leaf_first(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        depth = 2000
+        spans = [
+            (
+                _span(
+                    "trace",
+                    f"span-{i}",
+                    f"span-{i - 1}" if i else None,
+                    t0 + timedelta(seconds=i),
+                    error=True,
+                    prompt_tokens=1,
+                ),
+                "project",
+            )
+            for i in range(depth)
+        ]
+        spans.reverse()
+        async with db() as session:
+            await insert_spans(session, spans[: depth // 2])
+        async with db() as session:
+            await insert_spans(session, spans[depth // 2 :])
+        async with db() as session:
+            root = await session.scalar(select(models.Span).filter_by(span_id="span-0"))
+        assert root is not None
+        assert root.cumulative_error_count == depth
+        assert root.cumulative_llm_token_count_prompt == depth
+
+    async def test_project_rowid_defaults_to_that_of_trace(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        async with db() as session:
+            project_rowid = await session.scalar(
+                insert(models.Project).values(name="project").returning(models.Project.id)
+            )
+            trace_rowid = await session.scalar(
+                insert(models.Trace)
+                .values(project_rowid=project_rowid, trace_id="trace", start_time=t0, end_time=t0)
+                .returning(models.Trace.id)
+            )
+            await session.execute(
+                insert(models.Span),
+                [
+                    dict(
+                        trace_rowid=trace_rowid,
+                        span_id=span_id,
+                        parent_id=None,
+                        name=span_id,
+                        span_kind="LLM",
+                        start_time=t0,
+                        end_time=t0,
+                        attributes={},
+                        events=[],
+                        status_code="OK",
+                        status_message="",
+                        cumulative_error_count=0,
+                        cumulative_llm_token_count_prompt=0,
+                        cumulative_llm_token_count_completion=0,
+                    )
+                    for span_id in ("span-0", "span-1")
+                ],
+            )
+            project_rowids = (await session.scalars(select(models.Span.project_rowid))).all()
+        assert project_rowids == [project_rowid, project_rowid]
@@ -0,0 +1,118 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+from sqlalchemy import func, select
+
+from phoenix.db import models
+from phoenix.db.insertion.span_annotation import SpanAnnotationQueueInserter
+from phoenix.db.insertion.types import Precursors
+from phoenix.server.dml_event import SpanAnnotationDmlEvent
+from phoenix.server.types import DbSessionFactory
+
+
+async def _insert_span(db: DbSessionFactory, now: datetime) -> None:
+    async with db() as session:
+        project = models.Project(name="project")
+        session.add(project)
+        await session.flush()
+        trace = models.Trace(
+            project_rowid=project.id, trace_id="trace", start_time=now, end_time=now
+        )
+        session.add(trace)
+        await session.flush()
+        session.add(
+            models.Span(
+                trace_rowid=trace.id,
+                span_id="span",
+                parent_id=None,
+                name="span",
+                span_kind="LLM",
+                start_time=now,
+                end_time=now,
+                attributes={},
+                events=[],
+                status_code="OK",
+                status_message="",
+                cumulative_error_count=0,
+                cumulative_llm_token_count_prompt=0,
+                cumulative_llm_token_count_completion=0,
+            )
+        )
+
+
+def _precursors(now: datetime, n: int) -> list[Precursors.SpanAnnotation]:
+    return [
+        Precursors.SpanAnnotation(
+            now,
+            "span",
+            models.SpanAnnotation(
+                name=f"annotation-{i}",
+                annotator_kind="LLM",
+                score=i,
+                label=None,
+                explanation=None,
+                metadata_={},
+                identifier="",
+                source="API",
+                user_id=None,
+            ),
+        )
+        for i in range(n)
+    ]
+
+
+async def test_backlog_is_inserted_in_chunks(db: DbSessionFactory) -> None:
+    now = datetime.now(timezone.utc)
+    await _insert_span(db, now)
+    inserter = SpanAnnotationQueueInserter(db, max_queue_size=20, chunk_size=10)
+    await inserter.enqueue(*_precursors(now, 25))
+    assert inserter.is_full
+
+    events = await inserter.insert()
+
+    assert not inserter.is_full and inserter.empty
+    assert events is not None
+    assert all(isinstance(event, SpanAnnotationDmlEvent) for event in events)
+    assert [len(event.ids) for event in events] == [10, 10, 5]
+    async with db() as session:
+        assert await session.scalar(select(func.count(models.SpanAnnotation.id))) == 25
+
+
+async def test_failed_chunk_is_retried_without_losing_other_chunks(
+    db: DbSessionFactory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = datetime.now(timezone.utc)
+    await _insert_span(db, now)
+    inserter = SpanAnnotationQueueInserter(db, retry_delay_sec=0, chunk_size=10)
+    await inserter.enqueue(*_precursors(now, 25))
+    partition = inserter._partition
+    num_calls = 0
+
+    async def fail_second_chunk(*args: Any, **kwargs: Any) -> Any:
+        nonlocal num_calls
+        if (num_calls := num_calls + 1) == 2:
+            raise RuntimeError("database is unavailable")
+        return await partition(*args, **kwargs)
+
+    monkeypatch.setattr(inserter, "_partition", fail_second_chunk)
+
+    events = await inserter.insert()
+
+    # the chunks before and after the failed one are committed and reported
+    assert events is not None
+    assert [len(event.ids) for event in events] == [10, 5]
+    async with db() as session:
+        assert await session.scalar(select(func.count(models.SpanAnnotation.id))) == 15
+
+    # the failed chunk is put back on the queue and inserted by a later run
+    await asyncio.sleep(0.01)
+    events = await inserter.insert()
+
+    assert inserter.empty
+    assert events is not None
+    assert [len(event.ids) for event in events] == [10]
+    async with db() as session:
+        assert await session.scalar(select(func.count(models.SpanAnnotation.id))) == 25
@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+from sqlalchemy import select
+
+from phoenix.db import models
+from phoenix.db.bulk_inserter import BulkInserter
+from phoenix.server.daemons.generative_model_store import GenerativeModelStore
+from phoenix.server.daemons.span_cost_calculator import SpanCostCalculator
+from phoenix.server.dml_event import DmlEvent, InsertedSpans, SpanInsertEvent
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class _EventQueue:
+    def __init__(self) -> None:
+        self.events: list[DmlEvent] = []
+
+    def put(self, item: DmlEvent) -> None:
+        self.events.append(item)
+
+
+def _span(trace_id: str, span_id: str, seconds: int, prompt: int, completion: int) -> Span:
+    start_time = _START + timedelta(seconds=seconds)
+    return Span(
+        name=span_id,
+        context=SpanContext(trace_id=trace_id, span_id=span_id),
+        parent_id=None,
+        span_kind=SpanKind.LLM,
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=10),
+        attributes={"llm": {"token_count": {"prompt": prompt, "completion": completion}}},
+        events=[],
+        status_code=SpanStatusCode.OK,
+        status_message="",
+        conversation=None,
+    )
+
+
+def _num_inserted_spans(events: list[DmlEvent]) -> int:
+    return sum(
+        len(summary.spans)
+        for event in events
+        if isinstance(event, SpanInsertEvent)
+        for summary in event.inserted_spans.values()
+    )
+
+
+async def test_span_insert_events_summarize_the_inserted_spans_by_project(
+    db: DbSessionFactory,
+) -> None:
+    event_queue = _EventQueue()
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=event_queue,
+        span_cost_calculator=SpanCostCalculator(db, GenerativeModelStore(db)),
+        sleep=1,
+    )
+    started_at = perf_counter()
+    async with bulk_inserter as (_, enqueue_span, *__):
+        await enqueue_span(_span("trace-a", "span-a0", 0, 1, 2), "project-a")
+        await enqueue_span(_span("trace-a", "span-a1", 5, 3, 4), "project-a")
+        await enqueue_span(_span("trace-b", "span-b0", 20, 5, 6), "project-b")
+        for _ in range(500):
+            if _num_inserted_spans(event_queue.events) == 3:
+                break
+            await asyncio.sleep(0.01)
+        # The event is put before the insertion is wrapped up, so wait for the inserter to
+        # go idle, so that exiting does not cancel it in the middle of a transaction.
+        await asyncio.sleep(0.5)
+        async with db() as session:
+            project_rowids = {
+                name: id_
+                for name, id_ in await session.execute(
+                    select(models.Project.name, models.Project.id)
+                )
+            }
+
+    events = [e for e in event_queue.events if isinstance(e, SpanInsertEvent)]
+    assert events
+    inserted_spans: dict[int, list[InsertedSpans]] = {}
+    for event in events:
+        assert set(event.inserted_spans) <= set(event.ids)
+        for project_rowid, summary in event.inserted_spans.items():
+            assert started_at <= summary.started_at
+            inserted_spans.setdefault(project_rowid, []).append(summary)
+    assert set(inserted_spans) == {project_rowids["project-a"], project_rowids["project-b"]}
+
+    (summary_a,) = inserted_spans[project_rowids["project-a"]]
+    assert summary_a.min_time == _START
+    assert summary_a.max_time == _START + timedelta(seconds=15)
+    assert sorted(summary_a.spans) == [
+        (_START, 1, 2),
+        (_START + timedelta(seconds=5), 3, 4),
+    ]
+    (summary_b,) = inserted_spans[project_rowids["project-b"]]
+    assert summary_b.min_time == _START + timedelta(seconds=20)
+    assert summary_b.max_time == _START + timedelta(seconds=30)
+    assert summary_b.spans == ((_START + timedelta(seconds=20), 5, 6),)
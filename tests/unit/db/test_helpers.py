@@ -1,3 +1,4 @@
+import asyncio
 import itertools
 from datetime import datetime, timedelta, timezone
 from secrets import token_hex
@@ -18,6 +19,13 @@ from phoenix.db.helpers import (
     create_experiment_examples_snapshot_insert,
     date_trunc,
     get_dataset_example_revisions,
+    get_dataset_example_revisions_from_history,
+)
+from phoenix.db.insertion.dataset import (
+    insert_dataset,
+    insert_dataset_example,
+    insert_dataset_example_revision,
+    insert_dataset_version,
 )
 from phoenix.server.types import DbSessionFactory
 
@@ -747,9 +755,9 @@ class TestGetDatasetExampleRevisions:
                 unique_example_ids = set(example_ids)
 
                 # No duplicates
-                assert len(example_ids) == len(unique_example_ids), (
-                    f"Duplicate example IDs found for version {version_id}: {example_ids}"
-                )
+                assert len(example_ids) == len(
+                    unique_example_ids
+                ), f"Duplicate example IDs found for version {version_id}: {example_ids}"
 
     async def test_cross_dataset_isolation(
         self,
@@ -1048,6 +1056,69 @@ class TestGetDatasetExampleRevisions:
                 f"instead of exactly once. Each example should appear exactly once."
             )
 
+    async def test_snapshot_matches_revision_history(
+        self,
+        db: DbSessionFactory,
+        _test_data: dict[str, int],
+    ) -> None:
+        version_ids = [
+            _test_data["version1_id"],
+            _test_data["version2_id"],
+            _test_data["version3_id"],
+            _test_data["version_isolated_id"],
+        ]
+        async with db() as session:
+            for version_id in version_ids:
+                for kwargs in ({}, {"split_ids": [_test_data["split_train_id"]]}):
+                    snapshot = await session.scalars(
+                        get_dataset_example_revisions(version_id, **kwargs)
+                    )
+                    history = await session.scalars(
+                        get_dataset_example_revisions_from_history(version_id, **kwargs)
+                    )
+                    assert sorted(r.id for r in snapshot) == sorted(r.id for r in history)
+
+    async def test_snapshot_of_concurrent_appends_matches_revision_history(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        if db.dialect is SupportedSQLDialect.SQLITE:
+            pytest.skip("SQLite serializes writes")
+
+        now = datetime.now(timezone.utc)
+
+        async def append(session: Any, dataset_id: Any) -> int:
+            version_id = await insert_dataset_version(session, dataset_id, created_at=now)
+            example_id = await insert_dataset_example(session, dataset_id, created_at=now)
+            await insert_dataset_example_revision(
+                session, version_id, example_id, {}, {}, created_at=now
+            )
+            return version_id
+
+        async def append_in_new_session(dataset_id: Any) -> int:
+            async with db() as session:
+                return await append(session, dataset_id)
+
+        async with db() as session:
+            dataset_id = await insert_dataset(session, token_hex(8), created_at=now)
+            await append(session, dataset_id)
+        async with db() as session:
+            first_version_id = await append(session, dataset_id)
+            second_append = asyncio.create_task(append_in_new_session(dataset_id))
+            await asyncio.sleep(0.5)
+            assert not second_append.done(), "appends to a dataset should be serialized"
+        second_version_id = await asyncio.wait_for(second_append, 10)
+        assert second_version_id > first_version_id
+        async with db() as session:
+            for version_id, num_examples in ((first_version_id, 2), (second_version_id, 3)):
+                snapshot = await session.scalars(get_dataset_example_revisions(version_id))
+                history = await session.scalars(
+                    get_dataset_example_revisions_from_history(version_id)
+                )
+                snapshot_ids = sorted(r.id for r in snapshot)
+                assert len(snapshot_ids) == num_examples
+                assert snapshot_ids == sorted(r.id for r in history)
+
 
 class TestCreateExperimentExamplesSnapshotInsert:
     @pytest.fixture
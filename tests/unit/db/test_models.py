@@ -8,8 +8,9 @@ import sqlalchemy as sa
 from deepdiff.diff import DeepDiff
 from sqlalchemy import select
 
+from phoenix.config import ENV_PHOENIX_ENABLE_SPAN_TEXT_SEARCH_INDEX
 from phoenix.db import models
-from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.db.helpers import SupportedSQLDialect, span_text_search
 from phoenix.server.types import DbSessionFactory
 
 
@@ -176,6 +177,143 @@ class TestCaseInsensitiveContains:
                 assert actual_ids == expected_ids, f"{test_description} failed for '{substring}'"
 
 
+class TestSpanTextSearch:
+    VALUES = [
+        ("Hello Wörld", "nothing here"),
+        ("HELLO wörld", None),
+        (None, "Café Naïve"),
+        ("test_underscore%percent", 'say "hello"'),
+        ("path\\to\\file", "Hello 世界"),
+        ({"not": "a string"}, ["hello"]),
+        ("Straße", None),
+    ]
+
+    @pytest.fixture(autouse=True)
+    def _enable_index(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # before the `db` fixture creates the tables
+        monkeypatch.setenv(ENV_PHOENIX_ENABLE_SPAN_TEXT_SEARCH_INDEX, "true")
+
+    @pytest.fixture
+    async def _spans(self, db: DbSessionFactory) -> list[models.Span]:
+        now = datetime.now()
+        async with db() as session:
+            project = models.Project(name=token_hex(8))
+            session.add(project)
+            await session.flush()
+            spans = []
+            for input_value, output_value in self.VALUES:
+                trace = models.Trace(
+                    project_rowid=project.id,
+                    trace_id=token_hex(16),
+                    start_time=now,
+                    end_time=now,
+                )
+                attributes: dict[str, Any] = {}
+                if input_value is not None:
+                    attributes["input"] = {"value": input_value}
+                if output_value is not None:
+                    attributes["output"] = {"value": output_value}
+                span = models.Span(
+                    trace=trace,
+                    span_id=token_hex(8),
+                    parent_id=None,
+                    name="span",
+                    span_kind="LLM",
+                    start_time=now,
+                    end_time=now,
+                    attributes=attributes,
+                    events=[],
+                    status_code="OK",
+                    status_message="",
+                    cumulative_error_count=0,
+                    cumulative_llm_token_count_prompt=0,
+                    cumulative_llm_token_count_completion=0,
+                )
+                session.add(span)
+                spans.append(span)
+        return spans
+
+    @pytest.mark.parametrize(
+        "substring",
+        [
+            "hello",
+            "WÖRLD",
+            "café",
+            "_underscore%",
+            "\\to\\",
+            '"hello"',
+            "世界",
+            "ello",
+            "He",
+            "STRAßE",
+        ],
+    )
+    async def test_prefilter_preserves_exact_matches(
+        self,
+        _spans: list[models.Span],
+        db: DbSessionFactory,
+        substring: str,
+    ) -> None:
+        input_value = models.Span.attributes[["input", "value"]].as_string()
+        output_value = models.Span.attributes[["output", "value"]].as_string()
+        exact = sa.or_(
+            models.CaseInsensitiveContains(input_value, substring),
+            models.CaseInsensitiveContains(output_value, substring),
+        )
+        async with db() as session:
+            expected = set(await session.scalars(select(models.Span.id).where(exact)))
+            actual = set(
+                await session.scalars(
+                    select(models.Span.id).where(
+                        span_text_search(substring, "input", "output"), exact
+                    )
+                )
+            )
+        assert expected
+        assert actual == expected
+
+    async def test_index_follows_deleted_spans(
+        self,
+        _spans: list[models.Span],
+        db: DbSessionFactory,
+    ) -> None:
+        search = span_text_search("hello", "input")
+        async with db() as session:
+            assert await session.scalar(select(sa.func.count()).where(search)) == 2
+            await session.execute(
+                sa.delete(models.Trace).where(models.Trace.id == _spans[0].trace_rowid)
+            )
+        async with db() as session:
+            assert await session.scalar(select(sa.func.count()).where(search)) == 1
+            dialect = SupportedSQLDialect(session.bind.dialect.name)
+            if dialect is SupportedSQLDialect.SQLITE:
+                indexed = await session.scalar(
+                    sa.text(f"SELECT COUNT(*) FROM {models.SPANS_TEXT_SEARCH}")
+                )
+                assert indexed == len(_spans) - 1
+
+
+@pytest.fixture
+def _disable_index(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(ENV_PHOENIX_ENABLE_SPAN_TEXT_SEARCH_INDEX, raising=False)
+
+
+async def test_span_text_search_is_not_indexed_by_default(
+    _disable_index: None,
+    db: DbSessionFactory,
+) -> None:
+    assert span_text_search("hello", "input", "output").compare(sa.true())
+    async with db() as session:
+        dialect = SupportedSQLDialect(session.bind.dialect.name)
+        if dialect is SupportedSQLDialect.SQLITE:
+            stmt = sa.text("SELECT COUNT(*) FROM sqlite_master WHERE name LIKE :name")
+            params = {"name": f"{models.SPANS_TEXT_SEARCH}%"}
+        else:
+            stmt = sa.text("SELECT COUNT(*) FROM pg_indexes WHERE indexname LIKE :name")
+            params = {"name": "ix_spans_%_value_trgm"}
+        assert await session.scalar(stmt, params) == 0
+
+
 class TestJsonSerialization:
     """Comprehensive validation of orjson serialization behavior across all JSON columns.
 
@@ -0,0 +1,247 @@
+import asyncio
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from google.protobuf.wrappers_pb2 import DoubleValue
+from sqlalchemy import select
+
+import phoenix.trace.v1 as pb
+from phoenix.db import models
+from phoenix.db.bulk_inserter import BulkInserter
+from phoenix.db.span_spool import ProjectName, SpanSpool
+from phoenix.server.daemons.generative_model_store import GenerativeModelStore
+from phoenix.server.daemons.span_cost_calculator import SpanCostCalculator
+from phoenix.server.dml_event import DmlEvent
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanEvent, SpanKind, SpanStatusCode
+
+
+class _EventQueue:
+    def __init__(self) -> None:
+        self.events: list[DmlEvent] = []
+
+    def put(self, item: DmlEvent) -> None:
+        self.events.append(item)
+
+
+def _span(i: int) -> Span:
+    start_time = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=i)
+    return Span(
+        name=f"span-{i}",
+        context=SpanContext(trace_id=f"trace-{i // 10}", span_id=f"span-{i}"),
+        parent_id=None,
+        span_kind=SpanKind.LLM,
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=1),
+        attributes={"llm": {"token_count": {"prompt": i}}, "metadata": {"tags": ["a", "b"]}},
+        events=[SpanEvent(name="event", timestamp=start_time, attributes={"i": i})],
+        status_code=SpanStatusCode.OK,
+        status_message="",
+        conversation=None,
+    )
+
+
+class TestSpanSpool:
+    def test_spans_are_replayed_until_committed(self, tmp_path: Path) -> None:
+        items = [(_span(i), f"project-{i % 2}") for i in range(10)]
+        spool = SpanSpool(tmp_path)
+        spool.open()
+        spool.append(items[:6])
+        spool.append(items[6:])
+        assert len(spool) == 10
+        assert spool.read(4) == items[:4]
+        spool.commit()
+        assert spool.read(4) == items[4:8]
+        spool.rewind()
+        assert len(spool) == 6
+        assert spool.read(100) == items[4:]
+        spool.close()
+
+        spool = SpanSpool(tmp_path)
+        spool.open()
+        assert len(spool) == 6
+        assert spool.read(100) == items[4:]
+        spool.commit()
+        spool.close()
+
+        spool = SpanSpool(tmp_path)
+        spool.open()
+        assert len(spool) == 0
+        assert spool.read(100) == []
+        spool.close()
+
+    def test_torn_record_is_skipped_and_committed_segments_are_deleted(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        items = [(_span(i), "project") for i in range(10)]
+        spool = SpanSpool(tmp_path, max_segment_size=1)
+        spool.open()
+        for item in items:
+            spool.append([item])
+        spool.close()
+        segments = sorted(tmp_path.glob("*.segment"))
+        assert len(segments) == 10
+        # simulate a crash in the middle of writing the last record
+        last = segments[-1]
+        last.write_bytes(last.read_bytes()[:-5])
+
+        spool = SpanSpool(tmp_path, max_segment_size=1)
+        spool.open()
+        assert len(spool) == 9
+        assert spool.read(5) == items[:5]
+        spool.commit()
+        assert len(list(tmp_path.glob("*.segment"))) == 7
+        spool.append(items[-1:])
+        assert spool.read(100) == items[5:9] + items[-1:]
+        spool.commit()
+        spool.close()
+        assert len(list(tmp_path.glob("*.segment"))) <= 2
+
+
+async def test_bulk_inserter_drains_span_spool(
+    db: DbSessionFactory,
+    tmp_path: Path,
+) -> None:
+    spool = SpanSpool(tmp_path)
+    spool.open()
+    spool.append((_span(i), "project") for i in range(25))
+    spool.close()
+
+    spool = SpanSpool(tmp_path)
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=_EventQueue(),
+        span_cost_calculator=SpanCostCalculator(db, GenerativeModelStore(db)),
+        sleep=0.01,
+        max_ops_per_transaction=10,
+        span_spool=spool,
+    )
+    async with bulk_inserter as (_, enqueue_span, *__):
+        await enqueue_span(_span(25), "project")
+        for _ in range(500):
+            if not len(spool):
+                break
+            await asyncio.sleep(0.01)
+    assert not len(spool)
+    async with db() as session:
+        span_ids = set(await session.scalars(select(models.Span.span_id)))
+    assert span_ids == {f"span-{i}" for i in range(26)}
+
+    spool = SpanSpool(tmp_path)
+    spool.open()
+    assert len(spool) == 0
+    spool.close()
+
+
+class _CountingSpanSpool(SpanSpool):
+    def __init__(self, directory: Path) -> None:
+        super().__init__(directory)
+        self.appends: list[int] = []
+
+    def append(self, items: Iterable[tuple[Span, ProjectName]]) -> None:
+        items = list(items)
+        if items:
+            self.appends.append(len(items))
+        super().append(items)
+
+
+async def test_concurrently_enqueued_spans_are_spooled_together_and_count_as_queued(
+    db: DbSessionFactory,
+    tmp_path: Path,
+) -> None:
+    spool = _CountingSpanSpool(tmp_path)
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=_EventQueue(),
+        span_cost_calculator=SpanCostCalculator(db, GenerativeModelStore(db)),
+        sleep=60,
+        max_spans_queue_size=10,
+        span_spool=spool,
+    )
+    async with bulk_inserter as (_, enqueue_span, *__):
+        await asyncio.sleep(0.1)
+        assert not bulk_inserter.is_full
+        await asyncio.gather(*(enqueue_span(_span(i), "project") for i in range(10)))
+        assert len(spool) == 10
+        assert bulk_inserter.is_full
+    assert sum(spool.appends) == 10
+    assert len(spool.appends) < 10
+
+
+async def test_evaluations_are_not_held_back_by_later_spans_in_spool(
+    db: DbSessionFactory,
+    tmp_path: Path,
+) -> None:
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=_EventQueue(),
+        span_cost_calculator=SpanCostCalculator(db, GenerativeModelStore(db)),
+        sleep=0.01,
+        max_ops_per_transaction=10,
+        span_spool=SpanSpool(tmp_path),
+    )
+    evaluation = pb.Evaluation(
+        name="score",
+        subject_id=pb.Evaluation.SubjectId(span_id="span-0"),
+        result=pb.Evaluation.Result(score=DoubleValue(value=1.0)),
+    )
+    annotation_names: list[str] = []
+    async with bulk_inserter as (_, enqueue_span, enqueue_evaluation, _):
+        await enqueue_span(_span(0), "project")
+        await enqueue_evaluation(evaluation)
+        # Keep the spool backlog above one batch, as under sustained ingest.
+        for i in range(1, 3001, 30):
+            await asyncio.gather(*(enqueue_span(_span(j), "project") for j in range(i, i + 30)))
+            async with db() as session:
+                annotation_names = list(await session.scalars(select(models.SpanAnnotation.name)))
+            if annotation_names:
+                break
+            await asyncio.sleep(0.01)
+    assert annotation_names == ["score"]
+
+
+class _FailingOnceSpanSpool(SpanSpool):
+    def __init__(self, directory: Path) -> None:
+        super().__init__(directory)
+        self.failed = False
+
+    def append(self, items: Iterable[tuple[Span, ProjectName]]) -> None:
+        items = list(items)
+        if items and not self.failed:
+            self.failed = True
+            raise OSError("disk full")
+        super().append(items)
+
+
+async def test_evaluations_are_not_held_back_by_spans_that_failed_to_be_spooled(
+    db: DbSessionFactory,
+    tmp_path: Path,
+) -> None:
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=_EventQueue(),
+        span_cost_calculator=SpanCostCalculator(db, GenerativeModelStore(db)),
+        sleep=0.01,
+        span_spool=_FailingOnceSpanSpool(tmp_path),
+    )
+    evaluation = pb.Evaluation(
+        name="score",
+        subject_id=pb.Evaluation.SubjectId(span_id="span-1"),
+        result=pb.Evaluation.Result(score=DoubleValue(value=1.0)),
+    )
+    annotation_names: list[str] = []
+    async with bulk_inserter as (_, enqueue_span, enqueue_evaluation, _):
+        with pytest.raises(OSError):
+            await enqueue_span(_span(0), "project")
+        await enqueue_span(_span(1), "project")
+        await enqueue_evaluation(evaluation)
+        for _ in range(500):
+            async with db() as session:
+                annotation_names = list(await session.scalars(select(models.SpanAnnotation.name)))
+            if annotation_names:
+                break
+            await asyncio.sleep(0.01)
+    assert annotation_names == ["score"]
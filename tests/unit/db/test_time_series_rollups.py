@@ -0,0 +1,177 @@
+from datetime import datetime, timedelta, timezone
+from secrets import token_hex
+from typing import Any, Optional
+
+import pytest
+from sqlalchemy import delete, select
+
+from phoenix.db import models
+from phoenix.db.time_series_rollups import (
+    Granularity,
+    TimeBinField,
+    get_time_series_rollup_granularity,
+    refresh_time_series_rollups,
+)
+from phoenix.server.types import DbSessionFactory
+
+_T0 = datetime(2024, 1, 1, 23, 58, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "field, utc_offset_minutes, start, end, expected",
+    [
+        pytest.param("minute", 0, _T0, None, None, id="unaligned-start"),
+        pytest.param("minute", 0, _T0.replace(second=0), None, "minute", id="minute-aligned-start"),
+        pytest.param(
+            "hour",
+            0,
+            datetime(2024, 1, 1, 1, tzinfo=timezone.utc),
+            datetime(2024, 1, 1, 3, 30, tzinfo=timezone.utc),
+            "minute",
+            id="unaligned-end",
+        ),
+        pytest.param(
+            "hour",
+            -300,
+            datetime(2024, 1, 1, 1, tzinfo=timezone.utc),
+            datetime(2024, 1, 1, 3, tzinfo=timezone.utc),
+            "hour",
+            id="whole-hour-offset",
+        ),
+        pytest.param(
+            "hour",
+            330,
+            datetime(2024, 1, 1, 1, tzinfo=timezone.utc),
+            None,
+            "minute",
+            id="fractional-hour-offset",
+        ),
+        pytest.param(
+            "month",
+            0,
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+            datetime(2024, 3, 1, tzinfo=timezone.utc),
+            "day",
+            id="day-for-month",
+        ),
+        pytest.param(
+            "day",
+            60,
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+            None,
+            "hour",
+            id="no-day-with-offset",
+        ),
+    ],
+)
+def test_get_time_series_rollup_granularity(
+    field: TimeBinField,
+    utc_offset_minutes: int,
+    start: datetime,
+    end: Optional[datetime],
+    expected: Optional[Granularity],
+) -> None:
+    assert get_time_series_rollup_granularity(field, utc_offset_minutes, start, end) == expected
+
+
+async def _rollups(
+    db: DbSessionFactory,
+    granularity: Granularity,
+) -> dict[datetime, tuple[Any, ...]]:
+    rollup = models.ProjectTimeSeriesRollup
+    async with db() as session:
+        return {
+            bucket_start: tuple(values)
+            for bucket_start, *values in await session.execute(
+                select(
+                    rollup.bucket_start,
+                    rollup.span_count,
+                    rollup.span_error_count,
+                    rollup.trace_count,
+                    rollup.span_cost_count,
+                    rollup.total_cost,
+                )
+                .where(rollup.granularity == granularity)
+                .order_by(rollup.bucket_start)
+            )
+        }
+
+
+class TestRefreshTimeSeriesRollups:
+    async def test_rollups_follow_raw_data(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        async with db() as session:
+            project = models.Project(name=token_hex(8))
+            session.add(project)
+            await session.flush()
+            # one trace spanning midnight, with spans starting a minute apart
+            trace = models.Trace(
+                trace_id=token_hex(16),
+                project_rowid=project.id,
+                start_time=_T0,
+                end_time=_T0 + timedelta(minutes=3),
+            )
+            session.add(trace)
+            await session.flush()
+            for i, status_code in enumerate(["OK", "ERROR", "OK"]):
+                start_time = _T0 + timedelta(minutes=i)
+                span = models.Span(
+                    trace_rowid=trace.id,
+                    span_id=token_hex(8),
+                    parent_id=None,
+                    name="span",
+                    span_kind="LLM",
+                    start_time=start_time,
+                    end_time=start_time + timedelta(seconds=1),
+                    attributes={},
+                    events=[],
+                    status_code=status_code,
+                    status_message="",
+                    cumulative_error_count=0,
+                    cumulative_llm_token_count_prompt=0,
+                    cumulative_llm_token_count_completion=0,
+                )
+                session.add(span)
+                await session.flush()
+                session.add(
+                    models.SpanCost(
+                        span_rowid=span.id,
+                        trace_rowid=trace.id,
+                        span_start_time=start_time,
+                        total_cost=0.25,
+                    )
+                )
+            await session.flush()
+            await refresh_time_series_rollups(
+                session, [(project.id, trace.start_time, trace.end_time)]
+            )
+        # costs are bucketed by the start time of their trace
+        assert await _rollups(db, "minute") == {
+            datetime(2024, 1, 1, 23, 58, tzinfo=timezone.utc): (1, 0, 1, 3, 0.75),
+            datetime(2024, 1, 1, 23, 59, tzinfo=timezone.utc): (1, 1, 0, 0, None),
+            datetime(2024, 1, 2, 0, 0, tzinfo=timezone.utc): (1, 0, 0, 0, None),
+        }
+        assert await _rollups(db, "hour") == {
+            datetime(2024, 1, 1, 23, tzinfo=timezone.utc): (2, 1, 1, 3, 0.75),
+            datetime(2024, 1, 2, 0, tzinfo=timezone.utc): (1, 0, 0, 0, None),
+        }
+        assert await _rollups(db, "day") == {
+            datetime(2024, 1, 1, tzinfo=timezone.utc): (2, 1, 1, 3, 0.75),
+            datetime(2024, 1, 2, tzinfo=timezone.utc): (1, 0, 0, 0, None),
+        }
+        # refreshing again changes nothing
+        async with db() as session:
+            await refresh_time_series_rollups(
+                session, [(project.id, trace.start_time, trace.end_time)]
+            )
+        assert len(await _rollups(db, "minute")) == 3
+        # deleting the trace empties every bucket it touched
+        async with db() as session:
+            await session.execute(delete(models.Trace))
+            await refresh_time_series_rollups(
+                session, [(project.id, trace.start_time, trace.end_time)]
+            )
+        for granularity in ("minute", "hour", "day"):
+            assert await _rollups(db, granularity) == {}
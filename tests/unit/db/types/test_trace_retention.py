@@ -245,6 +245,51 @@ class TestTraceRetentionRuleMaxCount:
             chain.from_iterable(unaffected_projects.values())
         ), "Unaffected projects should retain all their traces"
 
+    @pytest.mark.parametrize("with_cutoffs", [False, True])
+    async def test_delete_traces_with_limit(
+        self,
+        with_cutoffs: bool,
+        db: DbSessionFactory,
+    ) -> None:
+        async with db() as session:
+            project = models.Project(name=token_hex(8))
+            session.add(project)
+            await session.flush()
+            now = datetime.now(timezone.utc)
+            traces = [
+                models.Trace(
+                    project_rowid=project.id,
+                    trace_id=token_hex(16),
+                    start_time=now - timedelta(days=days),
+                    end_time=now,
+                )
+                for days in range(5)
+            ]
+            session.add_all(traces)
+            await session.flush()
+            trace_rowids = [trace.id for trace in traces]
+
+        # the oldest traces are deleted first, at most `limit` at a time
+        rule = MaxCountRule(max_count=1)
+        max_count_cutoffs = None
+        if with_cutoffs:
+            async with db() as session:
+                max_count_cutoffs = await rule.get_max_count_cutoffs(session, [project.id])
+            assert max_count_cutoffs == {project.id: (traces[0].start_time, trace_rowids[0])}
+        for expected_result, expected_remaining in [
+            ({project.id: 2}, trace_rowids[:3]),
+            ({project.id: 2}, trace_rowids[:1]),
+            ({}, trace_rowids[:1]),
+        ]:
+            async with db() as session:
+                result = await rule.delete_traces(
+                    session, [project.id], limit=2, max_count_cutoffs=max_count_cutoffs
+                )
+                assert result == expected_result
+            async with db() as session:
+                remaining = await session.scalars(sa.select(models.Trace.id))
+                assert set(remaining.all()) == set(expected_remaining)
+
 
 class TestTraceRetentionRuleMaxDaysOrCountRule:
     """Test the MaxDaysOrCountRule which combines both max_days and max_count rules.
@@ -343,11 +388,11 @@ class TestTraceRetentionRuleMaxDaysOrCountRule:
                     models.Trace.project_rowid.in_(affected_projects.keys())
                 )
             )
-        assert set(remaining_traces.all()) == set(
-            traces[0] for traces in affected_projects.values()
-        ) - set(chain.from_iterable(old_projects.values())), (
-            "Each affected project should retain only its most recent trace and old projects should haveno trace remaining"
-        )
+        assert (
+            set(remaining_traces.all())
+            == set(traces[0] for traces in affected_projects.values())
+            - set(chain.from_iterable(old_projects.values()))
+        ), "Each affected project should retain only its most recent trace and old projects should haveno trace remaining"
 
         # Verify unaffected projects are untouched
         async with db() as session:
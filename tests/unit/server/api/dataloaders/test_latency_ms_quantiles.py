@@ -1,5 +1,7 @@
-from datetime import datetime
-from typing import Literal
+from asyncio import Future, get_running_loop, sleep
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Literal, Optional
 
 import numpy as np
 import pandas as pd
@@ -8,8 +10,9 @@ from sqlalchemy import select
 
 from phoenix.db import models
 from phoenix.server.api.dataloaders import LatencyMsQuantileDataLoader
-from phoenix.server.api.dataloaders.latency_ms_quantile import Key
+from phoenix.server.api.dataloaders.latency_ms_quantile import Key, LatencyMsQuantileCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
+from phoenix.server.dml_event import InsertedSpans
 from phoenix.server.types import DbSessionFactory
 
 
@@ -66,3 +69,38 @@ async def test_latency_ms_quantiles_p25_p50_p75(
     ]
     actual = await LatencyMsQuantileDataLoader(db)._load_fn(keys)
     assert actual == pytest.approx(expected, 1e-7)
+
+
+async def test_latency_ms_quantile_cache_is_invalidated_by_overlapping_inserted_spans() -> None:
+    t0 = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+    closed = TimeRange(start=t0, end=t0 + timedelta(hours=1))
+    open_ = TimeRange(start=t0 + timedelta(hours=1))
+    keys: list[Key] = [
+        ("span", 1, closed, None, None, 0.5),
+        ("trace", 1, closed, None, None, 0.5),
+        ("span", 1, open_, None, None, 0.5),
+        ("span", 1, None, "name == 'span'", None, 0.5),
+        ("trace", 1, closed, None, "'abc' in input.value", 0.5),
+        ("span", 2, open_, None, None, 0.5),
+    ]
+    cache = LatencyMsQuantileCache()
+    for key in keys:
+        future: Future[Optional[float]] = get_running_loop().create_future()
+        future.set_result(1.0)
+        cache.set(key, future)
+    await sleep(0)  # let the cache record when the futures were settled
+
+    start_time = t0 + timedelta(hours=2)
+    cache.update_with_inserted_spans(
+        1,
+        InsertedSpans(
+            started_at=perf_counter(),
+            min_time=start_time,
+            max_time=start_time + timedelta(seconds=1),
+            spans=((start_time, 0, 0),),
+        ),
+    )
+
+    # quantiles cannot be updated in place, so entries for intervals overlapping the
+    # inserted spans or with session filters are evicted, and the rest are untouched
+    assert [cache.get(key) is not None for key in keys] == [True, True, False, False, False, True]
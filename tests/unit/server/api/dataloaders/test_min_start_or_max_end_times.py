@@ -0,0 +1,47 @@
+from asyncio import Future, get_running_loop, sleep
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Optional
+
+from phoenix.server.api.dataloaders.min_start_or_max_end_times import (
+    Key,
+    MinStartOrMaxEndTimeCache,
+)
+from phoenix.server.dml_event import InsertedSpans
+
+
+async def test_min_start_or_max_end_time_cache_is_widened_by_inserted_spans() -> None:
+    t0 = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+    times: dict[Key, Optional[datetime]] = {
+        (1, "start"): t0 + timedelta(hours=1),
+        (1, "end"): t0 + timedelta(hours=2),
+        (2, "start"): t0 + timedelta(hours=1),
+        (3, "start"): None,
+        (3, "end"): None,
+    }
+    cache = MinStartOrMaxEndTimeCache()
+    for key, time in times.items():
+        future: Future[Optional[datetime]] = get_running_loop().create_future()
+        future.set_result(time)
+        cache.set(key, future)
+    await sleep(0)  # let the cache record when the futures were settled
+
+    for project_rowid in (1, 3):
+        cache.update_with_inserted_spans(
+            project_rowid,
+            InsertedSpans(
+                started_at=perf_counter(),
+                min_time=t0,
+                max_time=t0 + timedelta(hours=1),
+                spans=((t0, 0, 0),),
+            ),
+        )
+
+    results = {key: cached.result() if (cached := cache.get(key)) else None for key in times}
+    assert results == {
+        (1, "start"): t0,
+        (1, "end"): t0 + timedelta(hours=2),
+        (2, "start"): t0 + timedelta(hours=1),
+        (3, "start"): t0,
+        (3, "end"): t0 + timedelta(hours=1),
+    }
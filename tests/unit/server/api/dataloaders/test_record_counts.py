@@ -1,14 +1,20 @@
-from datetime import datetime
+from asyncio import sleep
+from datetime import datetime, timedelta
+from secrets import token_hex
+from time import perf_counter
 from typing import Literal
 
 import pandas as pd
 from sqlalchemy import func, select
 
 from phoenix.db import models
+from phoenix.db.insertion.span import insert_spans
 from phoenix.server.api.dataloaders import RecordCountDataLoader
-from phoenix.server.api.dataloaders.record_counts import Key
+from phoenix.server.api.dataloaders.record_counts import Key, RecordCountCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
+from phoenix.server.dml_event import InsertedSpans
 from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
 
 
 async def test_record_counts(
@@ -58,3 +64,71 @@ async def test_record_counts(
 
     actual = await RecordCountDataLoader(db)._load_fn(keys)
     assert actual == expected
+
+
+async def test_record_count_cache_is_updated_with_inserted_spans(
+    db: DbSessionFactory,
+) -> None:
+    t0 = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+
+    async def insert_spans_at(*start_times: datetime) -> None:
+        async with db() as session:
+            await insert_spans(
+                session,
+                [
+                    (
+                        Span(
+                            name="span",
+                            context=SpanContext(trace_id=token_hex(16), span_id=token_hex(8)),
+                            parent_id=None,
+                            span_kind=SpanKind.UNKNOWN,
+                            start_time=start_time,
+                            end_time=start_time + timedelta(seconds=1),
+                            attributes={},
+                            events=[],
+                            status_code=SpanStatusCode.OK,
+                            status_message="",
+                            conversation=None,
+                        ),
+                        "project",
+                    )
+                    for start_time in start_times
+                ],
+            )
+
+    await insert_spans_at(t0, t0 + timedelta(hours=1))
+    async with db() as session:
+        project_rowid = await session.scalar(select(models.Project.id))
+    assert project_rowid is not None
+    closed = TimeRange(start=t0, end=t0 + timedelta(hours=1))
+    open_ = TimeRange(start=t0 + timedelta(hours=1))
+    keys: list[Key] = [
+        ("span", project_rowid, closed, None, None),
+        ("span", project_rowid, open_, None, None),
+        ("span", project_rowid, open_, "name == 'span'", None),
+        ("trace", project_rowid, None, None, None),
+    ]
+    cache = RecordCountCache()
+    assert await RecordCountDataLoader(db, cache_map=cache).load_many(keys) == [1, 1, 1, 2]
+    await sleep(0)
+
+    started_at = perf_counter()
+    start_time = t0 + timedelta(hours=2)
+    await insert_spans_at(start_time, start_time)
+    cache.update_with_inserted_spans(
+        project_rowid,
+        InsertedSpans(
+            started_at=started_at,
+            min_time=start_time,
+            max_time=start_time + timedelta(seconds=1),
+            spans=((start_time, 0, 0), (start_time, 0, 0)),
+        ),
+    )
+
+    # the count for the closed time range is untouched, the unfiltered span count for the
+    # open time range is incremented, and the rest are evicted to be recomputed
+    assert cache.get(keys[0]) is not None
+    assert (future := cache.get(keys[1])) is not None and future.result() == 3
+    assert cache.get(keys[2]) is None
+    assert cache.get(keys[3]) is None
+    assert await RecordCountDataLoader(db).load_many(keys) == [1, 3, 3, 4]
@@ -1,4 +1,6 @@
-from datetime import datetime
+from asyncio import Future, get_running_loop, sleep
+from datetime import datetime, timedelta
+from time import perf_counter
 from typing import Literal
 
 import pandas as pd
@@ -6,8 +8,9 @@ from sqlalchemy import func, select
 
 from phoenix.db import models
 from phoenix.server.api.dataloaders import TokenCountDataLoader
-from phoenix.server.api.dataloaders.token_counts import Key
+from phoenix.server.api.dataloaders.token_counts import Key, TokenCountCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
+from phoenix.server.dml_event import InsertedSpans
 from phoenix.server.types import DbSessionFactory
 
 
@@ -55,3 +58,50 @@ async def test_token_counts(
     ]
     actual = await TokenCountDataLoader(db)._load_fn(keys)
     assert actual == expected
+
+
+async def test_token_count_cache_is_updated_with_inserted_spans() -> None:
+    t0 = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+    closed = TimeRange(start=t0, end=t0 + timedelta(hours=1))
+    open_ = TimeRange(start=t0 + timedelta(hours=1))
+    keys: list[Key] = [
+        ("prompt", 1, open_, None),
+        ("completion", 1, open_, None),
+        ("total", 1, None, None),
+        ("total", 1, closed, None),
+        ("total", 1, open_, "name == 'span'"),
+        ("total", 2, None, None),
+    ]
+    cache = TokenCountCache()
+    for key in keys:
+        future: Future[int] = get_running_loop().create_future()
+        future.set_result(100)
+        cache.set(key, future)
+    pending_key: Key = ("prompt", 1, None, None)
+    cache.set(pending_key, get_running_loop().create_future())
+    await sleep(0)  # let the cache record when the futures were settled
+
+    started_at = perf_counter()
+    settled_late_key: Key = ("completion", 1, None, None)
+    settled_late: Future[int] = get_running_loop().create_future()
+    settled_late.set_result(100)
+    cache.set(settled_late_key, settled_late)
+    await sleep(0)
+
+    start_time = t0 + timedelta(hours=2)
+    cache.update_with_inserted_spans(
+        1,
+        InsertedSpans(
+            started_at=started_at,
+            min_time=start_time,
+            max_time=start_time + timedelta(seconds=1),
+            spans=((start_time, 10, 20), (start_time, 1, 2)),
+        ),
+    )
+
+    # unfiltered sums for intervals containing the spans are incremented, sums for the
+    # closed interval and for other projects are untouched, and the rest are evicted
+    results = [cached.result() if (cached := cache.get(key)) else None for key in keys]
+    assert results == [111, 122, 133, 100, None, 100]
+    assert cache.get(pending_key) is None
+    assert cache.get(settled_late_key) is None
@@ -56,6 +56,16 @@ class TestTraceTransferMutationMixin:
             ).all()
             assert len(span_costs) == 2
 
+            span_project_rowids = (
+                await session.scalars(
+                    select(models.Span.project_rowid).where(
+                        models.Span.trace_rowid.in_([trace1_id, trace2_id])
+                    )
+                )
+            ).all()
+            assert span_project_rowids
+            assert all(rowid == source_project_id for rowid in span_project_rowids)
+
         result = await gql_client.execute(
             self.TRANSFER_TRACES_MUTATION,
             variables={
@@ -95,6 +105,16 @@ class TestTraceTransferMutationMixin:
             ).all()
             assert len(span_costs) == 2
 
+            span_project_rowids = (
+                await session.scalars(
+                    select(models.Span.project_rowid).where(
+                        models.Span.trace_rowid.in_([trace1_id, trace2_id])
+                    )
+                )
+            ).all()
+            assert span_project_rowids
+            assert all(rowid == dest_project_id for rowid in span_project_rowids)
+
     async def test_transfer_traces_fails_with_non_existent_trace_id(
         self,
         gql_client: AsyncGraphQLClient,
@@ -2,12 +2,14 @@ import gzip
 import inspect
 import io
 import json
+import zlib
 from io import BytesIO, StringIO
 from typing import Any
 
 import httpx
 import pandas as pd
 import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from httpx import HTTPStatusError
 from pandas.testing import assert_frame_equal
@@ -15,6 +17,7 @@ from sqlalchemy import select
 from strawberry.relay import GlobalID
 
 from phoenix.db import models
+from phoenix.server.api.routers.v1 import datasets
 from phoenix.server.api.types.Dataset import Dataset
 from phoenix.server.api.types.DatasetVersion import DatasetVersion
 from phoenix.server.types import DbSessionFactory
@@ -380,6 +383,72 @@ async def test_get_dataset_download_specific_version(
     assert_frame_equal(actual, expected)
 
 
+async def test_get_dataset_download_in_multiple_batches(
+    httpx_client: httpx.AsyncClient,
+    dataset_with_revisions: Any,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(datasets, "EXPORT_BATCH_SIZE", 2)
+    dataset_global_id = GlobalID("Dataset", str(2))
+    dataset_version_global_id = GlobalID("DatasetVersion", str(8))
+    response = await httpx_client.get(
+        f"/v1/datasets/{dataset_global_id}/csv?version_id={dataset_version_global_id}"
+    )
+    assert response.status_code == 200
+    assert response.text.count("example_id") == 1
+    actual = pd.read_csv(StringIO(response.content.decode())).sort_index(axis=1)
+    expected = pd.read_csv(
+        StringIO(
+            "example_id,input_in,metadata_info,output_out\n"
+            "RGF0YXNldEV4YW1wbGU6Mw==,foo,first revision,bar\n"
+            "RGF0YXNldEV4YW1wbGU6NA==,updated foofoo,updating revision,updated barbar\n"
+            "RGF0YXNldEV4YW1wbGU6NQ==,look at me,a new example,i have all the answers\n"
+            "RGF0YXNldEV4YW1wbGU6Nw==,look at me,a newer example,i have all the answers\n"
+        )
+    ).sort_index(axis=1)
+    assert_frame_equal(actual, expected)
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+async def test_get_dataset_download_binary_formats(
+    httpx_client: httpx.AsyncClient,
+    dataset_with_revisions: Any,
+    monkeypatch: pytest.MonkeyPatch,
+    file_format: str,
+) -> None:
+    monkeypatch.setattr(datasets, "EXPORT_BATCH_SIZE", 3)
+    dataset_global_id = GlobalID("Dataset", str(2))
+    dataset_version_global_id = GlobalID("DatasetVersion", str(8))
+    response = await httpx_client.get(
+        f"/v1/datasets/{dataset_global_id}/{file_format}?version_id={dataset_version_global_id}"
+    )
+    assert response.status_code == 200
+    if file_format == "parquet":
+        assert response.headers.get("content-type") == "application/vnd.apache.parquet"
+        table = pq.read_table(pa.BufferReader(response.content))
+    else:
+        assert response.headers.get("content-type") == "application/vnd.apache.arrow.stream"
+        table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == ["example_id", "input", "output", "metadata"]
+    rows = table.to_pylist()
+    assert [row["example_id"] for row in rows] == [
+        str(GlobalID("DatasetExample", str(i))) for i in (3, 4, 5, 7)
+    ]
+    assert json.loads(rows[1]["input"]) == {"in": "updated foofoo"}
+    assert json.loads(rows[1]["output"]) == {"out": "updated barbar"}
+    assert json.loads(rows[1]["metadata"]) == {"info": "updating revision"}
+
+
+async def test_get_dataset_download_binary_formats_of_empty_dataset(
+    httpx_client: httpx.AsyncClient,
+    empty_dataset: Any,
+) -> None:
+    dataset_global_id = GlobalID("Dataset", str(1))
+    response = await httpx_client.get(f"/v1/datasets/{dataset_global_id}/parquet")
+    assert response.status_code == 200
+    assert pq.read_table(pa.BufferReader(response.content)).num_rows == 0
+
+
 async def test_get_dataset_jsonl_openai_ft(
     httpx_client: httpx.AsyncClient,
     dataset_with_messages: tuple[int, int],
@@ -569,6 +638,135 @@ async def test_post_dataset_upload_csv_create_then_append(
     assert db_dataset_version.dataset_id == int(GlobalID.from_id(dataset_id).node_id)
 
 
+async def test_post_dataset_upload_deflated_csv(
+    httpx_client: httpx.AsyncClient,
+    db: DbSessionFactory,
+) -> None:
+    name = inspect.stack()[0][3]
+    rows = "".join(f"{i},{i + 1},{i + 2}\n" for i in range(1000))
+    file = zlib.compress(f"a,b,c\n{rows}".encode())
+    response = await httpx_client.post(
+        url="v1/datasets/upload?sync=true",
+        files={"file": (" ", file, "text/csv", {"Content-Encoding": "deflate"})},
+        data={
+            "action": "create",
+            "name": name,
+            "input_keys[]": ["a"],
+            "output_keys[]": ["b"],
+            "metadata_keys[]": ["c"],
+        },
+    )
+    assert response.status_code == 200
+    async with db() as session:
+        revisions = list(
+            await session.scalars(
+                select(models.DatasetExampleRevision)
+                .join(models.DatasetExample)
+                .join_from(models.DatasetExample, models.Dataset)
+                .where(models.Dataset.name == name)
+                .order_by(models.DatasetExample.id)
+            )
+        )
+    assert len(revisions) == 1000
+    assert revisions[0].input == {"a": "0"}
+    assert revisions[-1].input == {"a": "999"}
+    assert revisions[-1].output == {"b": "1000"}
+    assert revisions[-1].metadata_ == {"c": "1001"}
+
+
+async def test_post_dataset_upload_jsonl(
+    httpx_client: httpx.AsyncClient,
+    db: DbSessionFactory,
+) -> None:
+    name = inspect.stack()[0][3]
+    file = gzip.compress(
+        b'{"question": "q1", "answer": "a1", "source": {"id": 1}}\n'
+        b"\n"
+        b'{"question": "q2", "answer": "a2"}\n'
+    )
+    response = await httpx_client.post(
+        url="v1/datasets/upload?sync=true",
+        files={"file": (" ", file, "application/jsonl", {"Content-Encoding": "gzip"})},
+        data={
+            "action": "create",
+            "name": name,
+            "input_keys[]": ["question"],
+            "output_keys[]": ["answer"],
+            "metadata_keys[]": ["source"],
+        },
+    )
+    assert response.status_code == 200
+    async with db() as session:
+        revisions = list(
+            await session.scalars(
+                select(models.DatasetExampleRevision)
+                .join(models.DatasetExample)
+                .join_from(models.DatasetExample, models.Dataset)
+                .where(models.Dataset.name == name)
+                .order_by(models.DatasetExample.id)
+            )
+        )
+    assert len(revisions) == 2
+    assert revisions[0].input == {"question": "q1"}
+    assert revisions[0].output == {"answer": "a1"}
+    assert revisions[0].metadata_ == {"source": {"id": 1}}
+    assert revisions[1].input == {"question": "q2"}
+    assert revisions[1].output == {"answer": "a2"}
+    assert revisions[1].metadata_ == {"source": None}
+
+
+async def test_post_dataset_upload_jsonl_with_missing_keys(
+    httpx_client: httpx.AsyncClient,
+) -> None:
+    response = await httpx_client.post(
+        url="v1/datasets/upload?sync=true",
+        files={"file": (" ", b'{"question": "q1"}\n', "application/jsonl", {})},
+        data={
+            "action": "create",
+            "name": inspect.stack()[0][3],
+            "input_keys[]": ["question"],
+            "output_keys[]": ["answer"],
+        },
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("sync", [True, False])
+async def test_post_dataset_upload_jsonl_with_malformed_row(
+    httpx_client: httpx.AsyncClient,
+    db: DbSessionFactory,
+    sync: bool,
+) -> None:
+    name = f"{inspect.stack()[0][3]}_{sync}"
+    file = b'{"question": "q1"}\n{"question": "q2"}\n{"question": \n{"question": "q4"}\n'
+    response = await httpx_client.post(
+        url=f"v1/datasets/upload?sync={str(sync).lower()}",
+        files={"file": (" ", file, "application/jsonl", {})},
+        data={
+            "action": "create",
+            "name": name,
+            "input_keys[]": ["question"],
+        },
+    )
+    assert response.status_code == 422
+    assert "row 3" in response.text
+    async with db() as session:
+        assert (
+            await session.scalar(select(models.Dataset.id).where(models.Dataset.name == name))
+            is None
+        )
+
+
+def test_spooled_examples_are_read_back_in_order() -> None:
+    examples = [
+        datasets.ExampleContent(input={"a": i}, output={"b": [i]}, metadata={"c": None})
+        for i in range(3)
+    ]
+    spool = datasets._spool_examples(iter(examples))
+    assert list(datasets._read_spooled_examples(spool)) == examples
+    assert spool.closed
+
+
 async def test_post_dataset_upload_pyarrow_create_then_append(
     httpx_client: httpx.AsyncClient,
     db: DbSessionFactory,
@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from typing import Any, Optional
+
+import httpx
+import pyarrow as pa
+import pytest
+from sqlalchemy import insert
+
+from phoenix.db import models
+from phoenix.server.api.routers.v1.evaluations import (
+    EVALUATIONS_NEXT_CURSOR_HEADER,
+    _encode_cursor,
+)
+from phoenix.server.api.types.pagination import Cursor
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace import Evaluations
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def project_with_evaluations(db: DbSessionFactory) -> None:
+    """
+    Contains a project with a trace and a span, with two trace evaluations and three span
+    evaluations updated one minute apart, in the order trace, span, span, trace, span.
+    """
+    async with db() as session:
+        project_rowid = await session.scalar(
+            insert(models.Project).values(name="project-name").returning(models.Project.id)
+        )
+        trace_rowid = await session.scalar(
+            insert(models.Trace)
+            .values(
+                trace_id="trace-id",
+                project_rowid=project_rowid,
+                start_time=_START,
+                end_time=_START,
+            )
+            .returning(models.Trace.id)
+        )
+        span_rowid = await session.scalar(
+            insert(models.Span)
+            .values(
+                trace_rowid=trace_rowid,
+                span_id="span-id",
+                parent_id=None,
+                name="span",
+                span_kind="LLM",
+                start_time=_START,
+                end_time=_START,
+                attributes={},
+                events=[],
+                status_code="OK",
+                status_message="",
+                cumulative_error_count=0,
+                cumulative_llm_token_count_prompt=0,
+                cumulative_llm_token_count_completion=0,
+            )
+            .returning(models.Span.id)
+        )
+        for i, (table, name) in enumerate(
+            [
+                (models.TraceAnnotation, "coherence"),
+                (models.SpanAnnotation, "correctness"),
+                (models.SpanAnnotation, "relevance"),
+                (models.TraceAnnotation, "toxicity"),
+                (models.SpanAnnotation, "hallucination"),
+            ]
+        ):
+            values: dict[str, Any] = dict(
+                name=name,
+                score=float(i),
+                label=None,
+                explanation=None,
+                metadata_={},
+                annotator_kind="LLM",
+                identifier="",
+                source="API",
+                created_at=_START,
+                updated_at=_START + timedelta(minutes=i),
+            )
+            if table is models.TraceAnnotation:
+                values["trace_rowid"] = trace_rowid
+            else:
+                values["span_rowid"] = span_rowid
+            await session.execute(insert(table).values(**values))
+
+
+async def _get_evaluations(
+    httpx_client: httpx.AsyncClient,
+    **params: Any,
+) -> tuple[list[Evaluations], Optional[str]]:
+    response = await httpx_client.get(
+        "v1/evaluations",
+        params={"project_name": "project-name", **params},
+    )
+    if response.status_code == 404:
+        return [], None
+    assert response.status_code == 200
+    source = BytesIO(response.content)
+    evaluations = []
+    while True:
+        try:
+            with pa.ipc.open_stream(source) as reader:
+                evaluations.append(Evaluations.from_pyarrow_reader(reader))
+        except pa.ArrowInvalid:
+            break
+    return evaluations, response.headers.get(EVALUATIONS_NEXT_CURSOR_HEADER)
+
+
+async def test_evaluations_are_paged_in_order_of_update(
+    httpx_client: httpx.AsyncClient,
+    project_with_evaluations: Any,
+) -> None:
+    pages = []
+    params: dict[str, Any] = {"limit": 2}
+    while True:
+        evaluations, cursor = await _get_evaluations(httpx_client, **params)
+        pages.append(sorted(e.eval_name for e in evaluations))
+        if not cursor:
+            break
+        params["cursor"] = cursor
+    assert pages == [
+        ["coherence", "toxicity"],
+        ["correctness", "relevance"],
+        ["hallucination"],
+        [],  # the document evaluations
+    ]
+
+    evaluations, cursor = await _get_evaluations(httpx_client)
+    assert cursor is None
+    assert len(evaluations) == 5
+
+
+async def test_evaluations_are_filtered_by_update_time_and_name(
+    httpx_client: httpx.AsyncClient,
+    project_with_evaluations: Any,
+) -> None:
+    evaluations, _ = await _get_evaluations(
+        httpx_client,
+        updated_after=(_START + timedelta(minutes=1)).isoformat(),
+    )
+    assert sorted(e.eval_name for e in evaluations) == ["hallucination", "relevance", "toxicity"]
+
+    evaluations, _ = await _get_evaluations(
+        httpx_client,
+        updated_after=(_START + timedelta(minutes=1)).isoformat(),
+        eval_names=["relevance", "coherence"],
+        limit=10,
+    )
+    assert [e.eval_name for e in evaluations] == ["relevance"]
+
+    evaluations, _ = await _get_evaluations(
+        httpx_client,
+        updated_after=(_START + timedelta(minutes=4)).isoformat(),
+    )
+    assert evaluations == []
+
+
+async def test_invalid_cursor_is_rejected(
+    httpx_client: httpx.AsyncClient,
+    project_with_evaluations: Any,
+) -> None:
+    response = await httpx_client.get("v1/evaluations", params={"cursor": "abc", "limit": 1})
+    assert response.status_code == 422
+    response = await httpx_client.get("v1/evaluations", params={"cursor": "abc"})
+    assert response.status_code == 422
+    response = await httpx_client.get(
+        "v1/evaluations",
+        params={"cursor": _encode_cursor("span", Cursor(rowid=5)), "limit": 1},
+    )
+    assert response.status_code == 422
@@ -409,6 +409,159 @@ async def test_experiment_runs_pagination(
     assert response.status_code == 422
 
 
+async def test_creating_experiment_runs_in_batch(
+    httpx_client: httpx.AsyncClient,
+    simple_dataset: Any,
+    db: DbSessionFactory,
+) -> None:
+    dataset_gid = GlobalID("Dataset", "0")
+    experiment = (
+        await httpx_client.post(
+            f"v1/datasets/{dataset_gid}/experiments",
+            json={"version_id": None, "repetitions": 3},
+        )
+    ).json()["data"]
+    example_id = (
+        await httpx_client.get(
+            f"v1/datasets/{dataset_gid}/examples",
+            params={"version_id": str(experiment["dataset_version_id"])},
+        )
+    ).json()["data"]["examples"][0]["id"]
+
+    def run(repetition_number: int, **kwargs: Any) -> dict[str, Any]:
+        return {
+            "dataset_example_id": example_id,
+            "output": f"output-{repetition_number}",
+            "repetition_number": repetition_number,
+            "start_time": datetime.now(timezone.utc).isoformat(),
+            "end_time": datetime.now(timezone.utc).isoformat(),
+            **kwargs,
+        }
+
+    url = f"v1/experiments/{experiment['id']}/runs/batch"
+    response = await httpx_client.post(
+        url,
+        json={
+            "data": [
+                run(1),
+                run(2, error="failed"),
+                run(3, dataset_example_id=str(GlobalID("DatasetExample", "999"))),
+                run(3, dataset_example_id=str(GlobalID("Experiment", "1"))),
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["data"]
+    assert len(results) == 4
+    assert results[0]["id"] and results[0]["error"] is None
+    assert results[1]["id"] and results[1]["error"] is None
+    assert results[2]["id"] is None and "does not exist" in results[2]["error"]
+    assert results[3]["id"] is None and "does not exist" in results[3]["error"]
+
+    # a successful run is kept, a failed run is overwritten
+    response = await httpx_client.post(url, json={"data": [run(1), run(2), run(3)]})
+    assert response.status_code == 200
+    retried = response.json()["data"]
+    assert retried[0]["id"] == results[0]["id"]
+    assert "already exists" in retried[0]["error"]
+    assert retried[1] == {"id": results[1]["id"], "error": None}
+    assert retried[2]["id"] and retried[2]["error"] is None
+
+    async with db() as session:
+        runs = (
+            await session.scalars(
+                select(models.ExperimentRun).order_by(models.ExperimentRun.repetition_number)
+            )
+        ).all()
+    assert [(r.repetition_number, r.error) for r in runs] == [(1, None), (2, None), (3, None)]
+    assert [r.output["task_output"] for r in runs] == ["output-1", "output-2", "output-3"]
+
+    response = await httpx_client.post(
+        f"v1/experiments/{GlobalID('Experiment', '999')}/runs/batch", json={"data": [run(1)]}
+    )
+    assert response.status_code == 404
+
+
+async def test_upserting_experiment_evaluations_in_batch(
+    httpx_client: httpx.AsyncClient,
+    simple_dataset: Any,
+    db: DbSessionFactory,
+) -> None:
+    dataset_gid = GlobalID("Dataset", "0")
+    experiment = (
+        await httpx_client.post(
+            f"v1/datasets/{dataset_gid}/experiments",
+            json={"version_id": None, "repetitions": 1},
+        )
+    ).json()["data"]
+    example_id = (
+        await httpx_client.get(
+            f"v1/datasets/{dataset_gid}/examples",
+            params={"version_id": str(experiment["dataset_version_id"])},
+        )
+    ).json()["data"]["examples"][0]["id"]
+    run_id = (
+        await httpx_client.post(
+            f"v1/experiments/{experiment['id']}/runs",
+            json={
+                "dataset_example_id": example_id,
+                "output": "output",
+                "repetition_number": 1,
+                "start_time": datetime.now(timezone.utc).isoformat(),
+                "end_time": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+    ).json()["data"]["id"]
+
+    def evaluation(name: str, **kwargs: Any) -> dict[str, Any]:
+        return {
+            "experiment_run_id": run_id,
+            "name": name,
+            "annotator_kind": "CODE",
+            "start_time": datetime.now(timezone.utc).isoformat(),
+            "end_time": datetime.now(timezone.utc).isoformat(),
+            **kwargs,
+        }
+
+    response = await httpx_client.post(
+        "v1/experiment_evaluations/batch",
+        json={
+            "data": [
+                evaluation("accuracy", result={"score": 0.5}),
+                evaluation("relevance", error="failed"),
+                evaluation(
+                    "accuracy",
+                    result={"score": 1.0},
+                    experiment_run_id=str(GlobalID("ExperimentRun", "999")),
+                ),
+                evaluation("accuracy", result={"score": 1.0}),
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["data"]
+    assert len(results) == 4
+    assert results[0]["id"] and results[0]["id"] == results[3]["id"]
+    assert results[1]["id"] and results[1]["error"] is None
+    assert results[2]["id"] is None and "does not exist" in results[2]["error"]
+
+    async with db() as session:
+        annotations = (
+            await session.scalars(
+                select(models.ExperimentRunAnnotation).order_by(models.ExperimentRunAnnotation.name)
+            )
+        ).all()
+    assert [(a.name, a.score, a.error) for a in annotations] == [
+        ("accuracy", 1.0, None),
+        ("relevance", None, "failed"),
+    ]
+
+    response = await httpx_client.post(
+        "v1/experiment_evaluations/batch", json={"data": [evaluation("accuracy")]}
+    )
+    assert response.status_code == 422
+
+
 class TestExperimentCounts:
     """
     Test suite for experiment count fields (example_count, successful_run_count, failed_run_count, and missing_run_count).
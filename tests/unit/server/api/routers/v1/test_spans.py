@@ -1,10 +1,12 @@
 from asyncio import sleep
 from datetime import datetime, timedelta
+from io import BytesIO
 from random import getrandbits
 from typing import Any, Callable, Optional, cast
 
 import httpx
 import pandas as pd
+import pyarrow as pa
 import pytest
 from faker import Faker
 from sqlalchemy import insert, select
@@ -14,13 +16,19 @@ from phoenix import Client as LegacyClient
 from phoenix import TraceDataset
 from phoenix.client import Client
 from phoenix.db import models
+from phoenix.db.bulk_inserter import BulkInserter
+from phoenix.server.api.routers.utils import table_to_bytes
+from phoenix.server.api.routers.v1 import spans as spans_router
 from phoenix.server.api.routers.v1.spans import (
+    ARROW_QUERY_INDEX_KEY,
+    ARROW_STREAM_MEDIA_TYPE,
     OtlpAnyValue,
     OtlpSpan,
     OtlpStatus,
     Span,
 )
 from phoenix.server.types import DbSessionFactory
+from phoenix.trace import SpanEvaluations
 from phoenix.trace.dsl import SpanQuery
 
 
@@ -38,7 +46,8 @@ async def test_span_round_tripping_with_docs(
     orig_docs = cast(pd.DataFrame, legacy_px_client.query_spans(doc_query))
     orig_count = len(orig_docs)
     assert orig_count
-    legacy_px_client.log_traces(TraceDataset(df))
+    # the test transport has to run on the event loop of the test
+    legacy_px_client.log_traces(TraceDataset(df), concurrency=1)
     await sleep(1)  # Wait for the spans to be inserted
     docs = cast(pd.DataFrame, legacy_px_client.query_spans(doc_query))
     new_count = len(docs)
@@ -57,6 +66,148 @@ async def test_querying_spans_with_new_client(
     assert legacy_df.equals(df)
 
 
+@pytest.fixture
+async def arrow_stream_test_data(db: DbSessionFactory) -> None:
+    start_time = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+    async with db() as session:
+        project_rowid = await session.scalar(
+            insert(models.Project).values(name="arrow-stream").returning(models.Project.id)
+        )
+        trace_rowid = await session.scalar(
+            insert(models.Trace)
+            .values(
+                trace_id="arrowstream",
+                project_rowid=project_rowid,
+                start_time=start_time,
+                end_time=start_time + timedelta(minutes=1),
+            )
+            .returning(models.Trace.id)
+        )
+        for i in range(7):
+            await session.execute(
+                insert(models.Span).values(
+                    trace_rowid=trace_rowid,
+                    span_id=f"{i:016x}",
+                    parent_id=None,
+                    name=f"span-{i}",
+                    span_kind="CHAIN",
+                    # spans 3 and 4 share a start time to exercise tie-breaking between pages
+                    start_time=start_time + timedelta(seconds=min(i, 3)),
+                    end_time=start_time + timedelta(seconds=10),
+                    # the attribute columns differ between spans, and hence between pages
+                    attributes={"even": i} if i % 2 == 0 else {"odd": str(i)},
+                    events=[],
+                    status_code="OK",
+                    status_message="",
+                    cumulative_error_count=0,
+                    cumulative_llm_token_count_prompt=0,
+                    cumulative_llm_token_count_completion=0,
+                )
+            )
+
+
+async def test_query_spans_as_arrow_stream(
+    httpx_client: httpx.AsyncClient,
+    arrow_stream_test_data: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(spans_router, "_ARROW_STREAM_PAGE_SIZE", 2)
+    queries = [SpanQuery(), SpanQuery().where("name == 'span-0'")]
+    request_body = {"queries": [query.to_dict() for query in queries], "limit": 5}
+    response = await httpx_client.post(
+        "v1/spans",
+        params={"project_name": "arrow-stream"},
+        headers={"accept": ARROW_STREAM_MEDIA_TYPE},
+        json=request_body,
+    )
+    assert response.is_success
+    assert response.headers["content-type"] == ARROW_STREAM_MEDIA_TYPE
+    tables: list[pa.Table] = []
+    source = BytesIO(response.content)
+    while True:
+        try:
+            with pa.ipc.open_stream(source) as reader:
+                tables.append(reader.read_all())
+        except pa.ArrowInvalid:
+            break
+    assert [table.num_rows for table in tables] == [2, 2, 1, 1]
+    assert [table.schema.metadata[ARROW_QUERY_INDEX_KEY.encode()] for table in tables] == [
+        b"0",
+        b"0",
+        b"0",
+        b"1",
+    ]
+    df = pd.concat([table.to_pandas() for table in tables[:3]])
+    assert df["name"].tolist() == ["span-6", "span-5", "span-4", "span-3", "span-2"]
+    assert tables[3].to_pandas()["name"].tolist() == ["span-0"]
+
+    # the pages add up to the same spans as the non-streaming response
+    response = await httpx_client.post(
+        "v1/spans",
+        params={"project_name": "arrow-stream"},
+        json=request_body,
+    )
+    assert response.is_success
+    with pa.ipc.open_stream(BytesIO(response.content)) as reader:
+        expected = reader.read_pandas()
+    assert sorted(df.index) == sorted(expected.index)
+    assert sorted(df.columns) == sorted(expected.columns)
+
+
+async def test_query_spans_with_mixed_type_attribute_as_arrow_stream(
+    db: DbSessionFactory,
+    httpx_client: httpx.AsyncClient,
+) -> None:
+    start_time = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+    async with db() as session:
+        project_rowid = await session.scalar(
+            insert(models.Project).values(name="mixed-types").returning(models.Project.id)
+        )
+        trace_rowid = await session.scalar(
+            insert(models.Trace)
+            .values(
+                trace_id="mixedtypes",
+                project_rowid=project_rowid,
+                start_time=start_time,
+                end_time=start_time + timedelta(minutes=1),
+            )
+            .returning(models.Trace.id)
+        )
+        for i, value in enumerate([1, "a", None]):
+            await session.execute(
+                insert(models.Span).values(
+                    trace_rowid=trace_rowid,
+                    span_id=f"{i:016x}",
+                    parent_id=None,
+                    name=f"span-{i}",
+                    span_kind="CHAIN",
+                    start_time=start_time + timedelta(seconds=i),
+                    end_time=start_time + timedelta(seconds=10),
+                    attributes={"metadata": {"x": value}} if value is not None else {},
+                    events=[],
+                    status_code="OK",
+                    status_message="",
+                    cumulative_error_count=0,
+                    cumulative_llm_token_count_prompt=0,
+                    cumulative_llm_token_count_completion=0,
+                )
+            )
+    response = await httpx_client.post(
+        "v1/spans",
+        params={"project_name": "mixed-types"},
+        headers={"accept": ARROW_STREAM_MEDIA_TYPE},
+        json={"queries": [SpanQuery().select("name", "metadata.x").to_dict()]},
+    )
+    assert response.is_success
+    with pa.ipc.open_stream(BytesIO(response.content)) as reader:
+        df = reader.read_pandas()
+    assert dict(zip(df["name"], df["metadata.x"])) == {
+        "span-0": "1",
+        "span-1": "a",
+        "span-2": None,
+    }
+
+
 @pytest.mark.parametrize("sync", [False, True])
 async def test_rest_span_annotation(
     db: DbSessionFactory,
@@ -100,6 +251,123 @@ async def test_rest_span_annotation(
     assert orm_annotation.metadata_ == dict()
 
 
+@pytest.mark.parametrize("sync", [False, True])
+async def test_rest_span_annotation_is_rejected_when_queue_is_full(
+    httpx_client: httpx.AsyncClient,
+    project_with_a_single_trace_and_span: Any,
+    sync: bool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(BulkInserter, "annotation_queue_is_full", lambda *_: True)
+    request_body = {
+        "data": [
+            {
+                "span_id": "7e2f08cb43bbf521",
+                "name": "correctness",
+                "annotator_kind": "LLM",
+                "result": {"score": 1},
+                "metadata": {},
+            }
+        ]
+    }
+    response = await httpx_client.post(f"v1/span_annotations?sync={sync}", json=request_body)
+    # synchronous requests do not go through the queue
+    assert response.status_code == (200 if sync else 503)
+
+
+async def test_rest_span_annotations_are_upserted_in_bulk(
+    db: DbSessionFactory,
+    httpx_client: httpx.AsyncClient,
+    project_with_a_single_trace_and_span: Any,
+) -> None:
+    # more annotations than fit in one chunk, with the last one updating the first one
+    num_names = 1200
+    request_body = {
+        "data": [
+            {
+                "span_id": "7e2f08cb43bbf521",
+                "name": f"eval-{i % num_names}",
+                "annotator_kind": "LLM",
+                "result": {"label": str(i), "score": i},
+                "metadata": {},
+            }
+            for i in range(num_names + 1)
+        ]
+    }
+    response = await httpx_client.post("v1/span_annotations?sync=true", json=request_body)
+    assert response.status_code == 200
+    ids = [item["id"] for item in response.json()["data"]]
+    assert len(ids) == num_names + 1
+    assert ids[0] == ids[-1]
+    assert len(set(ids)) == num_names
+    async with db() as session:
+        annotations = {
+            str(GlobalID("SpanAnnotation", str(annotation.id))): annotation
+            for annotation in await session.scalars(select(models.SpanAnnotation))
+        }
+    assert len(annotations) == num_names
+    assert [annotations[id_].name for id_ in ids[:-1]] == [f"eval-{i}" for i in range(num_names)]
+    assert annotations[ids[0]].label == str(num_names)
+
+
+async def test_span_evaluations_are_ingested_from_arrow(
+    db: DbSessionFactory,
+    httpx_client: httpx.AsyncClient,
+    project_with_a_single_trace_and_span: Any,
+) -> None:
+    evaluations = SpanEvaluations(
+        eval_name="correctness",
+        dataframe=pd.DataFrame(
+            {"score": [0.5], "label": ["correct"]},
+            index=pd.Index(["7e2f08cb43bbf521"], name="context.span_id"),
+        ),
+    )
+    response = await httpx_client.post(
+        "v1/evaluations",
+        content=table_to_bytes(evaluations.to_pyarrow_table()),
+        headers={"content-type": "application/x-pandas-arrow"},
+    )
+    assert response.status_code == 200
+    await sleep(0.1)
+    async with db() as session:
+        annotation = await session.scalar(select(models.SpanAnnotation))
+    assert annotation is not None
+    assert annotation.name == "correctness"
+    assert annotation.annotator_kind == "LLM"
+    assert annotation.score == 0.5
+    assert annotation.label == "correct"
+    assert annotation.explanation is None
+
+
+async def test_span_evaluations_from_arrow_are_rejected_when_queue_is_full(
+    db: DbSessionFactory,
+    httpx_client: httpx.AsyncClient,
+    project_with_a_single_trace_and_span: Any,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        BulkInserter,
+        "annotation_queue_is_full",
+        lambda _, table: table is models.SpanAnnotation,
+    )
+    evaluations = SpanEvaluations(
+        eval_name="correctness",
+        dataframe=pd.DataFrame(
+            {"score": [0.5]},
+            index=pd.Index(["7e2f08cb43bbf521"], name="context.span_id"),
+        ),
+    )
+    response = await httpx_client.post(
+        "v1/evaluations",
+        content=table_to_bytes(evaluations.to_pyarrow_table()),
+        headers={"content-type": "application/x-pandas-arrow"},
+    )
+    assert response.status_code == 503
+    await sleep(0.1)
+    async with db() as session:
+        assert await session.scalar(select(models.SpanAnnotation)) is None
+
+
 @pytest.fixture
 def span_factory() -> Callable[..., models.Span]:
     """Factory for creating spans with sensible defaults."""
@@ -128,6 +128,30 @@ async def test_traces_endpoint_otlp_compliance(
     response_message.ParseFromString(response.content)
 
 
+@pytest.fixture
+def otlp_decode_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PHOENIX_OTLP_DECODE_WORKERS", "1")
+
+
+async def test_traces_endpoint_with_otlp_decode_workers(
+    otlp_decode_workers: None,
+    httpx_client: httpx.AsyncClient,
+) -> None:
+    response = await httpx_client.post(
+        "v1/traces",
+        content=ExportTraceServiceRequest().SerializeToString(),
+        headers={"Content-Type": "application/x-protobuf"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-protobuf"
+    response = await httpx_client.post(
+        "v1/traces",
+        content=b"\xff\xff\xff",
+        headers={"Content-Type": "application/x-protobuf"},
+    )
+    assert response.status_code == 422
+
+
 async def test_delete_trace_by_trace_id(
     httpx_client: httpx.AsyncClient,
     db: DbSessionFactory,
@@ -156,9 +180,9 @@ async def test_delete_trace_by_trace_id(
     response = await httpx_client.delete(url)
 
     # Should return 204 No Content
-    assert response.status_code == 204, (
-        f"DELETE /traces/{trace_id} should return 204 status code, got {response.status_code}"
-    )
+    assert (
+        response.status_code == 204
+    ), f"DELETE /traces/{trace_id} should return 204 status code, got {response.status_code}"
     assert response.text == ""  # No content in response body
 
     # Verify the trace was actually deleted from the database
@@ -313,9 +337,9 @@ async def test_delete_trace_by_relay_global_id(
     response = await httpx_client.delete(url)
 
     # Should return 204 No Content
-    assert response.status_code == 204, (
-        f"DELETE /traces/{trace_global_id} should return 204 status code, got {response.status_code}"
-    )
+    assert (
+        response.status_code == 204
+    ), f"DELETE /traces/{trace_global_id} should return 204 status code, got {response.status_code}"
     assert response.text == ""  # No content in response body
 
     # Verify the trace was actually deleted from the database
@@ -0,0 +1,30 @@
+import asyncio
+
+from phoenix.db import models
+from phoenix.server.api.context import DataLoaders
+from phoenix.server.types import DbSessionFactory
+
+
+async def test_data_loaders_are_created_lazily_and_instrumented(db: DbSessionFactory) -> None:
+    async with db() as session:
+        project_ids = []
+        for name in ("abc", "xyz"):
+            project = models.Project(name=name)
+            session.add(project)
+            await session.flush()
+            project_ids.append(project.id)
+    data_loaders = DataLoaders(db)
+    assert not data_loaders.stats
+    assert "project_fields" not in vars(data_loaders)
+
+    loader = data_loaders.project_fields
+    assert data_loaders.project_fields is loader
+    assert list(data_loaders.stats) == ["project_fields"]
+
+    names = await asyncio.gather(
+        *(loader.load((project_id, models.Project.name)) for project_id in project_ids)
+    )
+    assert names == ["abc", "xyz"]
+    stats = data_loaders.stats["project_fields"]
+    assert (stats.num_batches, stats.num_keys, stats.max_batch_size) == (1, 2, 2)
+    assert stats.load_time > 0
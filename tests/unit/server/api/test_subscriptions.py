@@ -39,9 +39,9 @@ def _assert_spans_equal(span: Mapping[str, Any], subscription_span: Mapping[str,
     SQLite's floating-point arithmetic produces slightly different results than Python.
     """
     # Check that both have the same keys
-    assert span.keys() == subscription_span.keys(), (
-        f"Span keys don't match: {span.keys()} vs {subscription_span.keys()}"
-    )
+    assert (
+        span.keys() == subscription_span.keys()
+    ), f"Span keys don't match: {span.keys()} vs {subscription_span.keys()}"
 
     # Compare each field
     for key in span.keys():
@@ -50,9 +50,9 @@ def _assert_spans_equal(span: Mapping[str, Any], subscription_span: Mapping[str,
             span_latency = span[key]
             subscription_latency = subscription_span[key]
             if span_latency is not None and subscription_latency is not None:
-                assert abs(span_latency - subscription_latency) <= 2.0, (
-                    f"latencyMs difference too large: {span_latency} vs {subscription_latency}"
-                )
+                assert (
+                    abs(span_latency - subscription_latency) <= 2.0
+                ), f"latencyMs difference too large: {span_latency} vs {subscription_latency}"
             else:
                 assert span_latency == subscription_latency
         else:
@@ -1686,6 +1686,93 @@ class TestChatCompletionOverDatasetSubscription:
             split_links = result.scalars().all()
             assert len(split_links) == 0  # No splits associated
 
+    async def test_resumes_missing_runs_of_interrupted_experiment(
+        self,
+        gql_client: AsyncGraphQLClient,
+        openai_api_key: str,
+        playground_dataset_with_patch_revision: None,
+        db: DbSessionFactory,
+    ) -> None:
+        from phoenix.db import models
+
+        dataset_id = str(GlobalID(type_name=Dataset.__name__, node_id=str(1)))
+        version_id = str(GlobalID(type_name=DatasetVersion.__name__, node_id=str(1)))
+        variables: dict[str, Any] = {
+            "input": {
+                "model": {"providerKey": "OPENAI", "name": "gpt-4"},
+                "datasetId": dataset_id,
+                "datasetVersionId": version_id,
+                "messages": [
+                    {
+                        "role": "USER",
+                        "content": "{missing}",  # fails to format without calling the LLM
+                    }
+                ],
+                "templateFormat": "F_STRING",
+                "repetitions": 1,
+            }
+        }
+
+        async def run() -> list[dict[str, Any]]:
+            async with gql_client.subscription(
+                query=self.QUERY,
+                variables=variables,
+                operation_name="ChatCompletionOverDatasetSubscription",
+            ) as subscription:
+                return [
+                    payload["chatCompletionOverDataset"] async for payload in subscription.stream()
+                ]
+
+        payloads = await run()
+        assert payloads[0]["__typename"] == ChatCompletionSubscriptionExperiment.__name__
+        experiment_id = payloads[0]["experiment"]["id"]
+        _, experiment_rowid = from_global_id(GlobalID.from_id(experiment_id))
+        async with db() as session:
+            job = await session.scalar(
+                select(models.ExperimentJob).filter_by(experiment_id=experiment_rowid)
+            )
+            assert job is not None
+            assert (job.status, job.total_count, job.completed_count) == ("COMPLETED", 3, 3)
+
+            # simulate a server that went away before the run of the second example was recorded
+            run_ = await session.scalar(
+                select(models.ExperimentRun).filter_by(
+                    experiment_id=experiment_rowid, dataset_example_id=2
+                )
+            )
+            assert run_ is not None
+            await session.delete(run_)
+            job.status = "INTERRUPTED"
+
+        variables["input"]["experimentId"] = experiment_id
+        payloads = await run()
+        assert payloads[0]["__typename"] == ChatCompletionSubscriptionExperiment.__name__
+        assert payloads[0]["experiment"]["id"] == experiment_id
+        example_id = str(GlobalID(type_name=DatasetExample.__name__, node_id=str(2)))
+        assert {payload["datasetExampleId"] for payload in payloads[1:]} == {example_id}
+        assert [payload["__typename"] for payload in payloads[1:]] == [
+            ChatCompletionSubscriptionError.__name__,
+            ChatCompletionSubscriptionResult.__name__,
+        ]
+        async with db() as session:
+            job = await session.scalar(
+                select(models.ExperimentJob).filter_by(experiment_id=experiment_rowid)
+            )
+            assert job is not None
+            assert (job.status, job.total_count, job.completed_count) == ("COMPLETED", 3, 3)
+            runs = (
+                await session.scalars(
+                    select(models.ExperimentRun).filter_by(experiment_id=experiment_rowid)
+                )
+            ).all()
+            assert sorted(run.dataset_example_id for run in runs) == [1, 2, 3]
+
+        # nothing is left to run
+        payloads = await run()
+        assert [payload["__typename"] for payload in payloads] == [
+            ChatCompletionSubscriptionExperiment.__name__
+        ]
+
 
 def _request_bodies_contain_same_city(request1: VCRRequest, request2: VCRRequest) -> None:
     assert _extract_city(request1.body.decode()) == _extract_city(request2.body.decode())
@@ -17,6 +17,7 @@ from typing_extensions import assert_never
 
 from phoenix.config import DEFAULT_PROJECT_NAME
 from phoenix.db import models
+from phoenix.db.time_series_rollups import refresh_time_series_rollups
 from phoenix.server.api.input_types.TimeBinConfig import TimeBinConfig, TimeBinScale
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.api.types.pagination import Cursor, CursorSortColumn, CursorSortColumnDataType
@@ -2487,6 +2488,13 @@ class TestProject:
                 )
                 spans.append(span)
             session.add_all(spans)
+            await session.flush()
+            # The server refreshes the rollups whenever it writes spans, and the time series
+            # are read from the rollups whenever the time range is aligned to them.
+            await refresh_time_series_rollups(
+                session,
+                [(projects[-1].id, trace.start_time, trace.end_time) for trace in traces],
+            )
 
         return _Data(
             spans=spans,
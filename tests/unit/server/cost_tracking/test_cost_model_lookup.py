@@ -5,7 +5,7 @@ from typing import Any, Mapping, Optional
 import pytest
 
 from phoenix.db import models
-from phoenix.server.cost_tracking.cost_model_lookup import CostModelLookup
+from phoenix.server.cost_tracking.cost_model_lookup import CostModelLookup, _required_literals
 
 
 class TestCostModelLookup:
@@ -1021,9 +1021,9 @@ class TestCostModelLookup:
             assert ans is None, f"Expected None but got {ans}"
         else:
             assert ans is not None, f"Expected model with ID {expected_model_id} but got None"
-            assert ans.id == expected_model_id, (
-                f"Expected model ID {expected_model_id} but got {ans.id}"
-            )
+            assert (
+                ans.id == expected_model_id
+            ), f"Expected model ID {expected_model_id} but got {ans.id}"
 
 
 class TestCostModelLookupMerge:
@@ -1247,3 +1247,71 @@ class TestCostModelLookupMerge:
         )
         assert result is not None
         assert result.id == 1
+
+
+class TestCostModelLookupMemo:
+    """Test cases for the memo of models resolved by CostModelLookup.find_model()."""
+
+    @staticmethod
+    def _model(
+        id: int,
+        name_pattern: str,
+        start_time: Optional[datetime] = None,
+        deleted_at: Optional[datetime] = None,
+    ) -> models.GenerativeModel:
+        return models.GenerativeModel(
+            id=id,
+            name=f"model-{id}",
+            provider="openai",
+            start_time=start_time,
+            name_pattern=re.compile(name_pattern),
+            is_built_in=False,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+            deleted_at=deleted_at,
+        )
+
+    def test_memo_respects_model_start_times(self) -> None:
+        cutoff = datetime(2024, 6, 1, tzinfo=timezone.utc)
+        lookup = CostModelLookup([self._model(1, "gpt-4"), self._model(2, "^gpt-4$", cutoff)])
+        attributes = {"llm": {"model_name": "gpt-4"}}
+        for _ in range(2):
+            before = lookup.find_model(datetime(2024, 1, 1, tzinfo=timezone.utc), attributes)
+            after = lookup.find_model(datetime(2024, 7, 1, tzinfo=timezone.utc), attributes)
+            assert before is not None and before.id == 1
+            assert after is not None and after.id == 2
+
+    def test_memo_is_invalidated_by_merge(self) -> None:
+        lookup = CostModelLookup([self._model(1, "gpt-4")])
+        start_time = datetime.now(timezone.utc)
+        attributes = {"llm": {"model_name": "gpt-4o"}}
+        first = lookup.find_model(start_time, attributes)
+        assert first is not None and first.id == 1
+        lookup.merge([self._model(2, "^gpt-4o$")])
+        second = lookup.find_model(start_time, attributes)
+        assert second is not None and second.id == 2
+        lookup.merge([self._model(2, "^gpt-4o$", deleted_at=datetime.now(timezone.utc))])
+        third = lookup.find_model(start_time, attributes)
+        assert third is not None and third.id == 1
+
+    @pytest.mark.parametrize(
+        "pattern,expected",
+        [
+            pytest.param("gpt-4o", ("gpt-4o",), id="literal"),
+            pytest.param("^(gpt-4o)$", ("gpt-4o",), id="anchored-group"),
+            pytest.param("gpt-4o|gpt-4o-mini", ("gpt-4o",), id="common-prefix"),
+            pytest.param(
+                "claude-3-opus|anthropic\\.claude-3-opus",
+                ("claude-3-opus", "anthropic.claude-3-opus"),
+                id="alternatives",
+            ),
+            pytest.param("gpt-4(o|-turbo)", ("gpt-4",), id="literal-before-group"),
+            pytest.param("gpt-4o?", ("gpt-4",), id="optional-suffix"),
+            pytest.param("gpt.*|claude", ("gpt", "claude"), id="alternative-with-wildcard"),
+            pytest.param(".*gpt|claude", None, id="alternative-without-literal"),
+            pytest.param(".*gpt", None, id="leading-wildcard"),
+            pytest.param("(?i)gpt", None, id="case-insensitive"),
+        ],
+    )
+    def test_required_literals(self, pattern: str, expected: Optional[tuple[str, ...]]) -> None:
+        assert _required_literals(re.compile(pattern)) == expected
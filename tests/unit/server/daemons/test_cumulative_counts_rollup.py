@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import select
+
+from phoenix.db import models
+from phoenix.db.insertion.span import insert_spans
+from phoenix.server.daemons.cumulative_counts_rollup import CumulativeCountsRollup
+from phoenix.server.dml_event import DmlEvent, SpanInsertEvent
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+
+class _EventQueue:
+    def __init__(self) -> None:
+        self.events: list[DmlEvent] = []
+
+    def put(self, item: DmlEvent) -> None:
+        self.events.append(item)
+
+
+def _span(span_id: str, parent_id: Any, status_code: SpanStatusCode) -> Span:
+    start_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return Span(
+        name=span_id,
+        context=SpanContext(trace_id="trace", span_id=span_id),
+        parent_id=parent_id,
+        span_kind=SpanKind.CHAIN,
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=1),
+        attributes={},
+        events=[],
+        status_code=status_code,
+        status_message="",
+        conversation=None,
+    )
+
+
+class TestCumulativeCountsRollup:
+    async def test_flush_recomputes_dirty_traces_and_emits_event(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        event_queue = _EventQueue()
+        rollup = CumulativeCountsRollup(db, event_queue=event_queue)
+        for span in [
+            _span("child", "root", SpanStatusCode.ERROR),
+            _span("root", None, SpanStatusCode.OK),
+        ]:
+            async with db() as session:
+                results = await insert_spans(
+                    session, [(span, "project")], propagate_cumulative_counts=False
+                )
+            rollup.put_nowait(*(event.trace_rowid for _, event in results))
+        assert not rollup.empty
+        await rollup.flush()
+        assert rollup.empty
+        async with db() as session:
+            cumulative_error_count = await session.scalar(
+                select(models.Span.cumulative_error_count).filter_by(span_id="root")
+            )
+            project_rowid = await session.scalar(select(models.Project.id))
+        assert cumulative_error_count == 1
+        assert event_queue.events == [SpanInsertEvent((project_rowid,))]
+        # a clean trace does not emit another event
+        rollup.put_nowait(*(event.trace_rowid for _, event in results))
+        await rollup.flush()
+        assert len(event_queue.events) == 1
+
+    async def test_stop_drains_dirty_traces(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        rollup = CumulativeCountsRollup(db, sleep_seconds=3600)
+        await rollup.start()
+        for span in [
+            _span("child", "root", SpanStatusCode.ERROR),
+            _span("root", None, SpanStatusCode.OK),
+        ]:
+            async with db() as session:
+                results = await insert_spans(
+                    session, [(span, "project")], propagate_cumulative_counts=False
+                )
+            rollup.put_nowait(*(event.trace_rowid for _, event in results))
+        await rollup.stop()
+        assert rollup.empty
+        async with db() as session:
+            cumulative_error_count = await session.scalar(
+                select(models.Span.cumulative_error_count).filter_by(span_id="root")
+            )
+        assert cumulative_error_count == 1
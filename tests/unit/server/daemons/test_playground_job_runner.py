@@ -0,0 +1,81 @@
+import asyncio
+from collections.abc import Sequence
+from typing import Any, cast
+
+from sqlalchemy import select
+
+from phoenix.db import models
+from phoenix.server.daemons.playground_job_runner import (
+    ChatCompletionResult,
+    ChatStream,
+    PlaygroundJobRunner,
+)
+from phoenix.server.types import DbSessionFactory
+
+
+async def _create_experiment(db: DbSessionFactory) -> models.Experiment:
+    async with db() as session:
+        dataset = models.Dataset(name="dataset-name", metadata_={})
+        session.add(dataset)
+        await session.flush()
+        version = models.DatasetVersion(dataset_id=dataset.id, metadata_={})
+        session.add(version)
+        await session.flush()
+        experiment = models.Experiment(
+            dataset_id=dataset.id,
+            dataset_version_id=version.id,
+            name="experiment-name",
+            repetitions=1,
+            metadata_={},
+        )
+        session.add(experiment)
+    return experiment
+
+
+class TestPlaygroundJobRunner:
+    async def test_stop_records_results_already_received(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        experiment = await _create_experiment(db)
+        written: list[ChatCompletionResult] = []
+        received = asyncio.Event()
+        num_received = 0
+
+        async def run_example(
+            *,
+            revision: models.DatasetExampleRevision,
+            repetition_number: int,
+            results: asyncio.Queue[ChatCompletionResult],
+        ) -> Any:
+            nonlocal num_received
+            results.put_nowait(cast(ChatCompletionResult, (revision.dataset_example_id,)))
+            if (num_received := num_received + 1) == 2:
+                received.set()
+            await asyncio.Event().wait()  # the task never finishes on its own
+            yield
+
+        async def write_results(*, results: Sequence[ChatCompletionResult]) -> ChatStream:
+            written.extend(results)
+            return
+            yield
+
+        runner = PlaygroundJobRunner(db)
+        await runner.start()
+        await runner.create(
+            experiment,
+            items=[(models.DatasetExampleRevision(dataset_example_id=i), 1) for i in range(2)],
+            run_example=run_example,
+            write_results=write_results,
+        )
+        await asyncio.wait_for(received.wait(), 10)
+        await runner.stop()
+
+        assert sorted(cast(list[Any], written)) == [(0,), (1,)]
+        async with db() as session:
+            job = await session.scalar(
+                select(models.ExperimentJob).filter_by(experiment_id=experiment.id)
+            )
+        assert job is not None
+        assert job.status == "INTERRUPTED"
+        assert job.completed_count == 2
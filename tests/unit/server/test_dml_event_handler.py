@@ -0,0 +1,59 @@
+from asyncio import Future, get_running_loop, sleep
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from phoenix.db import models
+from phoenix.server.api.dataloaders import CacheForDataLoaders
+from phoenix.server.api.dataloaders.record_counts import Key
+from phoenix.server.dml_event import InsertedSpans, SpanInsertEvent
+from phoenix.server.dml_event_handler import DmlEventHandler
+from phoenix.server.types import DbSessionFactory, LastUpdatedAt
+
+
+def _record_count_key(project_id: int) -> Key:
+    return ("span", project_id, None, None, None)
+
+
+async def test_span_insert_event_updates_caches_of_summarized_projects_in_place(
+    db: DbSessionFactory,
+) -> None:
+    cache = CacheForDataLoaders()
+    last_updated_at = LastUpdatedAt()
+    handler = DmlEventHandler(
+        db=db,
+        last_updated_at=last_updated_at,
+        cache_for_dataloaders=cache,
+        sleep_seconds=0.01,
+    )
+    t0 = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+    async with handler:
+        for project_id in (1, 2):
+            future: Future[int] = get_running_loop().create_future()
+            future.set_result(10)
+            cache.record_count.set(_record_count_key(project_id), future)
+        await sleep(0)  # let the cache record when the futures were settled
+        handler.put(
+            SpanInsertEvent(
+                (1, 2),
+                inserted_spans={
+                    1: InsertedSpans(
+                        started_at=perf_counter(),
+                        min_time=t0,
+                        max_time=t0 + timedelta(seconds=1),
+                        spans=((t0, 0, 0), (t0, 0, 0)),
+                    ),
+                },
+            )
+        )
+        for _ in range(100):
+            if cache.record_count.get(_record_count_key(2)) is None:
+                break
+            await sleep(0.05)
+
+    # the project with a summary of its inserted spans is updated in place, while the
+    # caches of the other project are cleared
+    assert (cached := cache.record_count.get(_record_count_key(1))) is not None
+    assert cached.result() == 12
+    assert cache.record_count.get(_record_count_key(2)) is None
+    assert last_updated_at.get(models.Project, 1) is not None
+    assert last_updated_at.get(models.Project, 2) is not None
@@ -0,0 +1,104 @@
+import asyncio
+from asyncio import sleep
+from contextlib import AsyncExitStack
+
+import pytest
+
+from phoenix.db import models
+from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.server.api.dataloaders import CacheForDataLoaders
+from phoenix.server.api.dataloaders.record_counts import Key
+from phoenix.server.dml_event import ProjectDeleteEvent, SpanDeleteEvent, SpanInsertEvent
+from phoenix.server.dml_event_handler import DmlEventHandler
+from phoenix.server.dml_event_notifier import (
+    DmlEventNotifier,
+    InProcessDmlEventNotifier,
+    PostgresDmlEventNotifier,
+    decode_dml_event,
+    encode_dml_events,
+)
+from phoenix.server.types import DbSessionFactory, LastUpdatedAt
+
+
+def test_encode_dml_events_merges_ids_by_event_type() -> None:
+    payloads = list(
+        encode_dml_events(
+            [SpanInsertEvent((1, 2)), SpanInsertEvent((2, 3)), ProjectDeleteEvent((4,))],
+            "sender",
+        )
+    )
+    assert [decode_dml_event(payload) for payload in payloads] == [
+        ("sender", SpanInsertEvent((1, 2, 3))),
+        ("sender", ProjectDeleteEvent((4,))),
+    ]
+    assert decode_dml_event('{"sender": "sender", "type": "Unknown", "ids": [1]}') == (
+        "sender",
+        None,
+    )
+
+
+def _record_count_key(project_id: int) -> Key:
+    return ("span", project_id, None, None, None)
+
+
+async def _assert_events_are_shared_between_replicas(
+    db: DbSessionFactory,
+    *notifiers: DmlEventNotifier,
+) -> None:
+    caches = [CacheForDataLoaders() for _ in notifiers]
+    last_updated_ats = [LastUpdatedAt() for _ in notifiers]
+    handlers = [
+        DmlEventHandler(
+            db=db,
+            last_updated_at=last_updated_at,
+            cache_for_dataloaders=cache,
+            sleep_seconds=0.01,
+            notifier=notifier,
+        )
+        for cache, last_updated_at, notifier in zip(caches, last_updated_ats, notifiers)
+    ]
+    async with AsyncExitStack() as stack:
+        for handler in handlers:
+            await stack.enter_async_context(handler)
+        for notifier in notifiers:
+            if isinstance(notifier, PostgresDmlEventNotifier):
+                await asyncio.wait_for(notifier.wait_until_listening(), 10)
+        for cache in caches:
+            for project_id in (1, 2):
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(0)
+                cache.record_count.set(_record_count_key(project_id), future)
+        handlers[0].put(SpanDeleteEvent((1,)))
+        for _ in range(100):
+            if all(cache.record_count.get(_record_count_key(1)) is None for cache in caches):
+                break
+            await sleep(0.05)
+        for cache, last_updated_at in zip(caches, last_updated_ats):
+            assert cache.record_count.get(_record_count_key(1)) is None
+            assert cache.record_count.get(_record_count_key(2)) is not None
+            assert last_updated_at.get(models.Project, 1) is not None
+
+
+async def test_in_process_notifier_shares_events_between_replicas(
+    db: DbSessionFactory,
+) -> None:
+    channel: list[InProcessDmlEventNotifier] = []
+    await _assert_events_are_shared_between_replicas(
+        db,
+        InProcessDmlEventNotifier(channel),
+        InProcessDmlEventNotifier(channel),
+    )
+
+
+async def test_postgres_notifier_shares_events_between_replicas(
+    db: DbSessionFactory,
+    request: pytest.FixtureRequest,
+) -> None:
+    if db.dialect is not SupportedSQLDialect.POSTGRESQL:
+        pytest.skip("LISTEN/NOTIFY is only available in PostgreSQL")
+    engine = request.getfixturevalue("postgresql_engine")
+    await _assert_events_are_shared_between_replicas(
+        db,
+        PostgresDmlEventNotifier(engine),
+        PostgresDmlEventNotifier(engine),
+    )
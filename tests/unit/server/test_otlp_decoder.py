@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+import pytest
+from google.protobuf.message import DecodeError
+from openinference.semconv.resource import ResourceAttributes
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
+from opentelemetry.proto.resource.v1.resource_pb2 import Resource
+from opentelemetry.proto.trace.v1.trace_pb2 import ResourceSpans, ScopeSpans
+
+from phoenix.config import DEFAULT_PROJECT_NAME
+from phoenix.server.otlp_decoder import (
+    OtlpDecoderPool,
+    decode_export_trace_service_request,
+)
+from phoenix.trace.otel import encode_span_to_otlp
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+
+def _span(span_id: str) -> Span:
+    return Span(
+        name=span_id,
+        context=SpanContext(trace_id="0123456789abcdef0123456789abcdef", span_id=span_id),
+        parent_id=None,
+        span_kind=SpanKind.LLM,
+        start_time=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        end_time=datetime(2024, 1, 1, 0, 0, 1, tzinfo=timezone.utc),
+        attributes={
+            "openinference": {"span": {"kind": "LLM"}},
+            "llm": {"token_count": {"prompt": 1}},
+        },
+        events=[],
+        status_code=SpanStatusCode.OK,
+        status_message="",
+        conversation=None,
+    )
+
+
+@pytest.fixture
+def request_() -> ExportTraceServiceRequest:
+    return ExportTraceServiceRequest(
+        resource_spans=[
+            ResourceSpans(
+                resource=Resource(
+                    attributes=[
+                        KeyValue(
+                            key=ResourceAttributes.PROJECT_NAME,
+                            value=AnyValue(string_value="abc"),
+                        )
+                    ]
+                ),
+                scope_spans=[
+                    ScopeSpans(spans=[encode_span_to_otlp(_span("0000000000000001"))]),
+                    ScopeSpans(spans=[encode_span_to_otlp(_span("0000000000000002"))]),
+                ],
+            ),
+            ResourceSpans(
+                scope_spans=[ScopeSpans(spans=[encode_span_to_otlp(_span("0000000000000003"))])],
+            ),
+        ]
+    )
+
+
+def test_decode_export_trace_service_request(request_: ExportTraceServiceRequest) -> None:
+    spans = decode_export_trace_service_request(request_)
+    assert [(span.context.span_id, project_name) for span, project_name in spans] == [
+        ("0000000000000001", "abc"),
+        ("0000000000000002", "abc"),
+        ("0000000000000003", DEFAULT_PROJECT_NAME),
+    ]
+
+
+class TestOtlpDecoderPool:
+    async def test_decodes_the_same_spans_as_in_process_decoding(
+        self,
+        request_: ExportTraceServiceRequest,
+    ) -> None:
+        async with OtlpDecoderPool(2) as pool:
+            spans = await pool.decode(request_.SerializeToString())
+            with pytest.raises(DecodeError):
+                await pool.decode(b"\xff\xff\xff")
+        assert spans == decode_export_trace_service_request(request_)
@@ -2,7 +2,7 @@ from asyncio import Event, sleep
 from datetime import datetime, timedelta, timezone
 from secrets import token_hex
 from typing import Any, AsyncIterator
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 import sqlalchemy as sa
@@ -18,6 +18,7 @@ from phoenix.db.types.trace_retention import (
     TraceRetentionCronExpression,
     TraceRetentionRule,
 )
+from phoenix.server.dml_event import SpanDeleteEvent
 from phoenix.server.retention import TraceDataSweeper
 from phoenix.server.types import DbSessionFactory
 
@@ -112,9 +113,9 @@ class TestTraceDataSweeper:
                     traces_before_sweep = await session.scalar(
                         sa.select(func.count(models.Trace.id)).filter_by(project_rowid=project_id)
                     )
-                    assert traces_before_sweep == initial_traces, (
-                        f"Project {project_id}: Initial trace count mismatch in cycle {retention_cycle}"
-                    )
+                    assert (
+                        traces_before_sweep == initial_traces
+                    ), f"Project {project_id}: Initial trace count mismatch in cycle {retention_cycle}"
 
                     # Get the trace_ids of the most recent traces before sweep
                     expected_trace_ids = set(
@@ -148,9 +149,9 @@ class TestTraceDataSweeper:
 
                     # Verify we kept exactly the expected traces
                     expected_trace_ids = project_expected_trace_ids[project_id]
-                    assert remaining_trace_ids == expected_trace_ids, (
-                        f"Project {project_id}: Trace IDs mismatch in cycle {retention_cycle}"
-                    )
+                    assert (
+                        remaining_trace_ids == expected_trace_ids
+                    ), f"Project {project_id}: Trace IDs mismatch in cycle {retention_cycle}"
 
                     project_current_trace_count[project_id] = len(remaining_trace_ids)
 
@@ -432,6 +433,132 @@ class TestTraceDataSweeper:
                     f"trace IDs mismatch: expected {expected_trace_ids}, got {remaining_trace_ids}"
                 )
 
+    async def test_interrupted_sweep_is_resumed_in_batches(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        """Test that a sweep interrupted by a restart is resumed right away, in batches.
+
+        The policy is scheduled for an hour that never comes up in this test, so it only
+        runs because it is marked as having been interrupted. Each batch is deleted in its
+        own transaction and emits its own SpanDeleteEvent, and the mark is cleared once
+        there is nothing left to delete.
+        """
+        now = datetime.now(timezone.utc)
+        async with db() as session:
+            project = models.Project(name=token_hex(8))
+            idle_project = models.Project(name=token_hex(8))
+            session.add_all([project, idle_project])
+            await session.flush()
+            session.add_all(
+                models.Trace(
+                    project_rowid=p.id,
+                    trace_id=token_hex(16),
+                    start_time=now - timedelta(days=10 + i),
+                    end_time=now - timedelta(days=10 + i) + timedelta(seconds=1),
+                )
+                for p in (project, idle_project)
+                for i in range(7)
+            )
+            interrupted_policy = models.ProjectTraceRetentionPolicy(
+                name=token_hex(8),
+                cron_expression=TraceRetentionCronExpression(root="0 0 * * 0"),
+                rule=TraceRetentionRule(root=MaxDaysRule(max_days=1)),
+                projects=[project],
+                sweep_started_at=now - timedelta(hours=1),
+            )
+            idle_policy = models.ProjectTraceRetentionPolicy(
+                name=token_hex(8),
+                cron_expression=TraceRetentionCronExpression(root="0 0 * * 0"),
+                rule=TraceRetentionRule(root=MaxDaysRule(max_days=1)),
+                projects=[idle_project],
+            )
+            session.add_all([interrupted_policy, idle_policy])
+
+        dml_event_handler = MagicMock()
+        sweeper = TraceDataSweeper(
+            db=db,
+            dml_event_handler=dml_event_handler,
+            batch_size=3,
+            batch_pause_seconds=0,
+        )
+        await sweeper._sweep(current_hour=None)
+
+        assert [call.args for call in dml_event_handler.put.call_args_list] == [
+            (SpanDeleteEvent((project.id,)),)
+        ] * 3
+        async with db() as session:
+            remaining = await session.scalars(
+                sa.select(models.Trace.project_rowid).where(
+                    models.Trace.project_rowid.in_([project.id, idle_project.id])
+                )
+            )
+            assert remaining.all() == [idle_project.id] * 7
+            sweep_started_at = await session.scalar(
+                sa.select(models.ProjectTraceRetentionPolicy.sweep_started_at).filter_by(
+                    id=interrupted_policy.id
+                )
+            )
+            assert sweep_started_at is None
+
+    async def test_max_count_sweep_ranks_the_traces_once(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        """Test that the traces beyond the max count are determined once per sweep.
+
+        Each batch compares against the cutoffs determined at the start of the sweep
+        instead of ranking all the traces of the projects again.
+        """
+        now = datetime.now(timezone.utc)
+        async with db() as session:
+            project = models.Project(name=token_hex(8))
+            session.add(project)
+            await session.flush()
+            traces = [
+                models.Trace(
+                    project_rowid=project.id,
+                    trace_id=token_hex(16),
+                    start_time=now - timedelta(hours=i),
+                    end_time=now - timedelta(hours=i) + timedelta(seconds=1),
+                )
+                for i in range(8)
+            ]
+            session.add_all(traces)
+            session.add(
+                models.ProjectTraceRetentionPolicy(
+                    name=token_hex(8),
+                    cron_expression=TraceRetentionCronExpression(root="0 0 * * 0"),
+                    rule=TraceRetentionRule(root=MaxCountRule(max_count=2)),
+                    projects=[project],
+                    sweep_started_at=now - timedelta(hours=1),
+                )
+            )
+
+        dml_event_handler = MagicMock()
+        sweeper = TraceDataSweeper(
+            db=db,
+            dml_event_handler=dml_event_handler,
+            batch_size=2,
+            batch_pause_seconds=0,
+        )
+        get_max_count_cutoffs = MaxCountRule.get_max_count_cutoffs
+        with patch.object(
+            MaxCountRule,
+            "get_max_count_cutoffs",
+            autospec=True,
+            side_effect=get_max_count_cutoffs,
+        ) as mock:
+            await sweeper._sweep(current_hour=None)
+
+        assert mock.call_count == 1
+        assert len(dml_event_handler.put.call_args_list) == 3
+        async with db() as session:
+            remaining = await session.scalars(
+                sa.select(models.Trace.id).filter_by(project_rowid=project.id)
+            )
+            assert sorted(remaining.all()) == sorted(trace.id for trace in traces[:2])
+
 
 @pytest.fixture
 async def sweeper_trigger() -> AsyncIterator[Event]:
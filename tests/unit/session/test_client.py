@@ -8,7 +8,7 @@ import httpx
 import pandas as pd
 import pyarrow as pa
 import pytest
-from httpx import Request, Response
+from httpx import HTTPStatusError, Request, Response
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest,
 )
@@ -17,6 +17,7 @@ from pytz import UTC
 from respx import MockRouter
 from strawberry.relay import GlobalID
 
+from phoenix.session import client as client_module
 from phoenix.session.client import Client, TimeoutError
 from phoenix.trace import SpanEvaluations
 from phoenix.trace.dsl import SpanQuery
@@ -135,7 +136,11 @@ def test_log_traces_sends_oltp_spans(
         req = ExportTraceServiceRequest()
         req.ParseFromString(content)
         nonlocal span_counter
-        span_counter += 1
+        span_counter += sum(
+            len(scope_spans.spans)
+            for resource_spans in req.resource_spans
+            for scope_spans in resource_spans.scope_spans
+        )
         return Response(200)
 
     url = urljoin(endpoint, "v1/traces")
@@ -164,7 +169,7 @@ def test_log_traces_to_project(
         assert resource.attributes[0].key == "openinference.project.name"
         assert resource.attributes[0].value.string_value == "special-project"
         nonlocal span_counter
-        span_counter += 1
+        span_counter += len(resource_spans[0].scope_spans[0].spans)
         return httpx.Response(200)
 
     url = urljoin(endpoint, "v1/traces")
@@ -173,6 +178,49 @@ def test_log_traces_to_project(
     assert span_counter == len(trace_ds.dataframe)
 
 
+def test_log_traces_sends_spans_in_batches(
+    client: Client,
+    endpoint: str,
+    trace_ds: TraceDataset,
+    respx_mock: MockRouter,
+) -> None:
+    batch_sizes = []
+
+    def request_callback(request: Request) -> Response:
+        req = ExportTraceServiceRequest()
+        req.ParseFromString(gzip.decompress(request.content))
+        batch_sizes.append(len(req.resource_spans[0].scope_spans[0].spans))
+        return Response(200)
+
+    url = urljoin(endpoint, "v1/traces")
+    respx_mock.post(url).mock(side_effect=request_callback)
+    client.log_traces(trace_dataset=trace_ds, batch_size=2, concurrency=1)
+    assert batch_sizes == [2, 2, 1]
+
+    batch_sizes.clear()
+    client.log_traces(trace_dataset=trace_ds, max_batch_bytes=1)
+    assert batch_sizes == [1] * len(trace_ds.dataframe)
+
+
+def test_log_traces_retries_when_server_is_at_capacity(
+    client: Client,
+    endpoint: str,
+    trace_ds: TraceDataset,
+    respx_mock: MockRouter,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(client_module, "_TRACE_UPLOAD_RETRY_DELAY_SEC", 0)
+    url = urljoin(endpoint, "v1/traces")
+    route = respx_mock.post(url).mock(side_effect=[Response(503), Response(503), Response(200)])
+    client.log_traces(trace_dataset=trace_ds)
+    assert route.call_count == 3
+
+    route.side_effect = None
+    route.return_value = Response(503)
+    with pytest.raises(HTTPStatusError):
+        client.log_traces(trace_dataset=trace_ds)
+
+
 def test_get_dataset_versions(
     client: Client,
     endpoint: str,
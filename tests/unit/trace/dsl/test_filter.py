@@ -101,6 +101,10 @@ def test_get_attribute_keys_list(expression: str, expected: Optional[list[str]])
             "first.value in (1,) and second.value in ('2',) and '3' in third.value",
             "and_(attributes[['first', 'value']].as_float().in_((1,)), attributes[['second', 'value']].as_string().in_(('2',)), TextContains(attributes[['third', 'value']].as_string(), '3'))",
         ),
+        (
+            "'abc' in input.value and 'xyz' not in output.value and 'ab' in input.value",
+            "and_(and_(span_text_search('abc', 'input'), TextContains(attributes[['input', 'value']].as_string(), 'abc')), not_(TextContains(attributes[['output', 'value']].as_string(), 'xyz')), and_(span_text_search('ab', 'input'), TextContains(attributes[['input', 'value']].as_string(), 'ab')))",
+        ),
         (
             "'1.0' < my.value < 2.0",
             "and_('1.0' < attributes[['my', 'value']].as_string(), attributes[['my', 'value']].as_float() < 2.0)"
@@ -152,6 +156,7 @@ async def test_filter_translated(
     default_project: Any,
     abc_project: Any,
 ) -> None:
+    phoenix.trace.dsl.filter._COMPILED_SPAN_FILTERS.clear()
     with patch.object(
         phoenix.trace.dsl.filter,
         "uuid4",
@@ -253,3 +258,26 @@ def test_apply_eval_aliasing(filter_condition: str, expected: str) -> None:
     ):
         aliased, _ = _apply_eval_aliasing(filter_condition)
     assert aliased == expected
+
+
+def test_compiled_filters_are_cached() -> None:
+    cache = phoenix.trace.dsl.filter._COMPILED_SPAN_FILTERS
+    cache.clear()
+    condition = "evals['Q&A Correctness'].score > 0.5"
+    f1 = SpanFilter(condition, valid_eval_names=["Q&A Correctness"])
+    f2 = SpanFilter(condition, valid_eval_names=["Q&A Correctness"])
+    assert f1.compiled is f2.compiled
+    assert f1._aliased_annotation_relations is f2._aliased_annotation_relations
+    assert len(cache) == 1
+    # cache hits are reported to the callers, who count them
+    assert f1.cache_hit is False
+    assert f2.cache_hit is True
+    assert SpanFilter().cache_hit is None
+    # the valid eval names are part of the key, so validation is not bypassed by the cache
+    with pytest.raises(SyntaxError):
+        SpanFilter(condition, valid_eval_names=["Hallucination"])
+    assert len(cache) == 1
+    f3 = SpanFilter(condition)
+    assert f3.compiled is not f1.compiled
+    assert f3.cache_hit is False
+    assert len(cache) == 2